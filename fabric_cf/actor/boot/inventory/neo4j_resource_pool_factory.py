@@ -23,6 +23,12 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+
 from fim.graph.abc_property_graph import ABCPropertyGraph
 from fim.graph.neo4j_property_graph import Neo4jGraphImporter, Neo4jPropertyGraph
 from fim.graph.resources.neo4j_arm import Neo4jARMGraph
@@ -33,24 +39,184 @@ from fabric_cf.actor.boot.inventory.resource_pool_factory import ResourcePoolFac
 
 class Neo4jResourcePoolFactory(ResourcePoolFactory):
     """
-    Provides methods to load Graph Models and perform various operations on them
+    Provides methods to load Graph Models and perform various operations on them.
+    A single Neo4jGraphImporter (and hence a single driver and its connection pool) is shared by
+    all callers in the process; the neo4j driver is thread safe.
+    Graphs keep a reference to the driver of the importer that created them, so a driver is never closed while
+    graphs handed out by the factory may still use it: when the importer is replaced (failed connectivity check)
+    or released (Globals stop), it is retired and its driver is closed once the last of its graphs is gone.
     """
+    # Default seconds between driver connectivity checks
+    DEFAULT_HEALTH_CHECK_INTERVAL = 60
+
+    importer = None
+    # Re-entrant: graph finalizers release their importer and may run (garbage collection) while the lock is held
+    importer_lock = threading.RLock()
+    last_health_check = 0
+    # id(importer) -> number of live graphs created with the importer
+    importer_users = {}
+    # id(importer) -> importer no longer handed out; closed when it has no more users
+    retired_importers = {}
+    metrics = {}
+    metrics_lock = threading.Lock()
+
     @staticmethod
-    def get_neo4j_importer() -> Neo4jGraphImporter:
+    def create_neo4j_importer(*, neo4j_config: dict, logger) -> Neo4jGraphImporter:
         """
-        get neo4j graph importer
+        Create a neo4j graph importer; the driver connection pool is sized from the neo4j config (pool_size)
+        :param neo4j_config: neo4j config
+        :param logger: logger
         :return: Neo4jGraphImporter
         """
-        from fabric_cf.actor.core.container.globals import GlobalsSingleton
-        neo4j_config = GlobalsSingleton.get().get_config().get_global_config().get_neo4j_config()
-        logger = GlobalsSingleton.get().get_logger()
-
         neo4j_graph_importer = Neo4jGraphImporter(url=neo4j_config["url"], user=neo4j_config["user"],
                                                   pswd=neo4j_config["pass"],
                                                   import_host_dir=neo4j_config["import_host_dir"],
                                                   import_dir=neo4j_config["import_dir"], logger=logger)
+        pool_size = neo4j_config.get("pool_size", None)
+        if pool_size is not None:
+            # The importer does not expose driver options; replace its (not yet connected) driver
+            from neo4j import GraphDatabase
+            neo4j_graph_importer.driver.close()
+            neo4j_graph_importer.driver = GraphDatabase.driver(neo4j_config["url"],
+                                                               auth=(neo4j_config["user"], neo4j_config["pass"]),
+                                                               max_connection_pool_size=int(pool_size))
         return neo4j_graph_importer
 
+    @staticmethod
+    def get_neo4j_config() -> tuple:
+        """
+        get the neo4j configuration and the logger of the container
+        :return: tuple of neo4j config, logger
+        """
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        neo4j_config = GlobalsSingleton.get().get_config().get_global_config().get_neo4j_config()
+        return neo4j_config, GlobalsSingleton.get().get_logger()
+
+    @staticmethod
+    def get_neo4j_importer() -> Neo4jGraphImporter:
+        """
+        get the shared neo4j graph importer; the importer is created on first use and re-created
+        if its driver fails the periodic connectivity check
+        :return: Neo4jGraphImporter
+        """
+        neo4j_config, logger = Neo4jResourcePoolFactory.get_neo4j_config()
+        interval = int(neo4j_config.get("health_check_interval",
+                                        Neo4jResourcePoolFactory.DEFAULT_HEALTH_CHECK_INTERVAL))
+
+        with Neo4jResourcePoolFactory.importer_lock:
+            now = time.time()
+            if Neo4jResourcePoolFactory.importer is not None and \
+                    now - Neo4jResourcePoolFactory.last_health_check >= interval:
+                Neo4jResourcePoolFactory.last_health_check = now
+                try:
+                    with Neo4jResourcePoolFactory.timed(operation="health_check"):
+                        Neo4jResourcePoolFactory.importer.driver.verify_connectivity()
+                except Exception as e:
+                    logger.error("Neo4j connectivity check failed, re-creating driver: {}".format(e))
+                    Neo4jResourcePoolFactory.retire_importer_locked()
+
+            if Neo4jResourcePoolFactory.importer is None:
+                Neo4jResourcePoolFactory.importer = Neo4jResourcePoolFactory.create_neo4j_importer(
+                    neo4j_config=neo4j_config, logger=logger)
+                Neo4jResourcePoolFactory.last_health_check = now
+
+            return Neo4jResourcePoolFactory.importer
+
+    @staticmethod
+    def track(*, graph, importer: Neo4jGraphImporter):
+        """
+        Register a graph created with an importer; the importer driver is not closed while the graph is alive
+        :param graph: graph
+        :param importer: importer used by the graph
+        :return: graph
+        """
+        with Neo4jResourcePoolFactory.importer_lock:
+            key = id(importer)
+            Neo4jResourcePoolFactory.importer_users[key] = Neo4jResourcePoolFactory.importer_users.get(key, 0) + 1
+        weakref.finalize(graph, Neo4jResourcePoolFactory.release, importer)
+        return graph
+
+    @staticmethod
+    def release(importer: Neo4jGraphImporter):
+        """
+        Release a graph of an importer; the driver of a retired importer is closed with its last graph
+        :param importer: importer used by the graph
+        """
+        with Neo4jResourcePoolFactory.importer_lock:
+            key = id(importer)
+            count = Neo4jResourcePoolFactory.importer_users.get(key, 0) - 1
+            if count > 0:
+                Neo4jResourcePoolFactory.importer_users[key] = count
+                return
+            Neo4jResourcePoolFactory.importer_users.pop(key, None)
+            if Neo4jResourcePoolFactory.retired_importers.pop(key, None) is not None:
+                Neo4jResourcePoolFactory.close_driver(importer=importer)
+
+    @staticmethod
+    def close_driver(*, importer: Neo4jGraphImporter):
+        """
+        Close the driver of an importer
+        :param importer: importer
+        """
+        try:
+            importer.driver.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def retire_importer_locked():
+        """
+        Stop handing out the shared importer; its driver is closed now if no graph uses it, otherwise when the
+        last graph using it is gone. Must be called with importer_lock held
+        """
+        importer = Neo4jResourcePoolFactory.importer
+        if importer is None:
+            return
+        Neo4jResourcePoolFactory.importer = None
+        key = id(importer)
+        if Neo4jResourcePoolFactory.importer_users.get(key, 0) > 0:
+            Neo4jResourcePoolFactory.retired_importers[key] = importer
+        else:
+            Neo4jResourcePoolFactory.close_driver(importer=importer)
+
+    @staticmethod
+    def close_neo4j_importer():
+        """
+        Release the shared importer; its driver connection pool is closed once no graph uses it
+        """
+        with Neo4jResourcePoolFactory.importer_lock:
+            Neo4jResourcePoolFactory.retire_importer_locked()
+
+    @staticmethod
+    @contextmanager
+    def timed(*, operation: str):
+        """
+        Measure the duration of a neo4j operation
+        :param operation: operation name
+        """
+        begin = time.time()
+        try:
+            yield
+        finally:
+            elapsed = time.time() - begin
+            with Neo4jResourcePoolFactory.metrics_lock:
+                entry = Neo4jResourcePoolFactory.metrics.get(operation, None)
+                if entry is None:
+                    entry = {"count": 0, "total_time": 0.0, "max_time": 0.0}
+                    Neo4jResourcePoolFactory.metrics[operation] = entry
+                entry["count"] += 1
+                entry["total_time"] += elapsed
+                entry["max_time"] = max(entry["max_time"], elapsed)
+
+    @staticmethod
+    def get_metrics() -> dict:
+        """
+        Return call count, total and maximum time in seconds per neo4j operation
+        :return: dict
+        """
+        with Neo4jResourcePoolFactory.metrics_lock:
+            return {k: v.copy() for k, v in Neo4jResourcePoolFactory.metrics.items()}
+
     @staticmethod
     def get_arm_graph_from_file(*, filename: str) -> ABCPropertyGraph:
         """
@@ -59,12 +225,14 @@ class Neo4jResourcePoolFactory(ResourcePoolFactory):
         :return:
         """
         neo4j_graph_importer = Neo4jResourcePoolFactory.get_neo4j_importer()
-        neo4_graph = neo4j_graph_importer.import_graph_from_file(graph_file=filename)
-        neo4_graph.validate_graph()
+        with Neo4jResourcePoolFactory.timed(operation="import"):
+            neo4_graph = neo4j_graph_importer.import_graph_from_file(graph_file=filename)
+        with Neo4jResourcePoolFactory.timed(operation="validate"):
+            neo4_graph.validate_graph()
 
         arm_graph = Neo4jARMGraph(graph=neo4_graph)
 
-        return arm_graph
+        return Neo4jResourcePoolFactory.track(graph=arm_graph, importer=neo4j_graph_importer)
 
     @staticmethod
     def get_arm_graph(*, graph_id: str) -> Neo4jARMGraph:
@@ -76,7 +244,7 @@ class Neo4jResourcePoolFactory(ResourcePoolFactory):
         neo4j_graph_importer = Neo4jResourcePoolFactory.get_neo4j_importer()
         arm_graph = Neo4jARMGraph(graph=Neo4jPropertyGraph(graph_id=graph_id, importer=neo4j_graph_importer))
 
-        return arm_graph
+        return Neo4jResourcePoolFactory.track(graph=arm_graph, importer=neo4j_graph_importer)
 
     @staticmethod
     def get_neo4j_cbm_empty_graph() -> Neo4jCBMGraph:
@@ -86,7 +254,7 @@ class Neo4jResourcePoolFactory(ResourcePoolFactory):
         """
         neo4j_graph_importer = Neo4jResourcePoolFactory.get_neo4j_importer()
         combined_broker_model = Neo4jCBMGraph(importer=neo4j_graph_importer, logger=neo4j_graph_importer.log)
-        return combined_broker_model
+        return Neo4jResourcePoolFactory.track(graph=combined_broker_model, importer=neo4j_graph_importer)
 
     @staticmethod
     def get_neo4j_cbm_graph_from_database(combined_broker_model_graph_id: str) -> Neo4jCBMGraph:
@@ -99,8 +267,9 @@ class Neo4jResourcePoolFactory(ResourcePoolFactory):
         combined_broker_model = Neo4jCBMGraph(graph_id=combined_broker_model_graph_id,
                                               importer=neo4j_graph_importer,
                                               logger=neo4j_graph_importer.log)
-        combined_broker_model.validate_graph()
-        return combined_broker_model
+        with Neo4jResourcePoolFactory.timed(operation="validate"):
+            combined_broker_model.validate_graph()
+        return Neo4jResourcePoolFactory.track(graph=combined_broker_model, importer=neo4j_graph_importer)
 
     @staticmethod
     def get_graph_from_string(*, graph_str: str) -> Neo4jPropertyGraph:
@@ -110,9 +279,10 @@ class Neo4jResourcePoolFactory(ResourcePoolFactory):
         :return: Neo4jPropertyGraph
         """
         neo4j_graph_importer = Neo4jResourcePoolFactory.get_neo4j_importer()
-        graph = neo4j_graph_importer.import_graph_from_string_direct(graph_string=graph_str)
+        with Neo4jResourcePoolFactory.timed(operation="import"):
+            graph = neo4j_graph_importer.import_graph_from_string_direct(graph_string=graph_str)
 
-        return graph
+        return Neo4jResourcePoolFactory.track(graph=graph, importer=neo4j_graph_importer)
 
     @staticmethod
     def delete_graph(*, graph_id: str):
@@ -121,4 +291,32 @@ class Neo4jResourcePoolFactory(ResourcePoolFactory):
         @param graph_id graph id
         """
         neo4j_graph_importer = Neo4jResourcePoolFactory.get_neo4j_importer()
-        neo4j_graph_importer.delete_graph(graph_id=graph_id)
+        with Neo4jResourcePoolFactory.timed(operation="delete"):
+            neo4j_graph_importer.delete_graph(graph_id=graph_id)
+
+    @staticmethod
+    def replace_graph(*, graph_id: str, graph_str: str):
+        """
+        Replace a graph with a new version. The new version is imported under a temporary graph id first; the
+        old graph is deleted and the new version takes over its graph id in a single transaction. If the import
+        or the switch fails, the old graph is left as is.
+        @param graph_id graph id
+        @param graph_str GraphML of the new version
+        """
+        neo4j_graph_importer = Neo4jResourcePoolFactory.get_neo4j_importer()
+        temp_graph_id = str(uuid.uuid4())
+        with Neo4jResourcePoolFactory.timed(operation="import"):
+            neo4j_graph_importer.import_graph_from_string(graph_string=graph_str, graph_id=temp_graph_id)
+
+        def switch(tx):
+            tx.run('MATCH (n:GraphNode {GraphID: $graphId}) DETACH DELETE n', graphId=graph_id)
+            tx.run('MATCH (n:GraphNode {GraphID: $tempGraphId}) SET n.GraphID = $graphId',
+                   tempGraphId=temp_graph_id, graphId=graph_id)
+
+        try:
+            with Neo4jResourcePoolFactory.timed(operation="replace"):
+                with neo4j_graph_importer.driver.session() as session:
+                    session.execute_write(switch)
+        except Exception as e:
+            neo4j_graph_importer.delete_graph(graph_id=temp_graph_id)
+            raise e
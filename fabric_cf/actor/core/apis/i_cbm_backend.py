@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from abc import abstractmethod
+
+from fim.graph.abc_property_graph import ABCPropertyGraph
+
+
+class ICBMBackend:
+    """
+    ICBMBackend holds the Combined Broker Model (CBM) of a broker: the merge of all Aggregate Delegation
+    Models (ADMs) donated to the broker, from which Broker Query Models (BQMs) are produced.
+    """
+
+    @abstractmethod
+    def load(self, *, graph_id: str = None) -> str:
+        """
+        Create an empty CBM or load an existing one
+        @param graph_id graph id of an existing CBM; None to create an empty CBM
+        @return graph id of the CBM
+        """
+
+    @abstractmethod
+    def get_graph_id(self) -> str:
+        """
+        Return the graph id of the CBM
+        @return graph id
+        """
+
+    @abstractmethod
+    def merge_adm(self, *, adm: ABCPropertyGraph):
+        """
+        Merge and validate an ADM into the CBM
+        @param adm aggregate delegation model
+        @raises Exception in case of error
+        """
+
+    @abstractmethod
+    def get_bqm(self, **kwargs) -> str:
+        """
+        Produce a Broker Query Model
+        @param kwargs query parameters
+        @return BQM serialized as GraphML
+        """
+
+    @abstractmethod
+    def stop(self):
+        """
+        Release the resources held by the backend
+        """
@@ -64,6 +64,15 @@ class IContainerDatabase:
         @param value TRUE if reset is required, FALSE otherwise
         """
 
+    @abstractmethod
+    def upgrade(self):
+        """
+        Brings the schema of an existing database up to date (missing tables and indexes).
+        Must be idempotent.
+
+        @throws Exception if an error occurs while accessing the database
+        """
+
     @abstractmethod
     def get_actors(self, *, name: str = None, actor_type: int = None) -> list:
         """
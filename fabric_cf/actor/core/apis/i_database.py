@@ -343,15 +343,27 @@ class IDatabase:
         """
 
     @abstractmethod
-    def get_reservations_by_rids(self, *, rid: list):
+    def get_reservations_by_rids(self, *, rid: list, columns: list = None):
         """
         Retrieves the specified reservation records.
         The order in the return vector is the same order as @rids
         @param rids rids
+        @param columns columns to load (e.g. only the state columns); all columns if None
         @return list of properties
         @throws Exception in case of error
         """
 
+    @abstractmethod
+    def stream_reservations(self, *, slice_types: list = None, exclude_states: list = None, batch_size: int = 1000):
+        """
+        Streams the reservation records of the actor ordered by slice
+        @param slice_types only return reservations in slices of these types (SliceTypes); all slices if None
+        @param exclude_states reservation states (int) to skip; nothing is skipped if None
+        @param batch_size number of records fetched from the database at a time
+        @return generator of properties
+        @throws Exception in case of error
+        """
+
     @abstractmethod
     def add_delegation(self, *, delegation: IDelegation):
         """
@@ -384,3 +396,11 @@ class IDatabase:
         """
         Get delegations
         """
+
+    @abstractmethod
+    def flush(self):
+        """
+        Persist any pending (write behind) updates to the database
+
+        @throws Exception in case of error
+        """
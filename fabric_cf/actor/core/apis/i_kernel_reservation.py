@@ -136,6 +136,31 @@ class IKernelReservation(IReservation):
         @throws Exception in case of error
         """
 
+    @abstractmethod
+    def is_probe_idle(self) -> bool:
+        """
+        Checks if probing the reservation would be a no-op i.e. there is no pending
+        operation to complete or notification to send.
+
+        @return true if the reservation does not need to be probed
+        """
+
+    @abstractmethod
+    def set_index(self, *, index):
+        """
+        Sets the kernel index tracking the reservation. The index is updated on
+        every state transition.
+
+        @param index kernel reservation index
+        """
+
+    @abstractmethod
+    def request_probe(self):
+        """
+        Requests the reservation to be probed on the next tick, e.g. when its
+        units have changed.
+        """
+
     @abstractmethod
     def probe_pending(self):
         """
@@ -34,6 +34,7 @@ from fabric_cf.actor.core.apis.i_mgmt_actor import IMgmtActor
 if TYPE_CHECKING:
     from fabric_cf.actor.core.util.id import ID
     from fabric_mb.message_bus.messages.unit_avro import UnitAvro
+    from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
 
 
 class IMgmtController(IMgmtActor, IMgmtClientActor):
@@ -49,6 +50,15 @@ class IMgmtController(IMgmtActor, IMgmtClientActor):
         @returns list of units
         """
 
+    @abstractmethod
+    def get_reservation_status(self, *, rids: List[ID], id_token: str = None) -> List[ReservationStatusMng]:
+        """
+        Return state, pending state and (for Active reservations) units of several reservations in one call
+        @params rids: reservation ids
+        @param id_token: id token
+        @returns list of reservation status in the order of rids; reservations not found are in Unknown state
+        """
+
     @abstractmethod
     def modify_reservation(self, *, rid: ID, modify_properties: dict) -> bool:
         """
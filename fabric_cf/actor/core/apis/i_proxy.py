@@ -59,6 +59,16 @@ class IProxy(IActorIdentity):
             Exception in case of error
         """
 
+    @abstractmethod
+    def is_async_delivery(self) -> bool:
+        """
+        Returns true if execute only queues the request for delivery; delivery is then reported
+        to the RPC manager
+
+        Returns:
+            true if delivery is asynchronous
+        """
+
     @abstractmethod
     def get_logger(self):
         """
@@ -160,12 +160,14 @@ class IReservationOperations:
         """
 
     @abstractmethod
-    def re_register(self, *, reservation: IReservation):
+    def re_register(self, *, reservation: IReservation, check_database: bool = True):
         """
         Registers a previously registered reservation with the actor. The reservation must have a database record.
 
         Args:
             reservation: reservation
+            check_database: verify that the database record exists; False if the reservation was just read from
+                the database
         Raises:
             Exception in case of error
         """
@@ -75,6 +75,9 @@ class Constants:
     property_conf_kafka_sasl_consumer_username = "kafka-sasl-consumer-username"
     property_conf_kafka_sasl_consumer_password = "kafka-sasl-consumer-password"
     property_conf_kafka_sasl_mechanism = "kafka-sasl-mechanism"
+    property_conf_kafka_producer_async = "kafka-producer-async"
+    property_conf_kafka_producer_linger_ms = "kafka-producer-linger-ms"
+    property_conf_kafka_producer_batch_size = "kafka-producer-batch-size"
 
     kafka_topic = "kafka-topic"
     name = "name"
@@ -94,9 +97,30 @@ class Constants:
     property_proxies_module = ".module"
 
     property_conf_prometheus_rest_port = "prometheus.port"
+    property_conf_prometheus_metrics = "prometheus.metrics"
+    property_conf_rpc_workers = "rpc-executor-workers"
+    property_conf_rpc_queue_depth = "rpc-executor-queue-depth"
+    property_conf_rpc_peer_concurrency = "rpc-executor-peer-concurrency"
+    property_conf_rpc_submit_timeout = "rpc-executor-submit-timeout"
+    property_conf_message_service_mgmt_workers = "message-service-mgmt-workers"
+    property_conf_message_service_mgmt_queue_depth = "message-service-mgmt-queue-depth"
+    property_conf_message_service_rpc_workers = "message-service-rpc-workers"
+    property_conf_message_service_rpc_queue_depth = "message-service-rpc-queue-depth"
+    property_conf_message_service_submit_timeout = "message-service-submit-timeout"
+    property_conf_actor_event_shards = "actor-event-shards"
+    property_conf_recovery_bulk = "recovery-bulk"
+    property_conf_recovery_batch_size = "recovery-batch-size"
+    property_conf_recovery_workers = "recovery-workers"
+    property_conf_handler_workers = "handler-workers"
+    property_conf_handler_concurrency = "handler-concurrency"
+    property_conf_handler_timeout = "handler-timeout"
+    property_conf_cbm_backend = "cbm-backend"
+    property_conf_cbm_snapshot_interval = "cbm-snapshot-interval"
     property_conf_controller_rest_port = "orchestrator.rest.port"
     property_conf_controller_create_wait_time_ms = "orchestrator.create.wait.time.ms"
     property_conf_controller_delay_resource_types = "orchestrator.delay.resource.types"
+    property_conf_controller_bqm_cache_ttl = "orchestrator.bqm.cache.ttl"
+    property_conf_controller_bqm_refresh_interval = "orchestrator.bqm.refresh.interval"
 
     property_substrate_file = "substrate.file"
     property_aggregate_resource_model = "AggregateResourceModel"
@@ -106,6 +130,9 @@ class Constants:
     config_logging_section = 'logging'
 
     config_section_pdp = 'pdp'
+    property_conf_pdp_url = 'url'
+    property_conf_pdp_decision_cache_ttl = 'decision-cache-ttl'
+    property_conf_pdp_decision_cache_size = 'decision-cache-size'
 
     property_conf_log_file = 'log-file'
     property_conf_log_level = 'log-level'
@@ -132,6 +159,14 @@ class Constants:
     property_conf_db_password = "db-password"
     property_conf_db_name = "db-name"
     property_conf_db_host = "db-host"
+    property_conf_db_pool_size = "db-pool-size"
+    property_conf_db_max_overflow = "db-max-overflow"
+    property_conf_db_pool_timeout = "db-pool-timeout"
+    property_conf_db_pool_recycle = "db-pool-recycle"
+    property_conf_db_pool_pre_ping = "db-pool-pre-ping"
+    property_conf_db_statement_timeout = "db-statement-timeout-ms"
+    property_conf_db_write_behind = "db-write-behind"
+    property_conf_db_serializer_compression = "db-serializer-compression"
 
     config_section_neo4j = "neo4j"
 
@@ -160,6 +195,7 @@ class Constants:
     query_action = "query.action"
     query_response = "query.response"
     broker_query_model = "bqm"
+    broker_query_model_version = "bqm.version"
     pool_type = "neo4j"
 
     config_handler = "config.handler"
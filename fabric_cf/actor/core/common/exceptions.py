@@ -215,3 +215,9 @@ class FrameworkException(Exception):
     """
     Framework Exception
     """
+
+
+class SerializerException(Exception):
+    """
+    Serializer Exception
+    """
@@ -172,16 +172,39 @@ class Container(IActorContainer):
         """
         Create Database
         """
-        user = self.config.get_global_config().get_database().get(Constants.property_conf_db_user, None)
-        password = self.config.get_global_config().get_database().get(Constants.property_conf_db_password, None)
-        dbname = self.config.get_global_config().get_database().get(Constants.property_conf_db_name, None)
-        dbhost = self.config.get_global_config().get_database().get(Constants.property_conf_db_host, None)
-        self.db = ContainerDatabase(user=user, password=password, database=dbname, db_host=dbhost, logger=self.logger)
+        db_config = self.config.get_global_config().get_database()
+        user = db_config.get(Constants.property_conf_db_user, None)
+        password = db_config.get(Constants.property_conf_db_password, None)
+        dbname = db_config.get(Constants.property_conf_db_name, None)
+        dbhost = db_config.get(Constants.property_conf_db_host, None)
+        self.db = ContainerDatabase(user=user, password=password, database=dbname, db_host=dbhost, logger=self.logger,
+                                    pool_config=self.get_db_pool_config(db_config=db_config))
         if self.is_fresh():
             self.db.set_reset_state(value=True)
         else:
             self.db.set_reset_state(value=False)
         self.db.initialize()
+        self.db.upgrade()
+
+    @staticmethod
+    def get_db_pool_config(*, db_config: dict) -> dict:
+        """
+        Extract the connection pool settings from the database configuration section
+        @param db_config database configuration
+        @return pool settings; settings not configured are left to their defaults
+        """
+        mapping = {Constants.property_conf_db_pool_size: ('pool_size', int),
+                   Constants.property_conf_db_max_overflow: ('max_overflow', int),
+                   Constants.property_conf_db_pool_timeout: ('pool_timeout', int),
+                   Constants.property_conf_db_pool_recycle: ('pool_recycle', int),
+                   Constants.property_conf_db_pool_pre_ping: ('pool_pre_ping', bool),
+                   Constants.property_conf_db_statement_timeout: ('statement_timeout_ms', int)}
+        result = {}
+        for key, (name, value_type) in mapping.items():
+            value = db_config.get(key, None)
+            if value is not None:
+                result[name] = value_type(value)
+        return result
 
     def initialize(self, *, config: Configuration):
         """
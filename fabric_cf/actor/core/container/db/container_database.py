@@ -47,12 +47,14 @@ class ContainerDatabase(IContainerDatabase):
     PropertyTime = "time"
     PropertyContainer = "container"
 
-    def __init__(self, *, user: str, password: str, database: str, db_host: str, logger):
+    def __init__(self, *, user: str, password: str, database: str, db_host: str, logger, pool_config: dict = None):
         self.user = user
         self.password = password
         self.database = database
         self.db_host = db_host
-        self.db = PsqlDatabase(user=user, password=password, database=database, db_host=db_host, logger=logger)
+        self.pool_config = pool_config
+        self.db = PsqlDatabase(user=user, password=password, database=database, db_host=db_host, logger=logger,
+                               pool_config=pool_config)
         self.initialized = False
         self.reset_state = False
         self.logger = logger
@@ -60,7 +62,7 @@ class ContainerDatabase(IContainerDatabase):
     def __getstate__(self):
         state = self.__dict__.copy()
         self.db = PsqlDatabase(user=self.user, password=self.password, database=self.database,
-                               db_host=self.db_host, logger=self.logger)
+                               db_host=self.db_host, logger=self.logger, pool_config=self.pool_config)
         del state['initialized']
         del state['reset_state']
         del state['logger']
@@ -80,6 +82,12 @@ class ContainerDatabase(IContainerDatabase):
                 self.db.reset_db()
             self.initialized = True
 
+    def upgrade(self):
+        """
+        Upgrade the database schema, creating any missing tables and indexes
+        """
+        self.db.upgrade_db()
+
     def set_reset_state(self, *, value: bool):
         """
         Set Reset State
@@ -24,6 +24,8 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 from __future__ import annotations
+
+import threading
 from typing import TYPE_CHECKING
 
 from fabric_cf.actor.core.common.constants import Constants
@@ -42,6 +44,7 @@ if TYPE_CHECKING:
 class EventManager:
     def __init__(self):
         self.subscriptions = {}
+        self.lock = threading.Lock()
 
     def create_subscription(self, *, token: AuthToken, filters: list, handler: IEventHandler) -> ID:
         if token is None:
@@ -53,19 +56,21 @@ class EventManager:
         else:
             subscription = SynchronousEventSubscription(handler=handler, token=token, filters=filters)
 
-        self.subscriptions[subscription.get_subscription_id()] = subscription
+        with self.lock:
+            self.subscriptions[subscription.get_subscription_id()] = subscription
         return subscription.get_subscription_id()
 
     def delete_subscription(self, *, sid: ID, token: AuthToken):
         self.get_subscription(sid=sid, token=token)
-        if sid in self.subscriptions:
-            self.subscriptions.pop(sid)
+        with self.lock:
+            self.subscriptions.pop(sid, None)
 
     def get_subscription(self, *, sid: ID, token: AuthToken) -> AEventSubscription:
-        if not sid in self.subscriptions:
+        with self.lock:
+            subscription = self.subscriptions.get(sid, None)
+        if subscription is None:
             raise EventException("Invalid subscription")
 
-        subscription = self.subscriptions[id]
         if not subscription.has_access(token=token):
             raise EventException("Access denied")
         return subscription
@@ -75,12 +80,17 @@ class EventManager:
         return subscription.drain_events(timeout=timeout)
 
     def dispatch_event(self, *, event: IEvent):
-        try:
-            for s in self.subscriptions.values():
+        # Events are delivered outside the lock on a snapshot of the subscriptions, so that handlers
+        # may subscribe/unsubscribe and a failing subscriber does not prevent delivery to the others
+        with self.lock:
+            subscriptions = list(self.subscriptions.values())
+
+        for s in subscriptions:
+            try:
                 if s.is_abandoned():
-                    if s.get_subscription_id() in self.subscriptions:
-                        self.subscriptions.pop(s.get_subscription_id())
+                    with self.lock:
+                        self.subscriptions.pop(s.get_subscription_id(), None)
                 else:
                     s.deliver_event(event=event)
-        except Exception as e:
-            print("Could not dispatch event {}".format(e))
+            except Exception as e:
+                print("Could not dispatch event {}".format(e))
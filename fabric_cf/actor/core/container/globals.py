@@ -42,6 +42,7 @@ from fabric_cf.actor.core.common.exceptions import InitializationException
 from fabric_cf.actor.core.container.event_manager import EventManager
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.container.container import Container
+from fabric_cf.actor.core.util.metrics import ActorMetrics
 
 if TYPE_CHECKING:
     from fabric_cf.actor.core.apis.i_actor_container import IActorContainer
@@ -65,6 +66,8 @@ class Globals:
         self.timer_condition = threading.Condition()
         self.lock = threading.Lock()
         self.jwt_validator = None
+        self.kafka_async_producer = None
+        self.kafka_async_producer_lock = threading.Lock()
 
     def make_logger(self):
         """
@@ -143,6 +146,7 @@ class Globals:
             if not self.initialized:
                 self.load_config()
                 self.log = self.make_logger()
+                ActorMetrics.configure(runtime_config=self.config.get_runtime_config())
                 self.log.info("Checking if connection to Kafka broker can be established")
                 admin_kafka_client = self.get_kafka_admin_client()
                 admin_kafka_client.list_topics()
@@ -316,6 +320,46 @@ class Globals:
         producer = AvroProducerApi(conf=conf, key_schema=key_schema, record_schema=val_schema, logger=self.get_logger())
         return producer
 
+    def is_kafka_producer_async(self) -> bool:
+        """
+        Check if outbound messages should be delivered asynchronously
+        @return True if asynchronous delivery is enabled
+        """
+        if self.config is None or self.config.get_runtime_config() is None:
+            return False
+        value = self.config.get_runtime_config().get(Constants.property_conf_kafka_producer_async, False)
+        if isinstance(value, str):
+            return value.lower() == 'true'
+        return bool(value)
+
+    def get_kafka_async_producer(self):
+        """
+        Create (if needed) and return the kafka producer shared by all proxies for asynchronous delivery
+        @return producer
+        """
+        with self.kafka_async_producer_lock:
+            if self.kafka_async_producer is None:
+                conf = self.get_kafka_config_producer()
+                runtime_config = self.config.get_runtime_config()
+                conf['linger.ms'] = int(runtime_config.get(Constants.property_conf_kafka_producer_linger_ms, 5))
+                conf['batch.num.messages'] = int(runtime_config.get(
+                    Constants.property_conf_kafka_producer_batch_size, 1000))
+                key_schema, val_schema = self.get_kafka_schemas()
+
+                from fabric_cf.actor.core.proxies.kafka.kafka_async_producer import KafkaAsyncProducer
+                self.kafka_async_producer = KafkaAsyncProducer(conf=conf, key_schema=key_schema,
+                                                               record_schema=val_schema, logger=self.get_logger())
+            return self.kafka_async_producer
+
+    def stop_kafka_async_producer(self):
+        """
+        Deliver the outstanding messages and stop the shared asynchronous kafka producer
+        """
+        with self.kafka_async_producer_lock:
+            if self.kafka_async_producer is not None:
+                self.kafka_async_producer.stop()
+                self.kafka_async_producer = None
+
     def get_kafka_admin_client(self):
         """
         Create and return a kafka admin client
@@ -382,6 +426,9 @@ class Globals:
             self.started = False
             self.stop_timer_thread()
             self.get_container().shutdown()
+            self.stop_kafka_async_producer()
+            from fabric_cf.actor.boot.inventory.neo4j_resource_pool_factory import Neo4jResourcePoolFactory
+            Neo4jResourcePoolFactory.close_neo4j_importer()
         except Exception as e:
             self.log.error("Error while shutting down: {}".format(e))
         finally:
@@ -25,6 +25,7 @@
 # Author: Komal Thareja (kthare10@renci.org)
 from __future__ import annotations
 
+import time
 import traceback
 from typing import TYPE_CHECKING
 
@@ -33,22 +34,152 @@ import threading
 from fabric_mb.message_bus.consumer import AvroConsumerApi
 from fabric_mb.message_bus.messages.message import IMessageAvro
 
+from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.exceptions import KafkaServiceException
+from fabric_cf.actor.core.kernel.rpc_executor_pool import RPCExecutorPool
+from fabric_cf.actor.core.util.rpc_exception import RPCException
 
 if TYPE_CHECKING:
     from fabric_cf.actor.core.proxies.kafka.services.actor_service import ActorService
     from fabric_cf.actor.core.manage.kafka.services.kafka_actor_service import KafkaActorService
 
 
+class MessageLane:
+    """
+    Processes the incoming messages of one kind, either on a bounded pool of worker threads or, with 0 workers,
+    on the Kafka consumer thread. Messages with the same key are processed in the order in which they were
+    received. When the pool is full the caller (the Kafka consumer thread) is blocked until there is room, so
+    that messages are never processed outside of the lane; a warning is logged every submit_timeout seconds.
+    """
+    def __init__(self, *, name: str, workers: int, queue_depth: int, submit_timeout: float, logger):
+        self.name = name
+        self.logger = logger
+        self.pool = None
+        if workers > 0:
+            self.pool = RPCExecutorPool(workers=workers, queue_depth=queue_depth, peer_concurrency=1,
+                                        submit_timeout=submit_timeout, name=name)
+        self.lock = threading.Lock()
+        self.inline = 0
+        self.inline_time_total = 0.0
+        self.inline_time_max = 0.0
+        self.blocked = 0
+        self.blocked_time_total = 0.0
+        self.blocked_time_max = 0.0
+
+    def submit(self, *, key: str, task):
+        """
+        Process a message; blocks while the lane is full
+        @param key ordering key
+        @param task callable processing the message
+        @raises RPCException if the lane is stopped
+        """
+        if self.pool is None:
+            self.run_inline(task=task)
+            return
+
+        begin = time.time()
+        blocked = False
+        while True:
+            try:
+                self.pool.submit(peer=key, task=task)
+                break
+            except RPCException as e:
+                if self.pool.stopped:
+                    raise e
+                blocked = True
+                self.logger.warning("{} lane is full, waiting to enqueue message: {}".format(self.name, e))
+
+        if blocked:
+            elapsed = time.time() - begin
+            with self.lock:
+                self.blocked += 1
+                self.blocked_time_total += elapsed
+                self.blocked_time_max = max(self.blocked_time_max, elapsed)
+
+    def run_inline(self, *, task):
+        """
+        Process a message on the caller thread
+        @param task callable processing the message
+        """
+        begin = time.time()
+        try:
+            task()
+        finally:
+            elapsed = time.time() - begin
+            with self.lock:
+                self.inline += 1
+                self.inline_time_total += elapsed
+                self.inline_time_max = max(self.inline_time_max, elapsed)
+
+    def shutdown(self, *, timeout: float = 30):
+        """
+        Stop the lane after processing the queued messages (for up to timeout seconds)
+        @param timeout timeout in seconds
+        """
+        if self.pool is None:
+            return
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            metrics = self.pool.get_metrics()
+            if metrics['queued'] == 0 and metrics['in_flight'] == 0:
+                break
+            time.sleep(0.01)
+        self.pool.shutdown(wait=True)
+
+    def get_metrics(self) -> dict:
+        """
+        Return the queue depth, processing latency and backpressure (seconds) metrics of the lane
+        """
+        result = {}
+        if self.pool is not None:
+            result = self.pool.get_metrics()
+            result.pop('peers', None)
+        with self.lock:
+            result['inline'] = self.inline
+            result['inline_time_avg'] = self.inline_time_total / self.inline if self.inline > 0 else 0.0
+            result['inline_time_max'] = self.inline_time_max
+            result['blocked'] = self.blocked
+            result['blocked_time_avg'] = self.blocked_time_total / self.blocked if self.blocked > 0 else 0.0
+            result['blocked_time_max'] = self.blocked_time_max
+        return result
+
+
 class MessageService(AvroConsumerApi):
+    """
+    Consumes the incoming Kafka messages of an actor. Management requests and inter-actor messages are
+    dispatched to separate lanes so that a burst of management queries does not delay the delivery of
+    inter-actor RPCs to the kernel; inter-actor messages are processed in order per reservation (delegation).
+    """
+    DEFAULT_MGMT_WORKERS = 4
+    DEFAULT_MGMT_QUEUE_DEPTH = 100
+    DEFAULT_RPC_WORKERS = 1
+    DEFAULT_RPC_QUEUE_DEPTH = 1000
+    DEFAULT_SUBMIT_TIMEOUT = 30
+
     def __init__(self, *, kafka_service: ActorService, kafka_mgmt_service: KafkaActorService, conf: dict, key_schema,
-                 record_schema, topics, batch_size=5, logger=None):
+                 record_schema, topics, batch_size=5, logger=None, runtime_config: dict = None):
         super().__init__(conf=conf, key_schema=key_schema, record_schema=record_schema, topics=topics,
                          batch_size=batch_size, logger=logger)
         self.thread_lock = threading.Lock()
         self.thread = None
         self.kafka_service = kafka_service
         self.kafka_mgmt_service = kafka_mgmt_service
+        if runtime_config is None:
+            runtime_config = {}
+        submit_timeout = float(runtime_config.get(Constants.property_conf_message_service_submit_timeout,
+                                                  self.DEFAULT_SUBMIT_TIMEOUT))
+        self.mgmt_lane = MessageLane(
+            name="MessageServiceMgmt", logger=logger, submit_timeout=submit_timeout,
+            workers=int(runtime_config.get(Constants.property_conf_message_service_mgmt_workers,
+                                           self.DEFAULT_MGMT_WORKERS)),
+            queue_depth=int(runtime_config.get(Constants.property_conf_message_service_mgmt_queue_depth,
+                                               self.DEFAULT_MGMT_QUEUE_DEPTH)))
+        self.rpc_lane = MessageLane(
+            name="MessageServiceRPC", logger=logger, submit_timeout=submit_timeout,
+            workers=int(runtime_config.get(Constants.property_conf_message_service_rpc_workers,
+                                           self.DEFAULT_RPC_WORKERS)),
+            queue_depth=int(runtime_config.get(Constants.property_conf_message_service_rpc_queue_depth,
+                                               self.DEFAULT_RPC_QUEUE_DEPTH)))
 
     def start(self):
         try:
@@ -66,6 +197,8 @@ class MessageService(AvroConsumerApi):
 
     def stop(self):
         self.shutdown()
+        self.mgmt_lane.shutdown()
+        self.rpc_lane.shutdown()
         try:
             self.thread_lock.acquire()
             temp = self.thread
@@ -82,28 +215,65 @@ class MessageService(AvroConsumerApi):
             if self.thread_lock is not None and self.thread_lock.locked():
                 self.thread_lock.release()
 
+    @staticmethod
+    def is_management_message(*, message: IMessageAvro) -> bool:
+        """
+        Check if the message is a management request
+        @param message message
+        @return True for management requests, False for inter-actor messages
+        """
+        return message.get_message_name() in (
+            IMessageAvro.claim_resources, IMessageAvro.reclaim_resources, IMessageAvro.get_slices_request,
+            IMessageAvro.get_reservations_request, IMessageAvro.get_reservations_state_request,
+            IMessageAvro.get_delegations, IMessageAvro.get_reservation_units_request, IMessageAvro.get_unit_request,
+            IMessageAvro.get_pool_info_request, IMessageAvro.add_slice, IMessageAvro.update_slice,
+            IMessageAvro.remove_slice, IMessageAvro.close_reservations, IMessageAvro.update_reservation,
+            IMessageAvro.remove_reservation, IMessageAvro.extend_reservation)
+
+    @staticmethod
+    def get_ordering_key(*, message: IMessageAvro) -> str:
+        """
+        Return the key within which inter-actor messages must be processed in order: the reservation or
+        delegation the message is about, the sender otherwise
+        @param message message
+        @return key
+        """
+        reservation = getattr(message, 'reservation', None)
+        if reservation is not None and reservation.reservation_id is not None:
+            return reservation.reservation_id
+        delegation = getattr(message, 'delegation', None)
+        if delegation is not None and delegation.get_delegation_id() is not None:
+            return delegation.get_delegation_id()
+        callback_topic = message.get_callback_topic()
+        if callback_topic is not None:
+            return callback_topic
+        return message.get_message_name()
+
     def handle_message(self, message: IMessageAvro):
         try:
-            if message.get_message_name() == IMessageAvro.claim_resources or \
-                    message.get_message_name() == IMessageAvro.reclaim_resources or \
-                    message.get_message_name() == IMessageAvro.get_slices_request or \
-                    message.get_message_name() == IMessageAvro.get_reservations_request or \
-                    message.get_message_name() == IMessageAvro.get_reservations_state_request or \
-                    message.get_message_name() == IMessageAvro.get_delegations or \
-                    message.get_message_name() == IMessageAvro.get_reservation_units_request or \
-                    message.get_message_name() == IMessageAvro.get_unit_request or \
-                    message.get_message_name() == IMessageAvro.get_pool_info_request or \
-                    message.get_message_name() == IMessageAvro.add_slice or \
-                    message.get_message_name() == IMessageAvro.update_slice or \
-                    message.get_message_name() == IMessageAvro.remove_slice or \
-                    message.get_message_name() == IMessageAvro.close_reservations or \
-                    message.get_message_name() == IMessageAvro.update_reservation or \
-                    message.get_message_name() == IMessageAvro.remove_reservation or \
-                    message.get_message_name() == IMessageAvro.extend_reservation:
-                self.kafka_mgmt_service.process(message=message)
+            if self.is_management_message(message=message):
+                # management requests are independent of each other
+                key = message.get_message_id() if message.get_message_id() is not None else str(id(message))
+                self.mgmt_lane.submit(key=key,
+                                      task=lambda: self.process(service=self.kafka_mgmt_service, message=message))
             else:
-                self.kafka_service.process(message=message)
+                self.rpc_lane.submit(key=self.get_ordering_key(message=message),
+                                     task=lambda: self.process(service=self.kafka_service, message=message))
         except Exception as e:
             traceback.print_exc()
             self.logger.error(e)
             self.logger.error("Discarding the incoming message {}".format(message))
+
+    def process(self, *, service, message: IMessageAvro):
+        try:
+            service.process(message=message)
+        except Exception as e:
+            self.logger.error(traceback.format_exc())
+            self.logger.error(e)
+            self.logger.error("Discarding the incoming message {}".format(message))
+
+    def get_metrics(self) -> dict:
+        """
+        Return the metrics of the management and inter-actor lanes
+        """
+        return {'management': self.mgmt_lane.get_metrics(), 'inter_actor': self.rpc_lane.get_metrics()}
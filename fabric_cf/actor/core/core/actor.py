@@ -26,7 +26,9 @@
 import pickle
 import queue
 import threading
+import time
 import traceback
+from concurrent.futures.process import ProcessPoolExecutor
 from typing import List
 
 from fabric_cf.actor.core.apis.i_delegation import IDelegation
@@ -45,11 +47,15 @@ from fabric_cf.actor.core.common.exceptions import ActorException
 from fabric_cf.actor.core.container.message_service import MessageService
 from fabric_cf.actor.core.core.reservation_tracker import ReservationTracker
 from fabric_cf.actor.core.delegation.delegation_factory import DelegationFactory
+from fabric_cf.actor.core.kernel.actor_event_shards import ActorEventShards
 from fabric_cf.actor.core.kernel.failed_rpc import FailedRPC
+from fabric_cf.actor.core.kernel.incoming_rpc_event import IncomingRPCEvent
 from fabric_cf.actor.core.kernel.kernel_wrapper import KernelWrapper
 from fabric_cf.actor.core.kernel.rpc_manager_singleton import RPCManagerSingleton
 from fabric_cf.actor.core.kernel.reservation_factory import ReservationFactory
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
 from fabric_cf.actor.core.kernel.resource_set import ResourceSet
+from fabric_cf.actor.core.kernel.slice import SliceTypes
 from fabric_cf.actor.core.kernel.slice_factory import SliceFactory
 from fabric_cf.actor.core.proxies.proxy import Proxy
 from fabric_cf.actor.core.time.actor_clock import ActorClock
@@ -57,6 +63,8 @@ from fabric_cf.actor.core.time.term import Term
 from fabric_cf.actor.core.util.all_actor_events_filter import AllActorEventsFilter
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.actor.core.util.iterable_queue import IterableQueue
+from fabric_cf.actor.core.util.metrics import ActorMetrics
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializer
 from fabric_cf.actor.core.util.reflection_utils import ReflectionUtils
 from fabric_cf.actor.core.util.reservation_set import ReservationSet
 from fabric_cf.actor.security.auth_token import AuthToken
@@ -113,6 +121,7 @@ class Actor(IActor):
     PropertyPlugin = "ActorPlugin"
     PropertyPluginClass = "ActorPluginClass"
     DefaultDescription = "no description"
+    DefaultRecoveryBatchSize = 1000
 
     actor_count = 0
 
@@ -162,6 +171,10 @@ class Actor(IActor):
         self.thread_lock = threading.Lock()
         self.actor_main_lock = threading.Condition()
         self.message_service = None
+        # Shards processing incoming reservation RPCs in parallel (None: all events are processed on the actor thread)
+        self.event_shards = None
+        # Counters of the last recovery
+        self.recovery_stats = {}
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -182,6 +195,8 @@ class Actor(IActor):
         del state['actor_main_lock']
         del state['closing']
         del state['message_service']
+        del state['event_shards']
+        del state['recovery_stats']
         return state
 
     def __setstate__(self, state):
@@ -203,6 +218,8 @@ class Actor(IActor):
         self.actor_main_lock = threading.Condition()
         self.closing = ReservationSet()
         self.message_service = None
+        self.event_shards = None
+        self.recovery_stats = {}
 
     def actor_added(self):
         self.plugin.actor_added()
@@ -280,6 +297,7 @@ class Actor(IActor):
         self.logger.debug("External Tick end cycle: {}".format(cycle))
 
     def actor_tick(self, *, cycle: int):
+        begin = ActorMetrics.start()
         try:
             if not self.recovered:
                 self.logger.warning("Tick for an actor that has not completed recovery")
@@ -309,6 +327,8 @@ class Actor(IActor):
         except Exception as e:
             self.logger.debug(traceback.format_exc())
             raise e
+        finally:
+            ActorMetrics.observe_tick(actor=self.name, begin=begin)
 
     def get_actor_clock(self) -> ActorClock:
         return self.clock
@@ -404,6 +424,7 @@ class Actor(IActor):
             self.current_cycle = -1
 
             self.setup_message_service()
+            self.setup_event_shards()
 
             self.initialized = True
 
@@ -436,24 +457,144 @@ class Actor(IActor):
         Recover
         """
         self.logger.info("Starting recovery")
+        begin = time.time()
+        self.recovery_stats = {'slices': 0, 'reservations': 0, 'recovered': 0, 'skipped': 0, 'failed': 0,
+                               'delegations': 0}
         self.recovery_starting()
-        self.logger.debug("Recovering inventory slices")
 
-        inventory_slices = self.plugin.get_database().get_inventory_slices()
-        self.logger.debug("Found {} inventory slices".format(len(inventory_slices)))
-        self.recover_slices(properties=inventory_slices)
-        self.logger.debug("Recovery of inventory slices complete")
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        config = GlobalsSingleton.get().get_config()
+        runtime_config = config.get_runtime_config() if config is not None else None
+        if runtime_config is None:
+            runtime_config = {}
+
+        if str(runtime_config.get(Constants.property_conf_recovery_bulk, True)).lower() == 'true':
+            self.recover_bulk(batch_size=int(runtime_config.get(Constants.property_conf_recovery_batch_size,
+                                                                self.DefaultRecoveryBatchSize)),
+                              workers=int(runtime_config.get(Constants.property_conf_recovery_workers, 0)))
+        else:
+            self.logger.debug("Recovering inventory slices")
+
+            inventory_slices = self.plugin.get_database().get_inventory_slices()
+            self.logger.debug("Found {} inventory slices".format(len(inventory_slices)))
+            self.recover_slices(properties=inventory_slices)
+            self.logger.debug("Recovery of inventory slices complete")
 
-        self.logger.debug("Recovering client slices")
-        client_slices = self.plugin.get_database().get_client_slices()
-        self.logger.debug("Found {} client slices".format(len(client_slices)))
-        self.recover_slices(properties=client_slices)
-        self.logger.debug("Recovery of client slices complete")
+            self.logger.debug("Recovering client slices")
+            client_slices = self.plugin.get_database().get_client_slices()
+            self.logger.debug("Found {} client slices".format(len(client_slices)))
+            self.recover_slices(properties=client_slices)
+            self.logger.debug("Recovery of client slices complete")
 
         self.recovered = True
 
         self.recovery_ended()
-        self.logger.info("Recovery complete")
+
+        elapsed = time.time() - begin
+        self.recovery_stats['time'] = elapsed
+        self.recovery_stats['rows_per_second'] = self.recovery_stats['reservations'] / elapsed if elapsed > 0 else 0
+        self.logger.info("Recovery complete in {:.3f} seconds ({:.1f} reservations/second): {}".format(
+            elapsed, self.recovery_stats['rows_per_second'], self.recovery_stats))
+
+    def get_recovery_stats(self) -> dict:
+        """
+        Return the counters of the last recovery: slices, reservations read, recovered, skipped (closed) and
+        failed, delegations, time (seconds) and rows_per_second
+        @return recovery counters
+        """
+        return self.recovery_stats
+
+    def recover_bulk(self, *, batch_size: int, workers: int):
+        """
+        Recover all slices, reservations and delegations of the actor with one query per table. Reservations are
+        streamed ordered by slice and closed reservations are skipped by the database. Inventory slices are
+        recovered before client slices.
+        @param batch_size number of reservations read from the database at a time
+        @param workers number of processes decoding the reservations (0: decode on the calling thread)
+        """
+        database = self.plugin.get_database()
+        delegations = {}
+        for properties in database.get_delegations() or []:
+            delegations.setdefault(properties['dlg_slc_id'], []).append(properties)
+
+        pool = None
+        if workers > 0:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            groups = [([SliceTypes.InventorySlice], database.get_inventory_slices()),
+                      ([SliceTypes.ClientSlice, SliceTypes.BrokerClientSlice], database.get_client_slices())]
+            for slice_types, slices in groups:
+                self.logger.debug("Recovering {} {} slices".format(len(slices), slice_types))
+                recovered_slices = {}
+                for properties in slices:
+                    try:
+                        slice_obj = self.recover_slice_object(properties=properties)
+                        if slice_obj is not None:
+                            recovered_slices[properties['slc_id']] = slice_obj
+                    except Exception as e:
+                        self.logger.error(traceback.format_exc())
+                        self.logger.error("Error in recoverSlice for property list {}".format(e))
+
+                stream = database.stream_reservations(slice_types=slice_types,
+                                                      exclude_states=[ReservationStates.Closed.value],
+                                                      batch_size=batch_size)
+                batch = []
+                for properties in stream:
+                    batch.append(properties)
+                    if len(batch) == batch_size:
+                        self.recover_reservation_batch(batch=batch, slices=recovered_slices, pool=pool,
+                                                       workers=workers)
+                        batch = []
+                self.recover_reservation_batch(batch=batch, slices=recovered_slices, pool=pool, workers=workers)
+
+                for slc_id, slice_obj in recovered_slices.items():
+                    for properties in delegations.get(slc_id, []):
+                        try:
+                            self.recovery_stats['delegations'] = self.recovery_stats.get('delegations', 0) + 1
+                            self.recover_delegation(properties=properties, slice_obj=slice_obj)
+                        except Exception as e:
+                            self.logger.error("Unexpected error while recovering delegation {}".format(e))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def recover_reservation_batch(self, *, batch: list, slices: dict, pool: ProcessPoolExecutor = None,
+                                  workers: int = 0):
+        """
+        Recover a batch of reservations read from the database
+        @param batch reservation properties
+        @param slices recovered slices indexed by database slice id
+        @param pool process pool used to decode the reservations
+        @param workers number of processes in the pool
+        """
+        if len(batch) == 0:
+            return
+
+        if pool is not None:
+            # Decoding (header check and decompression) is done in the pool; the decoded pickle is read by
+            # ReservationFactory as a legacy blob
+            chunk_size = max(1, -(-len(batch) // workers))
+            futures = []
+            for i in range(0, len(batch), chunk_size):
+                data_list = [p[Constants.property_pickle_properties] for p in batch[i:i + chunk_size]]
+                futures.append(pool.submit(ObjectSerializer.decode_all, data_list=data_list))
+            i = 0
+            for future in futures:
+                for data in future.result():
+                    batch[i][Constants.property_pickle_properties] = data
+                    i += 1
+
+        for properties in batch:
+            slice_obj = slices.get(properties['rsv_slc_id'], None)
+            if slice_obj is None:
+                # The slice was recovered earlier or could not be recovered
+                continue
+            try:
+                self.recovery_stats['reservations'] = self.recovery_stats.get('reservations', 0) + 1
+                self.logger.debug("Recovering reservation {}".format(properties.get('rsv_resid', None)))
+                self.recover_reservation(properties=properties, slice_obj=slice_obj, check_database=False)
+            except Exception as e:
+                self.logger.error("Unexpected error while recovering reservation {}".format(e))
 
     def recovery_starting(self):
         """
@@ -481,10 +622,11 @@ class Actor(IActor):
                 self.logger.error(traceback.format_exc())
                 self.logger.error("Error in recoverSlice for property list {}".format(e))
 
-    def recover_slice(self, *, properties: dict):
+    def recover_slice_object(self, *, properties: dict) -> ISlice:
         """
-        Recover slice
+        Recover and register a slice without its reservations and delegations
         @param properties properties
+        @return slice object; None if the slice has already been recovered
         """
         if properties.get('slc_guid', None) is None:
             raise ActorException("Missing slice guid")
@@ -494,18 +636,31 @@ class Actor(IActor):
         slice_obj = self.get_slice(slice_id=slice_id)
         self.logger.debug("Found slice_id: {} slice:{}".format(slice_id, slice_obj))
 
-        if slice_obj is None:
-            self.logger.info("Recovering slice: {}".format(slice_id))
+        if slice_obj is not None:
+            return None
+
+        self.logger.info("Recovering slice: {}".format(slice_id))
+        self.recovery_stats['slices'] = self.recovery_stats.get('slices', 0) + 1
 
-            self.logger.debug("Instantiating slice object and recovering it")
-            slice_obj = SliceFactory.create_instance(properties=properties)
+        self.logger.debug("Instantiating slice object and recovering it")
+        slice_obj = SliceFactory.create_instance(properties=properties)
 
-            self.logger.debug("Informing the plugin about the slice")
-            self.plugin.revisit(slice_obj=slice_obj)
+        self.logger.debug("Informing the plugin about the slice")
+        self.plugin.revisit(slice_obj=slice_obj)
 
-            self.logger.debug("Registering slice: {}".format(slice_id))
-            self.re_register_slice(slice_object=slice_obj)
+        self.logger.debug("Registering slice: {}".format(slice_id))
+        self.re_register_slice(slice_object=slice_obj)
+        return slice_obj
 
+    def recover_slice(self, *, properties: dict):
+        """
+        Recover slice
+        @param properties properties
+        """
+        slice_obj = self.recover_slice_object(properties=properties)
+
+        if slice_obj is not None:
+            slice_id = slice_obj.get_slice_id()
             self.logger.debug("Recovering reservations in slice: {}".format(slice_id))
             self.recover_reservations(slice_obj=slice_obj)
 
@@ -534,18 +689,20 @@ class Actor(IActor):
 
         for properties in reservations:
             try:
-                self.logger.info("Reservation has properties: {}".format(properties))
+                self.recovery_stats['reservations'] = self.recovery_stats.get('reservations', 0) + 1
+                self.logger.debug("Recovering reservation {}".format(properties.get('rsv_resid', None)))
                 self.recover_reservation(properties=properties, slice_obj=slice_obj)
             except Exception as e:
                 self.logger.error("Unexpected error while recovering reservation {}".format(e))
 
         self.logger.info("Recovery for reservations in slice {} completed".format(slice_obj))
 
-    def recover_reservation(self, *, properties: dict, slice_obj: ISlice):
+    def recover_reservation(self, *, properties: dict, slice_obj: ISlice, check_database: bool = True):
         """
         Recover reservation
         @param properties properties
         @param slice_obj slice object
+        @param check_database verify that the reservation has a database record
         """
         try:
             r = ReservationFactory.create_instance(properties=properties, actor=self, slice_obj=slice_obj,
@@ -555,30 +712,33 @@ class Actor(IActor):
                 "Found reservation # {} in state {}".format(r.get_reservation_id(), r.get_reservation_state()))
             if r.is_closed():
                 self.logger.info("Reservation #{} is closed. Nothing to recover.".format(r.get_reservation_id()))
+                self.recovery_stats['skipped'] = self.recovery_stats.get('skipped', 0) + 1
                 return
 
             self.logger.info("Recovering reservation #{}".format(r.get_reservation_id()))
             self.logger.debug("Recovering reservation object r={}".format(r))
 
             self.logger.debug("Registering the reservation with the actor")
-            self.re_register(reservation=r)
+            self.re_register(reservation=r, check_database=check_database)
 
-            self.logger.info(r)
+            self.logger.debug(r)
 
             self.logger.debug("Revisiting with the Plugin")
 
             self.plugin.revisit(reservation=r)
 
-            self.logger.info(r)
+            self.logger.debug(r)
 
             self.logger.debug("Revisiting with the actor policy")
             self.policy.revisit(reservation=r)
 
+            self.recovery_stats['recovered'] = self.recovery_stats.get('recovered', 0) + 1
             self.logger.info("Recovered reservation #{}".format(r.get_reservation_id()))
         except Exception as e:
             traceback.print_exc()
+            self.recovery_stats['failed'] = self.recovery_stats.get('failed', 0) + 1
             self.logger.error("Exception occurred in recovering reservation e={}".format(e))
-            raise ActorException("Could not recover Reservation #{}".format(properties))
+            raise ActorException("Could not recover Reservation #{}".format(properties.get('rsv_resid', None)))
 
     def recover_delegations(self, *, slice_obj: ISlice):
         """
@@ -600,7 +760,8 @@ class Actor(IActor):
 
         for properties in delegations:
             try:
-                self.logger.info("Delegation has properties: {}".format(properties))
+                self.recovery_stats['delegations'] = self.recovery_stats.get('delegations', 0) + 1
+                self.logger.debug("Recovering delegation {}".format(properties.get('dlg_graph_id', None)))
                 self.recover_delegation(properties=properties, slice_obj=slice_obj)
             except Exception as e:
                 self.logger.error("Unexpected error while recovering delegation {}".format(e))
@@ -644,7 +805,7 @@ class Actor(IActor):
         except Exception as e:
             traceback.print_exc()
             self.logger.error("Exception occurred in recovering delegation e={}".format(e))
-            raise ActorException("Could not recover delegation #{}".format(properties))
+            raise ActorException("Could not recover delegation #{}".format(properties.get('dlg_graph_id', None)))
 
     def register(self, *, reservation: IReservation):
         self.wrapper.register_reservation(reservation=reservation)
@@ -668,8 +829,8 @@ class Actor(IActor):
     def re_register_delegation(self, *, delegation: IDelegation):
         self.wrapper.re_register_delegation(delegation=delegation)
 
-    def re_register(self, *, reservation: IReservation):
-        self.wrapper.re_register_reservation(reservation=reservation)
+    def re_register(self, *, reservation: IReservation, check_database: bool = True):
+        self.wrapper.re_register_reservation(reservation=reservation, check_database=check_database)
 
     def re_register_slice(self, *, slice_object: ISlice):
         self.wrapper.re_register_slice(slice_object=slice_object)
@@ -749,6 +910,9 @@ class Actor(IActor):
         try:
             self.thread_lock.acquire()
             result = self.thread == threading.current_thread()
+            # Shard threads process events on behalf of the actor thread
+            if not result and self.event_shards is not None:
+                result = self.event_shards.is_shard_thread()
         finally:
             self.thread_lock.release()
         return result
@@ -801,6 +965,8 @@ class Actor(IActor):
         finally:
             self.thread_lock.release()
 
+        if self.event_shards is not None:
+            self.event_shards.start()
         self.message_service.start()
 
     def stop(self):
@@ -827,6 +993,11 @@ class Actor(IActor):
         finally:
             if self.thread_lock is not None and self.thread_lock.locked():
                 self.thread_lock.release()
+        if self.event_shards is not None:
+            self.event_shards.shutdown()
+        if self.plugin is not None and self.plugin.get_config() is not None:
+            self.plugin.get_config().shutdown()
+        self.flush_database()
 
     def tick_handler(self):
         """
@@ -923,6 +1094,7 @@ class Actor(IActor):
                 if not self.event_queue.empty():
                     for event in IterableQueue(source_queue=self.event_queue):
                         events.append(event)
+                    ActorMetrics.set_event_queue_depth(actor=self.name, depth=len(events))
 
                 if not self.timer_queue.empty():
                     for timer in IterableQueue(source_queue=self.timer_queue):
@@ -935,11 +1107,23 @@ class Actor(IActor):
                 for e in events:
                     self.logger.debug("Processing event of type {}".format(type(e)))
                     self.logger.debug("Processing event {}".format(e))
+                    if self.event_shards is not None:
+                        slice_id = self.get_event_shard_key(event=e)
+                        if slice_id is not None:
+                            self.event_shards.submit(key=slice_id, event=e)
+                            continue
+                        # Barrier: all other events are processed only after the events queued before them
+                        self.event_shards.wait_idle()
+                    begin = ActorMetrics.start()
                     try:
                         e.process()
-                    except Exception as e:
+                    except Exception as ex:
                         traceback.print_exc()
-                        self.logger.error("Error while processing event {} {}".format(type(e), e))
+                        self.logger.error("Error while processing event {} {}".format(type(e), ex))
+                    ActorMetrics.observe_event(event=e, begin=begin)
+
+            if self.event_shards is not None:
+                self.event_shards.wait_idle()
 
             if len(timers) > 0:
                 for t in timers:
@@ -948,6 +1132,43 @@ class Actor(IActor):
                     except Exception as e:
                         self.logger.error("Error while processing a timer {}".format(e))
 
+            self.flush_database()
+
+    def get_event_shard_key(self, *, event: IActorEvent) -> ID:
+        """
+        Return the key used to process an event on an event shard
+        @param event event
+        @return slice id for incoming reservation RPCs; None if the event must be processed on the actor thread
+        """
+        if isinstance(event, IncomingRPCEvent):
+            return event.get_slice_id()
+        return None
+
+    def setup_event_shards(self):
+        """
+        Set up the shards processing incoming reservation RPCs in parallel as per the runtime configuration
+        """
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        config = GlobalsSingleton.get().get_config()
+        runtime_config = config.get_runtime_config() if config is not None else None
+        if runtime_config is None:
+            runtime_config = {}
+        shards = int(runtime_config.get(Constants.property_conf_actor_event_shards,
+                                        ActorEventShards.DEFAULT_SHARDS))
+        if shards > 0:
+            self.event_shards = ActorEventShards(shards=shards, logger=self.logger,
+                                                 name="{}-shard".format(self.get_name()))
+            self.logger.info("Processing incoming reservation RPCs on {} shards".format(shards))
+
+    def flush_database(self):
+        """
+        Persist the updates coalesced by the database (write behind) while processing events and timers
+        """
+        try:
+            self.plugin.get_database().flush()
+        except Exception as e:
+            self.logger.error("Error while flushing the database {}".format(e))
+
     def setup_message_service(self):
         """
         Set up Message Service for incoming Kafka Messages
@@ -975,7 +1196,8 @@ class Actor(IActor):
             key_schema, val_schema = GlobalsSingleton.get().get_kafka_schemas()
             self.message_service = MessageService(kafka_service=kafka_service, kafka_mgmt_service=kafka_mgmt_service,
                                                   conf=consumer_conf, key_schema=key_schema, record_schema=val_schema,
-                                                  topics=topics, logger=self.logger)
+                                                  topics=topics, logger=self.logger,
+                                                  runtime_config=config.get_runtime_config())
         except Exception as e:
             traceback.print_exc()
             self.logger.error("Failed to setup message service e={}".format(e))
@@ -128,6 +128,12 @@ class Broker(Actor, IBroker):
         self.extending = ReservationSet()
         self.registry = PeerRegistry()
 
+    def stop(self):
+        super().stop()
+        from fabric_cf.actor.core.policy.broker_simple_policy import BrokerSimplePolicy
+        if isinstance(self.policy, BrokerSimplePolicy):
+            self.policy.shutdown()
+
     def actor_added(self):
         super().actor_added()
         self.registry.actor_added()
@@ -23,7 +23,6 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-import pickle
 from enum import Enum
 
 
@@ -34,6 +33,7 @@ from fabric_cf.actor.core.plugins.config.config_token import ConfigToken
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.actor.core.util.notice import Notice
 from fabric_cf.actor.core.util.resource_type import ResourceType
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializerSingleton
 
 
 class UnitState(Enum):
@@ -416,5 +416,5 @@ class Unit(ConfigToken):
         if Constants.property_pickle_properties not in properties:
             raise UnitException(Constants.invalid_argument)
         serialized_unit = properties[Constants.property_pickle_properties]
-        deserialized_unit = pickle.loads(serialized_unit)
+        deserialized_unit = ObjectSerializerSingleton.get().deserialize(data=serialized_unit)
         return deserialized_unit
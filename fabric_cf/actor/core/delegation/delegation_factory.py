@@ -23,9 +23,9 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-import pickle
 
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializerSingleton
 from .delegation import Delegation
 from ..apis.i_actor import IActor
 from ..apis.i_delegation import IDelegation
@@ -68,6 +68,6 @@ class DelegationFactory:
             raise DelegationException(Constants.invalid_argument)
 
         serialized_delegation = properties[Constants.property_pickle_properties]
-        deserialized_delegation = pickle.loads(serialized_delegation)
+        deserialized_delegation = ObjectSerializerSingleton.get().deserialize(data=serialized_delegation)
         deserialized_delegation.restore(actor=actor, slice_obj=slice_obj, logger=logger)
         return deserialized_delegation
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import time
+import traceback
+import zlib
+from collections import deque
+
+from fabric_cf.actor.core.apis.i_actor_event import IActorEvent
+from fabric_cf.actor.core.util.metrics import ActorMetrics
+
+
+class ActorEventShards:
+    """
+    Fixed set of worker threads (shards) processing actor events in parallel.
+    - Events are routed to a shard by their key (slice id); events with the same key are always processed by the
+      same shard in the order in which they were submitted
+    - Events with different keys may be processed concurrently
+    - wait_idle blocks until every submitted event has been processed; the actor thread uses it as a barrier before
+      processing ticks, timers and all other events
+    """
+    DEFAULT_SHARDS = 0
+
+    def __init__(self, *, shards: int, logger, name: str = "ActorEventShard"):
+        self.shards = shards
+        self.logger = logger
+        self.name = name
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.available = [threading.Condition(self.lock) for _ in range(shards)]
+        self.queues = [deque() for _ in range(shards)]
+        self.threads = []
+        self.thread_ids = set()
+        self.pending = 0
+        self.stopped = False
+
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.processed_per_shard = [0] * shards
+        self.barriers = 0
+        self.barrier_wait_total = 0.0
+        self.barrier_wait_max = 0.0
+
+    def start(self):
+        """
+        Start the shard threads
+        """
+        with self.lock:
+            if len(self.threads) > 0:
+                return
+            self.stopped = False
+            for index in range(self.shards):
+                thread = threading.Thread(target=self._run, args=(index,), name="{}-{}".format(self.name, index),
+                                          daemon=True)
+                self.threads.append(thread)
+            for thread in self.threads:
+                thread.start()
+                self.thread_ids.add(thread.ident)
+
+    def get_shard(self, *, key) -> int:
+        """
+        Return the shard processing the events for a key
+        @param key key (slice id)
+        @return shard index
+        """
+        return zlib.crc32(str(key).encode('utf-8')) % self.shards
+
+    def submit(self, *, key, event: IActorEvent):
+        """
+        Queue an event on the shard for its key
+        @param key key (slice id)
+        @param event event
+        """
+        index = self.get_shard(key=key)
+        with self.lock:
+            self.queues[index].append(event)
+            self.pending += 1
+            self.submitted += 1
+            self.available[index].notify()
+
+    def wait_idle(self):
+        """
+        Barrier: block until all submitted events have been processed
+        """
+        begin = time.time()
+        with self.lock:
+            if self.pending == 0:
+                return
+            while self.pending > 0 and not self.stopped:
+                self.idle.wait()
+            wait_time = time.time() - begin
+            self.barriers += 1
+            self.barrier_wait_total += wait_time
+            self.barrier_wait_max = max(self.barrier_wait_max, wait_time)
+
+    def is_shard_thread(self) -> bool:
+        """
+        Check if the current thread is one of the shard threads
+        @return true if running on a shard thread
+        """
+        return threading.get_ident() in self.thread_ids
+
+    def _run(self, index: int):
+        shard_queue = self.queues[index]
+        while True:
+            with self.lock:
+                while len(shard_queue) == 0 and not self.stopped:
+                    self.available[index].wait()
+                if len(shard_queue) == 0:
+                    return
+                event = shard_queue.popleft()
+
+            failed = False
+            begin = ActorMetrics.start()
+            try:
+                event.process()
+            except Exception as e:
+                failed = True
+                traceback.print_exc()
+                self.logger.error("Error while processing event {} {}".format(type(event), e))
+            ActorMetrics.observe_event(event=event, begin=begin)
+
+            with self.lock:
+                self.pending -= 1
+                self.processed += 1
+                self.processed_per_shard[index] += 1
+                if failed:
+                    self.failed += 1
+                if self.pending == 0:
+                    self.idle.notify_all()
+
+    def shutdown(self, *, wait: bool = True):
+        """
+        Stop the shard threads; events already queued are processed first
+        @param wait wait for the shard threads to exit
+        """
+        with self.lock:
+            self.stopped = True
+            for available in self.available:
+                available.notify_all()
+            self.idle.notify_all()
+            threads = self.threads
+            self.threads = []
+        if wait:
+            for thread in threads:
+                if thread != threading.current_thread():
+                    thread.join()
+        self.thread_ids.clear()
+
+    def get_metrics(self) -> dict:
+        """
+        Return throughput and barrier wait (seconds) metrics
+        """
+        with self.lock:
+            return {'shards': self.shards,
+                    'pending': self.pending,
+                    'submitted': self.submitted,
+                    'processed': self.processed,
+                    'failed': self.failed,
+                    'processed_per_shard': list(self.processed_per_shard),
+                    'barriers': self.barriers,
+                    'barrier_wait_avg': self.barrier_wait_total / self.barriers if self.barriers > 0 else 0.0,
+                    'barrier_wait_max': self.barrier_wait_max}
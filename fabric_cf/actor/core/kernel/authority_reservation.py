@@ -77,6 +77,7 @@ class AuthorityReservation(ReservationServer, IKernelAuthorityReservation):
         del state['pending_recover']
         del state['state_transition']
         del state['service_pending']
+        del state['index']
 
         del state['policy']
 
@@ -97,6 +98,7 @@ class AuthorityReservation(ReservationServer, IKernelAuthorityReservation):
         self.pending_recover = False
         self.state_transition = False
         self.service_pending = ReservationPendingStates.None_
+        self.index = None
 
         self.policy = None
 
@@ -460,6 +462,11 @@ class AuthorityReservation(ReservationServer, IKernelAuthorityReservation):
                                 pending=ReservationPendingStates.None_)
                 self.generate_update()
 
+    def is_probe_idle(self) -> bool:
+        if self.is_failed() and not self.notified_about_failure:
+            return False
+        return super().is_probe_idle()
+
     def service_probe(self):
         # An exception in one of these service routines should mean some
         # unrecoverable, reservation-wide failure. It should not occur, e.g.,
@@ -100,6 +100,7 @@ class BrokerReservation(ReservationServer, IKernelBrokerReservation):
         del state['pending_recover']
         del state['state_transition']
         del state['service_pending']
+        del state['index']
 
         del state['policy']
 
@@ -121,6 +122,7 @@ class BrokerReservation(ReservationServer, IKernelBrokerReservation):
         self.pending_recover = False
         self.state_transition = False
         self.service_pending = ReservationPendingStates.None_
+        self.index = None
 
         self.policy = None
 
@@ -333,6 +335,13 @@ class BrokerReservation(ReservationServer, IKernelBrokerReservation):
                 self.service_pending = ReservationPendingStates.SendUpdate
                 self.must_send_update = False
 
+    def is_probe_idle(self) -> bool:
+        if self.is_failed() and not self.notified_failed:
+            return False
+        if self.must_send_update:
+            return False
+        return super().is_probe_idle()
+
     def service_probe(self):
         try:
             if self.service_pending == ReservationPendingStates.AbsorbUpdate:
@@ -31,6 +31,8 @@ from fabric_cf.actor.core.apis.i_actor_event import IActorEvent
 from fabric_cf.actor.core.apis.i_authority import IAuthority
 from fabric_cf.actor.core.apis.i_broker import IBroker
 from fabric_cf.actor.core.apis.i_controller import IController
+from fabric_cf.actor.core.kernel.incoming_reservation_rpc import IncomingReservationRPC
+from fabric_cf.actor.core.util.metrics import ActorMetrics
 from fabric_cf.actor.core.util.rpc_exception import RPCException
 
 if TYPE_CHECKING:
@@ -39,15 +41,36 @@ if TYPE_CHECKING:
     from fabric_cf.actor.core.kernel.incoming_rpc import IncomingRPC
     from fabric_cf.actor.core.apis.i_client_actor import IClientActor
     from fabric_cf.actor.core.apis.i_server_actor import IServerActor
+    from fabric_cf.actor.core.util.id import ID
 
 
 class IncomingRPCEvent(IActorEvent):
     """
     Represents incoming RPC event
     """
+    # Requests operating on a single reservation; these can be processed in parallel with requests for other slices
+    ReservationRequestTypes = (RPCRequestType.Ticket, RPCRequestType.ExtendTicket, RPCRequestType.Relinquish,
+                               RPCRequestType.UpdateTicket, RPCRequestType.Redeem, RPCRequestType.ExtendLease,
+                               RPCRequestType.ModifyLease, RPCRequestType.Close, RPCRequestType.UpdateLease)
+
     def __init__(self, *, actor: IActor, rpc: IncomingRPC):
         self.actor = actor
         self.rpc = rpc
+        # created when the RPC is dispatched
+        self.begin = ActorMetrics.start()
+
+    def get_slice_id(self) -> ID:
+        """
+        Return the slice id of the reservation the RPC operates on
+        @return slice id; None if the RPC does not operate on a single reservation
+        """
+        if self.rpc.get_request_type() not in self.ReservationRequestTypes or \
+                not isinstance(self.rpc, IncomingReservationRPC):
+            return None
+        reservation = self.rpc.get_reservation()
+        if reservation is None or reservation.get_slice() is None:
+            return None
+        return reservation.get_slice().get_slice_id()
 
     def do_process_actor(self, *, actor: IActor):
         """
@@ -187,6 +210,16 @@ class IncomingRPCEvent(IActorEvent):
         """
         Process Incoming RPC events
         """
+        try:
+            self.do_process()
+        finally:
+            ActorMetrics.observe_rpc(direction=ActorMetrics.INBOUND, request_type=self.rpc.get_request_type(),
+                                     begin=self.begin)
+
+    def do_process(self):
+        """
+        Process Incoming RPC events as per the actor type
+        """
         done = False
         if isinstance(self.actor, IAuthority):
             done = self.do_process_authority(authority=self.actor)
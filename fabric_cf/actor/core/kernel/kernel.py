@@ -43,6 +43,7 @@ from fabric_cf.actor.core.apis.i_kernel_server_reservation import IKernelServerR
 from fabric_cf.actor.core.apis.i_kernel_slice import IKernelSlice
 from fabric_cf.actor.core.kernel.request_types import RequestTypes
 from fabric_cf.actor.core.kernel.reservation import Reservation
+from fabric_cf.actor.core.kernel.reservation_index import ReservationIndex
 from fabric_cf.actor.core.kernel.reservation_purged_event import ReservationPurgedEvent
 from fabric_cf.actor.core.kernel.reservation_states import ReservationPendingStates, ReservationStates
 from fabric_cf.actor.core.kernel.resource_set import ResourceSet
@@ -57,6 +58,9 @@ from fabric_cf.actor.security.auth_token import AuthToken
 
 
 class Kernel:
+    # Number of ticks between full sweeps over all reservations
+    FULL_PROBE_INTERVAL = 60
+
     def __init__(self, *, plugin: IBasePlugin, policy: IPolicy, logger):
         # The plugin.
         self.plugin = plugin
@@ -68,8 +72,11 @@ class Kernel:
         self.slices = SliceTable()
         # All reservations managed by the kernel.
         self.reservations = ReservationSet()
+        # Incremental indexes over the reservations to avoid scanning all reservations on every tick
+        self.reservation_index = ReservationIndex()
+        self.tick_count = 0
         self.delegations = {}
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()
         self.nothing_pending = threading.Condition()
 
     def amend_reserve(self, *, reservation: IKernelReservation):
@@ -79,14 +86,15 @@ class Kernel:
         @param reservation reservation
         @throws Exception
         """
-        try:
-            reservation.reserve(policy=self.policy)
-            self.plugin.get_database().update_reservation(reservation=reservation)
-            if not reservation.is_failed():
-                reservation.service_reserve()
-        except Exception as e:
-            self.error(err="An error occurred during amend reserve for reservation #{}".format(
-                reservation.get_reservation_id()), e=e)
+        with self.lock:
+            try:
+                reservation.reserve(policy=self.policy)
+                self.plugin.get_database().update_reservation(reservation=reservation)
+                if not reservation.is_failed():
+                    reservation.service_reserve()
+            except Exception as e:
+                self.error(err="An error occurred during amend reserve for reservation #{}".format(
+                    reservation.get_reservation_id()), e=e)
 
     def amend_delegate(self, *, delegation: IDelegation):
         """
@@ -138,9 +146,10 @@ class Kernel:
         @param reservation reservation
         @param message message
         """
-        if not reservation.is_failed() and not reservation.is_closed():
-            reservation.fail(message=message, exception=None)
-        self.plugin.get_database().update_reservation(reservation=reservation)
+        with self.lock:
+            if not reservation.is_failed() and not reservation.is_closed():
+                reservation.fail(message=message, exception=None)
+            self.plugin.get_database().update_reservation(reservation=reservation)
 
     def close(self, *, reservation: IKernelReservation):
         """
@@ -152,16 +161,17 @@ class Kernel:
         @param reservation reservation for which to perform close
         @throws Exception
         """
-        try:
-            if not reservation.is_closed() and not reservation.is_closing():
-                self.policy.close(reservation=reservation)
-                reservation.close()
-                self.plugin.get_database().update_reservation(reservation=reservation)
-                reservation.service_close()
-        except Exception as e:
-            traceback.print_exc()
-            self.error(err="An error occurred during close for reservation #{}".format(
-                reservation.get_reservation_id()), e=e)
+        with self.lock:
+            try:
+                if not reservation.is_closed() and not reservation.is_closing():
+                    self.policy.close(reservation=reservation)
+                    reservation.close()
+                    self.plugin.get_database().update_reservation(reservation=reservation)
+                    reservation.service_close()
+            except Exception as e:
+                traceback.print_exc()
+                self.error(err="An error occurred during close for reservation #{}".format(
+                    reservation.get_reservation_id()), e=e)
 
     def compare_and_update(self, *, incoming: IKernelServerReservation, current: IKernelServerReservation):
         """
@@ -175,17 +185,18 @@ class Kernel:
         @param current the corresponding reservation stored at the server
         @return a comparison status flag (see Sequence*)
         """
-        code = SequenceComparisonCodes.SequenceEqual
-        if current.get_sequence_in() < incoming.get_sequence_in():
-            if current.is_no_pending():
-                code = SequenceComparisonCodes.SequenceGreater
-                current.set_sequence_in(sequence=incoming.get_sequence_in())
-                current.set_requested_resources(resources=incoming.get_requested_resources())
-                current.set_requested_term(term=incoming.get_requested_term())
-        else:
-            if current.get_sequence_in() > incoming.get_sequence_in():
-                code = SequenceComparisonCodes.SequenceSmaller
-        return code
+        with self.lock:
+            code = SequenceComparisonCodes.SequenceEqual
+            if current.get_sequence_in() < incoming.get_sequence_in():
+                if current.is_no_pending():
+                    code = SequenceComparisonCodes.SequenceGreater
+                    current.set_sequence_in(sequence=incoming.get_sequence_in())
+                    current.set_requested_resources(resources=incoming.get_requested_resources())
+                    current.set_requested_term(term=incoming.get_requested_term())
+            else:
+                if current.get_sequence_in() > incoming.get_sequence_in():
+                    code = SequenceComparisonCodes.SequenceSmaller
+            return code
 
     @staticmethod
     def compare_and_update_ignore_pending(*, incoming: IKernelServerReservation,
@@ -229,14 +240,15 @@ class Kernel:
         @param reservation reservation for which to perform extend lease
         @throws Exception
         """
-        try:
-            reservation.extend_lease()
-            self.plugin.get_database().update_reservation(reservation=reservation)
-            if not reservation.is_failed():
-                reservation.service_extend_lease()
-        except Exception as e:
-            self.error(err="An error occurred during extend lease for reservation #{}".format(
-                reservation.get_reservation_id()), e=e)
+        with self.lock:
+            try:
+                reservation.extend_lease()
+                self.plugin.get_database().update_reservation(reservation=reservation)
+                if not reservation.is_failed():
+                    reservation.service_extend_lease()
+            except Exception as e:
+                self.error(err="An error occurred during extend lease for reservation #{}".format(
+                    reservation.get_reservation_id()), e=e)
 
     def modify_lease(self, *, reservation: IKernelReservation):
         """
@@ -247,14 +259,15 @@ class Kernel:
         @param reservation reservation for which to perform extend lease
         @throws Exception
         """
-        try:
-            reservation.modify_lease()
-            self.plugin.get_database().update_reservation(reservation=reservation)
-            if not reservation.is_failed():
-                reservation.service_modify_lease()
-        except Exception as e:
-            self.error(err="An error occurred during modify lease for reservation #{}".format(
-                reservation.get_reservation_id()), e=e)
+        with self.lock:
+            try:
+                reservation.modify_lease()
+                self.plugin.get_database().update_reservation(reservation=reservation)
+                if not reservation.is_failed():
+                    reservation.service_modify_lease()
+            except Exception as e:
+                self.error(err="An error occurred during modify lease for reservation #{}".format(
+                    reservation.get_reservation_id()), e=e)
 
     def extend_reservation(self, *, rid: ID, resources: ResourceSet, term: Term) -> int:
         """
@@ -308,21 +321,22 @@ class Kernel:
         @param reservation reservation for which to perform extend ticket
         @throws Exception
         """
-        try:
-            self.logger.debug("Processing extend ticket for reservation={}".format(type(reservation)))
-            if reservation.can_renew():
-                reservation.extend_ticket(actor=self.plugin.get_actor())
-            else:
-                raise KernelException("The reservation state prevents it from extending its ticket.")
+        with self.lock:
+            try:
+                self.logger.debug("Processing extend ticket for reservation={}".format(type(reservation)))
+                if reservation.can_renew():
+                    reservation.extend_ticket(actor=self.plugin.get_actor())
+                else:
+                    raise KernelException("The reservation state prevents it from extending its ticket.")
 
-            self.plugin.get_database().update_reservation(reservation=reservation)
+                self.plugin.get_database().update_reservation(reservation=reservation)
 
-            if not reservation.is_failed():
-                reservation.service_extend_ticket()
-        except Exception as e:
-            self.logger.error(traceback.format_exc())
-            self.error(err="An error occurred during extend ticket for reservation #{}".format(
-                reservation.get_reservation_id()), e=e)
+                if not reservation.is_failed():
+                    reservation.service_extend_ticket()
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.error(err="An error occurred during extend ticket for reservation #{}".format(
+                    reservation.get_reservation_id()), e=e)
 
     def get_client_slices(self) -> List[IKernelSlice]:
         """
@@ -364,24 +378,25 @@ class Kernel:
         @return the slice object
         @throws Exception
         """
-        slice_name = reservation.get_slice().get_name()
-        slice_id = reservation.get_slice().get_slice_id()
-
-        result = self.get_slice(slice_id=slice_id)
-        if result is None:
-            if create_new_slice:
-                result = self.plugin.create_slice(slice_id=slice_id, name=slice_name, properties=ResourceData())
-                if reservation.get_slice().is_broker_client():
-                    result.set_broker_client()
+        with self.lock:
+            slice_name = reservation.get_slice().get_name()
+            slice_id = reservation.get_slice().get_slice_id()
+
+            result = self.get_slice(slice_id=slice_id)
+            if result is None:
+                if create_new_slice:
+                    result = self.plugin.create_slice(slice_id=slice_id, name=slice_name, properties=ResourceData())
+                    if reservation.get_slice().is_broker_client():
+                        result.set_broker_client()
+                    else:
+                        if reservation.get_slice().is_client():
+                            result.set_client()
                 else:
-                    if reservation.get_slice().is_client():
-                        result.set_client()
-            else:
-                result = reservation.get_kernel_slice()
+                    result = reservation.get_kernel_slice()
 
-            result.set_owner(owner=identity)
-            self.register_slice(slice_object=result)
-        return result
+                result.set_owner(owner=identity)
+                self.register_slice(slice_object=result)
+            return result
 
     def get_reservation(self, *, rid: ID) -> IKernelReservation:
         """
@@ -446,7 +461,8 @@ class Kernel:
         @param current reservation
         @param operation operation code
         """
-        current.handle_duplicate_request(operation=operation)
+        with self.lock:
+            current.handle_duplicate_request(operation=operation)
 
     def probe_pending(self, *, reservation: IKernelReservation):
         """
@@ -463,6 +479,9 @@ class Kernel:
             traceback.print_exc()
             self.error(err="An error occurred during probe pending for reservation #{}".format(
                 reservation.get_reservation_id()), e=e)
+        finally:
+            if self.reservations.contains(rid=reservation.get_reservation_id()):
+                self.reservation_index.update(reservation=reservation)
 
     def probe_pending_delegation(self, *, delegation: IDelegation):
         """
@@ -485,7 +504,7 @@ class Kernel:
         Purges all closed reservations.
         @throws Exception
         """
-        for reservation in self.reservations.values():
+        for reservation in self.reservation_index.get_closed_reservations():
             if reservation.is_closed():
                 try:
                     reservation.get_kernel_slice().unregister(reservation=reservation)
@@ -495,7 +514,7 @@ class Kernel:
                 finally:
                     GlobalsSingleton.get().event_manager.dispatch_event(event=ReservationPurgedEvent(
                         reservation=reservation))
-                    self.reservations.remove(reservation=reservation)
+                    self.remove_reservation_from_table(reservation=reservation)
 
         delegations_to_be_removed = []
         for delegation in self.delegations.values():
@@ -525,18 +544,19 @@ class Kernel:
         Redeem a reservation
         @param reservation reservation
         """
-        try:
-            if reservation.can_redeem():
-                reservation.reserve(policy=self.policy)
-            else:
-                raise KernelException("The current reservation state prevent it from being redeemed")
+        with self.lock:
+            try:
+                if reservation.can_redeem():
+                    reservation.reserve(policy=self.policy)
+                else:
+                    raise KernelException("The current reservation state prevent it from being redeemed")
 
-            self.plugin.get_database().update_reservation(reservation=reservation)
-            if not reservation.is_failed():
-                reservation.service_reserve()
-        except Exception as e:
-            self.logger.error(
-                "An error occurred during redeem for reservation #{}".format(reservation.get_reservation_id()), e)
+                self.plugin.get_database().update_reservation(reservation=reservation)
+                if not reservation.is_failed():
+                    reservation.service_reserve()
+            except Exception as e:
+                self.logger.error(
+                    "An error occurred during redeem for reservation #{}".format(reservation.get_reservation_id()), e)
 
     def register(self, *, reservation: IKernelReservation, slice_object: IKernelSlice) -> bool:
         """
@@ -570,6 +590,7 @@ class Kernel:
             reservation.set_actor(actor=self.plugin.get_actor())
             # attach the local slice object
             reservation.set_slice(slice_object=slice_object)
+            reservation.set_index(index=self.reservation_index)
             add = True
         else:
             self.logger.warning("Attempting to register a closed reservation #{}".format(
@@ -644,22 +665,23 @@ class Kernel:
         @param reservation reservation
         @throws Exception
         """
-        if reservation is None or reservation.get_reservation_id() is None or \
-                reservation.get_slice() is None or reservation.get_slice().get_name() is None:
-            raise KernelException(Constants.invalid_argument)
+        with self.lock:
+            if reservation is None or reservation.get_reservation_id() is None or \
+                    reservation.get_slice() is None or reservation.get_slice().get_name() is None:
+                raise KernelException(Constants.invalid_argument)
 
-        local_slice = None
-        add = False
+            local_slice = None
+            add = False
 
-        local_slice = self.slices.get(slice_id=reservation.get_slice().get_slice_id(), raise_exception=True)
-        add = self.register(reservation=reservation, slice_object=local_slice)
+            local_slice = self.slices.get(slice_id=reservation.get_slice().get_slice_id(), raise_exception=True)
+            add = self.register(reservation=reservation, slice_object=local_slice)
 
-        if add:
-            try:
-                self.plugin.get_database().add_reservation(reservation=reservation)
-            except Exception as e:
-                self.unregister_no_check(reservation=reservation, slice_object=local_slice)
-                raise e
+            if add:
+                try:
+                    self.plugin.get_database().add_reservation(reservation=reservation)
+                except Exception as e:
+                    self.unregister_no_check(reservation=reservation, slice_object=local_slice)
+                    raise e
 
     def register_slice(self, *, slice_object: IKernelSlice):
         """
@@ -751,10 +773,11 @@ class Kernel:
             self.unregister_no_check_d(delegation=delegation, slice_object=local_slice)
             raise KernelException("The delegation has no database record")
 
-    def re_register_reservation(self, *, reservation: IKernelReservation):
+    def re_register_reservation(self, *, reservation: IKernelReservation, check_database: bool = True):
         """
         Re-registers the reservation.
         @param reservation reservation
+        @param check_database verify that the reservation has a database record
         @throws Exception
         """
         if reservation is None or reservation.get_reservation_id() is None or \
@@ -769,6 +792,9 @@ class Kernel:
         else:
             self.register(reservation=reservation, slice_object=local_slice)
 
+        if not check_database:
+            return
+
         # Check if the reservation has a database record.
         temp = None
         temp = self.plugin.get_database().get_reservation(rid=reservation.get_reservation_id())
@@ -808,15 +834,16 @@ class Kernel:
         @param reservation reservation for which to perform redeem
         @throws Exception
         """
-        try:
-            reservation.reserve(policy=self.policy)
-            self.plugin.get_database().update_reservation(reservation=reservation)
-            if not reservation.is_failed():
-                reservation.service_reserve()
-        except Exception as e:
-            traceback.print_exc()
-            self.error(err="An error occurred during reserve for reservation #{}".format(
-                reservation.get_reservation_id()), e=e)
+        with self.lock:
+            try:
+                reservation.reserve(policy=self.policy)
+                self.plugin.get_database().update_reservation(reservation=reservation)
+                if not reservation.is_failed():
+                    reservation.service_reserve()
+            except Exception as e:
+                traceback.print_exc()
+                self.error(err="An error occurred during reserve for reservation #{}".format(
+                    reservation.get_reservation_id()), e=e)
 
     def delegate(self, *, delegation: IDelegation, id_token: str = None):
         """
@@ -908,7 +935,13 @@ class Kernel:
         try:
             for delegation in self.delegations.values():
                 self.probe_pending_delegation(delegation=delegation)
-            for reservation in self.reservations.values():
+            self.tick_count += 1
+            if self.tick_count % self.FULL_PROBE_INTERVAL == 0:
+                # Periodic full sweep guards against state changes that bypassed the index
+                reservations = list(self.reservations.values())
+            else:
+                reservations = self.reservation_index.get_probe_reservations()
+            for reservation in reservations:
                 self.probe_pending(reservation=reservation)
 
             self.purge()
@@ -922,11 +955,7 @@ class Kernel:
         Check is kernel has any pending reservations
         @return true if no terminal/nascent/pending reservations exist; false otherwise
         """
-        for reservation in self.reservations.values():
-            if not reservation.is_terminal() and (reservation.is_nascent() or not reservation.is_no_pending()):
-                return True
-
-        return False
+        return self.reservation_index.has_pending()
 
     def check_nothing_pending(self):
         """
@@ -953,7 +982,7 @@ class Kernel:
         """
         if reservation.is_closed() or reservation.is_failed() or reservation.get_state() == ReservationStates.CloseWait:
             slice_object.unregister(reservation=reservation)
-            self.reservations.remove(reservation=reservation)
+            self.remove_reservation_from_table(reservation=reservation)
         else:
             raise KernelException("Only reservations in failed, closed, or closewait state can be unregistered.")
 
@@ -966,7 +995,17 @@ class Kernel:
         @throws Exception
         """
         slice_object.unregister(reservation=reservation)
+        self.remove_reservation_from_table(reservation=reservation)
+
+    def remove_reservation_from_table(self, *, reservation: IKernelReservation):
+        """
+        Removes a reservation from the reservation table and the reservation index.
+        Must be called with the kernel lock on.
+        @param reservation reservation to remove
+        """
         self.reservations.remove(reservation=reservation)
+        self.reservation_index.remove(rid=reservation.get_reservation_id())
+        reservation.set_index(index=None)
 
     def unregister_no_check_d(self, *, delegation: IDelegation, slice_object: IKernelSlice):
         """
@@ -1023,24 +1062,25 @@ class Kernel:
         @param update_data status of the operation the authority is informing us about
         @throws Exception
         """
-        try:
-            self.logger.debug("updateLease: Incoming term {}".format(update.get_term()))
-            reservation.update_lease(incoming=update, update_data=update_data)
+        with self.lock:
+            try:
+                self.logger.debug("updateLease: Incoming term {}".format(update.get_term()))
+                reservation.update_lease(incoming=update, update_data=update_data)
 
-            # NOTE: the database update has to happen BEFORE the service
-            # update: we need to record the fact that we received a concrete
-            # set, so that on recovery we can go and recover the concrete set.
-            # If the database update is after the service call, we may end up
-            # in Ticketed, Redeeming with state in the database that will
-            # prevent us from incorporating a leaseUpdate.
+                # NOTE: the database update has to happen BEFORE the service
+                # update: we need to record the fact that we received a concrete
+                # set, so that on recovery we can go and recover the concrete set.
+                # If the database update is after the service call, we may end up
+                # in Ticketed, Redeeming with state in the database that will
+                # prevent us from incorporating a leaseUpdate.
 
-            self.plugin.get_database().update_reservation(reservation=reservation)
+                self.plugin.get_database().update_reservation(reservation=reservation)
 
-            if not reservation.is_failed():
-                reservation.service_update_lease()
-        except Exception as e:
-            self.error(err="An error occurred during update lease for reservation # {}".format(
-                reservation.get_reservation_id()), e=e)
+                if not reservation.is_failed():
+                    reservation.service_update_lease()
+            except Exception as e:
+                self.error(err="An error occurred during update lease for reservation # {}".format(
+                    reservation.get_reservation_id()), e=e)
 
     def update_ticket(self, *, reservation: IKernelReservation, update: Reservation, update_data: UpdateData):
         """
@@ -1050,14 +1090,15 @@ class Kernel:
         @param update_data status of the operation the broker is informing us about
         @throws Exception
         """
-        try:
-            reservation.update_ticket(incoming=update, update_data=update_data)
-            self.plugin.get_database().update_reservation(reservation=reservation)
-            if not reservation.is_failed():
-                reservation.service_update_ticket()
-        except Exception as e:
-            self.error(err="An error occurred during update ticket for reservation # {}".format(
-                reservation.get_reservation_id()), e=e)
+        with self.lock:
+            try:
+                reservation.update_ticket(incoming=update, update_data=update_data)
+                self.plugin.get_database().update_reservation(reservation=reservation)
+                if not reservation.is_failed():
+                    reservation.service_update_ticket()
+            except Exception as e:
+                self.error(err="An error occurred during update ticket for reservation # {}".format(
+                    reservation.get_reservation_id()), e=e)
 
     def update_delegation(self, *, delegation: IDelegation, update: IDelegation, update_data: UpdateData):
         """
@@ -1110,7 +1151,8 @@ class Kernel:
         @param reservation reservation
         @param rpc rpc
         """
-        reservation.handle_failed_rpc(failed=rpc)
+        with self.lock:
+            reservation.handle_failed_rpc(failed=rpc)
 
     def validate_delegation(self, *, delegation: IDelegation = None, did: ID = None):
         """
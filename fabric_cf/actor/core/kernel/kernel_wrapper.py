@@ -715,7 +715,7 @@ class KernelWrapper:
 
         self.kernel.remove_slice(slice_id=slice_id)
 
-    def re_register_reservation(self, *, reservation: IReservation):
+    def re_register_reservation(self, *, reservation: IReservation, check_database: bool = True):
         """
          Registers a previously unregistered reservation with the kernel. The
         containing slice should have been previously registered with the kernel
@@ -725,6 +725,7 @@ class KernelWrapper:
         that are not closed or failed can be registered. Closed or failed
         reservations will be ignored.
         @param reservation the reservation to reregister
+        @param check_database verify that the reservation has a database record
         @throws IllegalArgumentException when the passed in argument is illegal
         @throws Exception if the reservation has already been registered with the
                     kernel or the reservation does not have a database record. In
@@ -735,7 +736,7 @@ class KernelWrapper:
         if reservation is None or not isinstance(reservation, IKernelReservation):
             raise KernelException(Constants.invalid_argument)
 
-        self.kernel.re_register_reservation(reservation=reservation)
+        self.kernel.re_register_reservation(reservation=reservation, check_database=check_database)
 
     def re_register_delegation(self, *, delegation: IDelegation):
         """
@@ -148,6 +148,8 @@ class Reservation(IKernelReservation):
         self.state_transition = False
         # Scratch element to trigger post-actions on a probe.
         self.service_pending = ReservationPendingStates.None_
+        # Kernel index tracking this reservation; updated whenever the reservation changes
+        self.index = None
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -162,6 +164,7 @@ class Reservation(IKernelReservation):
         del state['pending_recover']
         del state['state_transition']
         del state['service_pending']
+        del state['index']
         return state
 
     def __setstate__(self, state):
@@ -177,6 +180,7 @@ class Reservation(IKernelReservation):
         self.pending_recover = False
         self.state_transition = False
         self.service_pending = ReservationPendingStates.None_
+        self.index = None
 
     def restore(self, *, actor: IActor, slice_obj: ISlice, logger):
         """
@@ -564,6 +568,33 @@ class Reservation(IKernelReservation):
         Set dirty
         """
         self.dirty = True
+        self.reindex()
+
+    def set_index(self, *, index):
+        """
+        Set the kernel index tracking this reservation
+        @param index index
+        """
+        self.index = index
+        self.reindex()
+
+    def reindex(self):
+        """
+        Update the kernel index to reflect the current state of the reservation
+        """
+        if self.index is not None:
+            self.index.update(reservation=self)
+
+    def request_probe(self):
+        """
+        Request the reservation to be probed on the next tick
+        """
+        if self.index is not None:
+            self.index.mark_probe(reservation=self)
+
+    def is_probe_idle(self) -> bool:
+        return self.pending_state == ReservationPendingStates.None_ and \
+               self.service_pending == ReservationPendingStates.None_ and not self.is_nascent()
 
     def set_expired(self, *, value: bool):
         self.expired = value
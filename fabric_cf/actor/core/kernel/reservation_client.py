@@ -210,6 +210,7 @@ class ReservationClient(Reservation, IKernelControllerReservation):
         del state['pending_recover']
         del state['state_transition']
         del state['service_pending']
+        del state['index']
 
         del state['suggested']
         return state
@@ -226,7 +227,8 @@ class ReservationClient(Reservation, IKernelControllerReservation):
         self.expired = False
         self.pending_recover = False
         self.state_transition = False
-        self.service_pending = ReservationPendingStates.None_
+        self.service_pending = JoinState.None_
+        self.index = None
 
         self.suggested = True
 
@@ -855,6 +857,13 @@ class ReservationClient(Reservation, IKernelControllerReservation):
                 # are not cheating
                 self.do_relinquish()
 
+    def is_probe_idle(self) -> bool:
+        # BlockedRedeem/BlockedJoin/Joining are advanced only by probe_join_state (and an unblocked join is serviced
+        # by service_probe on the same probe), so a reservation needs probing until its join state returns to NoJoin.
+        # service_pending (JoinState) is set and cleared within a single probe and does not affect idleness.
+        return self.pending_state == ReservationPendingStates.None_ and self.joinstate == JoinState.NoJoin and \
+            not self.is_nascent()
+
     def set_policy(self, *, policy: IClientPolicy):
         self.policy = policy
 
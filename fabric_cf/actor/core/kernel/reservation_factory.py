@@ -23,7 +23,6 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-import pickle
 
 from fabric_cf.actor.core.apis.i_actor import IActor
 from fabric_cf.actor.core.apis.i_reservation import IReservation
@@ -31,6 +30,7 @@ from fabric_cf.actor.core.apis.i_slice import ISlice
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.exceptions import ReservationException
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializerSingleton
 
 
 class ReservationFactory:
@@ -50,7 +50,7 @@ class ReservationFactory:
             raise ReservationException(Constants.invalid_argument)
 
         serialized_reservation = properties[Constants.property_pickle_properties]
-        deserialized_reservation = pickle.loads(serialized_reservation)
+        deserialized_reservation = ObjectSerializerSingleton.get().deserialize(data=serialized_reservation)
         deserialized_reservation.restore(actor=actor, slice_obj=slice_obj, logger=logger)
         return deserialized_reservation
 
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from fabric_cf.actor.core.apis.i_kernel_reservation import IKernelReservation
+    from fabric_cf.actor.core.util.id import ID
+
+
+class ReservationIndex:
+    """
+    Incremental indexes over the reservations registered with the kernel, so that a tick only visits
+    the reservations that require attention. A reservation is re-indexed whenever it changes
+    (state transitions, dirty marks, configuration completion) and after every probe.
+    - probe: reservations whose pending operations must be probed
+    - closed: closed reservations awaiting purge
+    - pending: non-terminal reservations that are nascent or have a pending operation
+    """
+    def __init__(self):
+        self.probe = {}
+        self.closed = {}
+        self.pending = {}
+
+    def update(self, *, reservation: IKernelReservation):
+        """
+        Update the indexes to reflect the current state of a reservation
+        @param reservation reservation
+        """
+        rid = reservation.get_reservation_id()
+        self._set(index=self.probe, rid=rid, reservation=reservation, value=not reservation.is_probe_idle())
+        self._set(index=self.closed, rid=rid, reservation=reservation, value=reservation.is_closed())
+        self._set(index=self.pending, rid=rid, reservation=reservation,
+                  value=not reservation.is_terminal() and (reservation.is_nascent() or
+                                                           not reservation.is_no_pending()))
+
+    @staticmethod
+    def _set(*, index: dict, rid: ID, reservation: IKernelReservation, value: bool):
+        if value:
+            index[rid] = reservation
+        else:
+            index.pop(rid, None)
+
+    def mark_probe(self, *, reservation: IKernelReservation):
+        """
+        Probe a reservation on the next tick regardless of its state, e.g. when its units changed
+        @param reservation reservation
+        """
+        self.probe[reservation.get_reservation_id()] = reservation
+
+    def remove(self, *, rid: ID):
+        """
+        Remove a reservation from all the indexes
+        @param rid reservation id
+        """
+        self.probe.pop(rid, None)
+        self.closed.pop(rid, None)
+        self.pending.pop(rid, None)
+
+    def get_probe_reservations(self) -> List[IKernelReservation]:
+        """
+        Return a snapshot of the reservations to be probed
+        """
+        return list(self.probe.values())
+
+    def get_closed_reservations(self) -> List[IKernelReservation]:
+        """
+        Return a snapshot of the closed reservations awaiting purge
+        """
+        return list(self.closed.values())
+
+    def has_pending(self) -> bool:
+        """
+        Check if any non-terminal reservation is nascent or has a pending operation
+        """
+        return len(self.pending) > 0
+
+    def clear(self):
+        """
+        Clear all indexes
+        """
+        self.probe.clear()
+        self.closed.clear()
+        self.pending.clear()
@@ -104,6 +104,7 @@ class ReservationServer(Reservation, IKernelServerReservation):
         del state['pending_recover']
         del state['state_transition']
         del state['service_pending']
+        del state['index']
 
         del state['policy']
         return state
@@ -121,6 +122,7 @@ class ReservationServer(Reservation, IKernelServerReservation):
         self.pending_recover = False
         self.state_transition = False
         self.service_pending = ReservationPendingStates.None_
+        self.index = None
 
         self.policy = None
 
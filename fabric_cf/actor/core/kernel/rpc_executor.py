@@ -25,9 +25,10 @@
 # Author: Komal Thareja (kthare10@renci.org)
 from __future__ import annotations
 from typing import TYPE_CHECKING
-from fabric_cf.actor.core.util.rpc_exception import RPCException
+from fabric_cf.actor.core.util.rpc_exception import RPCException, RPCError
 from fabric_cf.actor.core.kernel.failed_rpc import FailedRPC
 from fabric_cf.actor.core.kernel.failed_rpc_event import FailedRPCEvent
+from fabric_cf.actor.core.util.metrics import ActorMetrics
 
 if TYPE_CHECKING:
     from fabric_cf.actor.core.kernel.rpc_request import RPCRequest
@@ -39,6 +40,8 @@ class RPCExecutor:
     """
     def __init__(self, *, request: RPCRequest):
         self.request = request
+        # created when the RPC is enqueued
+        self.begin = ActorMetrics.start()
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
         self.logger = GlobalsSingleton.get().get_logger()
 
@@ -49,9 +52,10 @@ class RPCExecutor:
         try:
             self.logger.error("An error occurred while performing RPC. Error type={} {}".format(e.get_error_type(), e))
             from fabric_cf.actor.core.kernel.rpc_manager_singleton import RPCManagerSingleton
-            RPCManagerSingleton.get().remove_pending_request(self.request.request.get_message_id())
+            RPCManagerSingleton.get().remove_in_transit(guid=self.request.request.get_message_id())
+            RPCManagerSingleton.get().remove_pending_request(guid=self.request.request.get_message_id())
             failed = FailedRPC(e=e, request=self.request)
-            self.request.actor.queue_event(FailedRPCEvent(actor=self.request.actor, failed=failed))
+            self.request.actor.queue_event(incoming=FailedRPCEvent(actor=self.request.actor, failed=failed))
         except Exception as e:
             self.logger.error("postException failed = {}".format(e))
 
@@ -65,7 +69,13 @@ class RPCExecutor:
             self.request.proxy.execute(request=self.request.request)
         except RPCException as e:
             self.post_exception(e=e)
+        except Exception as e:
+            # e.g. translation or proxy errors raised before the message is sent
+            self.post_exception(e=RPCException(message="Unable to execute RPC: {}".format(e),
+                                               error=RPCError.LocalError))
         finally:
+            ActorMetrics.observe_rpc(direction=ActorMetrics.OUTBOUND, request_type=self.request.get_request_type(),
+                                     begin=self.begin)
             self.logger.debug("Completed RPC: type= {} to: {}".format(self.request.request.get_type(),
                                                                       self.request.proxy.get_name()))
             from fabric_cf.actor.core.kernel.rpc_manager_singleton import RPCManagerSingleton
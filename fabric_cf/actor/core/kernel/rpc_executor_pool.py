@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from fabric_cf.actor.core.util.rpc_exception import RPCException, RPCError
+
+
+class PeerState:
+    """
+    Outbound RPCs for a single peer: number of RPCs executing and RPCs waiting for a per peer slot
+    """
+    def __init__(self):
+        self.active = 0
+        self.waiting = deque()
+
+
+class RPCExecutorPool:
+    """
+    Bounded pool of worker threads executing outbound RPCs.
+    - At most workers RPCs are executed concurrently
+    - At most queue_depth RPCs wait for a worker; enqueue blocks for up to submit_timeout seconds when the pool
+      is full (backpressure) and fails with RPCException afterwards
+    - At most peer_concurrency RPCs are executed concurrently for the same peer; with the default of 1, RPCs to
+      a peer are sent in the order in which they were enqueued
+    """
+    DEFAULT_WORKERS = 8
+    DEFAULT_QUEUE_DEPTH = 1000
+    DEFAULT_PEER_CONCURRENCY = 1
+    DEFAULT_SUBMIT_TIMEOUT = 30
+
+    def __init__(self, *, workers: int = DEFAULT_WORKERS, queue_depth: int = DEFAULT_QUEUE_DEPTH,
+                 peer_concurrency: int = DEFAULT_PEER_CONCURRENCY, submit_timeout: float = DEFAULT_SUBMIT_TIMEOUT,
+                 name: str = "RPCExecutor"):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.peer_concurrency = peer_concurrency
+        self.submit_timeout = submit_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.slots = threading.BoundedSemaphore(workers + queue_depth)
+        self.lock = threading.Lock()
+        self.peers = {}
+        self.stopped = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.queued = 0
+        self.queued_max = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.execution_time_total = 0.0
+        self.execution_time_max = 0.0
+
+    def submit(self, *, peer: str, task):
+        """
+        Submit an RPC for execution
+        @param peer name of the peer the RPC is sent to
+        @param task callable executing the RPC
+        @raises RPCException if the pool is stopped or remains full for submit_timeout seconds
+        """
+        if self.stopped:
+            raise RPCException(message="RPC executor pool is stopped", error=RPCError.LocalError)
+
+        if not self.slots.acquire(timeout=self.submit_timeout):
+            with self.lock:
+                self.rejected += 1
+            raise RPCException(message="RPC executor queue is full ({} queued)".format(self.queued),
+                               error=RPCError.LocalError)
+
+        with self.lock:
+            self.submitted += 1
+            self.queued += 1
+            self.queued_max = max(self.queued_max, self.queued)
+            state = self.peers.get(peer, None)
+            if state is None:
+                state = PeerState()
+                self.peers[peer] = state
+            if state.active < self.peer_concurrency:
+                state.active += 1
+                run_now = True
+            else:
+                state.waiting.append((task, time.time()))
+                run_now = False
+
+        if run_now:
+            self._execute(peer=peer, task=task, enqueue_time=time.time())
+
+    def _execute(self, *, peer: str, task, enqueue_time: float):
+        try:
+            self.executor.submit(self._run, peer, task, enqueue_time)
+        except Exception as e:
+            self._done(peer=peer)
+            raise RPCException(message="Unable to execute RPC {}".format(e), error=RPCError.LocalError)
+
+    def _run(self, peer: str, task, enqueue_time: float):
+        begin = time.time()
+        with self.lock:
+            self.queued -= 1
+            self.in_flight += 1
+            wait_time = begin - enqueue_time
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+        try:
+            task()
+        finally:
+            execution_time = time.time() - begin
+            with self.lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.execution_time_total += execution_time
+                self.execution_time_max = max(self.execution_time_max, execution_time)
+            self._done(peer=peer)
+
+    def _done(self, *, peer: str):
+        """
+        Release the slot held by a completed RPC and start the next RPC waiting for the same peer
+        """
+        self.slots.release()
+        next_task = None
+        with self.lock:
+            state = self.peers[peer]
+            if len(state.waiting) > 0 and not self.stopped:
+                next_task = state.waiting.popleft()
+            else:
+                state.active -= 1
+                if state.active == 0 and len(state.waiting) == 0:
+                    self.peers.pop(peer)
+        if next_task is not None:
+            task, enqueue_time = next_task
+            self._execute(peer=peer, task=task, enqueue_time=enqueue_time)
+
+    def shutdown(self, *, wait: bool = True):
+        """
+        Stop accepting RPCs; RPCs already executing are completed
+        @param wait wait for executing RPCs to complete
+        """
+        self.stopped = True
+        self.executor.shutdown(wait=wait)
+
+    def get_metrics(self) -> dict:
+        """
+        Return queue depth and latency (seconds) metrics
+        """
+        with self.lock:
+            started = self.completed + self.in_flight
+            return {'workers': self.workers,
+                    'queue_depth_limit': self.queue_depth,
+                    'queued': self.queued,
+                    'queued_max': self.queued_max,
+                    'in_flight': self.in_flight,
+                    'submitted': self.submitted,
+                    'completed': self.completed,
+                    'rejected': self.rejected,
+                    'wait_time_avg': self.wait_time_total / started if started > 0 else 0.0,
+                    'wait_time_max': self.wait_time_max,
+                    'execution_time_avg': self.execution_time_total / self.completed if self.completed > 0 else 0.0,
+                    'execution_time_max': self.execution_time_max,
+                    'peers': {peer: {'active': state.active, 'waiting': len(state.waiting)}
+                              for peer, state in self.peers.items()}}
@@ -51,10 +51,12 @@ from fabric_cf.actor.core.kernel.incoming_reservation_rpc import IncomingReserva
 from fabric_cf.actor.core.kernel.outbound_rpc_event import OutboundRPCEvent
 from fabric_cf.actor.core.kernel.query_timeout import QueryTimeout
 from fabric_cf.actor.core.kernel.rpc_executor import RPCExecutor
+from fabric_cf.actor.core.kernel.rpc_executor_pool import RPCExecutorPool
 from fabric_cf.actor.core.kernel.rpc_request import RPCRequest
 from fabric_cf.actor.core.kernel.rpc_request_type import RPCRequestType
 from fabric_cf.actor.core.proxies.proxy import Proxy
 from fabric_cf.actor.core.util.kernel_timer import KernelTimer
+from fabric_cf.actor.core.util.metrics import ActorMetrics
 from fabric_cf.actor.core.util.rpc_exception import RPCException, RPCError
 from fabric_cf.actor.core.util.update_data import UpdateData
 from fabric_cf.actor.security.auth_token import AuthToken
@@ -74,6 +76,10 @@ class RPCManager:
         self.num_queued = 0
         self.pending_lock = threading.Lock()
         self.stats_lock = threading.Condition()
+        self.executor_pool = None
+        # RPCs queued by asynchronous proxies awaiting their delivery report
+        self.in_transit = {}
+        self.in_transit_lock = threading.Lock()
 
     @staticmethod
     def validate_delegation(*, delegation: IDelegation, check_requested: bool = False):
@@ -279,6 +285,7 @@ class RPCManager:
             self.pending.clear()
         finally:
             self.pending_lock.release()
+        self.executor_pool = self.create_executor_pool()
         self.started = True
 
     def do_stop(self):
@@ -288,6 +295,67 @@ class RPCManager:
             self.pending.clear()
         finally:
             self.pending_lock.release()
+        with self.in_transit_lock:
+            self.in_transit.clear()
+        if self.executor_pool is not None:
+            self.executor_pool.shutdown(wait=False)
+            self.executor_pool = None
+
+    @staticmethod
+    def create_executor_pool() -> RPCExecutorPool:
+        """
+        Create the RPC executor pool as per the runtime configuration
+        @return RPC executor pool
+        """
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        runtime_config = None
+        config = GlobalsSingleton.get().get_config()
+        if config is not None:
+            runtime_config = config.get_runtime_config()
+        if runtime_config is None:
+            runtime_config = {}
+        return RPCExecutorPool(
+            workers=int(runtime_config.get(Constants.property_conf_rpc_workers, RPCExecutorPool.DEFAULT_WORKERS)),
+            queue_depth=int(runtime_config.get(Constants.property_conf_rpc_queue_depth,
+                                               RPCExecutorPool.DEFAULT_QUEUE_DEPTH)),
+            peer_concurrency=int(runtime_config.get(Constants.property_conf_rpc_peer_concurrency,
+                                                    RPCExecutorPool.DEFAULT_PEER_CONCURRENCY)),
+            submit_timeout=float(runtime_config.get(Constants.property_conf_rpc_submit_timeout,
+                                                    RPCExecutorPool.DEFAULT_SUBMIT_TIMEOUT)))
+
+    def remove_in_transit(self, *, guid):
+        """
+        Stop tracking the delivery of an RPC sent by an asynchronous proxy
+        @param guid message id
+        """
+        with self.in_transit_lock:
+            self.in_transit.pop(str(guid), None)
+
+    def delivery_report(self, *, message_id: str, error=None):
+        """
+        Process the delivery report for an RPC sent by an asynchronous proxy
+        @param message_id message id
+        @param error delivery error; None if the message was delivered
+        """
+        with self.in_transit_lock:
+            rpc = self.in_transit.pop(message_id, None)
+        if rpc is None or error is None:
+            return
+        RPCExecutor(request=rpc).post_exception(
+            e=RPCException(message="Message delivery failed: {}".format(error), error=RPCError.NetworkError))
+
+    def get_metrics(self) -> dict:
+        """
+        Return the outbound RPC metrics: number of RPCs queued or executing and the executor pool metrics
+        """
+        with self.stats_lock:
+            result = {'num_queued': self.num_queued}
+        with self.in_transit_lock:
+            result['in_transit'] = len(self.in_transit)
+        executor_pool = self.executor_pool
+        if executor_pool is not None:
+            result.update(executor_pool.get_metrics())
+        return result
 
     def do_failed_rpc(self, *, actor: IActor, proxy: ICallbackProxy, rpc: IncomingRPC, e: Exception, caller: AuthToken):
         proxy.get_logger().info("Outbound failedRPC request from <{}>: requestID={}".format(caller.get_name(),
@@ -490,6 +558,8 @@ class RPCManager:
                 if request.handler is not None:
                     rpc.set_response_handler(response_handler=request.handler)
 
+        ActorMetrics.count_rpc(direction=ActorMetrics.INBOUND, request_type=rpc.get_request_type())
+
         if rpc.get_request_type() == RPCRequestType.Query:
             actor.get_logger().info("Inbound query from <{}>".format(rpc.get_caller().get_name()))
 
@@ -609,7 +679,6 @@ class RPCManager:
     def queued(self):
         with self.stats_lock:
             self.num_queued += 1
-            print("Queued: {}".format(self.num_queued))
 
     def de_queued(self):
         with self.stats_lock:
@@ -617,30 +686,35 @@ class RPCManager:
                 raise RPCException(message="De-queued invoked, but nothing is queued!!!")
 
             self.num_queued -= 1
-            print("DeQueued: {}".format(self.num_queued))
             if self.num_queued == 0:
                 self.stats_lock.notify_all()
 
     def enqueue(self, *, rpc: RPCRequest):
-        if not self.started:
-            print("Ignoring RPC request: container is shutting down")
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        executor_pool = self.executor_pool
+        if not self.started or executor_pool is None:
+            GlobalsSingleton.get().get_logger().warning("Ignoring RPC request: container is shutting down")
             return
         if rpc.handler is not None:
             self.add_pending_request(guid=rpc.request.get_message_id(), request=rpc)
 
-        from fabric_cf.actor.core.container.globals import GlobalsSingleton
         GlobalsSingleton.get().event_manager.dispatch_event(event=OutboundRPCEvent(request=rpc))
 
+        ActorMetrics.count_rpc(direction=ActorMetrics.OUTBOUND, request_type=rpc.get_request_type())
+
+        if rpc.proxy.is_async_delivery():
+            with self.in_transit_lock:
+                self.in_transit[str(rpc.request.get_message_id())] = rpc
+
         try:
             self.queued()
             rpc_executor = RPCExecutor(request=rpc)
-            # TODO Thread Pool
-            thread = threading.Thread(target=rpc_executor.run())
-            thread.setName("RPCExecutor {}".format(rpc.request.get_message_id()))
-            thread.start()
+            executor_pool.submit(peer=rpc.proxy.get_name(), task=rpc_executor.run)
         except Exception as e:
-            print("Exception occurred while starting RPC Executor {}".format(e))
+            GlobalsSingleton.get().get_logger().error("Exception occurred while starting RPC Executor {}".format(e))
             self.de_queued()
+            with self.in_transit_lock:
+                self.in_transit.pop(str(rpc.request.get_message_id()), None)
             if rpc.handler is not None:
                 self.remove_pending_request(guid=rpc.request.get_message_id())
             raise e
@@ -25,7 +25,6 @@
 # Author: Komal Thareja (kthare10@renci.org)
 from __future__ import annotations
 
-import pickle
 from typing import TYPE_CHECKING
 
 from fabric_cf.actor.boot.inventory.neo4j_resource_pool_factory import Neo4jResourcePoolFactory
@@ -34,6 +33,7 @@ from fabric_cf.actor.core.apis.i_slice_factory import ISliceFactory
 from fabric_cf.actor.core.common.exceptions import SliceException
 from fabric_cf.actor.core.kernel.slice import Slice
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializerSingleton
 
 if TYPE_CHECKING:
     from fabric_cf.actor.core.apis.i_slice import ISlice
@@ -51,7 +51,7 @@ class SliceFactory(ISliceFactory):
             raise SliceException(Constants.invalid_argument)
 
         serialized_slice = properties[Constants.property_pickle_properties]
-        deserialized_slice = pickle.loads(serialized_slice)
+        deserialized_slice = ObjectSerializerSingleton.get().deserialize(data=serialized_slice)
         if deserialized_slice.get_graph_id() is not None:
             graph_id = str(deserialized_slice.get_graph_id())
             arm_graph = Neo4jResourcePoolFactory.get_arm_graph(graph_id=graph_id)
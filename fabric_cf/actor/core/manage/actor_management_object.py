@@ -496,7 +496,8 @@ class ActorManagementObject(ManagementObject, IActorManagementObject):
                                        token=id_token, logger=self.logger, actor_type=self.actor.get_type())
             res_list = None
             try:
-                res_list = self.db.get_reservations_by_rids(rid=rids)
+                res_list = self.db.get_reservations_by_rids(rid=rids, columns=['rsv_resid', 'rsv_state',
+                                                                               'rsv_pending', 'rsv_joining'])
             except Exception as e:
                 self.logger.error("get_reservation_state_for_reservations:db access {}".format(e))
                 result.status.set_code(ErrorCodes.ErrorDatabaseError.value)
@@ -504,28 +505,20 @@ class ActorManagementObject(ManagementObject, IActorManagementObject):
                 result.status = ManagementObject.set_exception_details(result=result.status, e=e)
                 return result
 
-            if len(res_list) == len(rids):
-                result.reservation_states = []
-                for r in res_list:
-                    result.reservation_states.append(Converter.fill_reservation_state(res=res_list))
-            elif len(res_list) > len(rids):
+            if len(res_list) > len(rids):
                 raise ManageException("The database provided too many records")
-            else:
-                i = 0
-                j = 0
-                result.reservation_states = []
-                while i < len(rids):
-                    properties = res_list[j]
-                    if rids[i] == ReservationFactory.get_reservation_id(properties=properties):
-                        result.reservation_states.append(Converter.fill_reservation_state(res=res_list))
-                        j += 1
 
-                    else:
-                        state = ReservationStateAvro()
-                        state.set_state(ReservationStates.Unknown.value)
-                        state.set_pending_state(ReservationPendingStates.Unknown.value)
-                        result.reservation_states.append(state)
-                    i += 1
+            res_by_rid = {r['rsv_resid']: r for r in res_list}
+            result.reservation_states = []
+            for rid in rids:
+                res = res_by_rid.get(str(rid), None)
+                if res is not None:
+                    result.reservation_states.append(Converter.fill_reservation_state(res=res))
+                else:
+                    state = ReservationStateAvro()
+                    state.set_state(ReservationStates.Unknown.value)
+                    state.set_pending_state(ReservationPendingStates.Unknown.value)
+                    result.reservation_states.append(state)
         except ReservationNotFoundException as e:
             self.logger.error("get_reservation_state_for_reservations: {}".format(e))
             result.status.set_code(ErrorCodes.ErrorNoSuchReservation.value)
@@ -25,6 +25,7 @@
 # Author: Komal Thareja (kthare10@renci.org)
 from __future__ import annotations
 
+import threading
 import traceback
 from datetime import datetime
 from typing import TYPE_CHECKING, List
@@ -75,6 +76,9 @@ class ClientActorManagementObjectHelper(IClientActorManagementObject):
         self.client = client
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
         self.logger = GlobalsSingleton.get().get_logger()
+        # Last BQM received per broker: broker guid -> (version, bqm)
+        self.bqm_cache = {}
+        self.bqm_cache_lock = threading.Lock()
 
     def get_brokers(self, *, caller: AuthToken, broker_id: ID = None, id_token: str = None) -> ResultProxyAvro:
         result = ResultProxyAvro()
@@ -146,7 +150,12 @@ class ClientActorManagementObjectHelper(IClientActorManagementObject):
             b = self.client.get_broker(guid=broker)
             if b is not None:
                 request = BrokerPolicy.get_resource_pools_query()
+                with self.bqm_cache_lock:
+                    cached = self.bqm_cache.get(broker, None)
+                if cached is not None:
+                    request[Constants.broker_query_model_version] = cached[0]
                 response = ManagementUtils.query(actor=self.client, actor_proxy=b, query=request, id_token=id_token)
+                response = self.update_bqm_cache(broker=broker, cached=cached, response=response)
                 pool = Translate.translate_to_pool_info(query_response=response)
                 if result.pools is None:
                     result.pools = []
@@ -162,6 +171,25 @@ class ClientActorManagementObjectHelper(IClientActorManagementObject):
 
         return result
 
+    def update_bqm_cache(self, *, broker: ID, cached: tuple, response: dict) -> dict:
+        """
+        Fill in an unchanged BQM from the cache or remember a new BQM
+        @param broker broker guid
+        @param cached cached (version, bqm) sent with the query
+        @param response query response
+        @return query response including the BQM
+        """
+        if response is None:
+            return response
+        version = response.get(Constants.broker_query_model_version, None)
+        bqm = response.get(Constants.broker_query_model, None)
+        if bqm is None and version is not None and cached is not None and cached[0] == version:
+            response[Constants.broker_query_model] = cached[1]
+        elif bqm is not None and version is not None:
+            with self.bqm_cache_lock:
+                self.bqm_cache[broker] = (version, bqm)
+        return response
+
     def add_reservation_private(self, *, reservation: TicketReservationAvro):
         result = ResultAvro()
         slice_id = ID(uid=reservation.get_slice_id())
@@ -32,12 +32,18 @@ from fabric_mb.message_bus.messages.result_delegation_avro import ResultDelegati
 from fabric_mb.message_bus.messages.result_units_avro import ResultUnitsAvro
 from fabric_mb.message_bus.messages.result_avro import ResultAvro
 from fabric_cf.actor.core.common.constants import Constants, ErrorCodes
+from fabric_cf.actor.core.common.exceptions import ManageException
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
 from fabric_cf.actor.core.manage.actor_management_object import ActorManagementObject
 from fabric_cf.actor.core.manage.client_actor_management_object_helper import ClientActorManagementObjectHelper
 from fabric_cf.actor.core.manage.converter import Converter
 from fabric_cf.actor.core.manage.management_object import ManagementObject
+from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
+from fabric_cf.actor.core.manage.messages.result_reservation_status_mng import ResultReservationStatusMng
 from fabric_cf.actor.core.manage.proxy_protocol_descriptor import ProxyProtocolDescriptor
 from fabric_cf.actor.core.apis.i_client_actor_management_object import IClientActorManagementObject
+from fabric_cf.actor.security.acess_checker import AccessChecker
+from fabric_cf.actor.security.pdp_auth import ActionId, ResourceType as AuthResourceType
 
 if TYPE_CHECKING:
     from fabric_mb.message_bus.messages.result_proxy_avro import ResultProxyAvro
@@ -149,6 +155,65 @@ class ControllerManagementObject(ActorManagementObject, IClientActorManagementOb
 
         return result
 
+    def get_reservation_status(self, *, caller: AuthToken, rids: List[ID],
+                               id_token: str = None) -> ResultReservationStatusMng:
+        """
+        Return state and pending state of a list of reservations in one call; units are included for
+        Active reservations. Unknown reservations are reported in Unknown state.
+        @param caller caller
+        @param rids reservation ids
+        @param id_token id token
+        @return result with one status per reservation id, in the same order
+        """
+        result = ResultReservationStatusMng()
+        result.status = ResultAvro()
+
+        if rids is None or len(rids) == 0 or caller is None:
+            result.status.set_code(ErrorCodes.ErrorInvalidArguments.value)
+            result.status.set_message(ErrorCodes.ErrorInvalidArguments.name)
+            return result
+
+        try:
+            AccessChecker.check_access(action_id=ActionId.query, resource_type=AuthResourceType.sliver,
+                                       token=id_token, logger=self.logger, actor_type=self.actor.get_type())
+            try:
+                res_list = self.db.get_reservations_by_rids(rid=[str(r) for r in rids],
+                                                            columns=['rsv_resid', 'rsv_state', 'rsv_pending'])
+                if res_list is None:
+                    raise ManageException("Unable to load reservations {}".format(rids))
+                res_by_rid = {r['rsv_resid']: r for r in res_list}
+                units_by_rid = {}
+                for rid, res in res_by_rid.items():
+                    if res['rsv_state'] == ReservationStates.Active.value:
+                        units_by_rid[rid] = self.db.get_units(rid=rid)
+            except Exception as e:
+                self.logger.error("get_reservation_status:db access {}".format(e))
+                result.status.set_code(ErrorCodes.ErrorDatabaseError.value)
+                result.status.set_message(ErrorCodes.ErrorDatabaseError.name)
+                result.status = ManagementObject.set_exception_details(result=result.status, e=e)
+                return result
+
+            for rid in rids:
+                res = res_by_rid.get(str(rid), None)
+                if res is not None:
+                    units = units_by_rid.get(str(rid), None)
+                    if units is not None:
+                        units = Converter.fill_units(unit_list=units)
+                    result.result.append(Converter.fill_reservation_status(rid=str(rid), res=res, units=units))
+                else:
+                    status = ReservationStatusMng()
+                    status.set_reservation_id(value=str(rid))
+                    status.set_state(value=ReservationStates.Unknown.value)
+                    status.set_pending_state(value=ReservationPendingStates.Unknown.value)
+                    result.result.append(status)
+        except Exception as e:
+            self.logger.error("get_reservation_status: {}".format(e))
+            result.status.set_code(ErrorCodes.ErrorInternalError.value)
+            result.status.set_message(ErrorCodes.ErrorInternalError.name)
+            result.status = ManagementObject.set_exception_details(result=result.status, e=e)
+
+        return result
+
     def get_substrate_database(self) -> ISubstrateDatabase:
         return self.actor.get_plugin().get_database()
 
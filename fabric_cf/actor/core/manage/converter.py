@@ -57,6 +57,7 @@ from fabric_cf.actor.core.util.prop_list import PropList
 from fabric_cf.actor.core.util.resource_data import ResourceData
 from fabric_cf.actor.core.util.resource_type import ResourceType
 from fabric_cf.actor.core.manage.messages.client_mng import ClientMng
+from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
 
 if TYPE_CHECKING:
     from fabric_cf.actor.core.apis.i_reservation import IReservation
@@ -208,6 +209,15 @@ class Converter:
 
         return result
 
+    @staticmethod
+    def fill_reservation_status(*, rid: str, res: dict, units: List[UnitAvro] = None) -> ReservationStatusMng:
+        result = ReservationStatusMng()
+        result.set_reservation_id(value=rid)
+        result.set_state(value=res['rsv_state'])
+        result.set_pending_state(value=res['rsv_pending'])
+        result.set_units(value=units)
+        return result
+
     @staticmethod
     def fill_reservation_states(*, res_list: list) -> List[ReservationStateAvro]:
         result = []
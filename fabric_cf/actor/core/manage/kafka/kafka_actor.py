@@ -26,9 +26,9 @@
 from __future__ import annotations
 
 import traceback
+from concurrent.futures import Future
 from typing import List
 
-
 from fabric_mb.message_bus.messages.close_reservations_avro import CloseReservationsAvro
 from fabric_mb.message_bus.messages.delegation_avro import DelegationAvro
 from fabric_mb.message_bus.messages.get_delegations_avro import GetDelegationsAvro
@@ -76,15 +76,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             request.id_token = id_token
             request.slice_id = slice_id
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -123,15 +121,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             request.callback_topic = self.callback_topic
             request.message_id = str(ID())
             request.slice_id = str(slice_id)
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -169,15 +165,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             request.callback_topic = self.callback_topic
             request.message_id = str(ID())
             request.slice_obj = slice_obj
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -215,15 +209,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             request.callback_topic = self.callback_topic
             request.message_id = str(ID())
             request.slice_obj = slice_obj
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -269,16 +261,14 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             if rid is not None:
                 request.reservation_id = str(rid)
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
             response.message_id = request.message_id
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -324,16 +314,14 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             if delegation_id is not None:
                 request.delegation_id = str(delegation_id)
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
             response.message_id = request.message_id
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -377,15 +365,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             request.message_id = str(ID())
             request.reservation_id = str(rid)
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -429,15 +415,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             request.message_id = str(ID())
             request.reservation_id = str(rid)
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -481,15 +465,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             request.message_id = str(ID())
             request.slice_id = str(slice_id)
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -533,15 +515,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             request.message_id = str(ID())
             request.reservation = reservation
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -589,15 +569,13 @@ class KafkaActor(KafkaProxy, IMgmtActor):
             for r in reservation_list:
                 request.reservation_ids.append(str(r))
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -625,6 +603,107 @@ class KafkaActor(KafkaProxy, IMgmtActor):
 
         return None
 
+    def get_slices_async(self, *, id_token: str = None, slice_id: ID = None) -> Future:
+        """
+        Asynchronous version of get_slices
+        @return future completed with the ResultSliceAvro response
+        """
+        request = GetSlicesRequestAvro()
+        request.guid = str(self.management_id)
+        request.auth = self.auth
+        request.callback_topic = self.callback_topic
+        request.message_id = str(ID())
+        request.id_token = id_token
+        if slice_id is not None:
+            request.slice_id = str(slice_id)
+        return self.send_request_async(request=request)
+
+    def add_slice_async(self, *, slice_obj: SliceAvro) -> Future:
+        """
+        Asynchronous version of add_slice
+        @return future completed with the ResultStringAvro response
+        """
+        request = AddSliceAvro()
+        request.guid = str(self.management_id)
+        request.auth = self.auth
+        request.callback_topic = self.callback_topic
+        request.message_id = str(ID())
+        request.slice_obj = slice_obj
+        return self.send_request_async(request=request)
+
+    def remove_slice_async(self, *, slice_id: ID) -> Future:
+        """
+        Asynchronous version of remove_slice
+        @return future completed with the ResultStringAvro response
+        """
+        request = RemoveSliceAvro()
+        request.guid = str(self.management_id)
+        request.auth = self.auth
+        request.callback_topic = self.callback_topic
+        request.message_id = str(ID())
+        request.slice_id = str(slice_id)
+        return self.send_request_async(request=request)
+
+    def get_reservations_async(self, *, id_token: str = None, state: int = None,
+                               slice_id: ID = None, rid: ID = None) -> Future:
+        """
+        Asynchronous version of get_reservations
+        @return future completed with the ResultReservationAvro response
+        """
+        request = GetReservationsRequestAvro()
+        request.guid = str(self.management_id)
+        request.auth = self.auth
+        request.callback_topic = self.callback_topic
+        request.message_id = str(ID())
+        request.reservation_state = state
+        request.id_token = id_token
+
+        if slice_id is not None:
+            request.slice_id = str(slice_id)
+
+        if rid is not None:
+            request.reservation_id = str(rid)
+        return self.send_request_async(request=request)
+
+    def get_delegations_async(self, *, slice_id: ID = None, state: int = None,
+                              delegation_id: ID = None, id_token: str = None) -> Future:
+        """
+        Asynchronous version of get_delegations
+        @return future completed with the ResultDelegationAvro response
+        """
+        request = GetDelegationsAvro()
+        request.guid = str(self.management_id)
+        request.auth = self.auth
+        request.callback_topic = self.callback_topic
+        request.message_id = str(ID())
+        request.delegation_state = state
+        request.id_token = id_token
+
+        if slice_id is not None:
+            request.slice_id = str(slice_id)
+
+        if delegation_id is not None:
+            request.delegation_id = str(delegation_id)
+        return self.send_request_async(request=request)
+
+    def get_reservation_state_for_reservations_async(self, *, reservation_list: List[ID],
+                                                     id_token: str = None) -> Future:
+        """
+        Asynchronous version of get_reservation_state_for_reservations
+        @return future completed with the ResultReservationStateAvro response
+        """
+        if reservation_list is None:
+            raise ManageException(Constants.invalid_argument)
+
+        request = GetReservationsStateRequestAvro()
+        request.guid = str(self.management_id)
+        request.auth = self.auth
+        request.callback_topic = self.callback_topic
+        request.message_id = str(ID())
+        request.reservation_ids = [str(r) for r in reservation_list]
+        request.id_token = id_token
+        return self.send_request_async(request=request)
+
     def clone(self):
         return KafkaActor(guid=self.management_id,
                           kafka_topic=self.kafka_topic,
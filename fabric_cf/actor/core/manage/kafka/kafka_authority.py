@@ -57,15 +57,13 @@ class KafkaAuthority(KafkaServerActor, IMgmtAuthority):
             request.reservation_type = ReservationCategory.Authority.name
             request.id_token = id_token
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -107,15 +105,13 @@ class KafkaAuthority(KafkaServerActor, IMgmtAuthority):
             request.reservation_id = str(rid)
             request.id_token = id_token
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -157,16 +153,14 @@ class KafkaAuthority(KafkaServerActor, IMgmtAuthority):
             request.reservation_id = str(uid)
             request.id_token = id_token
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(
                 request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
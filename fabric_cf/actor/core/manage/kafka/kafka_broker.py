@@ -68,15 +68,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.callback_topic = self.callback_topic
             request.reservation_obj = reservation
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -117,15 +115,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.callback_topic = self.callback_topic
             request.reservation_list = reservations
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -165,15 +161,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.callback_topic = self.callback_topic
             request.reservation_obj = reservation
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -211,15 +205,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.callback_topic = self.callback_topic
             request.reservation_id = str(rid)
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -260,15 +252,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.id_token = id_token
             request.broker_id = broker
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -310,15 +300,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.callback_topic = self.callback_topic
             request.broker_id = str(broker)
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -382,15 +370,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.request_properties = request_properties
             request.config_properties = config_properties
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -431,15 +417,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.callback_topic = self.callback_topic
             request.id_token = id_token
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -482,15 +466,13 @@ class KafkaBroker(KafkaServerActor, IMgmtBroker):
             request.callback_topic = self.callback_topic
             request.id_token = id_token
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
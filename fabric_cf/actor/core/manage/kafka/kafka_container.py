@@ -62,15 +62,13 @@ class KafkaContainer(KafkaProxy, IMgmtContainer):
             request.callback_topic = self.callback_topic
             request.type = type
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
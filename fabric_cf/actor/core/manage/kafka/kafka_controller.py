@@ -44,7 +44,9 @@ from fabric_cf.actor.core.apis.i_actor import ActorType
 from fabric_cf.actor.core.common.exceptions import ManageException
 from fabric_cf.actor.core.apis.i_mgmt_controller import IMgmtController
 from fabric_cf.actor.core.common.constants import Constants, ErrorCodes
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
 from fabric_cf.actor.core.manage.kafka.kafka_actor import KafkaActor
+from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
 from fabric_cf.actor.core.util.id import ID
 
 
@@ -74,15 +76,13 @@ class KafkaController(KafkaActor, IMgmtController):
             request.id_token = id_token
             request.broker_id = broker
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -133,15 +133,13 @@ class KafkaController(KafkaActor, IMgmtController):
             request.reservation_id = str(rid)
             request.id_token = id_token
 
-            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+            message_wrapper = self.message_processor.add_message(message=request)
+            ret_val = self.produce(request=request)
 
             self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
 
             if ret_val:
-                message_wrapper = self.message_processor.add_message(message=request)
-
-                with message_wrapper.condition:
-                    message_wrapper.condition.wait(Constants.management_api_timeout_in_seconds)
+                message_wrapper.wait(timeout=Constants.management_api_timeout_in_seconds)
 
                 if not message_wrapper.done:
                     self.logger.debug(Constants.management_api_timeout_occurred)
@@ -169,6 +167,24 @@ class KafkaController(KafkaActor, IMgmtController):
 
         return rret_val
 
+    def get_reservation_status(self, *, rids: List[ID], id_token: str = None) -> List[ReservationStatusMng]:
+        # The message bus schema has no combined status message: states for all reservations are fetched
+        # with a single request and units only for the reservations that are Active
+        states = self.get_reservation_state_for_reservations(reservation_list=rids, id_token=id_token)
+        if states is None:
+            return None
+
+        result = []
+        for rid, state in zip(rids, states):
+            status = ReservationStatusMng()
+            status.set_reservation_id(value=str(rid))
+            status.set_state(value=state.get_state())
+            status.set_pending_state(value=state.get_pending_state())
+            if state.get_state() == ReservationStates.Active.value:
+                status.set_units(value=self.get_reservation_units(rid=rid, id_token=id_token))
+            result.append(status)
+        return result
+
     def add_reservation(self, *, reservation: TicketReservationAvro) -> ID:
         raise ManageException(Constants.not_implemented)
 
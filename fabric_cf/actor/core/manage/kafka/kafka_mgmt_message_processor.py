@@ -24,7 +24,9 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 import threading
+import time
 import traceback
+from concurrent.futures import Future
 
 from fabric_mb.message_bus.consumer import AvroConsumerApi
 from fabric_mb.message_bus.messages.message import IMessageAvro
@@ -33,14 +35,52 @@ from fabric_cf.actor.core.common.exceptions import ManageException
 
 
 class MessageWrapper:
-    def __init__(self, *, message: IMessageAvro):
+    def __init__(self, *, message: IMessageAvro, timeout: float = None):
         self.message = message
         self.condition = threading.Condition()
         self.done = False
         self.response = None
+        # completed with the response message; lets callers keep many requests outstanding
+        self.future = Future()
+        # once passed, the request is dropped and its future fails even if nobody waits for it
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+
+    def wait(self, *, timeout: int) -> bool:
+        """
+        Wait for the response; returns immediately if the response has already been received
+        @param timeout timeout in seconds
+        @return True if the response was received, False on timeout
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: self.done, timeout)
+
+    def complete(self, *, response: IMessageAvro):
+        """
+        Record the response and wake up the waiters
+        @param response response
+        """
+        with self.condition:
+            self.done = True
+            self.response = response
+            self.condition.notify_all()
+        if self.future.set_running_or_notify_cancel():
+            self.future.set_result(response)
+
+    def is_expired(self, *, now: float) -> bool:
+        return self.expires_at is not None and self.expires_at <= now
+
+    def expire(self):
+        """
+        Fail the future of a request whose response did not arrive in time
+        """
+        if self.future.set_running_or_notify_cancel():
+            self.future.set_exception(ManageException("Timed out waiting for response to message {}".format(
+                self.message.get_message_id())))
 
 
 class KafkaMgmtMessageProcessor(AvroConsumerApi):
+    EXPIRY_INTERVAL = 1
+
     def __init__(self, *, conf: dict, key_schema, record_schema, topics, batch_size=5, logger=None):
         super().__init__(conf=conf, key_schema=key_schema, record_schema=record_schema, topics=topics,
                          batch_size=batch_size, logger=logger)
@@ -49,6 +89,8 @@ class KafkaMgmtMessageProcessor(AvroConsumerApi):
         self.messages = {}
         self.lock = threading.Lock()
         self.logger = logger
+        self.expiry_thread = None
+        self.expiry_stopped = threading.Event()
 
     def start(self):
         try:
@@ -60,12 +102,21 @@ class KafkaMgmtMessageProcessor(AvroConsumerApi):
             self.thread.setName("KafkaMgmtMessageProcessor")
             self.thread.setDaemon(True)
             self.thread.start()
+
+            self.expiry_stopped.clear()
+            self.expiry_thread = threading.Thread(target=self.expire_loop, name="KafkaMgmtMessageExpiry",
+                                                  daemon=True)
+            self.expiry_thread.start()
             self.logger.debug("KafkaMgmtMessageProcessor has been started")
         finally:
             self.thread_lock.release()
 
     def stop(self):
         self.shutdown()
+        self.expiry_stopped.set()
+        if self.expiry_thread is not None:
+            self.expiry_thread.join()
+            self.expiry_thread = None
         try:
             self.thread_lock.acquire()
             temp = self.thread
@@ -91,23 +142,27 @@ class KafkaMgmtMessageProcessor(AvroConsumerApi):
                 self.logger.error("No corresponding request found for message_id: {}".format(message_id))
                 self.logger.error("Discarding the message: {}".format(message))
                 return
-            with request.condition:
-                request.done = True
-                request.response = message
-                request.condition.notify_all()
+            request.complete(response=message)
 
         except Exception as e:
             traceback.print_exc()
             self.logger.error(e)
             self.logger.error("Discarding the incoming message {}".format(message))
 
-    def add_message(self, *, message: IMessageAvro) -> MessageWrapper:
+    def add_message(self, *, message: IMessageAvro, timeout: float = None) -> MessageWrapper:
+        """
+        Register a request before it is produced so that its response can be matched
+        @param message request
+        @param timeout seconds after which the request is dropped and its future fails; None to keep it until
+        it is removed by the caller
+        @return message wrapper
+        """
         result = None
         try:
             msg_id = message.get_message_id()
             if msg_id is not None:
                 self.thread_lock.acquire()
-                result = MessageWrapper(message=message)
+                result = MessageWrapper(message=message, timeout=timeout)
                 if self.messages.get(msg_id, None) is not None:
                     print("Discarding the message, message with id: {} already exists".format(msg_id))
 
@@ -125,3 +180,22 @@ class KafkaMgmtMessageProcessor(AvroConsumerApi):
         finally:
             self.thread_lock.release()
         return None
+
+    def expire_messages(self):
+        """
+        Drop the requests whose response did not arrive in time and fail their futures
+        """
+        now = time.monotonic()
+        with self.thread_lock:
+            expired = [msg_id for msg_id, wrapper in self.messages.items() if wrapper.is_expired(now=now)]
+            wrappers = [self.messages.pop(msg_id) for msg_id in expired]
+        for wrapper in wrappers:
+            self.logger.warning("No response received for message_id: {}".format(wrapper.message.get_message_id()))
+            wrapper.expire()
+
+    def expire_loop(self):
+        while not self.expiry_stopped.wait(self.EXPIRY_INTERVAL):
+            try:
+                self.expire_messages()
+            except Exception as e:
+                self.logger.error("Failed to expire pending messages: {}".format(e))
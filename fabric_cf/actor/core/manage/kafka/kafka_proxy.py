@@ -26,11 +26,12 @@
 from __future__ import annotations
 
 import traceback
+from concurrent.futures import Future
 from typing import TYPE_CHECKING, List
 
 from fabric_mb.message_bus.messages.result_avro import ResultAvro
 
-from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.common.constants import Constants, ErrorCodes
 from fabric_cf.actor.core.common.exceptions import ManageException
 from fabric_cf.actor.core.manage.error import Error
 from fabric_cf.actor.core.apis.i_component import IComponent
@@ -39,6 +40,7 @@ from fabric_cf.actor.core.manage.messages.protocol_proxy_mng import ProtocolProx
 
 if TYPE_CHECKING:
     from fabric_mb.message_bus.messages.auth_avro import AuthAvro
+    from fabric_mb.message_bus.messages.message import IMessageAvro
     from fabric_mb.message_bus.producer import AvroProducerApi
     from fabric_cf.actor.core.util.id import ID
 
@@ -72,6 +74,53 @@ class KafkaProxy(IComponent):
     def get_kafka_topic(self):
         return self.kafka_topic
 
+    def produce(self, *, request: IMessageAvro) -> bool:
+        """
+        Produce a request whose response has already been registered with the message processor; registering
+        before producing ensures that a response arriving right away is not lost. The registration is dropped
+        if the request could not be produced.
+        @param request request
+        @return True if the request was produced; False otherwise
+        """
+        ret_val = False
+        try:
+            ret_val = self.producer.produce_sync(topic=self.kafka_topic, record=request)
+        finally:
+            if not ret_val:
+                self.message_processor.remove_message(msg_id=request.get_message_id())
+        return ret_val
+
+    def send_request_async(self, *, request: IMessageAvro,
+                           timeout: float = Constants.management_api_timeout_in_seconds) -> Future:
+        """
+        Send a request without waiting for the response. The returned future is completed with the response
+        message (the caller checks its status) or fails with a ManageException if the request could not be
+        produced or no response arrived within the timeout; the pending registration is dropped in both cases,
+        as well as when the future is cancelled. Use asyncio.wrap_future() to await the future from a coroutine.
+        @param request request with the message id set
+        @param timeout seconds to wait for the response
+        @return future
+        """
+        message_wrapper = self.message_processor.add_message(message=request, timeout=timeout)
+        future = message_wrapper.future
+        future.add_done_callback(
+            lambda f: self.message_processor.remove_message(msg_id=request.get_message_id()) if f.cancelled() else None)
+
+        try:
+            ret_val = self.produce(request=request)
+        except Exception as e:
+            self.logger.error(traceback.format_exc())
+            if future.set_running_or_notify_cancel():
+                future.set_exception(e)
+            return future
+
+        self.logger.debug(Constants.management_inter_actor_outbound_message.format(request.name, self.kafka_topic))
+        if not ret_val:
+            self.logger.debug(Constants.management_inter_actor_message_failed.format(request.name, self.kafka_topic))
+            if future.set_running_or_notify_cancel():
+                future.set_exception(ManageException(ErrorCodes.ErrorTransportFailure.name))
+        return future
+
     def clear_last(self):
         self.last_exception = None
         self.last_status = ResultAvro()
@@ -43,6 +43,7 @@ from fabric_cf.actor.core.util.id import ID
 if TYPE_CHECKING:
     from fabric_mb.message_bus.messages.proxy_avro import ProxyAvro
     from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
+    from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
 
     from fabric_cf.actor.core.manage.management_object import ManagementObject
     from fabric_cf.actor.security.auth_token import AuthToken
@@ -131,6 +132,18 @@ class LocalController(LocalActor, IMgmtController):
 
         return None
 
+    def get_reservation_status(self, *, rids: List[ID], id_token: str = None) -> List[ReservationStatusMng]:
+        self.clear_last()
+        try:
+            result = self.manager.get_reservation_status(caller=self.auth, rids=rids, id_token=id_token)
+            self.last_status = result.status
+            if result.status.get_code() == 0:
+                return result.result
+        except Exception as e:
+            self.last_exception = e
+
+        return None
+
     def add_reservation(self, *, reservation: TicketReservationAvro) -> ID:
         self.clear_last()
         try:
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from typing import List
+
+from fabric_mb.message_bus.messages.unit_avro import UnitAvro
+
+
+class ReservationStatusMng:
+    """
+    State of a reservation together with its units; units are only populated for Active reservations
+    """
+    def __init__(self):
+        self.reservation_id = None
+        self.state = None
+        self.pending_state = None
+        self.units = None
+
+    def get_reservation_id(self) -> str:
+        return self.reservation_id
+
+    def set_reservation_id(self, *, value: str):
+        self.reservation_id = value
+
+    def get_state(self) -> int:
+        return self.state
+
+    def set_state(self, *, value: int):
+        self.state = value
+
+    def get_pending_state(self) -> int:
+        return self.pending_state
+
+    def set_pending_state(self, *, value: int):
+        self.pending_state = value
+
+    def get_units(self) -> List[UnitAvro]:
+        return self.units
+
+    def set_units(self, *, value: List[UnitAvro]):
+        self.units = value
@@ -154,6 +154,10 @@ class BasePlugin(IBasePlugin):
 
         if not unsupported:
             self.actor.get_policy().configuration_complete(action=target, token=token, out_properties=properties)
+            # Units changed outside of a reservation state transition; probe the reservation on the next tick
+            reservation = self.actor.get_reservation(rid=token.get_reservation_id())
+            if reservation is not None:
+                reservation.request_probe()
 
     class ConfigurationCompleteEvent(IActorEvent):
         def __init__(self, *, token: ConfigToken, properties: dict, outer_class):
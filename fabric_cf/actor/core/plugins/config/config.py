@@ -63,6 +63,7 @@ class Config:
         self.initialized = False
         self.config_mappings = {}
         self.lock = threading.Lock()
+        self.handler_processor = None
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -70,6 +71,7 @@ class Config:
         del state['plugin']
         del state['initialized']
         del state['lock']
+        del state['handler_processor']
 
         return state
 
@@ -79,14 +81,33 @@ class Config:
         self.plugin = None
         self.initialized = False
         self.lock = threading.Lock()
+        self.handler_processor = None
 
     def initialize(self):
         if not self.initialized:
             if self.plugin is None:
                 raise PluginException(Constants.not_specified_prefix.format("plugin"))
             self.logger = self.plugin.get_logger()
+            self.setup_handler_processor()
             self.initialized = True
 
+    def setup_handler_processor(self):
+        """
+        Set up the processor executing the configuration actions as per the runtime configuration
+        """
+        from fabric_cf.actor.handlers.handler_processor import HandlerProcessor
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        config = GlobalsSingleton.get().get_config()
+        runtime_config = config.get_runtime_config() if config is not None else None
+        if runtime_config is None:
+            runtime_config = {}
+        workers = int(runtime_config.get(Constants.property_conf_handler_workers, HandlerProcessor.DEFAULT_WORKERS))
+        concurrency = int(runtime_config.get(Constants.property_conf_handler_concurrency,
+                                             HandlerProcessor.DEFAULT_CONCURRENCY))
+        timeout = float(runtime_config.get(Constants.property_conf_handler_timeout, HandlerProcessor.DEFAULT_TIMEOUT))
+        self.handler_processor = HandlerProcessor(plugin=self.plugin, logger=self.logger, workers=workers,
+                                                  concurrency=concurrency, timeout=timeout)
+
     def add_config_mapping(self, *, mapping: ConfigurationMapping):
         try:
             self.lock.acquire()
@@ -94,35 +115,49 @@ class Config:
         finally:
             self.lock.release()
 
+    def get_config_mapping(self, *, token: ConfigToken) -> ConfigurationMapping:
+        """
+        Return the configuration mapping (handler) for the resource type of a unit
+        @param token unit
+        @return configuration mapping or None
+        """
+        with self.lock:
+            return self.config_mappings.get(str(token.get_resource_type()))
+
     def create(self, *, token: ConfigToken, properties: dict):
         self.logger.info("Executing Join")
-
-        result = {self.property_target_name: self.target_create,
-                  self.property_target_result_code: self.result_code_ok,
-                  self.property_action_sequence_number: 0}
-
-        self.plugin.configuration_complete(token=token, properties=result)
-        self.logger.info("Executing Join completed")
+        self.handler_processor.submit(target=self.target_create, token=token, properties=properties,
+                                      mapping=self.get_config_mapping(token=token))
+        self.logger.info("Executing Join submitted")
 
     def delete(self, *, token: ConfigToken, properties: dict):
         self.logger.info("Executing Leave")
-
-        result = {self.property_target_name: self.target_delete,
-                  self.property_target_result_code: self.result_code_ok,
-                  self.property_action_sequence_number: 0}
-
-        self.plugin.configuration_complete(token=token, properties=result)
-        self.logger.info("Executing Leave completed")
+        self.handler_processor.submit(target=self.target_delete, token=token, properties=properties,
+                                      mapping=self.get_config_mapping(token=token))
+        self.logger.info("Executing Leave submitted")
 
     def modify(self, *, token: ConfigToken, properties: dict):
         self.logger.info("Executing Modify")
-
-        result = {self.property_target_name: self.target_modify,
-                  self.property_target_result_code: self.result_code_ok,
-                  self.property_action_sequence_number: 0}
-
-        self.plugin.configuration_complete(token=token, properties=result)
-        self.logger.info("Executing Modify completed")
+        self.handler_processor.submit(target=self.target_modify, token=token, properties=properties,
+                                      mapping=self.get_config_mapping(token=token))
+        self.logger.info("Executing Modify submitted")
+
+    def cancel(self, *, token: ConfigToken) -> int:
+        """
+        Cancel the pending configuration actions on a unit; cancelled actions complete with an error
+        @param token unit
+        @return number of actions cancelled
+        """
+        if self.handler_processor is None:
+            return 0
+        return self.handler_processor.cancel(token=token)
+
+    def shutdown(self):
+        """
+        Stop executing configuration actions
+        """
+        if self.handler_processor is not None:
+            self.handler_processor.shutdown()
 
     def set_logger(self, *, logger):
         self.logger = logger
@@ -59,7 +59,7 @@ class ConfigurationMapping:
         self.class_name = class_name
 
     def set_module_name(self, *, module_name: str):
-        self.class_name = module_name
+        self.module_name = module_name
 
     def set_key(self, *, key: str):
         self.type = key
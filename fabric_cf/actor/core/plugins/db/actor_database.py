@@ -25,6 +25,7 @@
 # Author: Komal Thareja (kthare10@renci.org)
 import pickle
 import threading
+import time
 from typing import List
 
 from fabric_cf.actor.core.apis.i_actor import IActor
@@ -39,6 +40,7 @@ from fabric_cf.actor.core.kernel.slice import SliceTypes
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.actor.core.util.resource_type import ResourceType
 from fabric_cf.actor.db.psql_database import PsqlDatabase
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializerSingleton
 
 
 class ActorDatabase(IDatabase):
@@ -55,6 +57,27 @@ class ActorDatabase(IDatabase):
         self.logger = None
         self.reset_state = False
         self.lock = threading.Lock()
+        self._init_write_behind()
+
+    def _init_write_behind(self):
+        """
+        Initialize the write behind state; when enabled, updates are coalesced and persisted on flush
+        """
+        self.write_behind = False
+        self.dirty_lock = threading.Lock()
+        self.dirty_reservations = {}
+        self.dirty_slices = {}
+        self.dirty_delegations = {}
+        # ids removed while a flush is in progress; not re-queued if the flush fails
+        self.flushing = False
+        self.removed_while_flushing = set()
+        self.flush_count = 0
+        self.flush_failures = 0
+        self.flush_objects_total = 0
+        self.flush_size_last = 0
+        self.flush_size_max = 0
+        self.flush_latency_last = 0.0
+        self.flush_latency_total = 0.0
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -65,6 +88,10 @@ class ActorDatabase(IDatabase):
         del state['logger']
         del state['reset_state']
         del state['lock']
+        for key in ['write_behind', 'dirty_lock', 'dirty_reservations', 'dirty_slices', 'dirty_delegations',
+                    'flushing', 'removed_while_flushing', 'flush_count', 'flush_failures', 'flush_objects_total',
+                    'flush_size_last', 'flush_size_max', 'flush_latency_last', 'flush_latency_total']:
+            state.pop(key, None)
         return state
 
     def __setstate__(self, state):
@@ -77,6 +104,7 @@ class ActorDatabase(IDatabase):
         self.logger = None
         self.reset_state = False
         self.lock = threading.Lock()
+        self._init_write_behind()
 
     def set_logger(self, *, logger):
         self.logger = logger
@@ -88,8 +116,36 @@ class ActorDatabase(IDatabase):
         if not self.initialized:
             if self.actor_name is None:
                 raise DatabaseException(Constants.not_specified_prefix.format("actor name"))
+            self.write_behind = self.is_write_behind_enabled()
             self.initialized = True
 
+    @staticmethod
+    def is_write_behind_enabled() -> bool:
+        """
+        Check if write behind is enabled in the database configuration
+        @return True if updates should be coalesced and flushed at the end of each actor tick
+        """
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        config = GlobalsSingleton.get().get_config()
+        if config is None:
+            return False
+        db_config = config.get_global_config().get_database()
+        if db_config is None:
+            return False
+        value = db_config.get(Constants.property_conf_db_write_behind, False)
+        if isinstance(value, str):
+            return value.lower() == 'true'
+        return bool(value)
+
+    def set_write_behind(self, *, value: bool):
+        """
+        Enable/disable write behind; pending updates are flushed when disabling
+        @param value value
+        """
+        self.write_behind = value
+        if not value:
+            self.flush()
+
     def actor_added(self):
         self.actor_id = self.get_actor_id_from_name(actor_name=self.actor_name)
         if self.actor_id is None:
@@ -137,7 +193,7 @@ class ActorDatabase(IDatabase):
             if self.get_slice(slice_id=slice_object.get_slice_id()) is not None:
                 raise DatabaseException("Slice # {} already exists".format(slice_object.get_slice_id()))
             self.lock.acquire()
-            properties = pickle.dumps(slice_object)
+            properties = ObjectSerializerSingleton.get().serialize(obj=slice_object)
             self.db.add_slice(act_id=self.actor_id, slc_guid=str(slice_object.get_slice_id()),
                               slc_name=slice_object.get_name(),
                               slc_type=slice_object.get_slice_type().value,
@@ -148,9 +204,13 @@ class ActorDatabase(IDatabase):
             self.lock.release()
 
     def update_slice(self, *, slice_object: ISlice):
+        if self.write_behind:
+            with self.dirty_lock:
+                self.dirty_slices[str(slice_object.get_slice_id())] = slice_object
+            return
         try:
             self.lock.acquire()
-            properties = pickle.dumps(slice_object)
+            properties = ObjectSerializerSingleton.get().serialize(obj=slice_object)
             self.db.update_slice(act_id=self.actor_id,
                                  slc_guid=str(slice_object.get_slice_id()),
                                  slc_name=slice_object.get_name(),
@@ -162,6 +222,10 @@ class ActorDatabase(IDatabase):
             self.lock.release()
 
     def remove_slice(self, *, slice_id: ID):
+        with self.dirty_lock:
+            self.dirty_slices.pop(str(slice_id), None)
+            if self.flushing:
+                self.removed_while_flushing.add(str(slice_id))
         try:
             self.lock.acquire()
             self.db.remove_slice(slc_guid=str(slice_id))
@@ -224,7 +288,7 @@ class ActorDatabase(IDatabase):
             self.lock.acquire()
             self.logger.debug("Adding reservation {} to slice {}".format(reservation.get_reservation_id(),
                                                                          reservation.get_slice()))
-            properties = pickle.dumps(reservation)
+            properties = ObjectSerializerSingleton.get().serialize(obj=reservation)
             self.db.add_reservation(act_id=self.actor_id,
                                     slc_guid=str(reservation.get_slice_id()),
                                     rsv_resid=str(reservation.get_reservation_id()),
@@ -243,11 +307,15 @@ class ActorDatabase(IDatabase):
         if not reservation.is_dirty():
             return
         reservation.clear_dirty()
+        if self.write_behind:
+            with self.dirty_lock:
+                self.dirty_reservations[str(reservation.get_reservation_id())] = reservation
+            return
         try:
             self.lock.acquire()
             self.logger.debug("Updating reservation {} in slice {}".format(reservation.get_reservation_id(),
                                                                            reservation.get_slice()))
-            properties = pickle.dumps(reservation)
+            properties = ObjectSerializerSingleton.get().serialize(obj=reservation)
             self.db.update_reservation(act_id=self.actor_id,
                                        slc_guid=str(reservation.get_slice_id()),
                                        rsv_resid=str(reservation.get_reservation_id()),
@@ -261,6 +329,10 @@ class ActorDatabase(IDatabase):
             self.lock.release()
 
     def remove_reservation(self, *, rid: ID):
+        with self.dirty_lock:
+            self.dirty_reservations.pop(str(rid), None)
+            if self.flushing:
+                self.removed_while_flushing.add(str(rid))
         try:
             self.lock.acquire()
             self.logger.debug("Removing reservation {}".format(rid))
@@ -384,16 +456,25 @@ class ActorDatabase(IDatabase):
             self.lock.release()
         return None
 
-    def get_reservations_by_rids(self, *, rid: List[str]):
+    def get_reservations_by_rids(self, *, rid: List[str], columns: List[str] = None):
         try:
             self.lock.acquire()
-            return self.db.get_reservations_by_rids(act_id=self.actor_id, rsv_resid_list=rid)
+            return self.db.get_reservations_by_rids(act_id=self.actor_id, rsv_resid_list=rid, columns=columns)
         except Exception as e:
             self.logger.error(e)
         finally:
             self.lock.release()
         return None
 
+    def stream_reservations(self, *, slice_types: List[SliceTypes] = None, exclude_states: List[int] = None,
+                            batch_size: int = 1000):
+        # The database lock is not held while streaming: the consumer accesses the database for every record
+        slc_types = None
+        if slice_types is not None:
+            slc_types = [t.value for t in slice_types]
+        return self.db.stream_reservations(act_id=self.actor_id, slc_types=slc_types, exclude_states=exclude_states,
+                                           batch_size=batch_size)
+
     def add_broker(self, *, broker: IBrokerProxy):
         try:
             self.lock.acquire()
@@ -443,7 +524,7 @@ class ActorDatabase(IDatabase):
             if slice_object is None:
                 raise DatabaseException("Slice with id: {} not found".format(delegation.get_slice_id()))
 
-            properties = pickle.dumps(delegation)
+            properties = ObjectSerializerSingleton.get().serialize(obj=delegation)
             self.db.add_delegation(dlg_act_id=self.actor_id,
                                    dlg_slc_id=slice_object['slc_id'],
                                    dlg_graph_id=str(delegation.get_delegation_id()),
@@ -460,11 +541,15 @@ class ActorDatabase(IDatabase):
         if not delegation.is_dirty():
             return
         delegation.clear_dirty()
+        if self.write_behind:
+            with self.dirty_lock:
+                self.dirty_delegations[str(delegation.get_delegation_id())] = delegation
+            return
         try:
             self.lock.acquire()
             self.logger.debug("Updating delegation {} in slice {}".format(delegation.get_delegation_id(),
                                                                           delegation.get_slice_id()))
-            properties = pickle.dumps(delegation)
+            properties = ObjectSerializerSingleton.get().serialize(obj=delegation)
             self.db.update_delegation(dlg_act_id=self.actor_id,
                                       dlg_graph_id=str(delegation.get_delegation_id()),
                                       dlg_state=delegation.get_state().value,
@@ -473,6 +558,10 @@ class ActorDatabase(IDatabase):
             self.lock.release()
 
     def remove_delegation(self, *, dlg_graph_id: ID):
+        with self.dirty_lock:
+            self.dirty_delegations.pop(str(dlg_graph_id), None)
+            if self.flushing:
+                self.removed_while_flushing.add(str(dlg_graph_id))
         try:
             self.lock.acquire()
             self.logger.debug("Removing delegation {}".format(dlg_graph_id))
@@ -510,3 +599,105 @@ class ActorDatabase(IDatabase):
         finally:
             self.lock.release()
         return None
+
+    def flush(self):
+        """
+        Persist all the coalesced reservation/slice/delegation updates in a single transaction
+        """
+        with self.dirty_lock:
+            if len(self.dirty_reservations) == 0 and len(self.dirty_slices) == 0 and \
+                    len(self.dirty_delegations) == 0:
+                return
+            reservations = self.dirty_reservations
+            slices = self.dirty_slices
+            delegations = self.dirty_delegations
+            self.dirty_reservations = {}
+            self.dirty_slices = {}
+            self.dirty_delegations = {}
+            self.flushing = True
+
+        begin = time.time()
+        try:
+            self.lock.acquire()
+            slice_list = []
+            for slice_object in slices.values():
+                slice_list.append({'slc_guid': str(slice_object.get_slice_id()),
+                                   'slc_name': slice_object.get_name(),
+                                   'slc_type': slice_object.get_slice_type().value,
+                                   'slc_resource_type': str(slice_object.get_resource_type()),
+                                   'properties': ObjectSerializerSingleton.get().serialize(obj=slice_object),
+                                   'slc_graph_id': str(slice_object.get_graph_id())})
+
+            reservation_list = []
+            for reservation in reservations.values():
+                reservation_list.append({'rsv_resid': str(reservation.get_reservation_id()),
+                                         'rsv_category': reservation.get_category().value,
+                                         'rsv_state': reservation.get_state().value,
+                                         'rsv_pending': reservation.get_pending_state().value,
+                                         'rsv_joining': reservation.get_join_state().value,
+                                         'properties': ObjectSerializerSingleton.get().serialize(obj=reservation)})
+
+            delegation_list = []
+            for delegation in delegations.values():
+                delegation_list.append({'dlg_graph_id': str(delegation.get_delegation_id()),
+                                        'dlg_state': delegation.get_state().value,
+                                        'properties': ObjectSerializerSingleton.get().serialize(obj=delegation)})
+
+            self.db.update_objects(act_id=self.actor_id, slices=slice_list, reservations=reservation_list,
+                                   delegations=delegation_list)
+        except Exception:
+            self.requeue(reservations=reservations, slices=slices, delegations=delegations)
+            raise
+        finally:
+            with self.dirty_lock:
+                self.flushing = False
+                self.removed_while_flushing.clear()
+            self.lock.release()
+
+        size = len(reservations) + len(slices) + len(delegations)
+        latency = time.time() - begin
+        self.flush_count += 1
+        self.flush_objects_total += size
+        self.flush_size_last = size
+        self.flush_size_max = max(self.flush_size_max, size)
+        self.flush_latency_last = latency
+        self.flush_latency_total += latency
+        if self.logger is not None:
+            self.logger.debug("Flushed {} objects (reservations: {} slices: {} delegations: {}) in {:.3f} "
+                              "seconds".format(size, len(reservations), len(slices), len(delegations), latency))
+
+    def requeue(self, *, reservations: dict, slices: dict, delegations: dict):
+        """
+        Merge the objects of a failed flush back into the dirty maps so that they are persisted by the next flush;
+        objects updated or removed since the flush started are not overwritten
+        @param reservations reservations being flushed
+        @param slices slices being flushed
+        @param delegations delegations being flushed
+        """
+        with self.dirty_lock:
+            self.flush_failures += 1
+            for dirty, snapshot in [(self.dirty_reservations, reservations), (self.dirty_slices, slices),
+                                    (self.dirty_delegations, delegations)]:
+                for key, value in snapshot.items():
+                    if key not in self.removed_while_flushing:
+                        dirty.setdefault(key, value)
+        if self.logger is not None:
+            self.logger.error("Flush failed, {} objects re-queued for the next flush".format(
+                len(reservations) + len(slices) + len(delegations)))
+
+    def get_flush_metrics(self) -> dict:
+        """
+        Return the write behind flush counters
+        @return dictionary containing flush count, sizes and latencies (seconds)
+        """
+        avg = 0.0
+        if self.flush_count > 0:
+            avg = self.flush_latency_total / self.flush_count
+        return {'write_behind': self.write_behind,
+                'flush_count': self.flush_count,
+                'flush_failures': self.flush_failures,
+                'flush_objects_total': self.flush_objects_total,
+                'flush_size_last': self.flush_size_last,
+                'flush_size_max': self.flush_size_max,
+                'flush_latency_last': self.flush_latency_last,
+                'flush_latency_avg': avg}
@@ -23,7 +23,6 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-import pickle
 
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.exceptions import DatabaseException
@@ -31,6 +30,7 @@ from fabric_cf.actor.core.core.unit import Unit
 from fabric_cf.actor.core.plugins.db.server_actor_database import ServerActorDatabase
 from fabric_cf.actor.core.apis.i_substrate_database import ISubstrateDatabase
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializerSingleton
 
 
 class SubstrateActorDatabase(ServerActorDatabase, ISubstrateDatabase):
@@ -59,7 +59,7 @@ class SubstrateActorDatabase(ServerActorDatabase, ISubstrateDatabase):
                 parent_id = parent['unt_id']
             res_id = str(u.get_reservation_id())
 
-            properties = pickle.dumps(u)
+            properties = ObjectSerializerSingleton.get().serialize(obj=u)
             self.db.add_unit(act_id=self.actor_id, slc_guid=slice_id, rsv_resid=res_id,
                              unt_uid=str(u.get_id()), unt_unt_id=parent_id,
                              unt_type=int(str(u.get_resource_type())),
@@ -88,7 +88,7 @@ class SubstrateActorDatabase(ServerActorDatabase, ISubstrateDatabase):
     def update_unit(self, *, u: Unit):
         try:
             self.lock.acquire()
-            properties = pickle.dumps(u)
+            properties = ObjectSerializerSingleton.get().serialize(obj=u)
             self.db.update_unit(act_id=self.actor_id, unt_uid=str(u.get_id()), properties=properties)
         finally:
             self.lock.release()
@@ -26,13 +26,16 @@
 from __future__ import annotations
 
 import threading
+import uuid
 from typing import TYPE_CHECKING
 
-from fabric_cf.actor.boot.inventory.neo4j_resource_pool_factory import Neo4jResourcePoolFactory
+from fabric_cf.actor.core.apis.i_cbm_backend import ICBMBackend
 from fabric_cf.actor.core.apis.i_delegation import IDelegation
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.exceptions import BrokerException
 from fabric_cf.actor.core.policy.broker_calendar_policy import BrokerCalendarPolicy
+from fabric_cf.actor.core.policy.memory_cbm_backend import InMemoryCBMBackend
+from fabric_cf.actor.core.policy.neo4j_cbm_backend import Neo4jCBMBackend
 from fabric_cf.actor.core.time.actor_clock import ActorClock
 from fabric_cf.actor.core.util.bids import Bids
 from fabric_cf.actor.core.util.prop_list import PropList
@@ -62,6 +65,9 @@ class BrokerSimplePolicy(BrokerCalendarPolicy):
     # is static.
     CLOCK_SKEW = 1
 
+    CBM_BACKEND_NEO4J = "neo4j"
+    CBM_BACKEND_MEMORY = "memory"
+
     # Number of cycles between two consecutive allocations.
     CALL_INTERVAL = 1
 
@@ -77,13 +83,58 @@ class BrokerSimplePolicy(BrokerCalendarPolicy):
         self.delegations = {}
         self.combined_broker_model = None
         self.combined_broker_model_graph_id = None
+        self.reset_bqm_cache()
+
+    def reset_bqm_cache(self):
+        """
+        Reset the BQM cache. The CBM generation is bumped whenever the model or the allocations change;
+        BQM versions combine it with a per instance id so versions are never reused across restarts.
+        """
+        self.cbm_instance = uuid.uuid4().hex[:8]
+        self.cbm_generation = 0
+        # Tuple (CBM generation, serialized BQM)
+        self.bqm_cache = None
+
+    def bump_cbm_generation(self):
+        """
+        Invalidate the cached BQM
+        """
+        self.cbm_generation += 1
+
+    def get_bqm_version(self) -> str:
+        """
+        Return the version of the BQM for the current CBM generation
+        """
+        return "{}-{}".format(self.cbm_instance, self.cbm_generation)
+
+    def create_cbm_backend(self) -> ICBMBackend:
+        """
+        Create the Combined Broker Model backend as per the runtime configuration
+        @return CBM backend
+        """
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        runtime_config = None
+        config = GlobalsSingleton.get().get_config()
+        if config is not None:
+            runtime_config = config.get_runtime_config()
+        if runtime_config is None:
+            runtime_config = {}
+
+        backend = runtime_config.get(Constants.property_conf_cbm_backend, self.CBM_BACKEND_NEO4J)
+        if backend == self.CBM_BACKEND_MEMORY:
+            interval = float(runtime_config.get(Constants.property_conf_cbm_snapshot_interval,
+                                                InMemoryCBMBackend.DEFAULT_SNAPSHOT_INTERVAL))
+            return InMemoryCBMBackend(logger=self.logger, snapshot_interval=interval)
+        if backend != self.CBM_BACKEND_NEO4J:
+            raise BrokerException("Unsupported Combined Broker Model backend: {}".format(backend))
+        return Neo4jCBMBackend(logger=self.logger)
 
     def load_combined_broker_model(self):
+        self.combined_broker_model = self.create_cbm_backend()
         if self.combined_broker_model_graph_id is None:
             self.logger.debug("Creating an empty Combined Broker Model Graph")
 
-            self.combined_broker_model = Neo4jResourcePoolFactory.get_neo4j_cbm_empty_graph()
-            self.combined_broker_model_graph_id = self.combined_broker_model.get_graph_id()
+            self.combined_broker_model_graph_id = self.combined_broker_model.load()
 
             self.logger.debug("Empty Combined Broker Model Graph created: {}".format(
                 self.combined_broker_model_graph_id))
@@ -91,8 +142,7 @@ class BrokerSimplePolicy(BrokerCalendarPolicy):
             self.logger.debug("Loading an existing Combined Broker Model Graph: {}".format(
                 self.combined_broker_model_graph_id))
 
-            self.combined_broker_model = Neo4jResourcePoolFactory.get_neo4j_cbm_graph_from_database(
-                combined_broker_model_graph_id=self.combined_broker_model_graph_id)
+            self.combined_broker_model.load(graph_id=self.combined_broker_model_graph_id)
             self.logger.debug(
                 "Successfully loaded an existing Combined Broker Model Graph: {}".format(
                     self.combined_broker_model_graph_id))
@@ -425,7 +475,8 @@ class BrokerSimplePolicy(BrokerCalendarPolicy):
 
     def query(self, *, p: dict) -> dict:
         """
-        Returns the Broker Query Model
+        Returns the Broker Query Model. The BQM is regenerated only when the CBM generation has changed. If the
+        caller passes the version of the BQM it holds and the version is current, the BQM is omitted.
         @params p : dictionary containing filters (not used currently)
         """
         result = {}
@@ -434,13 +485,23 @@ class BrokerSimplePolicy(BrokerCalendarPolicy):
         try:
             self.lock.acquire()
             if self.combined_broker_model is not None:
-                graph = self.combined_broker_model.get_bqm(some=5)
-                result[Constants.broker_query_model] = graph.serialize_graph()
-                graph.delete_graph()
+                generation = self.cbm_generation
+                version = self.get_bqm_version()
+                result[Constants.broker_query_model_version] = version
+                if p is not None and p.get(Constants.broker_query_model_version, None) == version:
+                    self.logger.debug("BQM version {} unchanged".format(version))
+                    return result
+
+                if self.bqm_cache is None or self.bqm_cache[0] != generation:
+                    self.bqm_cache = (generation, self.combined_broker_model.get_bqm(some=5))
+                else:
+                    self.logger.debug("Returning cached BQM version {}".format(version))
+                result[Constants.broker_query_model] = self.bqm_cache[1]
         finally:
             self.lock.release()
 
-        self.logger.debug("Returning Query Result: {}".format(result))
+        self.logger.debug("Returning Query Result version: {}".format(
+            result.get(Constants.broker_query_model_version, None)))
         return result
 
     def satisfy_allocation(self, *, reservation: IBrokerReservation, source: IClientReservation, resource_share: int,
@@ -549,14 +610,22 @@ class BrokerSimplePolicy(BrokerCalendarPolicy):
             self.lock.acquire()
             if delegation.get_delegation_id() in self.delegations:
                 self.combined_broker_model.merge_adm(adm=delegation.get_graph())
-                self.combined_broker_model.validate_graph()
-                self.logger.debug("Donated Delegation: self.combined_broker_model: {}".format(
-                    self.combined_broker_model.serialize_graph()))
+                self.bump_cbm_generation()
+                self.logger.debug("Donated Delegation {} merged into Combined Broker Model {}".format(
+                    delegation.get_delegation_id(), self.combined_broker_model_graph_id))
             else:
                 self.logger.debug("Delegation ignored")
         finally:
             self.lock.release()
 
+    def shutdown(self):
+        """
+        Release the Combined Broker Model backend
+        """
+        if self.combined_broker_model is not None:
+            self.combined_broker_model.stop()
+
     def closed_delegation(self, *, delegation: IDelegation):
         self.logger.debug("Close Delegation")
+        self.bump_cbm_generation()
         # TODO remove the delegation from the combined broker model
@@ -34,6 +34,7 @@ from fabric_cf.actor.core.common.exceptions import BrokerException
 from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
 from fabric_cf.actor.core.time.actor_clock import ActorClock
 from fabric_cf.actor.core.time.term import Term
+from fabric_cf.actor.core.util.metrics import ActorMetrics
 from fabric_cf.actor.core.util.prop_list import PropList
 from fabric_cf.actor.core.util.reservation_set import ReservationSet
 from fabric_cf.actor.core.policy.broker_priority_policy import BrokerPriorityPolicy
@@ -61,6 +62,9 @@ class BrokerSimplerUnitsPolicy(BrokerPriorityPolicy):
 
         del state['delegations']
         del state['combined_broker_model']
+        del state['cbm_instance']
+        del state['cbm_generation']
+        del state['bqm_cache']
         del state['for_approval']
         del state['lock']
 
@@ -83,6 +87,7 @@ class BrokerSimplerUnitsPolicy(BrokerPriorityPolicy):
 
         self.delegations = {}
         self.combined_broker_model = None
+        self.reset_bqm_cache()
         self.load_combined_broker_model()
 
         self.lock = threading.Lock()
@@ -110,17 +115,23 @@ class BrokerSimplerUnitsPolicy(BrokerPriorityPolicy):
 
         start_cycle = self.get_start_for_allocation(allocation_cycle=cycle)
         advance_cycle = self.get_end_for_allocation(allocation_cycle=cycle)
-        requests = self.calendar.get_all_requests(cycle=advance_cycle)
 
-        if requests is None or requests.size() == 0 and self.queue is None or self.queue.size() == 0:
+        # Avoid materializing the request set on cycles without any work
+        if not self.calendar.has_requests(cycle=advance_cycle) and (self.queue is None or self.queue.size() == 0):
             self.logger.debug("no requests for auction start cycle {}".format(start_cycle))
             return
 
+        begin = ActorMetrics.start()
+        requests = self.calendar.get_all_requests(cycle=advance_cycle)
+
         self.logger.debug("allocating resources for cycle {}".format(start_cycle))
 
-        self.allocate_extending_reservation_set(requests=requests, start_cycle=start_cycle)
-        self.allocate_queue(start_cycle=start_cycle)
-        self.allocate_ticketing(requests=requests, start_cycle=start_cycle)
+        try:
+            self.allocate_extending_reservation_set(requests=requests, start_cycle=start_cycle)
+            self.allocate_queue(start_cycle=start_cycle)
+            self.allocate_ticketing(requests=requests, start_cycle=start_cycle)
+        finally:
+            ActorMetrics.observe_allocate(policy=self, begin=begin)
 
     def get_default_pool_id(self) -> ResourceType:
         result = None
@@ -299,6 +310,7 @@ class BrokerSimplerUnitsPolicy(BrokerPriorityPolicy):
         if mine is not None and not reservation.is_failed():
             reservation.set_approved(term=term, approved_resources=mine)
             reservation.set_source(source=source)
+            self.bump_cbm_generation()
             self.logger.debug("allocated: {} for term: {}".format(mine.get_units(), term))
             self.logger.debug("resourceshare= {} mine= {}".format(units, mine.get_units()))
 
@@ -335,6 +347,7 @@ class BrokerSimplerUnitsPolicy(BrokerPriorityPolicy):
         self.release_resources(rset=reservation.get_approved_resources(), term=reservation.get_approved_term())
 
     def release_resources(self, *, rset: ResourceSet, term: Term):
+        self.bump_cbm_generation()
         try:
             if rset is None or term is None or rset.get_resources() is None:
                 self.logger.warning("Reservation does not have resources to release")
@@ -24,6 +24,7 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 from fabric_cf.actor.core.common.exceptions import PolicyException
+from fabric_cf.actor.core.util.range_set import RangeSet
 
 
 class FreeAllocatedSet:
@@ -31,12 +32,13 @@ class FreeAllocatedSet:
     FreeAllocatedSet is a simple data structure that maintains two sets: free and allocated.
     The structure can be used to track free and allocated items. Use add_inventory to
     add inventory items, allocate to allocate an item, and free to free an item.
+    Items are integers kept in range sets; the lowest free item is allocated first.
     """
     def __init__(self):
         # Free set.
-        self.free_set = set()
+        self.free_set = RangeSet()
         # Allocated set.
-        self.allocated = set()
+        self.allocated = RangeSet()
 
     def add_inventory(self, *, item):
         """
@@ -49,7 +51,19 @@ class FreeAllocatedSet:
         if item in self.allocated:
             raise PolicyException("item is already in allocated")
 
-        self.free_set.add(item)
+        self.free_set.add(value=item)
+
+    def add_inventory_range(self, *, start: int, end: int):
+        """
+        Adds all items in [start, end] to the set.
+        @param start first item
+        @param end last item
+        """
+        for s, e in self.allocated.get_ranges():
+            if s <= end and e >= start:
+                raise PolicyException("item is already in allocated: {}".format(max(s, start)))
+
+        self.free_set.add_range(start=start, end=end)
 
     def allocate(self, *, tag=None, config_tag: bool = None, count: int = None):
         """
@@ -65,16 +79,17 @@ class FreeAllocatedSet:
         if len(self.free_set) > 0:
             if tag is None and config_tag is None and count is None:
                 item = self.free_set.pop()
-                self.allocated.add(item)
+                self.allocated.add(value=item)
 
             elif tag is not None and config_tag is not None:
                 if config_tag:
                     item = tag
                     if item not in self.free_set:
                         raise PolicyException("item is already in allocated: {}".format(item))
+                    self.free_set.remove(value=item)
                 else:
                     item = self.free_set.pop()
-                self.allocated.add(item)
+                self.allocated.add(value=item)
         return item
 
     def allocate_count(self, *, count: int):
@@ -83,7 +98,7 @@ class FreeAllocatedSet:
             item = []
             for i in range(count):
                 val = self.free_set.pop()
-                self.allocated.add(val)
+                self.allocated.add(value=val)
                 item.append(val)
         return item
 
@@ -93,22 +108,22 @@ class FreeAllocatedSet:
                 raise PolicyException("no items have been allocated")
 
             item = self.allocated.pop()
-            self.free_set.add(item)
+            self.free_set.add(value=item)
         elif item is not None:
             if item not in self.allocated:
                 raise PolicyException("item has not been allocated")
             if item in self.free_set:
                 raise PolicyException("item has already been freed")
 
-            self.allocated.remove(item)
-            self.free_set.add(item)
+            self.allocated.remove(value=item)
+            self.free_set.add(value=item)
         elif count is not None:
             for i in range(count):
                 if len(self.allocated) == 0:
                     raise PolicyException("no items have been allocated")
 
                 item = self.allocated.pop()
-                self.free_set.add(item)
+                self.free_set.add(value=item)
 
     def free_list(self, *, items: list):
         for i in items:
@@ -93,8 +93,7 @@ class LUNControl(ResourceControl):
                     end = int(local[end_p])
                     if start == 0 and end == 0:
                         break
-                    for j in range(start, end):
-                        self.tags.add_inventory(item=j)
+                    self.tags.add_inventory_range(start=start, end=end - 1)
 
                     size = size + (end - start + 1)
                     self.logger.info("Tag donation: {}:{}-{}:{}".format(self.rtype, start, end, size))
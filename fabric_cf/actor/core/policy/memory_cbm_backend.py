@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import io
+import json
+import threading
+import time
+import traceback
+import uuid
+
+import networkx as nx
+from fim.graph.abc_property_graph import ABCPropertyGraph
+from fim.graph.resources.neo4j_cbm import Neo4jCBMGraph
+from fim.pluggable import PluggableRegistry, PluggableType, BrokerPluggable
+
+from fabric_cf.actor.boot.inventory.neo4j_resource_pool_factory import Neo4jResourcePoolFactory
+from fabric_cf.actor.core.apis.i_cbm_backend import ICBMBackend
+from fabric_cf.actor.core.common.exceptions import BrokerException
+from fabric_cf.actor.core.util.graph_validator import GraphValidator
+
+
+class InMemoryCBMBackend(ICBMBackend):
+    """
+    Keeps the Combined Broker Model in process memory as a NetworkX graph keyed by NodeID. ADMs are merged
+    following the semantics of the Neo4j CBM (delegations are keyed by ADM graph id, properties of common
+    nodes are kept from the CBM, relationships are merged) and BQMs are served from memory.
+    The model is snapshot to Neo4j asynchronously under the same graph id so that it can be recovered.
+    ADMs are checked against the FIM graph validation rules used by the Neo4j CBM. BQMs have the same shape
+    as those of the Neo4j CBM: a copy of the model under a new graph id or, if a broker BQM pluggable is
+    registered, the result of the pluggable which is run against a temporary Neo4j copy of the model.
+    """
+    ADM_GRAPH_IDS = "ADMGraphIDs"
+    NODE_ID = "NodeID"
+    GRAPH_ID = "GraphID"
+    CLASS = "Class"
+    DELEGATION_PROPS = [ABCPropertyGraph.PROP_LABEL_DELEGATIONS, ABCPropertyGraph.PROP_CAPACITY_DELEGATIONS]
+    NONE = "None"
+    DEFAULT_SNAPSHOT_INTERVAL = 30
+
+    def __init__(self, *, logger, snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL, snapshot: bool = True):
+        self.logger = logger
+        self.graph = nx.MultiDiGraph()
+        self.graph_id = None
+        self.lock = threading.Lock()
+        # Generation of the model; incremented on every merge
+        self.generation = 0
+
+        self.snapshot_enabled = snapshot
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_generation = 0
+        self.snapshot_condition = threading.Condition()
+        self.snapshot_thread = None
+        self.stopped = False
+        self.snapshot_count = 0
+        self.snapshot_time = 0.0
+
+    def load(self, *, graph_id: str = None) -> str:
+        with self.lock:
+            self.graph = nx.MultiDiGraph()
+            if graph_id is None:
+                self.graph_id = str(uuid.uuid4())
+            else:
+                self.graph_id = graph_id
+                if self.snapshot_enabled:
+                    self.load_snapshot()
+            self.snapshot_generation = self.generation
+        self.start_snapshot_thread()
+        return self.graph_id
+
+    def load_snapshot(self):
+        """
+        Load the last snapshot of the model from Neo4j
+        """
+        try:
+            cbm = Neo4jResourcePoolFactory.get_neo4j_cbm_graph_from_database(
+                combined_broker_model_graph_id=self.graph_id)
+            graph = self.read_graphml(graph_str=cbm.serialize_graph())
+            for node_id, props in graph.nodes(data=True):
+                self.graph.add_node(node_id, **props)
+            for a, b, key, props in graph.edges(keys=True, data=True):
+                self.graph.add_edge(a, b, key=key, **props)
+            self.logger.info("Loaded Combined Broker Model {} with {} nodes from snapshot".format(
+                self.graph_id, self.graph.number_of_nodes()))
+        except Exception as e:
+            self.logger.warning("Combined Broker Model {} could not be loaded from snapshot, starting empty: {}".
+                                format(self.graph_id, e))
+
+    def get_graph_id(self) -> str:
+        return self.graph_id
+
+    @staticmethod
+    def read_graphml(*, graph_str: str, validate: bool = False) -> nx.MultiDiGraph:
+        """
+        Parse a GraphML graph into a graph keyed by NodeID; relationships are keyed by their type
+        @param graph_str GraphML
+        @param validate apply the FIM graph validation rules before keying the graph
+        @return graph
+        @raises BrokerException if the graph is invalid
+        """
+        graph = nx.read_graphml(io.BytesIO(graph_str.encode('utf-8')))
+        if validate:
+            InMemoryCBMBackend.validate(graph=graph)
+        result = nx.MultiDiGraph()
+        for n, props in graph.nodes(data=True):
+            node_id = props.get(InMemoryCBMBackend.NODE_ID, None)
+            if node_id is None:
+                raise BrokerException("Node {} does not have a {} property".format(n, InMemoryCBMBackend.NODE_ID))
+            result.add_node(node_id, **props)
+        for a, b, props in graph.edges(data=True):
+            node_a = graph.nodes[a][InMemoryCBMBackend.NODE_ID]
+            node_b = graph.nodes[b][InMemoryCBMBackend.NODE_ID]
+            key = props.get('label', None)
+            if not result.has_edge(node_a, node_b, key=key):
+                result.add_edge(node_a, node_b, key=key, **props)
+        return result
+
+    def merge_adm(self, *, adm: ABCPropertyGraph):
+        adm_id = adm.graph_id
+        adm_graph = self.read_graphml(graph_str=adm.serialize_graph(), validate=True)
+
+        with self.lock:
+            for node_id, adm_props in adm_graph.nodes(data=True):
+                props = dict(adm_props)
+                # rewrite delegations into dictionaries keyed by ADM graph id
+                for name in self.DELEGATION_PROPS:
+                    if name in props and props[name] != self.NONE:
+                        props[name] = json.dumps({adm_id: json.loads(props[name])})
+                props[self.GRAPH_ID] = self.graph_id
+
+                if not self.graph.has_node(node_id):
+                    props[self.ADM_GRAPH_IDS] = json.dumps([adm_id])
+                    self.graph.add_node(node_id, **props)
+                    continue
+
+                # common node: keep CBM properties, merge delegations and record the ADM
+                cbm_props = self.graph.nodes[node_id]
+                for name in self.DELEGATION_PROPS:
+                    if name not in props or props[name] == self.NONE:
+                        continue
+                    delegations = {}
+                    if cbm_props.get(name, self.NONE) != self.NONE:
+                        delegations = json.loads(cbm_props[name])
+                    delegations.update(json.loads(props[name]))
+                    cbm_props[name] = json.dumps(delegations)
+                adm_ids = json.loads(cbm_props.get(self.ADM_GRAPH_IDS, "[]"))
+                adm_ids.append(adm_id)
+                cbm_props[self.ADM_GRAPH_IDS] = json.dumps(adm_ids)
+
+            for a, b, key, props in adm_graph.edges(keys=True, data=True):
+                if not self.graph.has_edge(a, b, key=key):
+                    self.graph.add_edge(a, b, key=key, **props)
+
+            self.generation += 1
+        self.request_snapshot()
+
+    @staticmethod
+    def validate(*, graph: nx.Graph):
+        """
+        Apply the FIM graph validation rules, as done for the Neo4j CBM
+        @param graph graph as parsed from GraphML
+        @raises BrokerException if the graph is invalid
+        """
+        try:
+            GraphValidator.validate(graph=graph)
+        except Exception as e:
+            raise BrokerException("Invalid graph: {}".format(e))
+
+    def serialize(self) -> str:
+        """
+        Serialize the model as GraphML
+        @return GraphML
+        """
+        with self.lock:
+            return "\n".join(nx.generate_graphml(self.graph))
+
+    @staticmethod
+    def bqm_pluggable_registered() -> bool:
+        """
+        Check if a broker pluggable producing BQMs is registered
+        @return true if registered
+        """
+        registry = PluggableRegistry()
+        return registry.pluggable_registered(t=PluggableType.Broker) and \
+            BrokerPluggable.PLUGGABLE_PRODUCE_BQM in registry.get_implemented_methods(t=PluggableType.Broker)
+
+    def get_bqm(self, **kwargs) -> str:
+        if self.bqm_pluggable_registered():
+            return self.get_bqm_from_pluggable(**kwargs)
+
+        # without a pluggable the Neo4j CBM returns a copy of itself under a new graph id
+        bqm_id = str(uuid.uuid4())
+        with self.lock:
+            bqm = self.graph.copy()
+        for node_id, props in bqm.nodes(data=True):
+            props[self.GRAPH_ID] = bqm_id
+        return "\n".join(nx.generate_graphml(bqm))
+
+    def get_bqm_from_pluggable(self, **kwargs) -> str:
+        """
+        Run the broker BQM pluggable against a temporary Neo4j copy of the model
+        @param kwargs query parameters passed to the pluggable
+        @return GraphML of the BQM
+        """
+        graph_str = self.serialize()
+        importer = Neo4jResourcePoolFactory.get_neo4j_importer()
+        cbm_copy = importer.import_graph_from_string(graph_string=graph_str, graph_id=str(uuid.uuid4()))
+        try:
+            cbm = Neo4jCBMGraph(graph_id=cbm_copy.graph_id, importer=importer, logger=importer.log)
+            bqm = cbm.get_bqm(**kwargs)
+            try:
+                return bqm.serialize_graph()
+            finally:
+                bqm.delete_graph()
+        finally:
+            cbm_copy.delete_graph()
+
+    def start_snapshot_thread(self):
+        """
+        Start the thread that snapshots the model to Neo4j
+        """
+        if not self.snapshot_enabled or self.snapshot_thread is not None:
+            return
+        self.stopped = False
+        self.snapshot_thread = threading.Thread(target=self.snapshot_loop, name="CBMSnapshot", daemon=True)
+        self.snapshot_thread.start()
+
+    def request_snapshot(self):
+        """
+        Wake up the snapshot thread
+        """
+        with self.snapshot_condition:
+            self.snapshot_condition.notify_all()
+
+    def snapshot_loop(self):
+        while True:
+            with self.snapshot_condition:
+                while not self.stopped and self.generation == self.snapshot_generation:
+                    self.snapshot_condition.wait(timeout=self.snapshot_interval)
+                if self.stopped:
+                    break
+            self.snapshot()
+            # at most one snapshot per interval; stop() cuts the wait short
+            with self.snapshot_condition:
+                if not self.stopped:
+                    self.snapshot_condition.wait(timeout=self.snapshot_interval)
+
+    def snapshot(self):
+        """
+        Write the current model to Neo4j under the CBM graph id; the previous snapshot is only replaced once the
+        new one has been imported
+        """
+        if self.generation == self.snapshot_generation:
+            return
+        with self.lock:
+            generation = self.generation
+            graph_str = "\n".join(nx.generate_graphml(self.graph))
+        begin = time.time()
+        try:
+            Neo4jResourcePoolFactory.replace_graph(graph_id=self.graph_id, graph_str=graph_str)
+            self.snapshot_generation = generation
+            self.snapshot_count += 1
+        except Exception as e:
+            self.logger.error(traceback.format_exc())
+            self.logger.error("Failed to snapshot Combined Broker Model {}: {}".format(self.graph_id, e))
+        finally:
+            self.snapshot_time = time.time() - begin
+
+    def stop(self):
+        with self.snapshot_condition:
+            self.stopped = True
+            self.snapshot_condition.notify_all()
+        if self.snapshot_thread is not None:
+            self.snapshot_thread.join()
+            self.snapshot_thread = None
+        if self.snapshot_enabled:
+            self.snapshot()
+
+    def get_metrics(self) -> dict:
+        """
+        Return model size and snapshot statistics
+        @return dict
+        """
+        return {"nodes": self.graph.number_of_nodes(), "edges": self.graph.number_of_edges(),
+                "generation": self.generation, "snapshot_generation": self.snapshot_generation,
+                "snapshots": self.snapshot_count, "last_snapshot_time": self.snapshot_time}
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from fim.graph.abc_property_graph import ABCPropertyGraph
+
+from fabric_cf.actor.boot.inventory.neo4j_resource_pool_factory import Neo4jResourcePoolFactory
+from fabric_cf.actor.core.apis.i_cbm_backend import ICBMBackend
+
+
+class Neo4jCBMBackend(ICBMBackend):
+    """
+    Keeps the Combined Broker Model in Neo4j; every merge and query is a round trip to Neo4j
+    """
+    def __init__(self, *, logger):
+        self.logger = logger
+        self.combined_broker_model = None
+
+    def load(self, *, graph_id: str = None) -> str:
+        if graph_id is None:
+            self.combined_broker_model = Neo4jResourcePoolFactory.get_neo4j_cbm_empty_graph()
+        else:
+            self.combined_broker_model = Neo4jResourcePoolFactory.get_neo4j_cbm_graph_from_database(
+                combined_broker_model_graph_id=graph_id)
+        return self.combined_broker_model.get_graph_id()
+
+    def get_graph_id(self) -> str:
+        return self.combined_broker_model.get_graph_id()
+
+    def merge_adm(self, *, adm: ABCPropertyGraph):
+        self.combined_broker_model.merge_adm(adm=adm)
+        self.combined_broker_model.validate_graph()
+
+    def get_bqm(self, **kwargs) -> str:
+        graph = self.combined_broker_model.get_bqm(**kwargs)
+        try:
+            return graph.serialize_graph()
+        finally:
+            graph.delete_graph()
+
+    def stop(self):
+        return
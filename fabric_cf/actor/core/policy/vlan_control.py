@@ -96,8 +96,7 @@ class VlanControl(ResourceControl):
                     if start == 0 and end == 0:
                         break
 
-                    for j in range(start, end + 1):
-                        self.tags.add_inventory(item=j)
+                    self.tags.add_inventory_range(start=start, end=end)
 
                     size = size + (end - start + 1)
                     self.logger.info("VlanControl.donate(): Tag Donation:{}:{}-{}:{}".format(rtype, start, end, size))
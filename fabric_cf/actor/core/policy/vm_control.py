@@ -25,6 +25,7 @@
 # Author: Komal Thareja (kthare10@renci.org)
 from __future__ import annotations
 
+import bisect
 from typing import TYPE_CHECKING, List
 
 from fabric_cf.actor.core.common.constants import Constants
@@ -53,6 +54,8 @@ class Vmm:
         self._host = host
         self.hosted = set()
         self.capacity = capacity
+        # pool indexing this vmm by available capacity
+        self.pool = None
 
     def __str__(self):
         return "{} {}".format(self._host, self.capacity)
@@ -73,6 +76,8 @@ class Vmm:
             raise PolicyException("the specified node is not hosted on this vmm")
 
         self.hosted.remove(vm)
+        if self.pool is not None:
+            self.pool.update_index(vmm=self, previous=self.get_available() - 1)
 
     def host(self, *, vm: Unit):
         if vm is None:
@@ -82,6 +87,8 @@ class Vmm:
             raise PolicyException("the specified node is already hosted on this vmm")
 
         self.hosted.add(vm)
+        if self.pool is not None:
+            self.pool.update_index(vmm=self, previous=self.get_available() + 1)
 
     def get_hosted_count(self) -> int:
         return len(self.hosted)
@@ -100,30 +107,115 @@ class Vmm:
 
 
 class VmmPool:
-    def __init__(self, *, rtype: ResourceType, properties: dict):
+    """
+    Pool of VMMs of a resource type. VMMs are indexed by available capacity so that a host can be
+    selected without scanning the pool:
+    - first-fit: the earliest donated VMM with free capacity
+    - best-fit: the VMM with the least free capacity (packs hosts)
+    - spread: the VMM with the most free capacity (balances load)
+    Ties are broken by donation order. Vmm.host and Vmm.release keep the index up to date.
+    """
+    PLACEMENT_FIRST_FIT = "first-fit"
+    PLACEMENT_BEST_FIT = "best-fit"
+    PLACEMENT_SPREAD = "spread"
+    PLACEMENTS = [PLACEMENT_FIRST_FIT, PLACEMENT_BEST_FIT, PLACEMENT_SPREAD]
+
+    def __init__(self, *, rtype: ResourceType, properties: dict, placement: str = PLACEMENT_FIRST_FIT):
+        if placement not in self.PLACEMENTS:
+            raise PolicyException("Unsupported placement: {}".format(placement))
         self.rtype = rtype
         self.properties = properties
+        self.placement = placement
         self.vmms = {}
         self.memory = 0
         self.cpu = 0
         self.bandwidth = 0
         self.disk = 0
         self.capacity = 0
+        # Capacity index: donation sequence per vmm, sorted sequences of vmms with free capacity,
+        # available capacity -> sorted sequences, sorted list of non-empty available capacities
+        self.sequence = {}
+        self.by_sequence = {}
+        self.non_full = []
+        self.buckets = {}
+        self.bucket_keys = []
+        self.available = 0
 
     def donate(self, *, vm: Vmm):
         if vm is None:
             raise PolicyException(Constants.not_specified_prefix.format("vm"))
 
-        if vm.get_host().get_actor_id() in self.vmms:
+        if vm.get_host().get_id() in self.vmms:
             raise PolicyException("the specified vm already in the pool")
 
         self.vmms[vm.get_host().get_id()] = vm
+        seq = len(self.by_sequence)
+        self.sequence[vm] = seq
+        self.by_sequence[seq] = vm
+        vm.pool = self
+        self.add_to_index(seq=seq, available=vm.get_available())
+
+    def add_to_index(self, *, seq: int, available: int):
+        self.available += available
+        if available <= 0:
+            return
+        bisect.insort(self.non_full, seq)
+        bucket = self.buckets.get(available, None)
+        if bucket is None:
+            bucket = []
+            self.buckets[available] = bucket
+            bisect.insort(self.bucket_keys, available)
+        bisect.insort(bucket, seq)
+
+    def remove_from_index(self, *, seq: int, available: int):
+        self.available -= available
+        if available <= 0:
+            return
+        del self.non_full[bisect.bisect_left(self.non_full, seq)]
+        bucket = self.buckets[available]
+        del bucket[bisect.bisect_left(bucket, seq)]
+        if len(bucket) == 0:
+            del self.buckets[available]
+            del self.bucket_keys[bisect.bisect_left(self.bucket_keys, available)]
+
+    def update_index(self, *, vmm: Vmm, previous: int):
+        """
+        Move a vmm within the capacity index after its available capacity changed
+        @param vmm vmm
+        @param previous available capacity before the change
+        """
+        seq = self.sequence.get(vmm, None)
+        if seq is None:
+            return
+        self.remove_from_index(seq=seq, available=previous)
+        self.add_to_index(seq=seq, available=vmm.get_available())
+
+    def select(self) -> Vmm:
+        """
+        Select a vmm with free capacity according to the placement strategy
+        @return vmm or None if all vmms are full
+        """
+        if len(self.non_full) == 0:
+            return None
+        if self.placement == self.PLACEMENT_BEST_FIT:
+            seq = self.buckets[self.bucket_keys[0]][0]
+        elif self.placement == self.PLACEMENT_SPREAD:
+            seq = self.buckets[self.bucket_keys[-1]][0]
+        else:
+            seq = self.non_full[0]
+        return self.by_sequence[seq]
+
+    def get_available(self) -> int:
+        """
+        Return the free capacity across all vmms
+        """
+        return self.available
+
+    def get_placement(self) -> str:
+        return self.placement
 
     def get_vmm_set(self) -> List[Vmm]:
-        result = []
-        for v in self.vmms.values():
-            result.append(v)
-        return result
+        return list(self.vmms.values())
 
     def get_vmm(self, *, uid: ID) -> Vmm:
         if uid in self.vmms:
@@ -176,6 +268,7 @@ class VMControl(ResourceControl):
     PropertyIPSubnet = "ip.subnet"
     PropertyIPGateway = "ip.gateway"
     PropertyDataSubnet = "data.subnet"
+    PropertyPlacement = "placement"
 
     def __init__(self):
         super().__init__()
@@ -184,6 +277,7 @@ class VMControl(ResourceControl):
         self.subnet = None
         self.gateway = None
         self.use_ip_set = False
+        self.placement = VmmPool.PLACEMENT_FIRST_FIT
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -212,6 +306,11 @@ class VMControl(ResourceControl):
         self.gateway = None
         self.use_ip_set = False
 
+    def configure(self, *, properties: dict):
+        super().configure(properties=properties)
+        if self.PropertyPlacement in properties:
+            self.placement = properties[self.PropertyPlacement]
+
     def donate_reservation(self, *, reservation: IClientReservation):
         return
 
@@ -222,7 +321,8 @@ class VMControl(ResourceControl):
 
         pool = self.inventory.get(rtype)
         if pool is None:
-            pool = VmmPool(rtype=rtype, properties=resource)
+            placement = local.get(self.PropertyPlacement, self.placement)
+            pool = VmmPool(rtype=rtype, properties=resource, placement=placement)
             rd = ResourcePoolDescriptor()
             rd.reset(properties=resource)
             memory = int(rd.get_attribute(key=Constants.resource_memory).get_value())
@@ -292,41 +392,48 @@ class VMControl(ResourceControl):
 
     def get_vms(self, *, pool: VmmPool, needed: int) -> UnitSet:
         uset = UnitSet(plugin=self.authority.get_plugin())
-        vmms = pool.get_vmm_set()
         allocated = 0
 
-        for vmm in vmms:
+        while allocated < needed:
+            if self.use_ip_set and self.ipset.get_free_count() == 0:
+                break
+
+            vmm = pool.select()
+            if vmm is None:
+                break
+
             available = vmm.get_available()
             if self.use_ip_set:
                 available = min(available, self.ipset.get_free_count())
 
-            if available > 0:
-                to_allocate = min(available, needed - allocated)
-                for i in range(to_allocate):
-                    vm = Unit(uid=ID())
-                    vm.set_resource_type(rtype=pool.get_type())
-                    vm.set_parent_id(parent_id=vmm.get_host().get_id())
-                    vm.set_property(name=Constants.unit_parent_host_name,
-                                    value=vmm.get_host().get_property(name=Constants.unit_host_name))
-                    vm.set_property(name=Constants.unit_control,
-                                    value=vmm.get_host().get_property(name=Constants.unit_control))
-                    vm.set_property(name=Constants.unit_memory,
-                                    value=str(pool.get_memory()))
-                    if self.use_ip_set:
-                        vm.set_property(name=Constants.unit_management_ip,
-                                        value=self.ipset.allocate())
-
-                    if self.subnet is not None:
-                        vm.set_property(name=Constants.unit_manage_subnet, value=self.subnet)
-
-                    if self.gateway is not None:
-                        vm.set_property(name=Constants.unit_manage_gateway, value=self.gateway)
-
-                    vmm.host(vm=vm)
-                    uset.add_unit(u=vm)
-                allocated += to_allocate
-            if allocated == needed or self.ipset.get_free_count() == 0:
-                break
+            to_allocate = min(available, needed - allocated)
+            if pool.get_placement() == VmmPool.PLACEMENT_SPREAD:
+                # re-select after every unit to keep the load balanced
+                to_allocate = 1
+
+            for i in range(to_allocate):
+                vm = Unit(uid=ID())
+                vm.set_resource_type(rtype=pool.get_type())
+                vm.set_parent_id(parent_id=vmm.get_host().get_id())
+                vm.set_property(name=Constants.unit_parent_host_name,
+                                value=vmm.get_host().get_property(name=Constants.unit_host_name))
+                vm.set_property(name=Constants.unit_control,
+                                value=vmm.get_host().get_property(name=Constants.unit_control))
+                vm.set_property(name=Constants.unit_memory,
+                                value=str(pool.get_memory()))
+                if self.use_ip_set:
+                    vm.set_property(name=Constants.unit_management_ip,
+                                    value=self.ipset.allocate())
+
+                if self.subnet is not None:
+                    vm.set_property(name=Constants.unit_manage_subnet, value=self.subnet)
+
+                if self.gateway is not None:
+                    vm.set_property(name=Constants.unit_manage_gateway, value=self.gateway)
+
+                vmm.host(vm=vm)
+                uset.add_unit(u=vm)
+            allocated += to_allocate
 
         return uset
 
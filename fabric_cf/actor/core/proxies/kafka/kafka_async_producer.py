@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import time
+import traceback
+
+from fabric_mb.message_bus.messages.message import IMessageAvro
+from fabric_mb.message_bus.producer import AvroProducerApi
+
+from fabric_cf.actor.core.util.metrics import ActorMetrics
+
+
+class KafkaAsyncProducer(AvroProducerApi):
+    """
+    Kafka producer shared by all the Kafka proxies of the container for asynchronous delivery.
+    Messages are batched by the producer (linger.ms/batch.num.messages) and delivery reports are served
+    by a background thread which invokes the per message callback.
+    """
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, conf, key_schema, record_schema, logger=None):
+        super().__init__(conf, key_schema, record_schema, logger)
+        self.running = True
+        self.stats_lock = threading.Lock()
+        self.produced = 0
+        self.delivered = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.thread = threading.Thread(target=self.poll_loop, name="KafkaAsyncProducer", daemon=True)
+        self.thread.start()
+
+    def poll_loop(self):
+        """
+        Serve the delivery reports
+        """
+        while self.running:
+            try:
+                self.producer.poll(self.POLL_INTERVAL)
+            except Exception as e:
+                self.log_error("Exception occurred while polling producer {}".format(e))
+
+    def produce(self, *, topic: str, record: IMessageAvro, on_delivery=None) -> bool:
+        """
+        Queue a record for delivery; on_delivery is invoked with the error (None on success)
+        once the broker acknowledges or rejects the record
+        @param topic topic
+        @param record record
+        @param on_delivery delivery callback
+        @return True if the record was queued, False otherwise
+        """
+        begin = time.time()
+        metrics_begin = ActorMetrics.start()
+
+        def delivery_report(err, msg):
+            latency = time.time() - begin
+            if err is None:
+                ActorMetrics.observe_kafka_produce(mode=ActorMetrics.ASYNC, begin=metrics_begin)
+            with self.stats_lock:
+                if err is None:
+                    self.delivered += 1
+                else:
+                    self.failed += 1
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+            if err is not None:
+                self.log_error("Message {} delivery failed with error {}".format(record.get_id(), err))
+            if on_delivery is not None:
+                on_delivery(err)
+
+        try:
+            try:
+                self.producer.produce(topic=topic, key=record.get_id(), value=record.to_dict(),
+                                      callback=delivery_report)
+            except BufferError:
+                # Local queue is full; wait for deliveries to free up space and retry once
+                self.producer.poll(1)
+                self.producer.produce(topic=topic, key=record.get_id(), value=record.to_dict(),
+                                      callback=delivery_report)
+            with self.stats_lock:
+                self.produced += 1
+            return True
+        except Exception as e:
+            self.log_error("Exception occurred {}".format(e))
+            self.log_error(traceback.format_exc())
+        return False
+
+    def stop(self, *, timeout: float = 30):
+        """
+        Deliver outstanding messages and stop the poll thread
+        @param timeout seconds to wait for outstanding messages
+        """
+        try:
+            self.producer.flush(timeout)
+        finally:
+            self.running = False
+
+    def get_metrics(self) -> dict:
+        """
+        Return delivery metrics; latency (seconds) is measured from produce to delivery report
+        """
+        with self.stats_lock:
+            reported = self.delivered + self.failed
+            return {'produced': self.produced,
+                    'delivered': self.delivered,
+                    'failed': self.failed,
+                    'pending': self.produced - reported,
+                    'delivery_latency_avg': self.latency_total / reported if reported > 0 else 0.0,
+                    'delivery_latency_max': self.latency_max}
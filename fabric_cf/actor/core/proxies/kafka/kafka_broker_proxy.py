@@ -94,14 +94,7 @@ class KafkaBrokerProxy(KafkaProxy, IBrokerProxy):
             super().execute(request=request)
             return
 
-        if self.producer is None:
-            self.producer = self.create_kafka_producer()
-
-        if self.producer is not None and self.producer.produce_sync(topic=self.kafka_topic, record=avro_message):
-            self.logger.debug("Message {} written to {}".format(avro_message.name, self.kafka_topic))
-        else:
-            self.logger.error("Failed to send message {} to {} via producer {}".format(avro_message.name,
-                                                                                       self.kafka_topic, self.producer))
+        self.send_message(avro_message=avro_message)
 
     def _prepare_delegation(self, *, delegation: IDelegation, callback: IClientCallbackProxy,
                             caller: AuthToken, id_token: str = None) -> IRPCRequestState:
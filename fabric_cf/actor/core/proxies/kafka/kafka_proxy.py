@@ -29,6 +29,7 @@ import traceback
 from typing import TYPE_CHECKING
 
 from fabric_mb.message_bus.messages.failed_rpc_avro import FailedRpcAvro
+from fabric_mb.message_bus.messages.message import IMessageAvro
 from fabric_mb.message_bus.messages.query_avro import QueryAvro
 from fabric_mb.message_bus.messages.query_result_avro import QueryResultAvro
 from fabric_mb.message_bus.producer import AvroProducerApi
@@ -40,6 +41,7 @@ from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.core.rpc_request_state import RPCRequestState
 from fabric_cf.actor.core.kernel.rpc_request_type import RPCRequestType
 from fabric_cf.actor.core.proxies.proxy import Proxy
+from fabric_cf.actor.core.util.metrics import ActorMetrics
 
 if TYPE_CHECKING:
     from fabric_cf.actor.core.apis.i_rpc_request_state import IRPCRequestState
@@ -126,10 +128,38 @@ class KafkaProxy(Proxy, ICallbackProxy):
         else:
             raise ProxyException("Unsupported RPC: type={}".format(request.get_type()))
 
+        self.send_message(avro_message=avro_message)
+
+    def is_async_delivery(self) -> bool:
+        from fabric_cf.actor.core.container.globals import GlobalsSingleton
+        return GlobalsSingleton.get().is_kafka_producer_async()
+
+    def send_message(self, *, avro_message: IMessageAvro):
+        """
+        Send a message to the kafka topic of the remote actor.
+        In asynchronous mode, the message is batched by the shared producer and the delivery report
+        is passed to the RPC manager; otherwise the message is written synchronously
+        @param avro_message message
+        """
+        if self.is_async_delivery():
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            from fabric_cf.actor.core.kernel.rpc_manager_singleton import RPCManagerSingleton
+            message_id = avro_message.get_message_id()
+            producer = GlobalsSingleton.get().get_kafka_async_producer()
+            if producer.produce(topic=self.kafka_topic, record=avro_message,
+                                on_delivery=lambda err: RPCManagerSingleton.get().delivery_report(
+                                    message_id=message_id, error=err)):
+                self.logger.debug("Message {} queued for {}".format(avro_message.name, self.kafka_topic))
+            else:
+                RPCManagerSingleton.get().delivery_report(message_id=message_id, error="Failed to queue message")
+            return
+
         if self.producer is None:
             self.producer = self.create_kafka_producer()
 
+        begin = ActorMetrics.start()
         if self.producer is not None and self.producer.produce_sync(topic=self.kafka_topic, record=avro_message):
+            ActorMetrics.observe_kafka_produce(mode=ActorMetrics.SYNC, begin=begin)
             self.logger.debug("Message {} written to {}".format(avro_message.name, self.kafka_topic))
         else:
             self.logger.error("Failed to send message {} to {} via producer {}".format(avro_message.name,
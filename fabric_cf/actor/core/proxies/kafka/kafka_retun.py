@@ -86,14 +86,7 @@ class KafkaReturn(KafkaProxy, IControllerCallbackProxy):
             super().execute(request=request)
             return
 
-        if self.producer is None:
-            self.producer = self.create_kafka_producer()
-
-        if self.producer is not None and self.producer.produce_sync(topic=self.kafka_topic, record=avro_message):
-            self.logger.debug("Message {} written to {}".format(avro_message.name, self.kafka_topic))
-        else:
-            self.logger.error("Failed to send message {} to {} via producer {}".format(avro_message.name,
-                                                                                       self.kafka_topic, self.producer))
+        self.send_message(avro_message=avro_message)
 
     def prepare_update_delegation(self, *, delegation: IDelegation, update_data: UpdateData,
                                   callback: ICallbackProxy, caller: AuthToken) -> IRPCRequestState:
@@ -271,4 +271,7 @@ class Translate:
         pool_info.name = Constants.broker_query_model
         if bqm is not None:
             pool_info.properties = {Constants.broker_query_model: bqm}
+            version = query_response.get(Constants.broker_query_model_version, None)
+            if version is not None:
+                pool_info.properties[Constants.broker_query_model_version] = version
         return pool_info
@@ -162,6 +162,9 @@ class Proxy(IProxy):
     def get_type(self) -> str:
         return self.proxy_type
 
+    def is_async_delivery(self) -> bool:
+        return False
+
     def set_logger(self, *, logger):
         self.logger = logger
 
@@ -103,6 +103,18 @@ class BrokerCalendar(ClientCalendar):
         finally:
             self.lock.release()
 
+    def has_requests(self, *, cycle: int) -> bool:
+        """
+        Checks if there are client requests up to the given cycle.
+        @params cycle: cycle
+        @returns true if there are requests with start time no later than cycle
+        """
+        try:
+            self.lock.acquire()
+            return self.requests.has_reservations(cycle=cycle)
+        finally:
+            self.lock.release()
+
     def add_request(self, *, reservation: IReservation, cycle: int, source: IReservation = None):
         """
         Adds a client request.
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import io
+import json
+import os
+import re
+
+import networkx as nx
+import fim.graph
+from fim.graph.abc_property_graph import ABCPropertyGraph
+
+from fabric_cf.actor.core.common.exceptions import FrameworkException
+
+
+class GraphValidator:
+    """
+    Applies the FIM graph validation rules to a graph held in memory. FIM expresses the rules as Cypher queries
+    run against Neo4j; the rules file shipped with FIM is translated into checks on node properties so that the
+    result is the same as validating the graph in Neo4j, including the check of the JSON properties.
+    """
+    VALIDATION_RULES = os.path.join(os.path.dirname(fim.graph.__file__), "data", "graph_validation_rules.json")
+    # Shapes of the Cypher rules in the FIM validation rules file
+    RULE_ALL = re.compile(r"MATCH \(n:(\w+) \{GraphID: \$graphId\}\) RETURN ALL\(r IN collect\(n\) WHERE (.+)\)$")
+    RULE_EXISTS = re.compile(r"exists\(r\.(\w+)\)$")
+    RULE_IN = re.compile(r"r\.(\w+) IN \[(.*)\]$")
+    RULE_DISTINCT = "n.NodeID=m.NodeID"
+    NODE_LABEL = "GraphNode"
+    NODE_ID = "NodeID"
+    CLASS = "Class"
+    NONE = "None"
+    rules = None
+
+    @staticmethod
+    def load_rules() -> list:
+        """
+        Translate the FIM graph validation rules into checks on node properties
+        @return list of (check, message) where check takes the list of node properties
+        @raises FrameworkException if a rule cannot be translated
+        """
+        if GraphValidator.rules is not None:
+            return GraphValidator.rules
+        with open(GraphValidator.VALIDATION_RULES, 'r') as f:
+            rules_dict = json.load(f)
+        rules = []
+        for r in rules_dict:
+            rule, msg = r['rule'], r['msg']
+            if GraphValidator.RULE_DISTINCT in rule:
+                rules.append((GraphValidator.check_distinct, msg))
+                continue
+            match = GraphValidator.RULE_ALL.match(rule)
+            if match is None:
+                raise FrameworkException("Unsupported graph validation rule: {}".format(rule))
+            label, conditions = match.group(1), []
+            for term in match.group(2).split(" AND "):
+                exists = GraphValidator.RULE_EXISTS.match(term)
+                values = GraphValidator.RULE_IN.match(term)
+                if exists is not None:
+                    conditions.append((exists.group(1), None))
+                elif values is not None:
+                    conditions.append((values.group(1), json.loads("[{}]".format(values.group(2)))))
+                else:
+                    raise FrameworkException("Unsupported graph validation rule: {}".format(rule))
+            rules.append((GraphValidator.make_check(label=label, conditions=conditions), msg))
+        GraphValidator.rules = rules
+        return rules
+
+    @staticmethod
+    def make_check(*, label: str, conditions: list):
+        """
+        Build a check requiring every node with the label to satisfy all the conditions; a condition is a
+        property name with either None (property must exist) or the list of allowed values
+        @param label node label
+        @param conditions conditions
+        @return check
+        """
+        def check(nodes: list) -> bool:
+            for props in nodes:
+                # nodes are labeled with their class on import into Neo4j
+                if label != GraphValidator.NODE_LABEL and props.get(GraphValidator.CLASS, None) != label:
+                    continue
+                for name, allowed in conditions:
+                    value = props.get(name, None)
+                    if value is None or (allowed is not None and value not in allowed):
+                        return False
+            return True
+        return check
+
+    @staticmethod
+    def check_distinct(nodes: list) -> bool:
+        node_ids = [props.get(GraphValidator.NODE_ID, None) for props in nodes]
+        return len(node_ids) == len(set(node_ids))
+
+    @staticmethod
+    def validate(*, graph: nx.Graph):
+        """
+        Validate a graph as parsed from GraphML
+        @param graph graph
+        @raises FrameworkException if the graph is invalid
+        """
+        nodes = [props for _, props in graph.nodes(data=True)]
+        if len(nodes) == 0:
+            raise FrameworkException("Graph validation failed: graph has no nodes")
+        for check, msg in GraphValidator.load_rules():
+            if not check(nodes):
+                raise FrameworkException("Graph validation failed: {}".format(msg))
+        for props in nodes:
+            for name in ABCPropertyGraph.JSON_PROPERTY_NAMES:
+                value = props.get(name, None)
+                if value is None or value == GraphValidator.NONE:
+                    continue
+                try:
+                    json.loads(value)
+                except json.decoder.JSONDecodeError:
+                    raise FrameworkException("Unable to parse JSON property {} of node {} with value {}".format(
+                        name, props.get(GraphValidator.NODE_ID, None), value))
+
+    @staticmethod
+    def validate_graphml(*, graph_str: str):
+        """
+        Validate a GraphML graph
+        @param graph_str GraphML
+        @raises FrameworkException if the graph cannot be parsed or is invalid
+        """
+        try:
+            graph = nx.read_graphml(io.BytesIO(graph_str.encode('utf-8')))
+        except Exception as e:
+            raise FrameworkException("Unable to parse graph: {}".format(e))
+        GraphValidator.validate(graph=graph)
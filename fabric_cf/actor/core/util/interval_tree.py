@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import itertools
+import random
+
+
+class IntervalNode:
+    """
+    Node of the interval tree. Nodes are ordered by start time and carry the maximum
+    end time of their subtree, which allows pruning subtrees during intersection queries.
+    """
+    __slots__ = ['key', 'start', 'end', 'value', 'priority', 'left', 'right', 'max_end']
+
+    def __init__(self, *, key: tuple, start: int, end: int, value, priority: float):
+        self.key = key
+        self.start = start
+        self.end = end
+        self.value = value
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+    def update(self):
+        """
+        Recompute the maximum end time of the subtree rooted at this node
+        """
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+class IntervalTree:
+    """
+    Augmented randomized binary search tree (treap) of closed intervals [start, end].
+    Inserts and removes are expected O(log(n)); intersection queries are expected
+    O(log(n) + k) where k is the number of intervals reported.
+    """
+    def __init__(self, *, seed: int = None):
+        self.root = None
+        self.count = 0
+        self.sequence = itertools.count()
+        self.random = random.Random(seed)
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, *, start: int, end: int, value) -> tuple:
+        """
+        Insert an interval
+        @param start start time
+        @param end end time
+        @param value value associated with the interval
+        @return key identifying the interval; needed to remove it
+        """
+        key = (start, next(self.sequence))
+        node = IntervalNode(key=key, start=start, end=end, value=value, priority=self.random.random())
+        self.root = self._insert(self.root, node)
+        self.count += 1
+        return key
+
+    def remove(self, *, key: tuple) -> bool:
+        """
+        Remove an interval
+        @param key key returned by insert
+        @return True if the interval was found and removed
+        """
+        count = self.count
+        self.root = self._remove(self.root, key)
+        return self.count < count
+
+    def clear(self):
+        """
+        Remove all intervals
+        """
+        self.root = None
+        self.count = 0
+
+    def overlap(self, *, start: int, end: int) -> list:
+        """
+        Return the values of all intervals intersecting [start, end]
+        @param start start time
+        @param end end time
+        @return list of values
+        """
+        result = []
+        stack = [self.root]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node is None or node.max_end < start:
+                continue
+            stack.append(node.left)
+            if node.start <= end:
+                if node.end >= start:
+                    result.append(node.value)
+                stack.append(node.right)
+        return result
+
+    def search(self, *, point: int) -> list:
+        """
+        Return the values of all intervals containing point
+        @param point time instance
+        @return list of values
+        """
+        return self.overlap(start=point, end=point)
+
+    def values(self) -> list:
+        """
+        Return the values of all intervals in start time order
+        """
+        result = []
+        stack = []
+        node = self.root
+        while len(stack) > 0 or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                result.append(node.value)
+                node = node.right
+        return result
+
+    def _insert(self, node: IntervalNode, new: IntervalNode) -> IntervalNode:
+        if node is None:
+            return new
+        if new.priority > node.priority:
+            new.left, new.right = self._split(node, new.key)
+            new.update()
+            return new
+        if new.key < node.key:
+            node.left = self._insert(node.left, new)
+        else:
+            node.right = self._insert(node.right, new)
+        node.update()
+        return node
+
+    def _remove(self, node: IntervalNode, key: tuple) -> IntervalNode:
+        if node is None:
+            return None
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        elif key > node.key:
+            node.right = self._remove(node.right, key)
+        else:
+            self.count -= 1
+            return self._merge(node.left, node.right)
+        node.update()
+        return node
+
+    def _split(self, node: IntervalNode, key: tuple):
+        """
+        Split the subtree into nodes with keys less than key and the rest
+        """
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = self._split(node.right, key)
+            node.update()
+            return node, right
+        left, node.left = self._split(node.left, key)
+        node.update()
+        return left, node
+
+    def _merge(self, left: IntervalNode, right: IntervalNode) -> IntervalNode:
+        """
+        Merge two subtrees; all keys in left are less than the keys in right
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.update()
+            return left
+        right.left = self._merge(left, right.left)
+        right.update()
+        return right
@@ -28,6 +28,7 @@ import ipaddress
 
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.exceptions import FrameworkException
+from fabric_cf.actor.core.util.range_set import RangeSet
 
 
 class IPv4Set:
@@ -36,8 +37,9 @@ class IPv4Set:
     range_mark = "-"
 
     def __init__(self, *, ip_list: str = None):
-        self.free_set = set()
-        self.allocated = set()
+        # addresses are kept as ranges of integers; the lowest free address is allocated first
+        self.free_set = RangeSet()
+        self.allocated = RangeSet()
 
         if ip_list:
             self.add(ip_list=ip_list)
@@ -64,14 +66,11 @@ class IPv4Set:
             raise FrameworkException("Invalid subnet size: {}".format(size))
 
         network = ipaddress.IPv4Network(token, False)
-        all_ips = list(network.hosts())
-        last = all_ips[-1]
-        start = base
-        end = int(last)
-
-        while start <= end:
-            self.free_set.add(start)
-            start += 1
+        # last host address without enumerating the subnet
+        last = int(network.broadcast_address)
+        if network.prefixlen < 31:
+            last -= 1
+        self.free_set.add_range(start=base, end=last)
 
     def process_range(self, *, token: str):
         tokens = token.split(self.range_mark)
@@ -92,8 +91,7 @@ class IPv4Set:
         if size < 0 | size > 65536:
             raise FrameworkException("Range must be positive and less than 65536")
 
-        for i in range(size):
-            self.free_set.add(start_ip + i)
+        self.free_set.add_range(start=start_ip, end=start_ip + size - 1)
 
     def pad_if_needed(self, *, token: str):
         index = 0
@@ -110,23 +108,23 @@ class IPv4Set:
         return token
 
     def process_single(self, *, token: str):
-        self.free_set.add(self.to_ip4(ip=token))
+        self.free_set.add(value=self.to_ip4(ip=token))
 
     def allocate(self):
         item = self.free_set.pop()
-        self.allocated.add(item)
+        self.allocated.add(value=item)
         ret_val = self.int_to_ip4(ip=item)
         return ret_val
 
     def free(self, *, ip: str):
         val = self.to_ip4(ip=ip)
-        self.allocated.remove(val)
-        self.free_set.add(val)
+        self.allocated.remove(value=val)
+        self.free_set.add(value=val)
 
     def reserve(self, *, ip: str):
         val = self.to_ip4(ip=ip)
-        self.free_set.remove(val)
-        self.allocated.add(val)
+        self.free_set.remove(value=val)
+        self.allocated.add(value=val)
 
     def get_free_count(self) -> int:
         return len(self.free_set)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import inspect
+import time
+from functools import wraps
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from fabric_cf.actor.core.common.constants import Constants
+
+EVENT_QUEUE_DEPTH = Gauge('actor_event_queue_depth', 'Events dequeued by the actor thread in one pass', ['actor'])
+EVENT_SECONDS = Histogram('actor_event_seconds', 'Actor event processing latency', ['event'])
+TICK_SECONDS = Histogram('actor_tick_seconds', 'Actor tick duration', ['actor'])
+RPC_TOTAL = Counter('actor_rpc_total', 'RPCs sent (outbound) and received (inbound)', ['direction', 'type'])
+RPC_SECONDS = Histogram('actor_rpc_seconds', 'RPC latency: enqueue to sent (outbound), dispatch to processed '
+                                             '(inbound)', ['direction', 'type'])
+DB_SECONDS = Histogram('actor_db_seconds', 'Database call latency', ['method'])
+ALLOCATE_SECONDS = Histogram('actor_policy_allocate_seconds', 'Broker policy allocation duration', ['policy'])
+KAFKA_PRODUCE_SECONDS = Histogram('actor_kafka_produce_seconds', 'Kafka produce latency: write (sync) or produce '
+                                                                 'to delivery report (async)', ['mode'])
+
+
+class ActorMetrics:
+    """
+    Prometheus metrics of the actor kernel, RPC and database hot paths; exposed on prometheus.port.
+    Metrics are collected only when enabled (prometheus.metrics in the runtime configuration); when disabled,
+    start returns None and the observe functions return immediately.
+
+    Usage:
+        begin = ActorMetrics.start()
+        ...
+        ActorMetrics.observe_tick(actor=name, begin=begin)
+    """
+    INBOUND = "inbound"
+    OUTBOUND = "outbound"
+    SYNC = "sync"
+    ASYNC = "async"
+
+    enabled = False
+
+    @staticmethod
+    def configure(*, runtime_config: dict):
+        """
+        Enable or disable the metrics as per the runtime configuration
+        @param runtime_config runtime configuration
+        """
+        value = runtime_config.get(Constants.property_conf_prometheus_metrics, False) if runtime_config else False
+        ActorMetrics.enabled = str(value).lower() == 'true'
+
+    @staticmethod
+    def start() -> float:
+        """
+        Return the start time of a measurement
+        @return start time; None if the metrics are disabled
+        """
+        if ActorMetrics.enabled:
+            return time.perf_counter()
+        return None
+
+    @staticmethod
+    def set_event_queue_depth(*, actor: str, depth: int):
+        """
+        Record the number of events dequeued by the actor thread
+        @param actor actor name
+        @param depth number of events
+        """
+        if ActorMetrics.enabled:
+            EVENT_QUEUE_DEPTH.labels(actor=actor).set(depth)
+
+    @staticmethod
+    def observe_event(*, event, begin: float):
+        """
+        Record the processing latency of an actor event
+        @param event event
+        @param begin start time
+        """
+        if begin is not None:
+            EVENT_SECONDS.labels(event=type(event).__name__).observe(time.perf_counter() - begin)
+
+    @staticmethod
+    def observe_tick(*, actor: str, begin: float):
+        """
+        Record the duration of an actor tick
+        @param actor actor name
+        @param begin start time
+        """
+        if begin is not None:
+            TICK_SECONDS.labels(actor=actor).observe(time.perf_counter() - begin)
+
+    @staticmethod
+    def count_rpc(*, direction: str, request_type):
+        """
+        Count an RPC
+        @param direction inbound or outbound
+        @param request_type RPCRequestType
+        """
+        if ActorMetrics.enabled:
+            RPC_TOTAL.labels(direction=direction, type=request_type.name).inc()
+
+    @staticmethod
+    def observe_rpc(*, direction: str, request_type, begin: float):
+        """
+        Record the latency of an RPC
+        @param direction inbound or outbound
+        @param request_type RPCRequestType
+        @param begin start time
+        """
+        if begin is not None:
+            RPC_SECONDS.labels(direction=direction, type=request_type.name).observe(time.perf_counter() - begin)
+
+    @staticmethod
+    def observe_allocate(*, policy, begin: float):
+        """
+        Record the duration of a policy allocation
+        @param policy policy
+        @param begin start time
+        """
+        if begin is not None:
+            ALLOCATE_SECONDS.labels(policy=type(policy).__name__).observe(time.perf_counter() - begin)
+
+    @staticmethod
+    def observe_kafka_produce(*, mode: str, begin: float):
+        """
+        Record the latency of a Kafka produce
+        @param mode sync or async
+        @param begin start time
+        """
+        if begin is not None:
+            KAFKA_PRODUCE_SECONDS.labels(mode=mode).observe(time.perf_counter() - begin)
+
+    @staticmethod
+    def timed_methods(cls):
+        """
+        Class decorator recording the latency of each public method of a database class
+        (static methods and generators are not measured)
+        """
+        for name, method in list(vars(cls).items()):
+            if name.startswith('_') or not inspect.isfunction(method) or inspect.isgeneratorfunction(method):
+                continue
+            setattr(cls, name, ActorMetrics._timed(method=method, name=name))
+        return cls
+
+    @staticmethod
+    def _timed(*, method, name: str):
+        histogram = DB_SECONDS.labels(method=name)
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if not ActorMetrics.enabled:
+                return method(*args, **kwargs)
+            begin = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - begin)
+        return wrapper
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import pickle
+import threading
+import zlib
+
+from fabric_cf.actor.core.apis.i_serializer import ISerializer
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.common.exceptions import SerializerException
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+class Compression:
+    """
+    Compression codecs supported by the ObjectSerializer; the value is stored in the envelope header
+    """
+    Nothing = 0
+    Zlib = 1
+    Zstd = 2
+    Lz4 = 3
+
+    names = {"none": Nothing, "zlib": Zlib, "zstd": Zstd, "lz4": Lz4}
+
+    @staticmethod
+    def from_name(*, name: str) -> int:
+        """
+        Map a configured compression name to the codec id
+        @param name name (none, zlib, zstd, lz4)
+        @return codec id
+        """
+        if name is None:
+            return Compression.Nothing
+        code = Compression.names.get(str(name).lower(), None)
+        if code is None:
+            raise SerializerException("Unsupported compression {}".format(name))
+        if code == Compression.Zstd and zstandard is None:
+            raise SerializerException("Compression {} requires the zstandard package".format(name))
+        if code == Compression.Lz4 and lz4_frame is None:
+            raise SerializerException("Compression {} requires the lz4 package".format(name))
+        return code
+
+    @staticmethod
+    def compress(*, code: int, data: bytes) -> bytes:
+        """
+        Compress data
+        @param code codec id
+        @param data data
+        @return compressed data
+        """
+        if code == Compression.Nothing:
+            return data
+        if code == Compression.Zlib:
+            return zlib.compress(data)
+        if code == Compression.Zstd:
+            return zstandard.ZstdCompressor().compress(data)
+        if code == Compression.Lz4:
+            return lz4_frame.compress(data)
+        raise SerializerException("Unsupported compression {}".format(code))
+
+    @staticmethod
+    def decompress(*, code: int, data: bytes) -> bytes:
+        """
+        Decompress data
+        @param code codec id
+        @param data compressed data
+        @return data
+        """
+        if code == Compression.Nothing:
+            return data
+        if code == Compression.Zlib:
+            return zlib.decompress(data)
+        if code == Compression.Zstd:
+            if zstandard is None:
+                raise SerializerException("zstandard package is required to decode this object")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if code == Compression.Lz4:
+            if lz4_frame is None:
+                raise SerializerException("lz4 package is required to decode this object")
+            return lz4_frame.decompress(data)
+        raise SerializerException("Unsupported compression {}".format(code))
+
+
+class ObjectSerializer(ISerializer):
+    """
+    Versioned serializer for the objects persisted in the database.
+
+    The encoding is a 5 byte header (magic, format version, compression codec) followed by the payload.
+    The payload is the object state as returned by its __getstate__ encoded with the highest pickle protocol.
+    Blobs without the header are decoded as legacy pickle, so existing databases can be read without migration.
+    """
+    MAGIC = b'FCS'
+    VERSION = 1
+    HEADER_LENGTH = len(MAGIC) + 2
+
+    def __init__(self, *, compression: int = Compression.Nothing, compression_threshold: int = 512):
+        """
+        Constructor
+        @param compression compression codec
+        @param compression_threshold payloads smaller than this (in bytes) are not compressed
+        """
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+
+    def serialize(self, *, obj) -> bytes:
+        payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        code = self.compression
+        if code != Compression.Nothing and len(payload) >= self.compression_threshold:
+            payload = Compression.compress(code=code, data=payload)
+        else:
+            code = Compression.Nothing
+        return self.MAGIC + bytes([self.VERSION, code]) + payload
+
+    def deserialize(self, *, data: bytes):
+        if data is None:
+            return None
+        return pickle.loads(self.decode(data=data))
+
+    @staticmethod
+    def decode(*, data: bytes) -> bytes:
+        """
+        Strip the header and decompress the payload; legacy blobs are returned as is
+        @param data serialized object
+        @return pickled object state
+        """
+        data = bytes(data)
+        if not data.startswith(ObjectSerializer.MAGIC):
+            return data
+
+        version = data[len(ObjectSerializer.MAGIC)]
+        if version > ObjectSerializer.VERSION:
+            raise SerializerException("Unsupported serialization version {}".format(version))
+        code = data[len(ObjectSerializer.MAGIC) + 1]
+        return Compression.decompress(code=code, data=data[ObjectSerializer.HEADER_LENGTH:])
+
+    @staticmethod
+    def decode_all(*, data_list: list) -> list:
+        """
+        Decode a list of serialized objects; used to decode in a separate process
+        @param data_list serialized objects
+        @return pickled object states; the result can be passed to deserialize
+        """
+        return [ObjectSerializer.decode(data=data) if data is not None else None for data in data_list]
+
+
+class ObjectSerializerSingleton:
+    """
+    Singleton Class for the ObjectSerializer; configured from the database section of the configuration
+    """
+    __instance = None
+    __lock = threading.Lock()
+
+    def __init__(self):
+        if self.__instance is not None:
+            raise SerializerException("Singleton can't be created twice !")
+
+    @staticmethod
+    def create() -> ObjectSerializer:
+        """
+        Create an ObjectSerializer based on the configuration
+        """
+        compression = Compression.Nothing
+        try:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            config = GlobalsSingleton.get().get_config()
+            if config is not None:
+                db_config = config.get_global_config().get_database()
+                if db_config is not None:
+                    compression = Compression.from_name(
+                        name=db_config.get(Constants.property_conf_db_serializer_compression, None))
+        except SerializerException as e:
+            raise e
+        except Exception:
+            compression = Compression.Nothing
+        return ObjectSerializer(compression=compression)
+
+    def get(self) -> ObjectSerializer:
+        """
+        Actually create an instance
+        """
+        if self.__instance is None:
+            with self.__lock:
+                if self.__instance is None:
+                    self.__instance = self.create()
+        return self.__instance
+
+    get = classmethod(get)
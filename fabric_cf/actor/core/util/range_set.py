@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import bisect
+
+
+class RangeSet:
+    """
+    Set of integers stored as sorted, disjoint, non-adjacent closed ranges [start, end].
+    Membership, add and remove locate the range by binary search (O(log(n)) in the number of
+    ranges); pop always returns the lowest member, which makes allocation deterministic.
+    Contiguous pools (subnets, VLAN ranges) take two list entries regardless of their size.
+    """
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, value: int) -> bool:
+        return self._find(value) != -1
+
+    def __iter__(self):
+        for start, end in zip(self.starts, self.ends):
+            yield from range(start, end + 1)
+
+    def _find(self, value: int) -> int:
+        """
+        Return the index of the range containing value or -1
+        """
+        i = bisect.bisect_right(self.starts, value) - 1
+        if i >= 0 and self.ends[i] >= value:
+            return i
+        return -1
+
+    def add(self, *, value: int):
+        """
+        Add a value; adding an existing member is a no-op
+        @param value value
+        """
+        self.add_range(start=value, end=value)
+
+    def add_range(self, *, start: int, end: int):
+        """
+        Add all values in [start, end], merging with overlapping or adjacent ranges
+        @param start first value
+        @param end last value
+        """
+        if end < start:
+            return
+        # ranges lo..hi-1 overlap or touch [start, end]
+        lo = bisect.bisect_left(self.ends, start - 1)
+        hi = bisect.bisect_right(self.starts, end + 1)
+        covered = 0
+        for i in range(lo, hi):
+            overlap = min(self.ends[i], end) - max(self.starts[i], start) + 1
+            if overlap > 0:
+                covered += overlap
+        new_start = start
+        new_end = end
+        if lo < hi:
+            new_start = min(start, self.starts[lo])
+            new_end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [new_start]
+        self.ends[lo:hi] = [new_end]
+        self.count += end - start + 1 - covered
+
+    def remove(self, *, value: int):
+        """
+        Remove a value
+        @param value value
+        @raises KeyError if value is not a member
+        """
+        i = self._find(value)
+        if i == -1:
+            raise KeyError(value)
+        start = self.starts[i]
+        end = self.ends[i]
+        if start == end:
+            del self.starts[i]
+            del self.ends[i]
+        elif value == start:
+            self.starts[i] = start + 1
+        elif value == end:
+            self.ends[i] = end - 1
+        else:
+            self.ends[i] = value - 1
+            self.starts.insert(i + 1, value + 1)
+            self.ends.insert(i + 1, end)
+        self.count -= 1
+
+    def discard(self, *, value: int):
+        """
+        Remove a value if it is a member
+        @param value value
+        """
+        if value in self:
+            self.remove(value=value)
+
+    def pop(self) -> int:
+        """
+        Remove and return the lowest member
+        @return lowest member
+        @raises KeyError if the set is empty
+        """
+        if self.count == 0:
+            raise KeyError("pop from an empty set")
+        value = self.starts[0]
+        if value == self.ends[0]:
+            del self.starts[0]
+            del self.ends[0]
+        else:
+            self.starts[0] = value + 1
+        self.count -= 1
+        return value
+
+    def clear(self):
+        self.starts.clear()
+        self.ends.clear()
+        self.count = 0
+
+    def get_ranges(self) -> list:
+        """
+        Return the ranges as a list of (start, end) tuples
+        """
+        return list(zip(self.starts, self.ends))
+
+    def __str__(self):
+        return "[{}]".format(",".join(str(s) if s == e else "{}-{}".format(s, e)
+                                      for s, e in zip(self.starts, self.ends)))
@@ -26,6 +26,7 @@
 import bisect
 
 from fabric_cf.actor.core.apis.i_reservation import IReservation
+from fabric_cf.actor.core.util.interval_tree import IntervalTree
 from fabric_cf.actor.core.util.reservation_set import ReservationSet
 from fabric_cf.actor.core.util.resource_type import ResourceType
 from fabric_cf.actor.core.util.utils import binary_search
@@ -39,6 +40,9 @@ class ReservationWrapper:
         self.start = start
         self.end = end
         self.reservation = reservation
+        # Resource type and interval tree key; set when the entry is indexed
+        self.rtype = None
+        self.key = None
 
     def __eq__(self, other):
         if not isinstance(other, ReservationWrapper):
@@ -75,16 +79,21 @@ class ReservationHoldings:
     As time goes by, the class can be purged from irrelevant reservation records
     by invoking tick(). Purging is strongly recommended as it reduces the cost of intersection queries.
 
-    An attempt has been made to optimize the cost of using this data structure.
-    Inserts are O(log(n)). Queries, however, may take between O(log(n)) and O(n).
+    Reservations are indexed in one interval tree per resource type, so that queries
+    filtered by resource type do not touch unrelated entries. Tree inserts and removes are
+    O(log(n)); keeping the end time ordered list for purging makes inserts and removes O(n) overall,
+    as elements are shifted. Intersection queries are O(log(n) + k) where k is the number of reservations
+    returned.
     """
     def __init__(self):
-        # List of reservation wrappers sorted by increasing end time.
+        # List of reservation wrappers sorted by increasing end time. Used for purging.
         self.list = []
         # All reservations stored in this collection.
         self.reservation_set = ReservationSet()
         # Map of reservations to ReservationWrappers. Needed when removing a reservation.
         self.map = {}
+        # Interval tree of reservation wrappers per resource type
+        self.trees = {}
 
     def add_reservation(self, *, reservation: IReservation, start: int, end: int):
         """
@@ -113,11 +122,17 @@ class ReservationHoldings:
 
     def add_to_list(self, *, entry: ReservationWrapper):
         """
-        Adds the entry to the linked list. Maintains the list in sorted order.
-        Cost: O(log(n)).
+        Adds the entry to the sorted list and to the interval tree for its resource type.
+        Cost: O(log(n)) for the tree, plus O(n) for the list insertion.
         @params entry : entry to add
         """
         bisect.insort_left(self.list, entry)
+        entry.rtype = entry.reservation.get_type()
+        tree = self.trees.get(entry.rtype, None)
+        if tree is None:
+            tree = IntervalTree()
+            self.trees[entry.rtype] = tree
+        entry.key = tree.insert(start=entry.start, end=entry.end, value=entry)
 
     def clear(self):
         """
@@ -125,6 +140,7 @@ class ReservationHoldings:
         """
         self.map.clear()
         self.list.clear()
+        self.trees.clear()
         self.reservation_set.clear()
 
     def get_reservations(self, *, time: int = None, rtype: ResourceType = None) -> ReservationSet:
@@ -139,34 +155,21 @@ class ReservationHoldings:
         if time is None and rtype is None:
             return self.reservation_set
 
-        result = ReservationSet()
-        key = ReservationWrapper(reservation=None, start=time, end=time)
-
-        # Find the location of key in the list.
-        index = binary_search(a=self.list, x=key)
-        if index < 0:
-            index = -index -1
-
-        # Scan the upper part of the list. We need to scan the whole list.
-        i = index
-        count = self.size()
-        while i < count:
-            entry = self.list[i]
-
-            if rtype is None or rtype == entry.reservation.getType() and entry.start <= time <= entry.end:
-                result.add(reservation=entry.reservation)
-            i += 1
-
-        # Scan the lower part of the list until no further intersections are possible
-        i = index - 1
-        while i >= 0:
-            entry = self.list[i]
-            if entry.end < time:
-                break
+        if rtype is None:
+            trees = self.trees.values()
+        elif rtype in self.trees:
+            trees = [self.trees[rtype]]
+        else:
+            trees = []
 
-            if entry.start <= time and rtype is None or entry.reservation.getType() == rtype:
+        result = ReservationSet()
+        for tree in trees:
+            if time is None:
+                entries = tree.values()
+            else:
+                entries = tree.search(point=time)
+            for entry in entries:
                 result.add(reservation=entry.reservation)
-            i -= 1
 
         return result
 
@@ -179,6 +182,20 @@ class ReservationHoldings:
 
         if index >= 0:
             self.list.pop(index)
+        self.remove_from_tree(entry=entry)
+
+    def remove_from_tree(self, *, entry: ReservationWrapper):
+        """
+        Removes an entry from the interval tree for its resource type.
+        @params entry : entry to remove
+        """
+        tree = self.trees.get(entry.rtype, None)
+        if tree is None or entry.key is None:
+            return
+        tree.remove(key=entry.key)
+        entry.key = None
+        if len(tree) == 0:
+            self.trees.pop(entry.rtype)
 
     def remove_reservation(self, *, reservation: IReservation):
         """
@@ -203,14 +220,12 @@ class ReservationHoldings:
         Removes all reservations that have end time not after the given cycle.
         @params time : time
         """
-        while True:
-            if len(self.list) > 0:
-                entry = self.list[0]
-                if entry.end <= time:
-                    self.list.remove(entry)
-                    self.reservation_set.remove(reservation=entry.reservation)
-                    self.map.pop(entry.reservation.get_reservation_id())
-                else:
-                    break
-            else:
-                break
+        count = 0
+        while count < len(self.list) and self.list[count].end <= time:
+            entry = self.list[count]
+            self.remove_from_tree(entry=entry)
+            self.reservation_set.remove(reservation=entry.reservation)
+            self.map.pop(entry.reservation.get_reservation_id())
+            count += 1
+        if count > 0:
+            del self.list[:count]
@@ -73,8 +73,9 @@ class ReservationList:
     Cost of operations:
     - Insert: first insert to a cycle O(log(cycles)), subsequent inserts to an
     existing cycle: 0(1)
-    - Remove: 0(1)
-    - Reclaim: 0(k), where k is the number of cycles to reclaim.
+    - Remove: 0(1), O(log(cycles)) when the last reservation of a cycle is removed
+    - Reclaim: 0(log(cycles) + k), where k is the number of reservations to reclaim.
+    - Range queries: O(log(cycles) + k), where k is the number of reservations returned.
     """
 
     def __init__(self):
@@ -82,7 +83,7 @@ class ReservationList:
         Constructor
         """
         self.count = 0
-        # list of ReservationSetWrapper
+        # list of ReservationSetWrapper sorted by cycle
         self.rset_wrapper_list = []
         # map of <int(cycle), ReservationSet>
         self.cycle_to_rset = {}
@@ -132,6 +133,32 @@ class ReservationList:
         entry = ReservationSetWrapper(reservation_set=reservation_set, cycle=cycle)
         bisect.insort(self.rset_wrapper_list, entry)
 
+    def remove_from_list(self, *, cycle: int):
+        """
+        Removes the entry for a cycle from the sorted list
+        @params cycle: cycle
+        """
+        key = ReservationSetWrapper(reservation_set=None, cycle=cycle)
+        index = bisect.bisect_left(self.rset_wrapper_list, key)
+        if index < len(self.rset_wrapper_list) and self.rset_wrapper_list[index].cycle == cycle:
+            self.rset_wrapper_list.pop(index)
+
+    def upper_bound(self, *, cycle: int) -> int:
+        """
+        Returns the number of entries in the sorted list with cycles up to and including the specified cycle
+        @params cycle: cycle
+        """
+        key = ReservationSetWrapper(reservation_set=None, cycle=cycle)
+        return bisect.bisect_right(self.rset_wrapper_list, key)
+
+    def has_reservations(self, *, cycle: int) -> bool:
+        """
+        Checks if any reservation is associated with cycles up to and including the specified cycle
+        @params cycle : cycle
+        @returns true if there are reservations up to the specified cycle
+        """
+        return len(self.rset_wrapper_list) > 0 and self.rset_wrapper_list[0].cycle <= cycle
+
     def get_all_reservations(self, *, cycle: int) -> ReservationSet:
         """
         Returns all reservations associated with cycles up to and including the specified cycle
@@ -140,12 +167,8 @@ class ReservationList:
         Note that removing from the set will not affect the ReservationList
         """
         result = ReservationSet()
-        for entry in self.rset_wrapper_list:
-            if entry.cycle <= cycle:
-                for reservation in entry.reservation_set.values():
-                    result.add(reservation=reservation)
-            else:
-                break
+        for i in range(self.upper_bound(cycle=cycle)):
+            result.reservations.update(self.rset_wrapper_list[i].reservation_set.reservations)
         return result
 
     def get_reservations(self, *, cycle: int) -> ReservationSet:
@@ -178,6 +201,7 @@ class ReservationList:
 
                 if reservation_set.size() == 0:
                     self.cycle_to_rset.pop(cycle)
+                    self.remove_from_list(cycle=cycle)
                 self.count -= 1
 
     def size(self) -> int:
@@ -192,24 +216,18 @@ class ReservationList:
         Removes reservations associated with cycles less than or equal to the given cycle
         @params cycle: cycle
         """
-        while True:
-            if len(self.rset_wrapper_list) > 0:
-                entry = self.rset_wrapper_list[0]
-                if entry.cycle <= cycle:
-                    self.rset_wrapper_list.remove(entry)
-
-                    if entry.cycle in self.cycle_to_rset:
-                        self.cycle_to_rset.pop(entry.cycle)
+        index = self.upper_bound(cycle=cycle)
+        if index == 0:
+            return
 
-                    self.count -= entry.reservation_set.size()
+        for entry in self.rset_wrapper_list[:index]:
+            self.cycle_to_rset.pop(entry.cycle, None)
+            self.count -= entry.reservation_set.size()
+            for rid in entry.reservation_set.reservations.keys():
+                self.reservation_id_to_cycle.pop(rid, None)
+            entry.reservation_set.clear()
 
-                    for reservation in entry.reservation_set.values():
-                        self.reservation_id_to_cycle.pop(reservation.get_reservation_id())
-                    entry.reservation_set.clear()
-                else:
-                    break
-            else:
-                break
+        del self.rset_wrapper_list[:index]
 
     def print(self):
         print("rw_list: {} c_to_r: {} r_to_c: {}".format(len(self.rset_wrapper_list), len(self.cycle_to_rset),
@@ -24,7 +24,7 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 
-from sqlalchemy import JSON, ForeignKey, LargeBinary
+from sqlalchemy import JSON, ForeignKey, LargeBinary, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import Column, String, Integer, Sequence
 
@@ -48,6 +48,8 @@ class Clients(Base):
     Represents Clients Database Table
     """
     __tablename__ = 'Clients'
+    __table_args__ = (Index('clt_act_id_clt_name_idx', 'clt_act_id', 'clt_name'),
+                      Index('clt_act_id_clt_guid_idx', 'clt_act_id', 'clt_guid'))
     clt_id = Column(Integer, Sequence('clt_id', start=1, increment=1), autoincrement=True, primary_key=True)
     clt_act_id = Column(Integer, ForeignKey('Actors.act_id'))
     clt_name = Column(String, nullable=False)
@@ -60,6 +62,7 @@ class ConfigMappings(Base):
     Represents ConfigMappings Database Table
     """
     __tablename__ = 'ConfigMappings'
+    __table_args__ = (Index('cfgm_act_id_cfgm_type_idx', 'cfgm_act_id', 'cfgm_type'),)
     cfgm_id = Column(Integer, Sequence('cfgm_id', start=1, increment=1), autoincrement=True, primary_key=True)
     cfgm_act_id = Column(Integer, ForeignKey('Actors.act_id'))
     cfgm_type = Column(String, nullable=False)
@@ -93,6 +96,7 @@ class Proxies(Base):
     Represents Proxies Database Table
     """
     __tablename__ = 'Proxies'
+    __table_args__ = (Index('prx_act_id_prx_name_idx', 'prx_act_id', 'prx_name'),)
     prx_id = Column(Integer, Sequence('prx_id', start=1, increment=1), autoincrement=True, primary_key=True)
     prx_act_id = Column(Integer, ForeignKey('Actors.act_id'))
     prx_name = Column(String)
@@ -104,6 +108,9 @@ class Reservations(Base):
     Represents Reservations Database Table
     """
     __tablename__ = 'Reservations'
+    __table_args__ = (Index('rsv_resid_rsv_slc_id_idx', 'rsv_resid', 'rsv_slc_id', unique=True),
+                      Index('rsv_slc_id_rsv_state_idx', 'rsv_slc_id', 'rsv_state'),
+                      Index('rsv_slc_id_rsv_category_idx', 'rsv_slc_id', 'rsv_category'))
     rsv_id = Column(Integer, Sequence('rsv_id', start=1, increment=1), autoincrement=True, primary_key=True)
     rsv_graph_id = Column(String, nullable=True)
     rsv_slc_id = Column(Integer, ForeignKey('Slices.slc_id'))
@@ -120,6 +127,8 @@ class Slices(Base):
     Represents Slices Database Table
     """
     __tablename__ = 'Slices'
+    __table_args__ = (Index('slc_act_id_slc_guid_idx', 'slc_act_id', 'slc_guid'),
+                      Index('slc_act_id_slc_type_idx', 'slc_act_id', 'slc_type'))
     slc_id = Column(Integer, Sequence('slc_id', start=1, increment=1), autoincrement=True, primary_key=True)
     slc_graph_id = Column(String, nullable=True)
     slc_guid = Column(String, nullable=False)
@@ -135,6 +144,8 @@ class Units(Base):
     Represents Units Database Table
     """
     __tablename__ = 'Units'
+    __table_args__ = (Index('unt_rsv_id_idx', 'unt_rsv_id'),
+                      Index('unt_act_id_unt_uid_idx', 'unt_act_id', 'unt_uid'))
     unt_id = Column(Integer, Sequence('unt_id', start=1, increment=1), autoincrement=True, primary_key=True)
     unt_uid = Column(String)
     unt_unt_id = Column(Integer, nullable=True)
@@ -163,6 +174,8 @@ class Delegations(Base):
     Represents Delegations Database Table
     """
     __tablename__ = 'Delegations'
+    __table_args__ = (Index('dlg_act_id_dlg_graph_id_idx', 'dlg_act_id', 'dlg_graph_id'),
+                      Index('dlg_slc_id_idx', 'dlg_slc_id'))
     dlg_id = Column(Integer, Sequence('dlg_id', start=1, increment=1), autoincrement=True, primary_key=True)
     dlg_slc_id = Column(Integer, ForeignKey('Slices.slc_id'))
     dlg_act_id = Column(Integer, ForeignKey('Actors.act_id'))
@@ -26,20 +26,22 @@
 import logging
 import pickle
 from contextlib import contextmanager
+from typing import List
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import inspect
 
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.common.exceptions import DatabaseException
+from fabric_cf.actor.core.util.metrics import ActorMetrics
 from fabric_cf.actor.db import Base, Clients, ConfigMappings, Proxies, Units, Reservations, Slices, ManagerObjects, \
     Miscellaneous, Plugins, Actors, Delegations
+from fabric_cf.actor.db.psql_engine_cache import PsqlEngineCache
 
 
 @contextmanager
 def session_scope(psql_db_engine):
     """Provide a transactional scope around a series of operations."""
-    session = scoped_session(sessionmaker(psql_db_engine))
+    session = PsqlEngineCache.get_session_factory(engine=psql_db_engine)()
     try:
         yield session
         session.commit()
@@ -50,26 +52,59 @@ def session_scope(psql_db_engine):
         session.close()
 
 
-
-
-
+@ActorMetrics.timed_methods
 class PsqlDatabase:
     """
     Implements interface to Postgres database
     """
     OBJECT_NOT_FOUND = "{} Not Found {}"
 
-    def __init__(self, *, user: str, password: str, database: str, db_host: str, logger):
+    def __init__(self, *, user: str, password: str, database: str, db_host: str, logger, pool_config: dict = None):
+        """
+        @param pool_config connection pool settings (see PsqlEngineCache.build_engine); only applied by the first
+        instance connecting to this database in the process, later instances share the pooled engine
+        """
         # Connecting to PostgreSQL server at localhost using psycopg2 DBAPI
-        self.db_engine = create_engine("postgresql+psycopg2://{}:{}@{}/{}".format(user, password, db_host, database))
+        self.db_engine = PsqlEngineCache.get_engine(
+            dsn="postgresql+psycopg2://{}:{}@{}/{}".format(user, password, db_host, database),
+            pool_config=pool_config)
         self.logger = logger
 
+    def get_pool_metrics(self) -> dict:
+        """
+        Get connection pool metrics (size, checked out, overflow, wait times) of the shared engine
+        @return pool metrics
+        """
+        return PsqlEngineCache.get_pool_metrics(engine=self.db_engine)
+
     def create_db(self):
         """
         Create the database
         """
         Base.metadata.create_all(self.db_engine)
 
+    def upgrade_db(self):
+        """
+        Upgrade the schema of an existing database: create any missing tables and
+        indexes. Existing objects are left untouched, so this is safe to invoke on every start.
+        """
+        try:
+            Base.metadata.create_all(self.db_engine)
+            inspector = inspect(self.db_engine)
+            for table in Base.metadata.sorted_tables:
+                existing = {idx['name'] for idx in inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name in existing:
+                        continue
+                    try:
+                        self.logger.info("Creating index {} on {}".format(index.name, table.name))
+                        index.create(bind=self.db_engine)
+                    except Exception as e:
+                        self.logger.error("Failed to create index {} on {}: {}".format(index.name, table.name, e))
+        except Exception as e:
+            self.logger.error(Constants.exception_occurred.format(e))
+            raise e
+
     def reset_db(self):
         """
         Reset the database
@@ -434,6 +469,46 @@ class PsqlDatabase:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
 
+    def update_slices(self, *, act_id: int, slices: List[dict]):
+        """
+        Update several slices in a single transaction using a bulk (executemany) update
+        @param act_id actor id
+        @param slices list of dictionaries with keys slc_guid, slc_name, slc_type, slc_resource_type,
+        properties and optionally slc_graph_id
+        """
+        if slices is None or len(slices) == 0:
+            return
+        try:
+            with session_scope(self.db_engine) as session:
+                self.bulk_update_slices(session=session, act_id=act_id, slices=slices)
+        except Exception as e:
+            self.logger.error(Constants.exception_occurred.format(e))
+            raise e
+
+    def bulk_update_slices(self, *, session, act_id: int, slices: List[dict]):
+        """
+        Update several slices within the transaction of the caller
+        @param session session
+        @param act_id actor id
+        @param slices list of dictionaries as passed to update_slices
+        """
+        if slices is None or len(slices) == 0:
+            return
+        slc_ids = {}
+        for row in session.query(Slices.slc_id, Slices.slc_guid).filter(Slices.slc_act_id == act_id).filter(
+                Slices.slc_guid.in_([s['slc_guid'] for s in slices])):
+            slc_ids[row.slc_guid] = row.slc_id
+        mappings = []
+        for slc in slices:
+            slc_id = slc_ids.get(slc['slc_guid'], None)
+            if slc_id is None:
+                self.logger.error(self.OBJECT_NOT_FOUND.format("Slice", slc['slc_guid']))
+                continue
+            mapping = slc.copy()
+            mapping['slc_id'] = slc_id
+            mappings.append(mapping)
+        session.bulk_update_mappings(Slices, mappings)
+
     def remove_slice(self, *, slc_guid: str):
         """
         Remove Slice
@@ -659,6 +734,65 @@ class PsqlDatabase:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
 
+    def update_reservations(self, *, act_id: int, reservations: List[dict]):
+        """
+        Update several reservations in a single transaction using a bulk (executemany) update
+        @param act_id actor id
+        @param reservations list of dictionaries with keys rsv_resid, rsv_category, rsv_state, rsv_pending,
+        rsv_joining and properties
+        """
+        if reservations is None or len(reservations) == 0:
+            return
+        try:
+            with session_scope(self.db_engine) as session:
+                self.bulk_update_reservations(session=session, act_id=act_id, reservations=reservations)
+        except Exception as e:
+            self.logger.error(Constants.exception_occurred.format(e))
+            raise e
+
+    def bulk_update_reservations(self, *, session, act_id: int, reservations: List[dict]):
+        """
+        Update several reservations within the transaction of the caller
+        @param session session
+        @param act_id actor id
+        @param reservations list of dictionaries as passed to update_reservations
+        """
+        if reservations is None or len(reservations) == 0:
+            return
+        rsv_ids = {}
+        for row in self.query_reservations(session=session, act_id=act_id, columns=['rsv_id', 'rsv_resid']).filter(
+                Reservations.rsv_resid.in_([r['rsv_resid'] for r in reservations])):
+            rsv_ids[row.rsv_resid] = row.rsv_id
+        mappings = []
+        for r in reservations:
+            rsv_id = rsv_ids.get(r['rsv_resid'], None)
+            if rsv_id is None:
+                self.logger.error(self.OBJECT_NOT_FOUND.format("Reservation", r['rsv_resid']))
+                continue
+            mapping = r.copy()
+            mapping['rsv_id'] = rsv_id
+            mappings.append(mapping)
+        session.bulk_update_mappings(Reservations, mappings)
+
+    def update_objects(self, *, act_id: int, slices: List[dict], reservations: List[dict],
+                       delegations: List[dict]):
+        """
+        Update slices, reservations and delegations of an actor in a single transaction; either all the
+        updates are committed or none
+        @param act_id actor id
+        @param slices list of dictionaries as passed to update_slices
+        @param reservations list of dictionaries as passed to update_reservations
+        @param delegations list of dictionaries as passed to update_delegations
+        """
+        try:
+            with session_scope(self.db_engine) as session:
+                self.bulk_update_slices(session=session, act_id=act_id, slices=slices)
+                self.bulk_update_reservations(session=session, act_id=act_id, reservations=reservations)
+                self.bulk_update_delegations(session=session, dlg_act_id=act_id, delegations=delegations)
+        except Exception as e:
+            self.logger.error(Constants.exception_occurred.format(e))
+            raise e
+
     def remove_reservation(self, *, rsv_resid: str):
         """
         Remove a reservation
@@ -672,13 +806,17 @@ class PsqlDatabase:
             raise e
 
     @staticmethod
-    def generate_reservation_dict_from_row(row) -> dict:
+    def generate_reservation_dict_from_row(row, columns: List[str] = None) -> dict:
         """
         Generate a dictionary representing a reservation row read from database
         @param row row
+        @param columns columns loaded in the row; all columns if None
         """
         if row is None:
             return None
+        if columns is not None:
+            return {c: getattr(row, c) for c in columns}
+
         rsv_obj = {'rsv_id': row.rsv_id, 'rsv_slc_id': row.rsv_slc_id, 'rsv_resid': row.rsv_resid,
                    'rsv_category': row.rsv_category, 'rsv_state': row.rsv_state,
                    'rsv_pending': row.rsv_pending, 'rsv_joining': row.rsv_joining,
@@ -686,239 +824,246 @@ class PsqlDatabase:
 
         return rsv_obj
 
-    def get_reservations(self, *, act_id: int) -> list:
+    @staticmethod
+    def query_reservations(*, session, act_id: int, slc_guid: str = None, columns: List[str] = None):
+        """
+        Build a query for the reservations of an actor. Slices are joined in the same statement so that the
+        actor (and optionally slice) filter does not need a separate lookup.
+        @param session session
+        @param act_id actor id
+        @param slc_guid slice guid; all slices of the actor if None
+        @param columns reservation columns to load (e.g. ['rsv_resid', 'rsv_state']); all columns if None
+        @return query
+        """
+        if columns is None:
+            query = session.query(Reservations)
+        else:
+            query = session.query(*[getattr(Reservations, c) for c in columns])
+        query = query.join(Slices, Reservations.rsv_slc_id == Slices.slc_id).filter(Slices.slc_act_id == act_id)
+        if slc_guid is not None:
+            query = query.filter(Slices.slc_guid == slc_guid)
+        return query
+
+    def get_reservations(self, *, act_id: int, columns: List[str] = None) -> list:
         """
         Get Reservations for an actor
         @param act_id actor id
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_id_list = self.get_slice_ids(act_id=act_id)
-            if slc_id_list is None or len(slc_id_list) == 0:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", act_id))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(Reservations.rsv_slc_id.in_(slc_id_list)):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, columns=columns):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
-    def get_reservations_by_slice_id(self, *, act_id: int, slc_guid: str) -> list:
+    def get_reservations_by_slice_id(self, *, act_id: int, slc_guid: str, columns: List[str] = None) -> list:
         """
         Get Reservations by slice id
         @param act_id actor id
         @param slc_guid slice guid
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_obj = self.get_slice(act_id=act_id, slice_guid=slc_guid)
-            if slc_obj is None:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", slc_guid))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(Reservations.rsv_slc_id == slc_obj['slc_id']):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, slc_guid=slc_guid,
+                                                   columns=columns):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
-    def get_reservations_by_state(self, *, act_id: int, rsv_state: int) -> list:
+    def stream_reservations(self, *, act_id: int, slc_types: List[int] = None, exclude_states: List[int] = None,
+                            batch_size: int = 1000):
+        """
+        Stream the reservations of an actor ordered by slice. Rows are read through a server side cursor so only
+        batch_size rows are held in memory at a time.
+        @param act_id actor id
+        @param slc_types only return reservations in slices of these types; all slices if None
+        @param exclude_states reservation states to skip (e.g. Closed); nothing is skipped if None
+        @param batch_size number of rows fetched per round trip
+        @return generator of reservations
+        """
+        try:
+            with session_scope(self.db_engine) as session:
+                query = self.query_reservations(session=session, act_id=act_id)
+                if slc_types is not None:
+                    query = query.filter(Slices.slc_type.in_(slc_types))
+                if exclude_states is not None and len(exclude_states) > 0:
+                    query = query.filter(Reservations.rsv_state.notin_(exclude_states))
+                query = query.order_by(Reservations.rsv_slc_id, Reservations.rsv_id)
+                for row in query.execution_options(stream_results=True).yield_per(batch_size):
+                    yield self.generate_reservation_dict_from_row(row)
+        except Exception as e:
+            self.logger.error(Constants.exception_occurred.format(e))
+            raise e
+
+    def get_reservations_by_state(self, *, act_id: int, rsv_state: int, columns: List[str] = None) -> list:
         """
         Get Reservations for an actor by stats
         @param act_id actor id
         @param rsv_state state
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_id_list = self.get_slice_ids(act_id=act_id)
-            if slc_id_list is None or len(slc_id_list) == 0:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", act_id))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(
-                        Reservations.rsv_state == rsv_state).filter(Reservations.rsv_slc_id.in_(slc_id_list)):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, columns=columns).filter(
+                        Reservations.rsv_state == rsv_state):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
-    def get_reservations_by_slice_id_state(self, *, act_id: int, slc_guid: str, rsv_state: int) -> list:
+    def get_reservations_by_slice_id_state(self, *, act_id: int, slc_guid: str, rsv_state: int,
+                                           columns: List[str] = None) -> list:
         """
         Get Reservations for an actor by slice id and state
         @param act_id actor id
         @param slc_guid slice guid
         @param rsv_state state
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_obj = self.get_slice(act_id=act_id, slice_guid=slc_guid)
-            if slc_obj is None:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", slc_guid))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(Reservations.rsv_state == rsv_state).filter(
-                        Reservations.rsv_slc_id == slc_obj['slc_id']):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, slc_guid=slc_guid,
+                                                   columns=columns).filter(Reservations.rsv_state == rsv_state):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
-    def get_reservations_by_2_category(self, *, act_id: int, rsv_cat1: int, rsv_cat2: int) -> list:
+    def get_reservations_by_2_category(self, *, act_id: int, rsv_cat1: int, rsv_cat2: int,
+                                       columns: List[str] = None) -> list:
         """
         Get Reservations for an actor by categories
         @param act_id actor id
         @param rsv_cat1 category 1
         @param rsv_cat2 category 2
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_id_list = self.get_slice_ids(act_id=act_id)
-            if slc_id_list is None or len(slc_id_list) == 0:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", act_id))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(
-                        Reservations.rsv_category == rsv_cat1 or Reservations.rsv_category == rsv_cat2).filter(
-                            Reservations.rsv_slc_id.in_(slc_id_list)):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, columns=columns).filter(
+                        Reservations.rsv_category.in_([rsv_cat1, rsv_cat2])):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
-    def get_reservations_by_category(self, *, act_id: int, rsv_cat: int) -> list:
+    def get_reservations_by_category(self, *, act_id: int, rsv_cat: int, columns: List[str] = None) -> list:
         """
         Get Reservations for an actor by category
         @param act_id actor id
         @param rsv_cat category
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_id_list = self.get_slice_ids(act_id=act_id)
-            if slc_id_list is None or len(slc_id_list) == 0:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", act_id))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(
-                        Reservations.rsv_category == rsv_cat).filter(
-                            Reservations.rsv_slc_id.in_(slc_id_list)):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, columns=columns).filter(
+                        Reservations.rsv_category == rsv_cat):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
     def get_reservations_by_slice_id_by_2_category(self, *, act_id: int, slc_guid: str, rsv_cat1: int,
-                                                   rsv_cat2: int) -> list:
+                                                   rsv_cat2: int, columns: List[str] = None) -> list:
         """
         Get Reservations for an actor by slice id and categories
         @param act_id actor id
         @param slc_guid slice guid
         @param rsv_cat1 category 1
         @param rsv_cat2 category 2
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_obj = self.get_slice(act_id=act_id, slice_guid=slc_guid)
-            if slc_obj is None:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", slc_guid))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(
-                        Reservations.rsv_slc_id == slc_obj['slc_id']).filter(
-                            Reservations.rsv_category == rsv_cat1 or Reservations.rsv_category == rsv_cat2):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, slc_guid=slc_guid,
+                                                   columns=columns).filter(
+                        Reservations.rsv_category.in_([rsv_cat1, rsv_cat2])):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
-    def get_reservations_by_slice_id_by_category(self, *, act_id: int, slc_guid: str, rsv_cat: int) -> list:
+    def get_reservations_by_slice_id_by_category(self, *, act_id: int, slc_guid: str, rsv_cat: int,
+                                                 columns: List[str] = None) -> list:
         """
         Get Reservations for an actor by slice id and category
         @param act_id actor id
         @param slc_guid slice guid
         @param rsv_cat category
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_obj = self.get_slice(act_id=act_id, slice_guid=slc_guid)
-            if slc_obj is None:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", slc_guid))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(Reservations.rsv_slc_id == slc_obj['slc_id']).filter(
-                        Reservations.rsv_category == rsv_cat):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, slc_guid=slc_guid,
+                                                   columns=columns).filter(Reservations.rsv_category == rsv_cat):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
-    def get_reservation(self, *, act_id: int, rsv_resid: str) -> dict:
+    def get_reservation(self, *, act_id: int, rsv_resid: str, columns: List[str] = None) -> dict:
         """
         Get Reservation for an actor
         @param act_id actor id
         @param rsv_resid reservation guid
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = None
         try:
-            slc_id_list = self.get_slice_ids(act_id=act_id)
-            if slc_id_list is None or len(slc_id_list) == 0:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", act_id))
             with session_scope(self.db_engine) as session:
-                rsv_obj = session.query(Reservations).filter(
-                    Reservations.rsv_resid == rsv_resid).filter(Reservations.rsv_slc_id.in_(slc_id_list)).first()
+                rsv_obj = self.query_reservations(session=session, act_id=act_id, columns=columns).filter(
+                    Reservations.rsv_resid == rsv_resid).first()
                 if rsv_obj is None:
                     raise DatabaseException(self.OBJECT_NOT_FOUND.format("Reservation", rsv_resid))
-                result = self.generate_reservation_dict_from_row(rsv_obj)
-                if rsv_obj.rsv_joining is not None:
-                    result['rsv_joining'] = rsv_obj.rsv_joining
+                result = self.generate_reservation_dict_from_row(rsv_obj, columns=columns)
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
         return result
 
-    def get_reservations_by_rids(self, *, act_id: int, rsv_resid_list: list) -> list:
+    def get_reservations_by_rids(self, *, act_id: int, rsv_resid_list: list, columns: List[str] = None) -> list:
         """
         Get Reservations for an actor by reservation ids
         @param act_id actor id
         @param rsv_resid_list reservation guid list
+        @param columns columns to load; all columns if None
         @return list of reservations
         """
         result = []
         try:
-            slc_id_list = self.get_slice_ids(act_id=act_id)
-            if slc_id_list is None or len(slc_id_list) == 0:
-                raise DatabaseException(self.OBJECT_NOT_FOUND.format("Slice", act_id))
             with session_scope(self.db_engine) as session:
-                for row in session.query(Reservations).filter(
-                        Reservations.rsv_resid.in_(rsv_resid_list)).filter(Reservations.rsv_slc_id.in_(slc_id_list)):
-                    rsv_obj = self.generate_reservation_dict_from_row(row)
-                    result.append(rsv_obj.copy())
-                    rsv_obj.clear()
+                for row in self.query_reservations(session=session, act_id=act_id, columns=columns).filter(
+                        Reservations.rsv_resid.in_(rsv_resid_list)):
+                    result.append(self.generate_reservation_dict_from_row(row, columns=columns))
         except Exception as e:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
@@ -1484,6 +1629,46 @@ class PsqlDatabase:
             self.logger.error(Constants.exception_occurred.format(e))
             raise e
 
+    def update_delegations(self, *, dlg_act_id: int, delegations: List[dict]):
+        """
+        Update several delegations in a single transaction using a bulk (executemany) update
+        @param dlg_act_id actor id
+        @param delegations list of dictionaries with keys dlg_graph_id, dlg_state and properties
+        """
+        if delegations is None or len(delegations) == 0:
+            return
+        try:
+            with session_scope(self.db_engine) as session:
+                self.bulk_update_delegations(session=session, dlg_act_id=dlg_act_id, delegations=delegations)
+        except Exception as e:
+            self.logger.error(Constants.exception_occurred.format(e))
+            raise e
+
+    def bulk_update_delegations(self, *, session, dlg_act_id: int, delegations: List[dict]):
+        """
+        Update several delegations within the transaction of the caller
+        @param session session
+        @param dlg_act_id actor id
+        @param delegations list of dictionaries as passed to update_delegations
+        """
+        if delegations is None or len(delegations) == 0:
+            return
+        dlg_ids = {}
+        for row in session.query(Delegations.dlg_id, Delegations.dlg_graph_id).filter(
+                Delegations.dlg_act_id == dlg_act_id).filter(
+                Delegations.dlg_graph_id.in_([d['dlg_graph_id'] for d in delegations])):
+            dlg_ids[row.dlg_graph_id] = row.dlg_id
+        mappings = []
+        for dlg in delegations:
+            dlg_id = dlg_ids.get(dlg['dlg_graph_id'], None)
+            if dlg_id is None:
+                self.logger.error(self.OBJECT_NOT_FOUND.format("Delegation", dlg['dlg_graph_id']))
+                continue
+            mapping = dlg.copy()
+            mapping['dlg_id'] = dlg_id
+            mappings.append(mapping)
+        session.bulk_update_mappings(Delegations, mappings)
+
     def remove_delegation(self, *, dlg_graph_id: str):
         """
         Remove delegation
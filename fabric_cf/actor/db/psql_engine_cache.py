@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool which keeps track of the time callers spend waiting for a connection
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        begin = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.monotonic() - begin
+            with self.wait_lock:
+                self.wait_count += 1
+                self.wait_time_total += elapsed
+                if elapsed > self.wait_time_max:
+                    self.wait_time_max = elapsed
+
+    def recreate(self):
+        # Pool is recreated on invalidation (e.g. after database restart); carry the counters over
+        result = super().recreate()
+        result.wait_count = self.wait_count
+        result.wait_time_total = self.wait_time_total
+        result.wait_time_max = self.wait_time_max
+        return result
+
+    def get_metrics(self) -> dict:
+        """
+        Return pool metrics
+        @return dictionary with pool size, checked out connections, overflow and wait times (in seconds)
+        """
+        with self.wait_lock:
+            avg_wait = self.wait_time_total / self.wait_count if self.wait_count > 0 else 0.0
+            return {'size': self.size(), 'checked_in': self.checkedin(), 'checked_out': self.checkedout(),
+                    'overflow': self.overflow(), 'wait_count': self.wait_count,
+                    'wait_time_avg': avg_wait, 'wait_time_max': self.wait_time_max}
+
+
+class PsqlEngineCache:
+    """
+    Process wide cache of SQLAlchemy engines keyed by DSN. All PsqlDatabase instances pointing to the same
+    database share one engine (and hence one connection pool) and one session factory. Pool settings are applied
+    when the engine for a DSN is first created.
+    """
+    DEFAULT_POOL_SIZE = 5
+    DEFAULT_MAX_OVERFLOW = 10
+    DEFAULT_POOL_TIMEOUT = 30
+    DEFAULT_POOL_RECYCLE = 3600
+    DEFAULT_POOL_PRE_PING = True
+
+    lock = threading.Lock()
+    engines = {}
+    session_factories = {}
+
+    @staticmethod
+    def build_engine(*, dsn: str, pool_size: int = DEFAULT_POOL_SIZE, max_overflow: int = DEFAULT_MAX_OVERFLOW,
+                     pool_timeout: int = DEFAULT_POOL_TIMEOUT, pool_recycle: int = DEFAULT_POOL_RECYCLE,
+                     pool_pre_ping: bool = DEFAULT_POOL_PRE_PING, statement_timeout_ms: int = None) -> Engine:
+        """
+        Create an engine with an instrumented connection pool
+        @param dsn database url
+        @param pool_size number of connections kept open
+        @param max_overflow number of connections allowed above pool_size
+        @param pool_timeout seconds to wait for a connection before giving up
+        @param pool_recycle seconds after which connections are recycled
+        @param pool_pre_ping test connections for liveness on checkout
+        @param statement_timeout_ms server side statement timeout in milliseconds
+        @return engine
+        """
+        connect_args = {}
+        if statement_timeout_ms is not None:
+            connect_args['options'] = "-c statement_timeout={}".format(int(statement_timeout_ms))
+        return create_engine(dsn, poolclass=InstrumentedQueuePool, pool_size=pool_size, max_overflow=max_overflow,
+                             pool_timeout=pool_timeout, pool_recycle=pool_recycle, pool_pre_ping=pool_pre_ping,
+                             connect_args=connect_args)
+
+    @staticmethod
+    def get_engine(*, dsn: str, pool_config: dict = None) -> Engine:
+        """
+        Get the engine for a DSN, creating it if needed
+        @param dsn database url
+        @param pool_config pool settings (keyword arguments of build_engine) used if the engine is created
+        @return engine
+        """
+        with PsqlEngineCache.lock:
+            engine = PsqlEngineCache.engines.get(dsn, None)
+            if engine is None:
+                if pool_config is None:
+                    pool_config = {}
+                engine = PsqlEngineCache.build_engine(dsn=dsn, **pool_config)
+                PsqlEngineCache.engines[dsn] = engine
+                PsqlEngineCache.session_factories[engine] = sessionmaker(bind=engine)
+            return engine
+
+    @staticmethod
+    def get_session_factory(*, engine: Engine) -> sessionmaker:
+        """
+        Get the session factory bound to an engine
+        @param engine engine
+        @return session factory
+        """
+        with PsqlEngineCache.lock:
+            factory = PsqlEngineCache.session_factories.get(engine, None)
+            if factory is None:
+                factory = sessionmaker(bind=engine)
+                PsqlEngineCache.session_factories[engine] = factory
+            return factory
+
+    @staticmethod
+    def get_pool_metrics(*, engine: Engine) -> dict:
+        """
+        Get connection pool metrics for an engine
+        @param engine engine
+        @return pool metrics or None if the engine does not use an instrumented pool
+        """
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            return engine.pool.get_metrics()
+        return None
+
+    @staticmethod
+    def dispose():
+        """
+        Close all pooled connections and clear the cache
+        """
+        with PsqlEngineCache.lock:
+            for engine in PsqlEngineCache.engines.values():
+                engine.dispose()
+            PsqlEngineCache.engines.clear()
+            PsqlEngineCache.session_factories.clear()
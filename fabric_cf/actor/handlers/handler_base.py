@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+from abc import abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fabric_cf.actor.core.plugins.config.config_token import ConfigToken
+
+
+class HandlerBase:
+    """
+    Base class for the handlers configuring the substrate for a resource type. Handlers are
+    registered per resource type (handler module/class in the resource pool configuration) and
+    invoked by the HandlerProcessor on its worker threads.
+    - Each method returns a dict of result properties (may be None); the result code defaults to ok
+    - Raising an exception fails the action
+    - The unit must be treated as read only; the handler must not block indefinitely
+    """
+    def __init__(self):
+        self.logger = None
+        self.properties = {}
+
+    def set_logger(self, *, logger):
+        """
+        Set the logger
+        @param logger logger
+        """
+        self.logger = logger
+
+    def set_properties(self, *, properties: dict):
+        """
+        Set the handler properties from the resource pool configuration
+        @param properties properties
+        """
+        self.properties = properties if properties is not None else {}
+
+    @abstractmethod
+    def create(self, *, unit: ConfigToken, properties: dict) -> dict:
+        """
+        Configure (provision) the unit
+        @param unit unit
+        @param properties configuration properties
+        @return result properties
+        @throws Exception in case of error
+        """
+
+    @abstractmethod
+    def delete(self, *, unit: ConfigToken, properties: dict) -> dict:
+        """
+        Release the unit
+        @param unit unit
+        @param properties configuration properties
+        @return result properties
+        @throws Exception in case of error
+        """
+
+    @abstractmethod
+    def modify(self, *, unit: ConfigToken, properties: dict) -> dict:
+        """
+        Modify the unit
+        @param unit unit
+        @param properties configuration properties
+        @return result properties
+        @throws Exception in case of error
+        """
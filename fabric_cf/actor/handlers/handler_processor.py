@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+from __future__ import annotations
+
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from fabric_cf.actor.core.plugins.config.config import Config
+from fabric_cf.actor.core.util.reflection_utils import ReflectionUtils
+
+if TYPE_CHECKING:
+    from fabric_cf.actor.core.plugins.base_plugin import BasePlugin
+    from fabric_cf.actor.core.plugins.config.config_token import ConfigToken
+    from fabric_cf.actor.core.plugins.config.configuration_mapping import ConfigurationMapping
+    from fabric_cf.actor.handlers.handler_base import HandlerBase
+
+
+class HandlerAction:
+    """
+    Configuration action (create/delete/modify) on a unit
+    """
+    def __init__(self, *, target: str, token: ConfigToken, properties: dict, handler: HandlerBase,
+                 resource_type: str, concurrency: int, timeout: float):
+        self.target = target
+        self.token = token
+        self.properties = properties
+        self.handler = handler
+        self.resource_type = resource_type
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.unit_id = str(token.get_id())
+        self.sequence = token.get_sequence()
+        self.timer = None
+        self.done = False
+
+    def __str__(self):
+        return "{} unit: {} type: {} sequence: {}".format(self.target, self.unit_id, self.resource_type,
+                                                          self.sequence)
+
+
+class HandlerProcessor:
+    """
+    Executes the configuration actions of the substrate on a bounded pool of worker threads and delivers
+    their completions through BasePlugin.configuration_complete (processed on the actor thread).
+    - At most `concurrency` actions per resource type run at a time (handler.concurrency in the handler
+      properties overrides the default; 0 is only bounded by the number of workers)
+    - Actions on the same unit run one at a time, in the order in which they were submitted
+    - Actions running longer than `timeout` seconds (handler.timeout overrides the default; 0 disables)
+      fail; the late result of the handler is discarded
+    - Cancelled actions fail; the result of a cancelled running action is discarded
+    - Resource types without a handler (or whose handler cannot be loaded) complete immediately
+    - With 0 workers, actions run on the calling thread
+    """
+    DEFAULT_WORKERS = 8
+    DEFAULT_CONCURRENCY = 0
+    DEFAULT_TIMEOUT = 0
+
+    property_concurrency = "handler.concurrency"
+    property_timeout = "handler.timeout"
+
+    def __init__(self, *, plugin: BasePlugin, logger, workers: int = DEFAULT_WORKERS,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT):
+        self.plugin = plugin
+        self.logger = logger
+        self.workers = workers
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.executor = None
+        if workers > 0:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="HandlerProcessor")
+        # resource type -> handler (None if the handler could not be loaded)
+        self.handlers = {}
+        # resource type -> actions waiting for a slot
+        self.queued = {}
+        # resource type -> number of running actions
+        self.running = {}
+        # unit id -> queued or running actions of the unit
+        self.unit_actions = {}
+        self.busy_units = set()
+        self.stopped = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+
+    def get_handler(self, *, mapping: ConfigurationMapping) -> HandlerBase:
+        """
+        Return the handler for a configuration mapping; handlers are loaded once per resource type
+        @param mapping configuration mapping
+        @return handler or None if the handler could not be loaded
+        """
+        key = mapping.get_key()
+        with self.lock:
+            if key in self.handlers:
+                return self.handlers[key]
+        handler = None
+        try:
+            handler = ReflectionUtils.create_instance(module_name=mapping.get_module_name(),
+                                                      class_name=mapping.get_class_name())
+            if hasattr(handler, 'set_logger'):
+                handler.set_logger(logger=self.logger)
+            if hasattr(handler, 'set_properties'):
+                handler.set_properties(properties=mapping.get_properties())
+        except Exception as e:
+            self.logger.error("Could not load handler {}.{} for resource type {}, configuration actions on "
+                              "this resource type complete without a handler: {}".format(
+                                mapping.get_module_name(), mapping.get_class_name(), key, e))
+            handler = None
+        with self.lock:
+            return self.handlers.setdefault(key, handler)
+
+    def submit(self, *, target: str, token: ConfigToken, properties: dict, mapping: ConfigurationMapping = None):
+        """
+        Submit a configuration action
+        @param target action (Config.target_create/target_delete/target_modify)
+        @param token unit
+        @param properties configuration properties
+        @param mapping configuration mapping for the resource type of the unit
+        """
+        handler = self.get_handler(mapping=mapping) if mapping is not None else None
+        concurrency = self.concurrency
+        timeout = self.timeout
+        if mapping is not None and mapping.get_properties() is not None:
+            handler_properties = mapping.get_properties()
+            concurrency = int(handler_properties.get(self.property_concurrency, concurrency))
+            timeout = float(handler_properties.get(self.property_timeout, timeout))
+
+        action = HandlerAction(target=target, token=token, properties=properties, handler=handler,
+                               resource_type=str(token.get_resource_type()), concurrency=concurrency,
+                               timeout=timeout)
+        with self.lock:
+            self.submitted += 1
+
+        if handler is None:
+            self._finish(action=action, result=self._make_result(action=action))
+            return
+
+        if self.executor is None:
+            self._execute(action=action)
+            return
+
+        with self.lock:
+            if self.stopped:
+                stopped = True
+            else:
+                stopped = False
+                self.queued.setdefault(action.resource_type, deque()).append(action)
+                self.unit_actions.setdefault(action.unit_id, []).append(action)
+                runnable = self._next_runnable(resource_type=action.resource_type)
+
+        if stopped:
+            self._finish(action=action, result=self._make_result(action=action, code=Config.result_code_exception,
+                                                                 message="Handler processor is stopped"))
+            return
+        self._dispatch(actions=runnable)
+
+    def _next_runnable(self, *, resource_type: str) -> list:
+        """
+        Dequeue the actions of a resource type that can start; must be called with the lock held
+        @param resource_type resource type
+        @return actions to start
+        """
+        queue = self.queued.get(resource_type)
+        if queue is None or len(queue) == 0:
+            return []
+        result = []
+        skipped = deque()
+        while len(queue) > 0:
+            action = queue[0]
+            if 0 < action.concurrency <= self.running.get(resource_type, 0):
+                break
+            queue.popleft()
+            if action.unit_id in self.busy_units:
+                skipped.append(action)
+                continue
+            self.busy_units.add(action.unit_id)
+            self.running[resource_type] = self.running.get(resource_type, 0) + 1
+            result.append(action)
+        queue.extendleft(reversed(skipped))
+        return result
+
+    def _dispatch(self, *, actions: list):
+        for action in actions:
+            try:
+                self.executor.submit(self._execute, action=action)
+            except RuntimeError as e:
+                # executor shut down
+                self._release(action=action)
+                self._finish(action=action, result=self._make_result(action=action,
+                                                                     code=Config.result_code_exception,
+                                                                     message=str(e)))
+
+    def _execute(self, *, action: HandlerAction):
+        with self.lock:
+            # cancelled or timed out while waiting for a worker
+            if action.done:
+                return
+            if self.executor is not None and action.timeout > 0:
+                action.timer = threading.Timer(action.timeout, self._expire, kwargs={'action': action})
+                action.timer.daemon = True
+                action.timer.start()
+        try:
+            self.logger.debug("Executing {}".format(action))
+            method = getattr(action.handler, action.target)
+            handler_result = method(unit=action.token, properties=action.properties)
+            result = self._make_result(action=action, handler_result=handler_result)
+        except Exception as e:
+            self.logger.error("Error executing {}: {}".format(action, e))
+            result = self._make_result(action=action, code=Config.result_code_exception, message=str(e),
+                                       stack=traceback.format_exc())
+        # a timed out or cancelled action has already completed
+        if self.executor is None or self._release(action=action):
+            self._finish(action=action, result=result)
+
+    def _expire(self, *, action: HandlerAction):
+        self.logger.error("Timed out after {} seconds: {}".format(action.timeout, action))
+        if self._release(action=action):
+            with self.lock:
+                self.timed_out += 1
+            self._finish(action=action, result=self._make_result(
+                action=action, code=Config.result_code_exception,
+                message="Configuration action timed out after {} seconds".format(action.timeout)))
+
+    def _release(self, *, action: HandlerAction) -> bool:
+        """
+        Release the slot of a running or queued action and start the next runnable actions
+        @param action action
+        @return True if the action had not been released before
+        """
+        with self.lock:
+            if action.done:
+                return False
+            action.done = True
+            if action.timer is not None:
+                action.timer.cancel()
+            queue = self.queued.get(action.resource_type)
+            if queue is not None and action in queue:
+                queue.remove(action)
+            elif action.unit_id in self.busy_units:
+                self.busy_units.discard(action.unit_id)
+                self.running[action.resource_type] -= 1
+            unit_actions = self.unit_actions.get(action.unit_id)
+            if unit_actions is not None:
+                if action in unit_actions:
+                    unit_actions.remove(action)
+                if len(unit_actions) == 0:
+                    self.unit_actions.pop(action.unit_id)
+            runnable = [] if self.stopped else self._next_runnable(resource_type=action.resource_type)
+        self._dispatch(actions=runnable)
+        return True
+
+    def _finish(self, *, action: HandlerAction, result: dict):
+        """
+        Deliver the completion of an action to the plugin
+        @param action action
+        @param result result properties
+        """
+        with self.lock:
+            self.completed += 1
+            if result.get(Config.property_target_result_code) != Config.result_code_ok:
+                self.failed += 1
+        self.plugin.configuration_complete(token=action.token, properties=result)
+
+    @staticmethod
+    def _make_result(*, action: HandlerAction, handler_result: dict = None, code: int = Config.result_code_ok,
+                     message: str = None, stack: str = None) -> dict:
+        result = {}
+        if handler_result is not None:
+            result.update(handler_result)
+        result.setdefault(Config.property_target_result_code, code)
+        if code != Config.result_code_ok:
+            result[Config.property_target_result_code] = code
+        if message is not None:
+            result[Config.property_exception_message] = message
+        if stack is not None:
+            result[Config.property_exception_stack] = stack
+        result[Config.property_target_name] = action.target
+        result[Config.property_action_sequence_number] = action.sequence
+        return result
+
+    def cancel(self, *, token: ConfigToken) -> int:
+        """
+        Cancel the queued and running actions on a unit; cancelled actions fail
+        @param token unit
+        @return number of actions cancelled
+        """
+        with self.lock:
+            actions = list(self.unit_actions.get(str(token.get_id()), []))
+        count = 0
+        for action in actions:
+            if self._release(action=action):
+                count += 1
+                with self.lock:
+                    self.cancelled += 1
+                self._finish(action=action, result=self._make_result(action=action,
+                                                                     code=Config.result_code_exception,
+                                                                     message="Configuration action cancelled"))
+        return count
+
+    def shutdown(self, *, wait: bool = True):
+        """
+        Stop the processor; queued actions are cancelled, running actions complete
+        @param wait wait for the running actions to complete
+        """
+        with self.lock:
+            self.stopped = True
+            queued = [action for queue in self.queued.values() for action in queue]
+        for action in queued:
+            self.cancel(token=action.token)
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+
+    def get_metrics(self) -> dict:
+        """
+        Return the action counters
+        """
+        with self.lock:
+            return {'workers': self.workers,
+                    'submitted': self.submitted,
+                    'completed': self.completed,
+                    'failed': self.failed,
+                    'timed_out': self.timed_out,
+                    'cancelled': self.cancelled,
+                    'queued': sum(len(queue) for queue in self.queued.values()),
+                    'running': sum(self.running.values())}
@@ -23,14 +23,20 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import copy
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from enum import Enum
 from typing import List
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from fabric_cf.actor.core.apis.i_actor import ActorType
+from fabric_cf.actor.core.common.constants import Constants
 
 
 class PdpAuthException(Exception):
@@ -72,10 +78,106 @@ class ActionId(Enum):
     relinquish = 16
 
 
+class PdpDecisionCache:
+    """
+    Bounded cache of PDP decisions; entries expire after ttl seconds and the least recently used entry is evicted
+    when the cache is full. A ttl of 0 disables the cache.
+    """
+    DEFAULT_TTL = 60
+    DEFAULT_SIZE = 10000
+
+    def __init__(self, *, ttl: int = DEFAULT_TTL, size: int = DEFAULT_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, *, ttl: int, size: int):
+        """
+        Update the ttl and the maximum size
+        @param ttl ttl in seconds
+        @param size maximum number of entries
+        """
+        with self.lock:
+            self.ttl = ttl
+            self.size = size
+            if self.ttl <= 0:
+                self.entries.clear()
+            while len(self.entries) > max(self.size, 0):
+                self.entries.popitem(last=False)
+
+    def get(self, *, key: tuple):
+        """
+        Return the cached decision
+        @param key key
+        @return tuple of decision and PDP response; None if not cached or expired
+        """
+        with self.lock:
+            if self.ttl <= 0:
+                return None
+            entry = self.entries.get(key, None)
+            if entry is not None and entry[0] < time.monotonic():
+                self.entries.pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, *, key: tuple, decision: bool, response: dict):
+        """
+        Cache a decision
+        @param key key
+        @param decision True for Permit
+        @param response PDP response
+        """
+        with self.lock:
+            if self.ttl <= 0 or self.size <= 0:
+                return
+            self.entries[key] = (time.monotonic() + self.ttl, (decision, response))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get_metrics(self) -> dict:
+        """
+        Return the cache counters
+        @return dictionary containing hits, misses, hit rate and size
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                    "size": len(self.entries)}
+
+
 class PdpAuth:
     """
     Responsible for Authorization against PDP
+
+    Requests to the PDP share a keep-alive HTTP session and decisions are cached in a process wide
+    PdpDecisionCache keyed on the subject, roles and projects of the token, the action and the resource.
     """
+    POOL_SIZE = 10
+
+    session = None
+    session_lock = threading.Lock()
+    decision_cache = PdpDecisionCache()
+    request_templates = {}
+    metrics_lock = threading.Lock()
+    pdp_requests = 0
+    pdp_latency_total = 0.0
+    pdp_latency_last = 0.0
+    pdp_latency_max = 0.0
+
     co_manage_project_leads_project = 'project-leads'
     project_lead_role = 'projectLead'
 
@@ -116,6 +218,47 @@ class PdpAuth:
         self.project_member = "projectMember:{}"
         self.config = config
         self.logger = logger
+        if config is not None:
+            PdpAuth.decision_cache.configure(
+                ttl=config.get(Constants.property_conf_pdp_decision_cache_ttl, PdpDecisionCache.DEFAULT_TTL),
+                size=config.get(Constants.property_conf_pdp_decision_cache_size, PdpDecisionCache.DEFAULT_SIZE))
+
+    @staticmethod
+    def get_session() -> requests.Session:
+        """
+        Returns the HTTP session shared by all PDP requests so that connections are kept alive
+        """
+        with PdpAuth.session_lock:
+            if PdpAuth.session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PdpAuth.POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                PdpAuth.session = session
+            return PdpAuth.session
+
+    @staticmethod
+    def get_metrics() -> dict:
+        """
+        Return the decision cache and PDP request counters
+        @return dictionary containing cache hits, misses, hit rate, size and PDP request count and latencies (seconds)
+        """
+        result = PdpAuth.decision_cache.get_metrics()
+        with PdpAuth.metrics_lock:
+            result["pdp_requests"] = PdpAuth.pdp_requests
+            result["pdp_latency_last"] = PdpAuth.pdp_latency_last
+            result["pdp_latency_max"] = PdpAuth.pdp_latency_max
+            result["pdp_latency_avg"] = PdpAuth.pdp_latency_total / PdpAuth.pdp_requests \
+                if PdpAuth.pdp_requests > 0 else 0.0
+        return result
+
+    @staticmethod
+    def record_latency(*, latency: float):
+        with PdpAuth.metrics_lock:
+            PdpAuth.pdp_requests += 1
+            PdpAuth.pdp_latency_total += latency
+            PdpAuth.pdp_latency_last = latency
+            PdpAuth.pdp_latency_max = max(PdpAuth.pdp_latency_max, latency)
 
     @staticmethod
     def _headers() -> dict:
@@ -245,10 +388,13 @@ class PdpAuth:
         else:
             raise PdpAuthException("Invalid Actor Type: {}".format(actor_type))
 
-        request_json = None
-        with open(request_file) as f:
-            request_json = json.load(f)
-            f.close()
+        request_json = PdpAuth.request_templates.get(request_file, None)
+        if request_json is None:
+            with open(request_file) as f:
+                request_json = json.load(f)
+                f.close()
+            PdpAuth.request_templates[request_file] = request_json
+        request_json = copy.deepcopy(request_json)
 
         ## Subject
         categories = request_json[PdpAuth.request][PdpAuth.category]
@@ -289,24 +435,56 @@ class PdpAuth:
         @raises PdpAuthException in case of denied access or failure
         """
 
-        pdp_request = self.build_pdp_request(fabric_token=fabric_token, actor_type=actor_type,
-                                             action_id=action_id, resource_type=resource_type, resource_id=resource_id)
+        key = self.get_cache_key(fabric_token=fabric_token, actor_type=actor_type, action_id=action_id,
+                                 resource_type=resource_type, resource_id=resource_id)
+        cached = PdpAuth.decision_cache.get(key=key)
+
+        if cached is not None:
+            decision, response_json = cached
+            if self.logger is not None:
+                self.logger.debug("PDP cached response: {}".format(response_json))
+        else:
+            pdp_request = self.build_pdp_request(fabric_token=fabric_token, actor_type=actor_type,
+                                                 action_id=action_id, resource_type=resource_type,
+                                                 resource_id=resource_id)
 
-        self.logger.debug("PDP Auth Request: {}".format(pdp_request))
+            if self.logger is not None:
+                self.logger.debug("PDP Auth Request: {}".format(pdp_request))
 
-        response = requests.post(url=self.config['url'], headers=self._headers(), json=pdp_request)
+            start = time.perf_counter()
+            response = self.get_session().post(url=self.config[Constants.property_conf_pdp_url],
+                                               headers=self._headers(), json=pdp_request)
+            PdpAuth.record_latency(latency=time.perf_counter() - start)
 
-        if response.status_code != 200:
-            raise PdpAuthException('Authorization check failure: {}'.format(response))
+            if response.status_code != 200:
+                raise PdpAuthException('Authorization check failure: {}'.format(response))
+
+            response_json = response.json()
+            decision = response_json["Response"][0]["Decision"] == "Permit"
+            PdpAuth.decision_cache.put(key=key, decision=decision, response=response_json)
 
-        if response.json()["Response"][0]["Decision"] == "Permit":
             if self.logger is not None:
-                self.logger.debug("PDP response: {}".format(response.json()))
+                self.logger.debug("PDP response: {}".format(response_json))
+
+        if decision:
             return True
-        else:
-            if self.logger is not None:
-                self.logger.debug("PDP response: {}".format(response.json()))
-            raise PdpAuthException('Authorization check failure: {}'.format(response.json()))
+        raise PdpAuthException('Authorization check failure: {}'.format(response_json))
+
+    def get_cache_key(self, *, fabric_token: dict, actor_type: ActorType, action_id: ActionId,
+                      resource_type: ResourceType, resource_id: str = None) -> tuple:
+        """
+        Return the decision cache key for a request; includes everything from the token that is sent to the PDP
+        @param fabric_token fabric token
+        @param actor_type actor type
+        @param action_id action id
+        @param resource_type resource type
+        @param resource_id resource id
+        @return key
+        """
+        roles = tuple(sorted(self.get_roles(fabric_token=fabric_token)))
+        projects = json.dumps(fabric_token.get('projects', fabric_token.get('project', None)), sort_keys=True)
+        return (fabric_token.get(PdpAuth.email, None), roles, projects, actor_type, action_id, resource_type,
+                resource_id)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Measures the throughput of incoming reservation RPC events for many concurrent slices when processed serially on
+the actor thread and when sharded by slice id. Each event spends io_ms outside the kernel (e.g. waiting on
+the database or the PDP) and then updates shared state under a single lock standing in for the kernel lock; a
+barrier (tick) is inserted every TICK_EVERY events as done by Actor.actor_main.
+
+Usage: python -m fabric_cf.actor.test.benchmark.actor_event_shards_benchmark [shards...]
+"""
+import logging
+import sys
+import threading
+import time
+
+from fabric_cf.actor.core.apis.i_actor_event import IActorEvent
+from fabric_cf.actor.core.kernel.actor_event_shards import ActorEventShards
+
+
+class BenchmarkEvent(IActorEvent):
+    """
+    Event for a slice: blocking work outside the kernel followed by a kernel update
+    """
+    def __init__(self, *, benchmark, slice_id: int, sequence: int):
+        self.benchmark = benchmark
+        self.slice_id = slice_id
+        self.sequence = sequence
+
+    def process(self):
+        time.sleep(self.benchmark.io_ms / 1000)
+        with self.benchmark.kernel_lock:
+            last = self.benchmark.last.get(self.slice_id, -1)
+            if last + 1 != self.sequence:
+                self.benchmark.out_of_order += 1
+            self.benchmark.last[self.slice_id] = self.sequence
+            total = 0
+            for i in range(self.benchmark.kernel_work):
+                total += i
+
+
+class ActorEventShardsBenchmark:
+    """
+    Compares serial and sharded processing of reservation RPC events
+    """
+    SLICES = 500
+    EVENTS_PER_SLICE = 4
+    TICK_EVERY = 200
+
+    def __init__(self, *, io_ms: float = 2.0, kernel_work: int = 2000):
+        self.logger = logging.getLogger(__name__)
+        self.io_ms = io_ms
+        self.kernel_work = kernel_work
+        self.kernel_lock = threading.RLock()
+        self.last = {}
+        self.out_of_order = 0
+
+    def make_events(self) -> list:
+        """
+        Create the events; the events for different slices are interleaved
+        """
+        events = []
+        for sequence in range(self.EVENTS_PER_SLICE):
+            for slice_id in range(self.SLICES):
+                events.append(BenchmarkEvent(benchmark=self, slice_id=slice_id, sequence=sequence))
+        return events
+
+    def run(self, *, shards: int):
+        """
+        Process all events with the given number of shards (0: serially)
+        @param shards number of shards
+        """
+        self.last = {}
+        self.out_of_order = 0
+        events = self.make_events()
+        event_shards = None
+        if shards > 0:
+            event_shards = ActorEventShards(shards=shards, logger=self.logger)
+            event_shards.start()
+
+        begin = time.time()
+        for count, e in enumerate(events, 1):
+            if event_shards is not None:
+                event_shards.submit(key=e.slice_id, event=e)
+            else:
+                e.process()
+            if count % self.TICK_EVERY == 0 and event_shards is not None:
+                event_shards.wait_idle()
+        if event_shards is not None:
+            event_shards.wait_idle()
+        elapsed = time.time() - begin
+
+        barrier_wait = 0.0
+        if event_shards is not None:
+            barrier_wait = event_shards.get_metrics()['barrier_wait_max']
+            event_shards.shutdown()
+
+        print("Shards: {:>3} slices: {:>5} events: {:>6} time: {:8.3f} s throughput: {:9.1f} events/s "
+              "max barrier wait: {:6.3f} s out of order: {}".format(shards, self.SLICES, len(events), elapsed,
+                                                                   len(events) / elapsed, barrier_wait,
+                                                                   self.out_of_order))
+
+
+if __name__ == '__main__':
+    shard_counts = [int(s) for s in sys.argv[1:]] or [0, 1, 4, 8, 16]
+    benchmark = ActorEventShardsBenchmark()
+    for s in shard_counts:
+        benchmark.run(shards=s)
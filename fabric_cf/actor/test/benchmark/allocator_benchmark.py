@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares memory, pickled size and allocate/free throughput of the range set backed IPv4Set
+and FreeAllocatedSet against plain Python sets for a /16 subnet and a 4094 tag VLAN pool.
+
+Usage: python -m fabric_cf.actor.test.benchmark.allocator_benchmark
+"""
+import ipaddress
+import pickle
+import time
+import tracemalloc
+
+from fabric_cf.actor.core.policy.free_allocated_set import FreeAllocatedSet
+from fabric_cf.actor.core.util.ipv4_set import IPv4Set
+
+
+class SetPool:
+    """
+    Baseline pool keeping every free and allocated item in a Python set; IP pools convert
+    items to and from dotted strings like IPv4Set
+    """
+    def __init__(self, *, start: int, end: int, ip: bool = False):
+        self.free_set = set(range(start, end + 1))
+        self.allocated = set()
+        self.ip = ip
+
+    def allocate(self):
+        item = self.free_set.pop()
+        self.allocated.add(item)
+        if self.ip:
+            return str(ipaddress.ip_address(item))
+        return item
+
+    def free(self, *, item):
+        if self.ip:
+            item = int(ipaddress.ip_address(item))
+        self.allocated.remove(item)
+        self.free_set.add(item)
+
+
+class AllocatorBenchmark:
+    """
+    Builds each pool, then allocates half of it and frees every other allocated item
+    """
+    SUBNET = "10.0.0.1/16"
+    SUBNET_START = 167772161
+    SUBNET_END = 167837694
+    VLAN_START = 1
+    VLAN_END = 4094
+
+    @staticmethod
+    def measure(*, name: str, build, allocate, free, size: int):
+        tracemalloc.start()
+        begin = time.time()
+        pool = build()
+        build_time = time.time() - begin
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        pickled = len(pickle.dumps(pool))
+
+        count = size // 2
+        begin = time.time()
+        items = [allocate(pool) for i in range(count)]
+        for item in items[::2]:
+            free(pool, item)
+        ops_time = time.time() - begin
+
+        print("  {:<18} build: {:8.3f} ms memory: {:10d} B pickled: {:10d} B {:10.0f} ops/s".format(
+            name, build_time * 1000, memory, pickled, (count + len(items[::2])) / ops_time))
+
+    def run(self):
+        size = self.SUBNET_END - self.SUBNET_START + 1
+        print("IPv4 pool {} ({} addresses)".format(self.SUBNET, size))
+        self.measure(name="set", build=lambda: SetPool(start=self.SUBNET_START, end=self.SUBNET_END, ip=True),
+                     allocate=lambda p: p.allocate(), free=lambda p, i: p.free(item=i), size=size)
+        self.measure(name="IPv4Set", build=lambda: IPv4Set(ip_list=self.SUBNET),
+                     allocate=lambda p: p.allocate(), free=lambda p, i: p.free(ip=i), size=size)
+
+        size = self.VLAN_END - self.VLAN_START + 1
+        print("VLAN pool {}-{} ({} tags)".format(self.VLAN_START, self.VLAN_END, size))
+
+        def build_tags():
+            tags = FreeAllocatedSet()
+            tags.add_inventory_range(start=self.VLAN_START, end=self.VLAN_END)
+            return tags
+
+        self.measure(name="set", build=lambda: SetPool(start=self.VLAN_START, end=self.VLAN_END),
+                     allocate=lambda p: p.allocate(), free=lambda p, i: p.free(item=i), size=size)
+        self.measure(name="FreeAllocatedSet", build=build_tags,
+                     allocate=lambda p: p.allocate(), free=lambda p, i: p.free(item=i), size=size)
+
+
+if __name__ == '__main__':
+    AllocatorBenchmark().run()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Measures ADM merge and BQM query latency of the in-memory Combined Broker Model backend for a multi-site
+model. Every site is a copy of the sample site ADM (config/neo4j) with its own node ids; the sample
+network ADM is merged once. The Neo4j backend needs a running Neo4j instance and is not measured here.
+
+Usage: python -m fabric_cf.actor.test.benchmark.cbm_query_benchmark [sites...]
+"""
+import io
+import logging
+import os
+import sys
+import time
+
+import networkx as nx
+
+from fabric_cf.actor.core.policy.memory_cbm_backend import InMemoryCBMBackend
+
+GRAPH_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "config", "neo4j")
+
+
+class GraphMLADM:
+    """
+    ADM given as GraphML
+    """
+    def __init__(self, *, graph_id: str, graph_str: str):
+        self.graph_id = graph_id
+        self.graph_str = graph_str
+
+    def serialize_graph(self) -> str:
+        return self.graph_str
+
+
+class CBMQueryBenchmark:
+    """
+    Merges a number of site ADMs and measures query() latency
+    """
+    QUERIES = 20
+
+    @staticmethod
+    def read(*, file_name: str) -> str:
+        with open(os.path.join(GRAPH_DIR, file_name), 'r') as f:
+            return f.read()
+
+    @staticmethod
+    def make_site(*, graph_str: str, site: int) -> GraphMLADM:
+        """
+        Copy the sample site ADM giving all of its nodes site specific ids
+        """
+        graph = nx.read_graphml(io.BytesIO(graph_str.encode('utf-8')))
+        for n, props in graph.nodes(data=True):
+            props[InMemoryCBMBackend.NODE_ID] = "{}-site{}".format(props[InMemoryCBMBackend.NODE_ID], site)
+        return GraphMLADM(graph_id="adm-site{}".format(site), graph_str="\n".join(nx.generate_graphml(graph)))
+
+    def run(self, *, sites: int):
+        """
+        Run the benchmark for a model with the given number of sites
+        @param sites number of sites
+        """
+        backend = InMemoryCBMBackend(logger=logging.getLogger(__name__), snapshot=False)
+        backend.load()
+        site_str = self.read(file_name="site-am-2broker-ad-enumerated.graphml")
+        adms = [self.make_site(graph_str=site_str, site=i) for i in range(sites)]
+        adms.append(GraphMLADM(graph_id="adm-net", graph_str=self.read(file_name="network-am-ad-enumerated.graphml")))
+
+        begin = time.time()
+        for adm in adms:
+            backend.merge_adm(adm=adm)
+        merge_time = (time.time() - begin) / len(adms)
+
+        begin = time.time()
+        size = 0
+        for i in range(self.QUERIES):
+            size = len(backend.get_bqm(some=5))
+        query_time = (time.time() - begin) / self.QUERIES
+
+        print("Sites: {:>4} nodes: {:>6} merge: {:8.3f} ms/adm query: {:8.3f} ms bqm bytes: {:>9}".format(
+            sites, backend.graph.number_of_nodes(), merge_time * 1000, query_time * 1000, size))
+
+
+if __name__ == '__main__':
+    counts = [int(s) for s in sys.argv[1:]] or [5, 30, 100]
+    benchmark = CBMQueryBenchmark()
+    for c in counts:
+        benchmark.run(sites=c)
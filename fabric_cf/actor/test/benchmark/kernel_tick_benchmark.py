@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares the cost of selecting the reservations to visit on a kernel tick by scanning every reservation
+against the incremental ReservationIndex, for a population where only a small fraction is busy.
+
+Usage: python -m fabric_cf.actor.test.benchmark.kernel_tick_benchmark [sizes...]
+"""
+import logging
+import sys
+import time
+
+from fabric_cf.actor.core.kernel.client_reservation_factory import ClientReservationFactory
+from fabric_cf.actor.core.kernel.reservation_index import ReservationIndex
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates, JoinState
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.reservation_set import ReservationSet
+
+
+class KernelTickBenchmark:
+    """
+    Measures reservation selection per tick with and without the reservation index
+    """
+    # One in BUSY_RATIO reservations has a pending operation
+    BUSY_RATIO = 100
+    TICKS = 20
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def make_reservations(self, *, size: int, index: ReservationIndex) -> ReservationSet:
+        """
+        Create size client reservations, mostly active and idle
+        @param size number of reservations
+        @param index reservation index
+        """
+        result = ReservationSet()
+        for i in range(size):
+            reservation = ClientReservationFactory.create(rid=ID())
+            reservation.set_logger(logger=self.logger)
+            result.add(reservation=reservation)
+            reservation.set_index(index=index)
+            pending = ReservationPendingStates.ExtendingTicket if i % self.BUSY_RATIO == 0 \
+                else ReservationPendingStates.None_
+            reservation.transition_with_join(prefix="bench", state=ReservationStates.Active, pending=pending,
+                                             join_state=JoinState.NoJoin)
+        return result
+
+    @staticmethod
+    def full_scan(*, reservations: ReservationSet) -> int:
+        """
+        Selection as done by a tick that visits every reservation
+        """
+        visited = 0
+        for reservation in reservations.values():
+            if not reservation.is_probe_idle():
+                visited += 1
+        for reservation in reservations.values():
+            if reservation.is_closed():
+                visited += 1
+        for reservation in reservations.values():
+            if not reservation.is_terminal() and (reservation.is_nascent() or not reservation.is_no_pending()):
+                break
+        return visited
+
+    @staticmethod
+    def indexed(*, index: ReservationIndex) -> int:
+        """
+        Selection as done by a tick using the reservation index
+        """
+        visited = 0
+        for reservation in index.get_probe_reservations():
+            index.update(reservation=reservation)
+            visited += 1
+        visited += len(index.get_closed_reservations())
+        index.has_pending()
+        return visited
+
+    def run(self, *, size: int):
+        """
+        Run the benchmark for a population of size reservations
+        @param size number of reservations
+        """
+        index = ReservationIndex()
+        reservations = self.make_reservations(size=size, index=index)
+
+        begin = time.time()
+        for i in range(self.TICKS):
+            self.full_scan(reservations=reservations)
+        scan_time = (time.time() - begin) / self.TICKS
+
+        begin = time.time()
+        for i in range(self.TICKS):
+            self.indexed(index=index)
+        index_time = (time.time() - begin) / self.TICKS
+
+        print("Reservations: {:>7} busy: {:>5} full scan: {:8.3f} ms/tick indexed: {:8.3f} ms/tick".format(
+            size, len(index.probe), scan_time * 1000, index_time * 1000))
+
+
+if __name__ == '__main__':
+    sizes = [int(s) for s in sys.argv[1:]] or [10000, 100000]
+    benchmark = KernelTickBenchmark()
+    for s in sizes:
+        benchmark.run(size=s)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares encode/decode time and bytes on disk of the ObjectSerializer (per compression codec) against plain
+pickle for a synthetic reservation population.
+
+Usage: python -m fabric_cf.actor.test.benchmark.object_serializer_benchmark [sizes...]
+"""
+import pickle
+import sys
+import time
+
+from fabric_cf.actor.core.kernel.client_reservation_factory import ClientReservationFactory
+from fabric_cf.actor.core.kernel.resource_set import ResourceSet
+from fabric_cf.actor.core.kernel.slice_factory import SliceFactory
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializer, Compression
+from fabric_cf.actor.core.util.resource_type import ResourceType
+
+
+class ObjectSerializerBenchmark:
+    """
+    Serializes a population of reservations with each available codec
+    """
+    RESERVATIONS_PER_SLICE = 10
+
+    @staticmethod
+    def make_reservations(*, size: int) -> list:
+        """
+        Create size client reservations spread over slices of RESERVATIONS_PER_SLICE reservations
+        @param size number of reservations
+        """
+        result = []
+        slice_obj = None
+        for i in range(size):
+            if i % ObjectSerializerBenchmark.RESERVATIONS_PER_SLICE == 0:
+                slice_obj = SliceFactory.create(slice_id=ID(), name="slice-{}".format(i))
+            rtype = ResourceType(resource_type=["VM", "Baremetal", "L2Bridge"][i % 3])
+            rset = ResourceSet(units=1 + i % 4, rtype=rtype)
+            result.append(ClientReservationFactory.create(rid=ID(), resources=rset, slice_object=slice_obj))
+        return result
+
+    @staticmethod
+    def measure(*, name: str, encode, decode, objects: list):
+        """
+        Time encoding and decoding of all objects and print the result
+        """
+        begin = time.time()
+        blobs = [encode(o) for o in objects]
+        encode_time = time.time() - begin
+        begin = time.time()
+        for b in blobs:
+            decode(b)
+        decode_time = time.time() - begin
+        total = sum(len(b) for b in blobs)
+        print("{:<8} encode: {:8.3f} ms decode: {:8.3f} ms bytes: {:>10} avg bytes: {:>7}".format(
+            name, encode_time * 1000, decode_time * 1000, total, total // max(len(blobs), 1)))
+
+    def run(self, *, size: int):
+        """
+        Run the benchmark for a population of size reservations
+        @param size number of reservations
+        """
+        objects = self.make_reservations(size=size)
+        print("Reservations: {}".format(size))
+        self.measure(name="pickle", encode=pickle.dumps, decode=pickle.loads, objects=objects)
+        for name in Compression.names.keys():
+            try:
+                serializer = ObjectSerializer(compression=Compression.from_name(name=name))
+            except Exception as e:
+                print("{:<8} skipped: {}".format(name, e))
+                continue
+            self.measure(name=name, encode=lambda o: serializer.serialize(obj=o),
+                         decode=lambda b: serializer.deserialize(data=b), objects=objects)
+
+
+if __name__ == '__main__':
+    sizes = [int(s) for s in sys.argv[1:]] or [1000, 10000]
+    benchmark = ObjectSerializerBenchmark()
+    for s in sizes:
+        benchmark.run(size=s)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Measures reservation/slice/unit lookup latency against table size, with and without the secondary
+indexes declared in fabric_cf.actor.db. Requires a reachable Postgres instance (same defaults as the unit tests).
+
+Usage: python -m fabric_cf.actor.test.benchmark.psql_database_benchmark [db_host] [sizes...]
+"""
+import logging
+import pickle
+import sys
+import time
+
+from fabric_cf.actor.db import Base, Actors, Slices, Reservations, Units
+from fabric_cf.actor.db.psql_database import PsqlDatabase, session_scope
+
+
+class PsqlDatabaseBenchmark:
+    """
+    Populates the database with a synthetic reservation population and times the hot lookups
+    """
+    RESERVATIONS_PER_SLICE = 10
+    LOOKUPS = 200
+
+    def __init__(self, *, db_host: str = '127.0.0.1:5432'):
+        self.logger = logging.getLogger('PsqlDatabaseBenchmark')
+        self.db = PsqlDatabase(user='fabric', password='fabric', database='test', db_host=db_host,
+                               logger=self.logger)
+        self.act_id = None
+
+    def populate(self, *, size: int):
+        """
+        Reset the database and insert size reservations (with one unit each)
+        @param size number of reservations
+        """
+        self.db.create_db()
+        self.db.reset_db()
+        properties = pickle.dumps({'benchmark': 'x' * 256})
+        self.db.add_actor(name="benchmark-actor", guid="benchmark-guid", act_type=1, properties=properties)
+        self.act_id = self.db.get_actor(name="benchmark-actor")['act_id']
+
+        slices = size // self.RESERVATIONS_PER_SLICE
+        with session_scope(self.db.db_engine) as session:
+            session.bulk_insert_mappings(Slices, [{'slc_act_id': self.act_id, 'slc_guid': "slice-{}".format(s),
+                                                   'slc_name': "slice-{}".format(s), 'slc_type': 1,
+                                                   'slc_resource_type': "vm", 'properties': properties}
+                                                  for s in range(slices)])
+        slc_ids = {row['slc_guid']: row['slc_id'] for row in self.db.get_slices(act_id=self.act_id)}
+        with session_scope(self.db.db_engine) as session:
+            session.bulk_insert_mappings(Reservations, [
+                {'rsv_slc_id': slc_ids["slice-{}".format(r // self.RESERVATIONS_PER_SLICE)],
+                 'rsv_resid': "rsv-{}".format(r), 'rsv_category': r % 3, 'rsv_state': r % 8,
+                 'rsv_pending': 0, 'rsv_joining': 0, 'properties': properties}
+                for r in range(slices * self.RESERVATIONS_PER_SLICE)])
+        with session_scope(self.db.db_engine) as session:
+            rsv_ids = [row.rsv_id for row in session.query(Reservations.rsv_id)]
+            session.bulk_insert_mappings(Units, [{'unt_uid': "unit-{}".format(r), 'unt_act_id': self.act_id,
+                                                  'unt_rsv_id': r, 'unt_type': 1, 'unt_state': 1,
+                                                  'properties': properties} for r in rsv_ids])
+        with self.db.db_engine.connect() as conn:
+            conn.execute("ANALYZE")
+
+    def drop_indexes(self):
+        """
+        Drop all secondary indexes
+        """
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(bind=self.db.db_engine)
+
+    def measure(self, *, size: int) -> dict:
+        """
+        Time the lookups; returns average latency per operation in milliseconds
+        @param size number of reservations present
+        """
+        slices = size // self.RESERVATIONS_PER_SLICE
+        operations = {
+            'get_reservation': lambda i: self.db.get_reservation(act_id=self.act_id,
+                                                                 rsv_resid="rsv-{}".format(i % size)),
+            'get_reservations_by_slice_id_state': lambda i: self.db.get_reservations_by_slice_id_state(
+                act_id=self.act_id, slc_guid="slice-{}".format(i % slices), rsv_state=i % 8),
+            'get_units': lambda i: self.db.get_units(act_id=self.act_id, rsv_resid="rsv-{}".format(i % size)),
+            'get_unit': lambda i: self.db.get_unit(act_id=self.act_id, unt_uid="unit-{}".format(i % size))
+        }
+        result = {}
+        for name, operation in operations.items():
+            begin = time.perf_counter()
+            for i in range(self.LOOKUPS):
+                operation(i * 7919)
+            result[name] = (time.perf_counter() - begin) * 1000 / self.LOOKUPS
+        return result
+
+    def run(self, *, sizes: list):
+        """
+        Run the benchmark for each table size
+        @param sizes list of reservation counts
+        """
+        print("{:>8} {:<36} {:>12} {:>12}".format("rows", "operation", "before(ms)", "after(ms)"))
+        for size in sizes:
+            self.populate(size=size)
+            self.drop_indexes()
+            before = self.measure(size=size)
+            self.db.upgrade_db()
+            after = self.measure(size=size)
+            for name in before:
+                print("{:>8} {:<36} {:>12.3f} {:>12.3f}".format(size, name, before[name], after[name]))
+        self.db.reset_db()
+
+
+if __name__ == '__main__':
+    host = sys.argv[1] if len(sys.argv) > 1 else '127.0.0.1:5432'
+    counts = [int(x) for x in sys.argv[2:]] if len(sys.argv) > 2 else [1000, 10000, 100000]
+    PsqlDatabaseBenchmark(db_host=host).run(sizes=counts)
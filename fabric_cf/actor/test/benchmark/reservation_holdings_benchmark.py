@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares intersection queries on ReservationHoldings (interval tree per resource type) against
+a linear scan of the end-time sorted list, with and without a resource type filter.
+
+Usage: python -m fabric_cf.actor.test.benchmark.reservation_holdings_benchmark [sizes...]
+"""
+import random
+import sys
+import time
+
+from fabric_cf.actor.core.kernel.client_reservation_factory import ClientReservationFactory
+from fabric_cf.actor.core.kernel.resource_set import ResourceSet
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.reservation_holdings import ReservationHoldings
+from fabric_cf.actor.core.util.resource_type import ResourceType
+
+
+class ReservationHoldingsBenchmark:
+    """
+    Measures active-at-time queries over a population of reservations
+    """
+    QUERIES = 200
+    RESOURCE_TYPES = ["VM", "Baremetal", "L2Bridge", "FABNetv4", "Switch"]
+    # Reservations start within HORIZON and last at most MAX_LENGTH
+    HORIZON = 1000000
+    MAX_LENGTH = 10000
+
+    def __init__(self):
+        self.random = random.Random(0)
+        self.rtypes = [ResourceType(resource_type=t) for t in self.RESOURCE_TYPES]
+
+    def make_holdings(self, *, size: int) -> ReservationHoldings:
+        holdings = ReservationHoldings()
+        for i in range(size):
+            rset = ResourceSet(units=1, rtype=self.rtypes[i % len(self.rtypes)])
+            reservation = ClientReservationFactory.create(rid=ID(), resources=rset)
+            start = self.random.randint(0, self.HORIZON)
+            holdings.add_reservation(reservation=reservation, start=start,
+                                     end=start + self.random.randint(1, self.MAX_LENGTH))
+        return holdings
+
+    @staticmethod
+    def scan(*, holdings: ReservationHoldings, time: int, rtype: ResourceType) -> int:
+        """
+        Linear scan over all entries ending at or after time
+        """
+        count = 0
+        for entry in holdings.list:
+            if entry.end >= time and entry.start <= time and (rtype is None or rtype == entry.rtype):
+                count += 1
+        return count
+
+    def run(self, *, size: int):
+        """
+        Run the benchmark for a population of size reservations
+        @param size number of reservations
+        """
+        begin = time.time()
+        holdings = self.make_holdings(size=size)
+        build_time = time.time() - begin
+        points = [self.random.randint(0, self.HORIZON) for i in range(self.QUERIES)]
+
+        print("Reservations: {} build: {:8.3f} ms".format(size, build_time * 1000))
+        for rtype in [None, self.rtypes[0]]:
+            begin = time.time()
+            for p in points:
+                self.scan(holdings=holdings, time=p, rtype=rtype)
+            scan_time = (time.time() - begin) / self.QUERIES
+
+            begin = time.time()
+            for p in points:
+                holdings.get_reservations(time=p, rtype=rtype)
+            tree_time = (time.time() - begin) / self.QUERIES
+
+            print("  rtype: {:<5} scan: {:8.3f} ms/query interval tree: {:8.3f} ms/query".format(
+                str(rtype), scan_time * 1000, tree_time * 1000))
+
+
+if __name__ == '__main__':
+    sizes = [int(s) for s in sys.argv[1:]] or [10000, 100000]
+    benchmark = ReservationHoldingsBenchmark()
+    for s in sizes:
+        benchmark.run(size=s)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+"""
+Compares host selection through the VmmPool capacity index against a linear scan of the pool
+for each placement strategy, on a site where most hosts are already full.
+
+Usage: python -m fabric_cf.actor.test.benchmark.vmm_placement_benchmark [hosts...]
+"""
+import sys
+import time
+
+from fabric_cf.actor.core.core.unit import Unit
+from fabric_cf.actor.core.policy.vm_control import Vmm, VmmPool
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.resource_type import ResourceType
+
+
+class VmmPlacementBenchmark:
+    """
+    Places single VMs on a pool whose first FULL_FRACTION of hosts are full
+    """
+    CAPACITY = 16
+    FULL_FRACTION = 0.9
+    PLACEMENTS = 1000
+
+    def make_pool(self, *, hosts: int, placement: str) -> VmmPool:
+        pool = VmmPool(rtype=ResourceType(resource_type="site.vm"), properties={}, placement=placement)
+        for i in range(hosts):
+            vmm = Vmm(host=Unit(uid=ID()), capacity=self.CAPACITY)
+            pool.donate(vm=vmm)
+            if i < hosts * self.FULL_FRACTION:
+                for j in range(self.CAPACITY):
+                    vmm.host(vm=Unit(uid=ID()))
+        return pool
+
+    @staticmethod
+    def scan(*, pool: VmmPool) -> Vmm:
+        """
+        Linear first-fit scan as done before the capacity index
+        """
+        for vmm in pool.get_vmm_set():
+            if vmm.get_available() > 0:
+                return vmm
+        return None
+
+    def run(self, *, hosts: int):
+        """
+        Run the benchmark for a pool of hosts
+        @param hosts number of hosts
+        """
+        print("Hosts: {} capacity: {} full: {:.0f}%".format(hosts, self.CAPACITY, self.FULL_FRACTION * 100))
+        pool = self.make_pool(hosts=hosts, placement=VmmPool.PLACEMENT_FIRST_FIT)
+        begin = time.time()
+        for i in range(self.PLACEMENTS):
+            self.scan(pool=pool).host(vm=Unit(uid=ID()))
+        scan_time = time.time() - begin
+        print("  {:<10} {:10.0f} placements/s".format("scan", self.PLACEMENTS / scan_time))
+
+        for placement in VmmPool.PLACEMENTS:
+            pool = self.make_pool(hosts=hosts, placement=placement)
+            begin = time.time()
+            for i in range(self.PLACEMENTS):
+                pool.select().host(vm=Unit(uid=ID()))
+            index_time = time.time() - begin
+            print("  {:<10} {:10.0f} placements/s".format(placement, self.PLACEMENTS / index_time))
+
+
+if __name__ == '__main__':
+    sizes = [int(s) for s in sys.argv[1:]] or [1000, 5000]
+    benchmark = VmmPlacementBenchmark()
+    for s in sizes:
+        benchmark.run(hosts=s)
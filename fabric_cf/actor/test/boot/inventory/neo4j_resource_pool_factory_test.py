@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import gc
+import logging
+import unittest
+from unittest import mock
+
+from fabric_cf.actor.boot.inventory.neo4j_resource_pool_factory import Neo4jResourcePoolFactory
+
+
+class Neo4jResourcePoolFactoryTest(unittest.TestCase):
+    # nothing listens on this port: connectivity checks fail, sessions are created lazily
+    neo4j_config = {"url": "bolt://127.0.0.1:1", "user": "neo4j", "pass": "password", "import_host_dir": "/tmp",
+                    "import_dir": "/tmp", "health_check_interval": 0}
+
+    def setUp(self):
+        self.patcher = mock.patch.object(Neo4jResourcePoolFactory, 'get_neo4j_config',
+                                         return_value=(self.neo4j_config, logging.getLogger(__name__)))
+        self.patcher.start()
+
+    def tearDown(self):
+        Neo4jResourcePoolFactory.close_neo4j_importer()
+        self.patcher.stop()
+
+    @staticmethod
+    def is_closed(driver) -> bool:
+        try:
+            driver.session().close()
+            return False
+        except Exception:
+            return True
+
+    def test_graph_survives_failed_health_check(self):
+        graph = Neo4jResourcePoolFactory.get_arm_graph(graph_id="graph-1")
+        importer = Neo4jResourcePoolFactory.importer
+        self.assertIs(importer.driver, graph.driver)
+
+        # health check fails: a new importer is handed out, the driver of the graph is not closed
+        new_importer = Neo4jResourcePoolFactory.get_neo4j_importer()
+        self.assertIsNot(importer, new_importer)
+        self.assertFalse(self.is_closed(graph.driver))
+        self.assertIn(id(importer), Neo4jResourcePoolFactory.retired_importers)
+
+        # the retired driver is closed with its last graph
+        driver = graph.driver
+        del graph
+        gc.collect()
+        self.assertTrue(self.is_closed(driver))
+        self.assertNotIn(id(importer), Neo4jResourcePoolFactory.retired_importers)
+
+    def test_close_importer(self):
+        graph = Neo4jResourcePoolFactory.get_arm_graph(graph_id="graph-2")
+        Neo4jResourcePoolFactory.close_neo4j_importer()
+        self.assertIsNone(Neo4jResourcePoolFactory.importer)
+        self.assertFalse(self.is_closed(graph.driver))
+
+        # an importer without graphs is closed right away
+        importer = Neo4jResourcePoolFactory.get_neo4j_importer()
+        Neo4jResourcePoolFactory.close_neo4j_importer()
+        self.assertTrue(self.is_closed(importer.driver))
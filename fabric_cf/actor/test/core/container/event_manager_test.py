@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from fabric_cf.actor.core.apis.i_event import IEvent
+from fabric_cf.actor.core.apis.i_event_handler import IEventHandler
+from fabric_cf.actor.core.common.exceptions import EventException
+from fabric_cf.actor.core.container.event_manager import EventManager
+from fabric_cf.actor.core.util.all_actor_events_filter import AllActorEventsFilter
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.security.auth_token import AuthToken
+
+
+class DummyEvent(IEvent):
+    def __init__(self, *, actor_id: ID):
+        self.actor_id = actor_id
+
+    def get_actor_id(self) -> ID:
+        return self.actor_id
+
+    def get_properties(self) -> dict:
+        return None
+
+
+class DummyHandler(IEventHandler):
+    def __init__(self, *, manager: EventManager = None, token: AuthToken = None):
+        self.events = []
+        self.manager = manager
+        self.token = token
+        self.sid = None
+
+    def handle(self, *, event: IEvent):
+        self.events.append(event)
+        if self.manager is not None and self.sid is not None:
+            self.manager.delete_subscription(sid=self.sid, token=self.token)
+
+
+class EventManagerTest(unittest.TestCase):
+    def test_subscription(self):
+        manager = EventManager()
+        token = AuthToken(name="actor", guid=ID())
+        handler = DummyHandler()
+        sid = manager.create_subscription(token=token, filters=[], handler=handler)
+
+        self.assertIsNotNone(manager.get_subscription(sid=sid, token=token))
+        with self.assertRaises(EventException):
+            manager.get_subscription(sid=sid, token=AuthToken(name="other", guid=ID()))
+
+        manager.delete_subscription(sid=sid, token=token)
+        with self.assertRaises(EventException):
+            manager.get_subscription(sid=sid, token=token)
+
+    def test_dispatch(self):
+        manager = EventManager()
+        token = AuthToken(name="actor", guid=ID())
+        actor_id = ID()
+        handler = DummyHandler()
+        manager.create_subscription(token=token, filters=[AllActorEventsFilter(actor_guid=actor_id)],
+                                    handler=handler)
+
+        manager.dispatch_event(event=DummyEvent(actor_id=actor_id))
+        manager.dispatch_event(event=DummyEvent(actor_id=ID()))
+        self.assertEqual(1, len(handler.events))
+
+    def test_unsubscribe_during_dispatch(self):
+        manager = EventManager()
+        token = AuthToken(name="actor", guid=ID())
+        first = DummyHandler(manager=manager, token=token)
+        first.sid = manager.create_subscription(token=token, filters=[], handler=first)
+        second = DummyHandler()
+        manager.create_subscription(token=token, filters=[], handler=second)
+
+        manager.dispatch_event(event=DummyEvent(actor_id=ID()))
+        manager.dispatch_event(event=DummyEvent(actor_id=ID()))
+        self.assertEqual(1, len(first.events))
+        self.assertEqual(2, len(second.events))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import time
+import unittest
+
+from fabric_mb.message_bus.messages.get_slices_request_avro import GetSlicesRequestAvro
+from fabric_mb.message_bus.messages.reservation_avro import ReservationAvro
+from fabric_mb.message_bus.messages.update_ticket_avro import UpdateTicketAvro
+
+from fabric_cf.actor.core.container.message_service import MessageService, MessageLane
+
+
+class RecordingService:
+    def __init__(self, *, delay: float = 0.0, event: threading.Event = None):
+        self.delay = delay
+        self.event = event
+        self.messages = []
+        self.lock = threading.Lock()
+
+    def process(self, *, message):
+        if self.event is not None:
+            self.event.wait(5)
+        time.sleep(self.delay)
+        with self.lock:
+            self.messages.append(message)
+
+
+class MessageServiceTest(unittest.TestCase):
+    logger = logging.getLogger("MessageServiceTest")
+
+    def get_message_service(self, *, kafka_service, kafka_mgmt_service) -> MessageService:
+        # avoid creating a Kafka consumer
+        service = MessageService.__new__(MessageService)
+        service.logger = self.logger
+        service.kafka_service = kafka_service
+        service.kafka_mgmt_service = kafka_mgmt_service
+        service.mgmt_lane = MessageLane(name="Mgmt", workers=2, queue_depth=10, submit_timeout=1,
+                                        logger=self.logger)
+        service.rpc_lane = MessageLane(name="RPC", workers=2, queue_depth=100, submit_timeout=1,
+                                       logger=self.logger)
+        return service
+
+    @staticmethod
+    def get_update_ticket(*, rid: str, sequence: int) -> UpdateTicketAvro:
+        message = UpdateTicketAvro()
+        message.message_id = "{}-{}".format(rid, sequence)
+        message.reservation = ReservationAvro()
+        message.reservation.reservation_id = rid
+        message.reservation.sequence = sequence
+        return message
+
+    def test_mgmt_does_not_block_rpc(self):
+        blocked = threading.Event()
+        mgmt = RecordingService(event=blocked)
+        rpc = RecordingService()
+        service = self.get_message_service(kafka_service=rpc, kafka_mgmt_service=mgmt)
+
+        for i in range(4):
+            request = GetSlicesRequestAvro()
+            request.message_id = str(i)
+            service.handle_message(request)
+        service.handle_message(self.get_update_ticket(rid="r1", sequence=1))
+
+        time.sleep(0.2)
+        self.assertEqual(1, len(rpc.messages))
+        self.assertEqual(0, len(mgmt.messages))
+        metrics = service.get_metrics()
+        self.assertEqual(2, metrics['management']['in_flight'])
+        self.assertEqual(2, metrics['management']['queued'])
+
+        blocked.set()
+        service.mgmt_lane.shutdown()
+        service.rpc_lane.shutdown()
+        self.assertEqual(4, len(mgmt.messages))
+
+    def test_per_reservation_order(self):
+        rpc = RecordingService(delay=0.001)
+        service = self.get_message_service(kafka_service=rpc, kafka_mgmt_service=RecordingService())
+
+        for sequence in range(20):
+            for rid in ["r1", "r2", "r3"]:
+                service.handle_message(self.get_update_ticket(rid=rid, sequence=sequence))
+        service.rpc_lane.shutdown()
+
+        self.assertEqual(60, len(rpc.messages))
+        for rid in ["r1", "r2", "r3"]:
+            sequences = [m.reservation.sequence for m in rpc.messages if m.reservation.reservation_id == rid]
+            self.assertEqual(list(range(20)), sequences)
+
+    def test_inline_lane(self):
+        lane = MessageLane(name="Inline", workers=0, queue_depth=0, submit_timeout=0, logger=self.logger)
+        result = []
+        lane.submit(key="k", task=lambda: result.append(threading.current_thread()))
+        self.assertEqual([threading.current_thread()], result)
+        self.assertEqual(1, lane.get_metrics()['inline'])
+
+    def test_full_lane_blocks_and_keeps_order(self):
+        lane = MessageLane(name="Full", workers=1, queue_depth=2, submit_timeout=0.05, logger=self.logger)
+        blocked = threading.Event()
+        result = []
+
+        def task(sequence: int):
+            blocked.wait(5)
+            result.append((sequence, threading.current_thread()))
+
+        submitted = []
+
+        def consume():
+            for sequence in range(10):
+                lane.submit(key="r1", task=lambda s=sequence: task(s))
+                submitted.append(sequence)
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        time.sleep(0.3)
+        # one message executing and two queued; the consumer waits for room
+        self.assertEqual(3, len(submitted))
+        self.assertTrue(consumer.is_alive())
+
+        blocked.set()
+        consumer.join(5)
+        lane.shutdown()
+        self.assertEqual(list(range(10)), [sequence for sequence, thread in result])
+        self.assertNotIn(consumer, [thread for sequence, thread in result])
+        metrics = lane.get_metrics()
+        self.assertEqual(0, metrics['inline'])
+        self.assertTrue(metrics['blocked'] > 0)
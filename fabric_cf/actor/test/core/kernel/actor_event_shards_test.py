@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import time
+import unittest
+
+from fabric_cf.actor.core.apis.i_actor_event import IActorEvent
+from fabric_cf.actor.core.kernel.actor_event_shards import ActorEventShards
+
+
+class DummyEvent(IActorEvent):
+    def __init__(self, *, result: list, value: int, delay: float = 0, fail: bool = False):
+        self.result = result
+        self.value = value
+        self.delay = delay
+        self.fail = fail
+
+    def process(self):
+        if self.delay > 0:
+            time.sleep(self.delay)
+        if self.fail:
+            raise Exception("failure")
+        self.result.append(self.value)
+
+
+class ActorEventShardsTest(unittest.TestCase):
+    def test_slice_order(self):
+        shards = ActorEventShards(shards=4, logger=logging.getLogger(__name__))
+        shards.start()
+        result = {"slice{}".format(i): [] for i in range(10)}
+        for i in range(50):
+            for key, values in result.items():
+                shards.submit(key=key, event=DummyEvent(result=values, value=i))
+        shards.wait_idle()
+        for values in result.values():
+            self.assertEqual(list(range(50)), values)
+        metrics = shards.get_metrics()
+        self.assertEqual(500, metrics['submitted'])
+        self.assertEqual(500, metrics['processed'])
+        self.assertEqual(0, metrics['pending'])
+        self.assertEqual(500, sum(metrics['processed_per_shard']))
+        shards.shutdown()
+
+    def test_slices_in_parallel(self):
+        shards = ActorEventShards(shards=4, logger=logging.getLogger(__name__))
+        shards.start()
+        result = []
+        keys = []
+        key = 0
+        # pick four keys that map to different shards
+        while len(keys) < 4:
+            if shards.get_shard(key=key) not in [shards.get_shard(key=k) for k in keys]:
+                keys.append(key)
+            key += 1
+        begin = time.time()
+        for k in keys:
+            shards.submit(key=k, event=DummyEvent(result=result, value=k, delay=0.2))
+        shards.wait_idle()
+        self.assertLess(time.time() - begin, 0.6)
+        self.assertEqual(4, len(result))
+        shards.shutdown()
+
+    def test_barrier(self):
+        shards = ActorEventShards(shards=2, logger=logging.getLogger(__name__))
+        shards.start()
+        result = []
+        shards.submit(key="slice1", event=DummyEvent(result=result, value=1, delay=0.1))
+        shards.submit(key="slice2", event=DummyEvent(result=result, value=2, delay=0.1))
+        shards.wait_idle()
+        result.append(3)
+        self.assertEqual([1, 2], sorted(result[:2]))
+        self.assertEqual([3], result[2:])
+        self.assertEqual(1, shards.get_metrics()['barriers'])
+        shards.shutdown()
+
+    def test_failure(self):
+        shards = ActorEventShards(shards=2, logger=logging.getLogger(__name__))
+        shards.start()
+        result = []
+        shards.submit(key="slice1", event=DummyEvent(result=result, value=1, fail=True))
+        shards.submit(key="slice1", event=DummyEvent(result=result, value=2))
+        shards.wait_idle()
+        self.assertEqual([2], result)
+        self.assertEqual(1, shards.get_metrics()['failed'])
+        shards.shutdown()
+
+    def test_shard_thread(self):
+        shards = ActorEventShards(shards=2, logger=logging.getLogger(__name__))
+        shards.start()
+        self.assertFalse(shards.is_shard_thread())
+        result = []
+
+        class ThreadEvent(IActorEvent):
+            def process(self):
+                result.append(shards.is_shard_thread())
+
+        shards.submit(key="slice1", event=ThreadEvent())
+        shards.wait_idle()
+        self.assertEqual([True], result)
+        shards.shutdown()
+
+    def test_shutdown_drains(self):
+        shards = ActorEventShards(shards=1, logger=logging.getLogger(__name__))
+        shards.start()
+        result = []
+        for i in range(10):
+            shards.submit(key="slice1", event=DummyEvent(result=result, value=i, delay=0.01))
+        shards.shutdown()
+        self.assertEqual(list(range(10)), result)
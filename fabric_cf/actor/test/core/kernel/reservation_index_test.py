@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+
+from fabric_cf.actor.core.kernel.client_reservation_factory import ClientReservationFactory
+from fabric_cf.actor.core.kernel.reservation_index import ReservationIndex
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates, JoinState
+from fabric_cf.actor.core.util.id import ID
+
+
+class ReservationIndexTest(unittest.TestCase):
+    def test_transitions(self):
+        index = ReservationIndex()
+        reservation = ClientReservationFactory.create(rid=ID())
+        reservation.set_logger(logger=logging.getLogger(__name__))
+        reservation.set_index(index=index)
+        rid = reservation.get_reservation_id()
+
+        # Nascent reservations are probed and pending
+        self.assertIn(rid, index.probe)
+        self.assertTrue(index.has_pending())
+        self.assertEqual(0, len(index.get_closed_reservations()))
+
+        reservation.transition_with_join(prefix="test", state=ReservationStates.Active,
+                                         pending=ReservationPendingStates.None_, join_state=JoinState.NoJoin)
+        self.assertNotIn(rid, index.probe)
+        self.assertFalse(index.has_pending())
+
+        reservation.transition(prefix="test", state=ReservationStates.Active,
+                               pending=ReservationPendingStates.ExtendingTicket)
+        self.assertEqual([reservation], index.get_probe_reservations())
+        self.assertTrue(index.has_pending())
+
+        reservation.transition(prefix="test", state=ReservationStates.Closed, pending=ReservationPendingStates.None_)
+        self.assertEqual([reservation], index.get_closed_reservations())
+        self.assertFalse(index.has_pending())
+        self.assertEqual(0, len(index.get_probe_reservations()))
+
+        index.remove(rid=rid)
+        self.assertEqual(0, len(index.get_closed_reservations()))
+
+    def test_joining(self):
+        index = ReservationIndex()
+        reservation = ClientReservationFactory.create(rid=ID())
+        reservation.set_logger(logger=logging.getLogger(__name__))
+        reservation.set_index(index=index)
+        rid = reservation.get_reservation_id()
+
+        # Joins are advanced only by probes: the reservation stays in the probe index while joining
+        for join_state in [JoinState.BlockedRedeem, JoinState.BlockedJoin, JoinState.Joining]:
+            reservation.transition_with_join(prefix="test", state=ReservationStates.Active,
+                                             pending=ReservationPendingStates.None_, join_state=join_state)
+            self.assertIn(rid, index.probe)
+
+        # service_probe clears service_pending; the join has not completed yet
+        reservation.service_pending = JoinState.Joining
+        reservation.service_probe()
+        self.assertEqual(JoinState.None_, reservation.service_pending)
+        index.update(reservation=reservation)
+        self.assertIn(rid, index.probe)
+
+        reservation.transition_with_join(prefix="test", state=ReservationStates.Active,
+                                         pending=ReservationPendingStates.None_, join_state=JoinState.NoJoin)
+        self.assertNotIn(rid, index.probe)
+
+    def test_request_probe(self):
+        index = ReservationIndex()
+        reservation = ClientReservationFactory.create(rid=ID())
+        reservation.set_logger(logger=logging.getLogger(__name__))
+        reservation.set_index(index=index)
+        reservation.transition_with_join(prefix="test", state=ReservationStates.Active,
+                                         pending=ReservationPendingStates.None_, join_state=JoinState.NoJoin)
+        self.assertEqual(0, len(index.get_probe_reservations()))
+        reservation.request_probe()
+        self.assertEqual([reservation], index.get_probe_reservations())
+        # Detached reservations no longer update the index
+        reservation.set_index(index=None)
+        index.clear()
+        reservation.transition(prefix="test", state=ReservationStates.Closed, pending=ReservationPendingStates.None_)
+        self.assertEqual(0, len(index.get_closed_reservations()))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import time
+import unittest
+
+from fabric_cf.actor.core.kernel.rpc_executor_pool import RPCExecutorPool
+from fabric_cf.actor.core.util.rpc_exception import RPCException
+
+
+class RPCExecutorPoolTest(unittest.TestCase):
+    @staticmethod
+    def wait_for(pool: RPCExecutorPool, completed: int):
+        for i in range(500):
+            if pool.get_metrics()['completed'] >= completed:
+                return
+            time.sleep(0.01)
+
+    def test_peer_order(self):
+        pool = RPCExecutorPool(workers=4, peer_concurrency=1)
+        result = {"peer1": [], "peer2": []}
+        for i in range(20):
+            for peer in result.keys():
+                pool.submit(peer=peer, task=lambda p=peer, v=i: result[p].append(v))
+        self.wait_for(pool, 40)
+        pool.shutdown()
+        for values in result.values():
+            self.assertEqual(list(range(20)), values)
+        metrics = pool.get_metrics()
+        self.assertEqual(40, metrics['submitted'])
+        self.assertEqual(40, metrics['completed'])
+        self.assertEqual(0, metrics['queued'])
+        self.assertEqual({}, metrics['peers'])
+
+    def test_backpressure(self):
+        pool = RPCExecutorPool(workers=1, queue_depth=1, submit_timeout=0.1)
+        release = threading.Event()
+        pool.submit(peer="peer1", task=release.wait)
+        pool.submit(peer="peer2", task=lambda: None)
+        with self.assertRaises(RPCException):
+            pool.submit(peer="peer3", task=lambda: None)
+        self.assertEqual(1, pool.get_metrics()['rejected'])
+        release.set()
+        self.wait_for(pool, 2)
+        pool.submit(peer="peer3", task=lambda: None)
+        self.wait_for(pool, 3)
+        pool.shutdown()
+        self.assertEqual(3, pool.get_metrics()['completed'])
+
+    def test_task_failure_releases_peer(self):
+        pool = RPCExecutorPool(workers=2)
+
+        def fail():
+            raise Exception("failure")
+
+        pool.submit(peer="peer1", task=fail)
+        pool.submit(peer="peer1", task=lambda: None)
+        self.wait_for(pool, 2)
+        pool.shutdown()
+        self.assertEqual(2, pool.get_metrics()['completed'])
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+from unittest import mock
+
+from fabric_cf.actor.core.common.exceptions import ProxyException
+from fabric_cf.actor.core.kernel.failed_rpc_event import FailedRPCEvent
+from fabric_cf.actor.core.kernel.rpc_executor import RPCExecutor
+from fabric_cf.actor.core.kernel.rpc_manager import RPCManager
+from fabric_cf.actor.core.kernel.rpc_manager_singleton import RPCManagerSingleton
+from fabric_cf.actor.core.util.rpc_exception import RPCException, RPCError
+
+
+class RPCManagerTest(unittest.TestCase):
+    @staticmethod
+    def make_rpc(*, message_id: str):
+        rpc = mock.MagicMock()
+        rpc.request.get_message_id.return_value = message_id
+        return rpc
+
+    def test_delivery_report_success(self):
+        manager = RPCManager()
+        manager.in_transit["m1"] = self.make_rpc(message_id="m1")
+        with mock.patch("fabric_cf.actor.core.kernel.rpc_manager.RPCExecutor") as executor:
+            manager.delivery_report(message_id="m1")
+        self.assertEqual({}, manager.in_transit)
+        executor.assert_not_called()
+        self.assertEqual(0, manager.get_metrics()['in_transit'])
+
+    def test_delivery_report_failure(self):
+        manager = RPCManager()
+        rpc = self.make_rpc(message_id="m1")
+        manager.in_transit["m1"] = rpc
+        with mock.patch("fabric_cf.actor.core.kernel.rpc_manager.RPCExecutor") as executor:
+            manager.delivery_report(message_id="m1", error="broker down")
+        self.assertEqual({}, manager.in_transit)
+        executor.assert_called_once_with(request=rpc)
+        e = executor.return_value.post_exception.call_args.kwargs["e"]
+        self.assertIsInstance(e, RPCException)
+        self.assertEqual(RPCError.NetworkError, e.get_error_type())
+
+    def test_executor_failure_clears_in_transit(self):
+        manager = RPCManager()
+        rpc = self.make_rpc(message_id="m1")
+        rpc.proxy.execute.side_effect = ProxyException("translation failed")
+        manager.in_transit["m1"] = rpc
+        manager.queued()
+        manager.remove_pending_request = mock.MagicMock()
+
+        # avoid loading the logger from the globals
+        executor = RPCExecutor.__new__(RPCExecutor)
+        executor.request = rpc
+        executor.begin = None
+        executor.logger = logging.getLogger(__name__)
+        with mock.patch.object(RPCManagerSingleton, "get", return_value=manager):
+            executor.run()
+
+        self.assertEqual({}, manager.in_transit)
+        manager.remove_pending_request.assert_called_once_with(guid="m1")
+        self.assertEqual(0, manager.num_queued)
+        event = rpc.actor.queue_event.call_args.kwargs["incoming"]
+        self.assertIsInstance(event, FailedRPCEvent)
+        self.assertEqual(RPCError.LocalError, event.failed.error.get_error_type())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+from unittest import mock
+
+from fabric_cf.actor.core.common.constants import ErrorCodes
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.manage.controller_management_object import ControllerManagementObject
+from fabric_cf.actor.core.manage.converter import Converter
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.security.acess_checker import AccessChecker
+
+
+class DummyDatabase:
+    def __init__(self, *, reservations: list):
+        self.reservations = reservations
+        self.units_requested = []
+
+    def get_reservations_by_rids(self, *, rid: list, columns: list = None):
+        return [r for r in self.reservations if r['rsv_resid'] in rid]
+
+    def get_units(self, *, rid: str):
+        self.units_requested.append(rid)
+        return [{"rid": rid}]
+
+
+class ControllerManagementObjectTest(unittest.TestCase):
+    def make_management_object(self, *, reservations: list) -> ControllerManagementObject:
+        # avoid creating an actor
+        result = ControllerManagementObject.__new__(ControllerManagementObject)
+        result.logger = logging.getLogger(__name__)
+        result.actor = mock.MagicMock()
+        result.db = DummyDatabase(reservations=reservations)
+        return result
+
+    def test_get_reservation_status(self):
+        active, ticketed, missing = ID(), ID(), ID()
+        mo = self.make_management_object(reservations=[
+            {'rsv_resid': str(active), 'rsv_state': ReservationStates.Active.value,
+             'rsv_pending': ReservationPendingStates.None_.value},
+            {'rsv_resid': str(ticketed), 'rsv_state': ReservationStates.Ticketed.value,
+             'rsv_pending': ReservationPendingStates.Redeeming.value}])
+
+        with mock.patch.object(AccessChecker, "check_access", return_value=True) as check_access, \
+                mock.patch.object(Converter, "fill_units", side_effect=lambda unit_list: unit_list):
+            result = mo.get_reservation_status(caller=mock.MagicMock(), rids=[missing, ticketed, active],
+                                               id_token="token")
+        self.assertEqual("token", check_access.call_args.kwargs["token"])
+        self.assertEqual(0, result.status.get_code())
+
+        # same order as requested; unknown reservations are reported as such
+        self.assertEqual([str(missing), str(ticketed), str(active)],
+                         [s.get_reservation_id() for s in result.result])
+        self.assertEqual(ReservationStates.Unknown.value, result.result[0].get_state())
+        self.assertEqual(ReservationPendingStates.Unknown.value, result.result[0].get_pending_state())
+        self.assertEqual(ReservationStates.Ticketed.value, result.result[1].get_state())
+        self.assertEqual(ReservationPendingStates.Redeeming.value, result.result[1].get_pending_state())
+
+        # units only for Active reservations
+        self.assertIsNone(result.result[1].get_units())
+        self.assertEqual([{"rid": str(active)}], result.result[2].get_units())
+        self.assertEqual([str(active)], mo.db.units_requested)
+
+    def test_get_reservation_status_checks_access(self):
+        mo = self.make_management_object(reservations=[])
+        mo.db = mock.MagicMock()
+        with mock.patch.object(AccessChecker, "check_access", side_effect=Exception("denied")):
+            result = mo.get_reservation_status(caller=mock.MagicMock(), rids=[ID()], id_token="token")
+        self.assertEqual(ErrorCodes.ErrorInternalError.value, result.status.get_code())
+        self.assertEqual(0, len(result.result))
+        mo.db.get_reservations_by_rids.assert_not_called()
+
+    def test_get_reservation_status_invalid(self):
+        mo = self.make_management_object(reservations=[])
+        result = mo.get_reservation_status(caller=mock.MagicMock(), rids=[])
+        self.assertEqual(ErrorCodes.ErrorInvalidArguments.value, result.status.get_code())
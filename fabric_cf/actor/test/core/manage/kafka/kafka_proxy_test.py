@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import unittest
+from unittest import mock
+
+from fabric_mb.message_bus.consumer import AvroConsumerApi
+
+from fabric_cf.actor.core.common.exceptions import ManageException
+from fabric_cf.actor.core.manage.kafka.kafka_mgmt_message_processor import KafkaMgmtMessageProcessor
+from fabric_cf.actor.core.manage.kafka.kafka_proxy import KafkaProxy
+from fabric_cf.actor.core.util.id import ID
+
+
+class DummyMessage:
+    def __init__(self, *, msg_id: str):
+        self.msg_id = msg_id
+        self.name = "DummyMessage"
+
+    def get_message_id(self) -> str:
+        return self.msg_id
+
+
+class DummyProducer:
+    """
+    Records produced requests; optionally delivers a response before produce returns
+    """
+    def __init__(self, *, result: bool = True, error: Exception = None, processor=None):
+        self.result = result
+        self.error = error
+        self.processor = processor
+        self.produced = []
+
+    def produce_sync(self, *, topic: str, record) -> bool:
+        if self.error is not None:
+            raise self.error
+        self.produced.append(record)
+        if self.processor is not None:
+            self.processor.handle_message(DummyMessage(msg_id=record.get_message_id()))
+        return self.result
+
+
+class KafkaProxyTest(unittest.TestCase):
+    def make_processor(self) -> KafkaMgmtMessageProcessor:
+        with mock.patch.object(AvroConsumerApi, "__init__", lambda *args, **kwargs: None):
+            return KafkaMgmtMessageProcessor(conf={}, key_schema=None, record_schema=None, topics=[],
+                                             logger=logging.getLogger(__name__))
+
+    def make_proxy(self, *, processor: KafkaMgmtMessageProcessor, producer: DummyProducer) -> KafkaProxy:
+        return KafkaProxy(guid=ID(), kafka_topic="topic", auth=None, logger=logging.getLogger(__name__),
+                          message_processor=processor, producer=producer)
+
+    def test_response_before_wait(self):
+        processor = self.make_processor()
+        proxy = self.make_proxy(processor=processor, producer=DummyProducer(processor=processor))
+        request = DummyMessage(msg_id="m1")
+        message_wrapper = processor.add_message(message=request)
+        self.assertTrue(proxy.produce(request=request))
+
+        # response was delivered while producing; wait returns right away
+        self.assertTrue(message_wrapper.wait(timeout=0))
+        self.assertEqual("m1", message_wrapper.response.get_message_id())
+        self.assertEqual("m1", message_wrapper.future.result(timeout=0).get_message_id())
+        self.assertEqual(0, len(processor.messages))
+
+    def test_produce_failure_removes_registration(self):
+        processor = self.make_processor()
+        proxy = self.make_proxy(processor=processor, producer=DummyProducer(result=False))
+        future = proxy.send_request_async(request=DummyMessage(msg_id="m1"))
+        with self.assertRaises(ManageException):
+            future.result(timeout=0)
+        self.assertEqual(0, len(processor.messages))
+
+        proxy = self.make_proxy(processor=processor, producer=DummyProducer(error=ValueError("broken")))
+        future = proxy.send_request_async(request=DummyMessage(msg_id="m2"))
+        with self.assertRaises(ValueError):
+            future.result(timeout=0)
+        self.assertEqual(0, len(processor.messages))
+
+    def test_cancel_removes_registration(self):
+        processor = self.make_processor()
+        proxy = self.make_proxy(processor=processor, producer=DummyProducer())
+        future = proxy.send_request_async(request=DummyMessage(msg_id="m1"))
+        self.assertEqual(1, len(processor.messages))
+        self.assertTrue(future.cancel())
+        self.assertEqual(0, len(processor.messages))
+
+        # a late response is discarded
+        processor.handle_message(DummyMessage(msg_id="m1"))
+        self.assertTrue(future.cancelled())
+
+    def test_many_outstanding(self):
+        processor = self.make_processor()
+        producer = DummyProducer()
+        proxy = self.make_proxy(processor=processor, producer=producer)
+        futures = {"m{}".format(i): proxy.send_request_async(request=DummyMessage(msg_id="m{}".format(i)))
+                   for i in range(10)}
+        self.assertEqual(10, len(processor.messages))
+
+        # responses arrive out of order on the consumer thread
+        consumer = threading.Thread(target=lambda: [processor.handle_message(DummyMessage(msg_id=msg_id))
+                                                    for msg_id in reversed(list(futures.keys()))])
+        consumer.start()
+        for msg_id, future in futures.items():
+            self.assertEqual(msg_id, future.result(timeout=5).get_message_id())
+        consumer.join()
+        self.assertEqual(0, len(processor.messages))
+
+    def test_expiry(self):
+        processor = self.make_processor()
+        proxy = self.make_proxy(processor=processor, producer=DummyProducer())
+        expired = proxy.send_request_async(request=DummyMessage(msg_id="m1"), timeout=0)
+        pending = proxy.send_request_async(request=DummyMessage(msg_id="m2"))
+        sync = processor.add_message(message=DummyMessage(msg_id="m3"))
+
+        processor.expire_messages()
+        with self.assertRaises(ManageException):
+            expired.result(timeout=0)
+        self.assertFalse(pending.done())
+        self.assertEqual({"m2", "m3"}, set(processor.messages.keys()))
+        self.assertFalse(sync.done)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+from unittest import mock
+
+from fabric_cf.actor.core.kernel.slice_factory import SliceFactory
+from fabric_cf.actor.core.plugins.db.actor_database import ActorDatabase
+from fabric_cf.actor.core.util.id import ID
+
+
+class ActorDatabaseFlushTest(unittest.TestCase):
+    def get_database(self) -> ActorDatabase:
+        db = ActorDatabase(user="fabric", password="fabric", database="test", db_host="127.0.0.1:5432",
+                           logger=logging.getLogger(__name__))
+        db.set_logger(logger=logging.getLogger(__name__))
+        db.actor_id = 1
+        db.set_write_behind(value=True)
+        db.db = mock.MagicMock()
+        return db
+
+    def test_flush_failure_requeues(self):
+        db = self.get_database()
+        first = SliceFactory.create(slice_id=ID(), name="first")
+        second = SliceFactory.create(slice_id=ID(), name="second")
+        db.update_slice(slice_object=first)
+        db.update_slice(slice_object=second)
+
+        db.db.update_objects.side_effect = Exception("connection lost")
+        with self.assertRaises(Exception):
+            db.flush()
+        self.assertEqual(2, len(db.dirty_slices))
+        self.assertEqual(1, db.get_flush_metrics()['flush_failures'])
+        self.assertEqual(0, db.get_flush_metrics()['flush_count'])
+
+        db.db.update_objects.side_effect = None
+        db.flush()
+        self.assertEqual(0, len(db.dirty_slices))
+        flushed = db.db.update_objects.call_args.kwargs['slices']
+        self.assertEqual({"first", "second"}, {s['slc_name'] for s in flushed})
+        self.assertEqual(1, db.get_flush_metrics()['flush_count'])
+
+    def test_flush_failure_keeps_newer_update(self):
+        db = self.get_database()
+        slice_obj = SliceFactory.create(slice_id=ID(), name="old")
+        removed = SliceFactory.create(slice_id=ID(), name="removed")
+        db.update_slice(slice_object=slice_obj)
+        db.update_slice(slice_object=removed)
+        newer = SliceFactory.create(slice_id=slice_obj.get_slice_id(), name="new")
+
+        def fail(**kwargs):
+            # updated and removed while the flush is in progress
+            db.update_slice(slice_object=newer)
+            with db.dirty_lock:
+                db.dirty_slices.pop(str(removed.get_slice_id()), None)
+                db.removed_while_flushing.add(str(removed.get_slice_id()))
+            raise Exception("connection lost")
+
+        db.db.update_objects.side_effect = fail
+        with self.assertRaises(Exception):
+            db.flush()
+        self.assertEqual(1, len(db.dirty_slices))
+        self.assertIs(newer, db.dirty_slices[str(slice_obj.get_slice_id())])
+        self.assertFalse(db.flushing)
+        self.assertEqual(0, len(db.removed_while_flushing))
@@ -77,4 +77,22 @@ class ActorDatabaseTest(BaseTestCase, unittest.TestCase):
         self.assertIsNotNone(result)
         slice2 = SliceFactory.create_instance(properties=result)
         self.assertIsNotNone(slice2)
-        db.remove_slice(slice_id=slice_obj.get_slice_id())
\ No newline at end of file
+        db.remove_slice(slice_id=slice_obj.get_slice_id())
+
+    def test_d_write_behind_slice(self):
+        db = self.get_database_to_test()
+        slice_obj = SliceFactory.create(slice_id=ID(), name="slice_to_update")
+        db.add_slice(slice_object=slice_obj)
+        db.set_write_behind(value=True)
+        slice_obj.set_name(name="slice_updated")
+        db.update_slice(slice_object=slice_obj)
+        result = SliceFactory.create_instance(properties=db.get_slice(slice_id=slice_obj.get_slice_id()))
+        self.assertEqual("slice_to_update", result.get_name())
+        db.flush()
+        result = SliceFactory.create_instance(properties=db.get_slice(slice_id=slice_obj.get_slice_id()))
+        self.assertEqual("slice_updated", result.get_name())
+        metrics = db.get_flush_metrics()
+        self.assertEqual(1, metrics['flush_count'])
+        self.assertEqual(1, metrics['flush_size_last'])
+        db.set_write_behind(value=False)
+        db.remove_slice(slice_id=slice_obj.get_slice_id())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.policy.broker_simple_policy import BrokerSimplePolicy
+
+
+class CountingCBMBackend:
+    """
+    CBM backend returning a new BQM on every call
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def get_bqm(self, **kwargs) -> str:
+        self.calls += 1
+        return "bqm-{}".format(self.calls)
+
+
+class BrokerSimplePolicyQueryTest(unittest.TestCase):
+    def make_policy(self) -> BrokerSimplePolicy:
+        policy = BrokerSimplePolicy(actor=None)
+        policy.logger = logging.getLogger(__name__)
+        policy.combined_broker_model = CountingCBMBackend()
+        return policy
+
+    def test_cached_bqm(self):
+        policy = self.make_policy()
+        first = policy.query(p={})
+        self.assertEqual("bqm-1", first[Constants.broker_query_model])
+        second = policy.query(p={})
+        self.assertEqual("bqm-1", second[Constants.broker_query_model])
+        self.assertEqual(first[Constants.broker_query_model_version], second[Constants.broker_query_model_version])
+        self.assertEqual(1, policy.combined_broker_model.calls)
+
+        policy.bump_cbm_generation()
+        third = policy.query(p={})
+        self.assertEqual("bqm-2", third[Constants.broker_query_model])
+        self.assertNotEqual(first[Constants.broker_query_model_version],
+                            third[Constants.broker_query_model_version])
+
+    def test_unchanged_version(self):
+        policy = self.make_policy()
+        version = policy.query(p={})[Constants.broker_query_model_version]
+        result = policy.query(p={Constants.broker_query_model_version: version})
+        self.assertNotIn(Constants.broker_query_model, result)
+        self.assertEqual(version, result[Constants.broker_query_model_version])
+
+        # versions are not reused by a new policy instance
+        other = self.make_policy()
+        result = other.query(p={Constants.broker_query_model_version: version})
+        self.assertIn(Constants.broker_query_model, result)
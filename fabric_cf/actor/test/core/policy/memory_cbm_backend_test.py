@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import io
+import json
+import logging
+import os
+import unittest
+from unittest import mock
+
+import networkx as nx
+
+from fabric_cf.actor.boot.inventory.neo4j_resource_pool_factory import Neo4jResourcePoolFactory
+from fabric_cf.actor.core.common.exceptions import BrokerException
+from fabric_cf.actor.core.policy.memory_cbm_backend import InMemoryCBMBackend
+
+GRAPH_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "..", "config", "neo4j")
+
+
+class DummyADM:
+    """
+    Stands in for a Neo4j ADM graph: exposes the graph id and the GraphML serialization
+    """
+    def __init__(self, *, graph_id: str, file_name: str):
+        self.graph_id = graph_id
+        with open(os.path.join(GRAPH_DIR, file_name), 'r') as f:
+            self.graph_str = f.read()
+
+    def serialize_graph(self) -> str:
+        return self.graph_str
+
+    def update_node(self, *, node_id: str, name: str, value: str):
+        graph = nx.read_graphml(io.BytesIO(self.graph_str.encode('utf-8')))
+        for n, props in graph.nodes(data=True):
+            if props["NodeID"] == node_id:
+                props[name] = value
+        self.graph_str = "\n".join(nx.generate_graphml(graph))
+
+
+class InMemoryCBMBackendTest(unittest.TestCase):
+    def make_backend(self) -> InMemoryCBMBackend:
+        backend = InMemoryCBMBackend(logger=logging.getLogger(__name__), snapshot=False)
+        backend.load()
+        return backend
+
+    def test_merge(self):
+        backend = self.make_backend()
+        site = DummyADM(graph_id="adm-site", file_name="site-am-2broker-ad-enumerated.graphml")
+        network = DummyADM(graph_id="adm-net", file_name="network-am-ad-enumerated.graphml")
+        site_graph = InMemoryCBMBackend.read_graphml(graph_str=site.serialize_graph())
+        network_graph = InMemoryCBMBackend.read_graphml(graph_str=network.serialize_graph())
+
+        backend.merge_adm(adm=site)
+        self.assertEqual(site_graph.number_of_nodes(), backend.graph.number_of_nodes())
+        for node_id, props in backend.graph.nodes(data=True):
+            self.assertEqual(backend.get_graph_id(), props["GraphID"])
+            self.assertEqual(["adm-site"], json.loads(props[InMemoryCBMBackend.ADM_GRAPH_IDS]))
+            delegations = props.get("CapacityDelegations", "None")
+            if delegations != "None":
+                self.assertEqual(["adm-site"], list(json.loads(delegations).keys()))
+
+        backend.merge_adm(adm=network)
+        common = set(site_graph.nodes).intersection(network_graph.nodes)
+        expected = site_graph.number_of_nodes() + network_graph.number_of_nodes() - len(common)
+        self.assertEqual(expected, backend.graph.number_of_nodes())
+        for node_id in common:
+            adm_ids = json.loads(backend.graph.nodes[node_id][InMemoryCBMBackend.ADM_GRAPH_IDS])
+            self.assertEqual(["adm-site", "adm-net"], adm_ids)
+        self.assertEqual(2, backend.generation)
+
+        # BQM round trips through GraphML
+        bqm = nx.read_graphml(io.BytesIO(backend.get_bqm(some=5).encode('utf-8')))
+        self.assertEqual(expected, bqm.number_of_nodes())
+
+    def test_merge_same_adm_twice_keeps_relationships(self):
+        backend = self.make_backend()
+        site = DummyADM(graph_id="adm-site", file_name="site-am-2broker-ad-enumerated.graphml")
+        backend.merge_adm(adm=site)
+        edges = backend.graph.number_of_edges()
+        backend.merge_adm(adm=site)
+        self.assertEqual(edges, backend.graph.number_of_edges())
+
+    def test_validate(self):
+        backend = self.make_backend()
+        site = DummyADM(graph_id="adm-site", file_name="site-am-2broker-ad-enumerated.graphml")
+        site_graph = InMemoryCBMBackend.read_graphml(graph_str=site.serialize_graph())
+        component = [n for n, props in site_graph.nodes(data=True) if props["Class"] == "Component"][0]
+        node = [n for n, props in site_graph.nodes(data=True) if props["Class"] == "NetworkNode"][0]
+
+        # component types are checked against the FIM validation rules
+        site.update_node(node_id=component, name="Type", value="Floppy")
+        with self.assertRaises(BrokerException):
+            backend.merge_adm(adm=site)
+
+        site = DummyADM(graph_id="adm-site", file_name="site-am-2broker-ad-enumerated.graphml")
+        site.update_node(node_id=node, name="Capacities", value="{not json")
+        with self.assertRaises(BrokerException):
+            backend.merge_adm(adm=site)
+        self.assertEqual(0, backend.graph.number_of_nodes())
+
+    def test_bqm(self):
+        backend = self.make_backend()
+        backend.merge_adm(adm=DummyADM(graph_id="adm-site", file_name="site-am-2broker-ad-enumerated.graphml"))
+
+        # same shape as the Neo4j CBM clone: all nodes and delegations under a new graph id
+        bqm = InMemoryCBMBackend.read_graphml(graph_str=backend.get_bqm(some=5))
+        graph_ids = {props["GraphID"] for _, props in bqm.nodes(data=True)}
+        self.assertEqual(1, len(graph_ids))
+        self.assertNotEqual(backend.get_graph_id(), graph_ids.pop())
+        self.assertEqual(backend.graph.number_of_nodes(), bqm.number_of_nodes())
+        self.assertEqual(backend.graph.number_of_edges(), bqm.number_of_edges())
+        for node_id, props in bqm.nodes(data=True):
+            self.assertEqual(backend.graph.nodes[node_id].get("CapacityDelegations"),
+                             props.get("CapacityDelegations"))
+        # the model itself is left untouched
+        for _, props in backend.graph.nodes(data=True):
+            self.assertEqual(backend.get_graph_id(), props["GraphID"])
+
+        # query parameters are handed to a registered BQM pluggable
+        with mock.patch.object(InMemoryCBMBackend, "bqm_pluggable_registered", return_value=True), \
+                mock.patch.object(InMemoryCBMBackend, "get_bqm_from_pluggable", return_value="bqm") as pluggable:
+            self.assertEqual("bqm", backend.get_bqm(some=5))
+            pluggable.assert_called_once_with(some=5)
+
+    def test_snapshot_keeps_previous_on_import_failure(self):
+        backend = self.make_backend()
+        backend.merge_adm(adm=DummyADM(graph_id="adm-site", file_name="site-am-2broker-ad-enumerated.graphml"))
+        importer = mock.MagicMock()
+        importer.import_graph_from_string.side_effect = Exception("import failed")
+        with mock.patch.object(Neo4jResourcePoolFactory, "get_neo4j_importer", return_value=importer):
+            backend.snapshot()
+
+        # the previous snapshot was not touched and the snapshot is retried later
+        importer.delete_graph.assert_not_called()
+        importer.driver.session.assert_not_called()
+        self.assertEqual(0, backend.snapshot_generation)
+        self.assertEqual(0, backend.snapshot_count)
+
+    def test_snapshot_switches_after_import(self):
+        backend = self.make_backend()
+        backend.merge_adm(adm=DummyADM(graph_id="adm-site", file_name="site-am-2broker-ad-enumerated.graphml"))
+        importer = mock.MagicMock()
+        tx = mock.MagicMock()
+        session = importer.driver.session.return_value.__enter__.return_value
+        session.execute_write.side_effect = lambda switch: switch(tx)
+        with mock.patch.object(Neo4jResourcePoolFactory, "get_neo4j_importer", return_value=importer):
+            backend.snapshot()
+
+        temp_graph_id = importer.import_graph_from_string.call_args.kwargs["graph_id"]
+        self.assertNotEqual(backend.get_graph_id(), temp_graph_id)
+        # old snapshot is deleted and replaced in the same transaction
+        self.assertEqual(2, tx.run.call_count)
+        self.assertEqual(backend.get_graph_id(), tx.run.call_args_list[0].kwargs["graphId"])
+        self.assertEqual(temp_graph_id, tx.run.call_args_list[1].kwargs["tempGraphId"])
+        importer.delete_graph.assert_not_called()
+        self.assertEqual(backend.generation, backend.snapshot_generation)
+
+        # a failed switch drops the temporary graph and leaves the snapshot stale
+        backend.merge_adm(adm=DummyADM(graph_id="adm-net", file_name="network-am-ad-enumerated.graphml"))
+        session.execute_write.side_effect = Exception("switch failed")
+        with mock.patch.object(Neo4jResourcePoolFactory, "get_neo4j_importer", return_value=importer):
+            backend.snapshot()
+        temp_graph_id = importer.import_graph_from_string.call_args.kwargs["graph_id"]
+        importer.delete_graph.assert_called_once_with(graph_id=temp_graph_id)
+        self.assertEqual(1, backend.snapshot_generation)
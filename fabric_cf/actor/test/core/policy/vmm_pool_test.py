@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import random
+import unittest
+
+from fabric_cf.actor.core.core.unit import Unit
+from fabric_cf.actor.core.policy.vm_control import Vmm, VmmPool
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.resource_type import ResourceType
+
+
+class VmmPoolTest(unittest.TestCase):
+    Capacity = 4
+
+    def make_pool(self, *, placement: str, hosts: int) -> VmmPool:
+        pool = VmmPool(rtype=ResourceType(resource_type="site.vm"), properties={}, placement=placement)
+        for i in range(hosts):
+            pool.donate(vm=Vmm(host=Unit(uid=ID()), capacity=self.Capacity))
+        return pool
+
+    def test_placement(self):
+        for placement in VmmPool.PLACEMENTS:
+            pool = self.make_pool(placement=placement, hosts=3)
+            vmms = pool.get_vmm_set()
+            self.assertEqual(3 * self.Capacity, pool.get_available())
+
+            vmms[1].host(vm=Unit(uid=ID()))
+            selected = pool.select()
+            if placement == VmmPool.PLACEMENT_FIRST_FIT:
+                self.assertEqual(vmms[0], selected)
+            elif placement == VmmPool.PLACEMENT_BEST_FIT:
+                self.assertEqual(vmms[1], selected)
+            else:
+                self.assertEqual(vmms[0], selected)
+            self.assertEqual(3 * self.Capacity - 1, pool.get_available())
+
+    def test_full(self):
+        pool = self.make_pool(placement=VmmPool.PLACEMENT_FIRST_FIT, hosts=2)
+        vms = []
+        while pool.select() is not None:
+            vmm = pool.select()
+            vm = Unit(uid=ID())
+            vmm.host(vm=vm)
+            vms.append((vmm, vm))
+        self.assertEqual(2 * self.Capacity, len(vms))
+        self.assertEqual(0, pool.get_available())
+
+        vmm, vm = vms[-1]
+        vmm.release(vm=vm)
+        self.assertEqual(vmm, pool.select())
+        self.assertEqual(1, pool.get_available())
+
+    def test_random(self):
+        rnd = random.Random(0)
+        for placement in VmmPool.PLACEMENTS:
+            pool = self.make_pool(placement=placement, hosts=20)
+            vmms = pool.get_vmm_set()
+            for i in range(500):
+                vmm = rnd.choice(vmms)
+                if vmm.get_available() > 0 and (vmm.get_hosted_count() == 0 or rnd.random() < 0.6):
+                    vmm.host(vm=Unit(uid=ID()))
+                elif vmm.get_hosted_count() > 0:
+                    vmm.release(vm=next(iter(vmm.get_hosted_vms())))
+
+                candidates = [v for v in vmms if v.get_available() > 0]
+                if placement == VmmPool.PLACEMENT_BEST_FIT:
+                    expected = min(candidates, key=lambda v: v.get_available(), default=None)
+                elif placement == VmmPool.PLACEMENT_SPREAD:
+                    expected = max(candidates, key=lambda v: (v.get_available(), -vmms.index(v)), default=None)
+                else:
+                    expected = next(iter(candidates), None)
+                self.assertEqual(expected, pool.select())
+                self.assertEqual(sum(v.get_available() for v in vmms), pool.get_available())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import time
+import unittest
+from unittest import mock
+
+from fabric_mb.message_bus.producer import AvroProducerApi
+
+from fabric_cf.actor.core.kernel.rpc_manager import RPCManager
+from fabric_cf.actor.core.kernel.rpc_manager_singleton import RPCManagerSingleton
+from fabric_cf.actor.core.proxies.kafka.kafka_async_producer import KafkaAsyncProducer
+from fabric_cf.actor.core.proxies.kafka.kafka_proxy import KafkaProxy
+from fabric_cf.actor.core.util.rpc_exception import RPCError
+
+
+class DummyProducer:
+    """
+    Stands in for the confluent producer; delivery reports are served by the test via report()
+    """
+    def __init__(self, *, failures: int = 0):
+        self.failures = failures
+        self.callbacks = []
+
+    def produce(self, *, topic, key, value, callback):
+        if self.failures > 0:
+            self.failures -= 1
+            raise BufferError("Local: Queue full")
+        self.callbacks.append(callback)
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, 0.01))
+
+    def flush(self, timeout):
+        return 0
+
+    def report(self, *, err=None):
+        self.callbacks.pop(0)(err, None)
+
+
+class DummyMessage:
+    def __init__(self, *, message_id: str):
+        self.message_id = message_id
+        self.name = "Query"
+
+    def get_id(self):
+        return self.message_id
+
+    def get_message_id(self):
+        return self.message_id
+
+    def to_dict(self):
+        return {"message_id": self.message_id}
+
+
+class KafkaAsyncProducerTest(unittest.TestCase):
+    def make_producer(self, *, producer: DummyProducer) -> KafkaAsyncProducer:
+        def init(obj, conf, key_schema, record_schema, logger=None):
+            obj.producer = producer
+            obj.logger = logging.getLogger(__name__)
+
+        with mock.patch.object(AvroProducerApi, "__init__", init):
+            result = KafkaAsyncProducer(None, None, None)
+        self.addCleanup(result.stop)
+        return result
+
+    @staticmethod
+    def make_manager(*, message_id: str) -> RPCManager:
+        manager = RPCManager()
+        rpc = mock.MagicMock()
+        rpc.request.get_message_id.return_value = message_id
+        manager.in_transit[message_id] = rpc
+        return manager
+
+    def test_delivery_success(self):
+        stub = DummyProducer()
+        producer = self.make_producer(producer=stub)
+        manager = self.make_manager(message_id="m1")
+
+        with mock.patch("fabric_cf.actor.core.kernel.rpc_manager.RPCExecutor") as executor:
+            self.assertTrue(producer.produce(topic="topic", record=DummyMessage(message_id="m1"),
+                                             on_delivery=lambda err: manager.delivery_report(message_id="m1",
+                                                                                             error=err)))
+            self.assertEqual(1, producer.get_metrics()['pending'])
+            stub.report()
+
+        self.assertEqual({}, manager.in_transit)
+        executor.assert_not_called()
+        metrics = producer.get_metrics()
+        self.assertEqual(1, metrics['delivered'])
+        self.assertEqual(0, metrics['pending'])
+
+    def test_delivery_failure(self):
+        stub = DummyProducer()
+        producer = self.make_producer(producer=stub)
+        manager = self.make_manager(message_id="m1")
+
+        with mock.patch("fabric_cf.actor.core.kernel.rpc_manager.RPCExecutor") as executor:
+            producer.produce(topic="topic", record=DummyMessage(message_id="m1"),
+                             on_delivery=lambda err: manager.delivery_report(message_id="m1", error=err))
+            stub.report(err="broker down")
+
+        self.assertEqual({}, manager.in_transit)
+        e = executor.return_value.post_exception.call_args.kwargs["e"]
+        self.assertEqual(RPCError.NetworkError, e.get_error_type())
+        self.assertEqual(1, producer.get_metrics()['failed'])
+
+    def test_retry_on_full_queue(self):
+        stub = DummyProducer(failures=1)
+        producer = self.make_producer(producer=stub)
+
+        self.assertTrue(producer.produce(topic="topic", record=DummyMessage(message_id="m1")))
+        self.assertEqual(1, len(stub.callbacks))
+        self.assertEqual(1, producer.get_metrics()['produced'])
+
+    def test_enqueue_failure(self):
+        stub = DummyProducer(failures=2)
+        producer = self.make_producer(producer=stub)
+
+        self.assertFalse(producer.produce(topic="topic", record=DummyMessage(message_id="m1")))
+        self.assertEqual(0, producer.get_metrics()['produced'])
+
+
+class KafkaProxyAsyncTest(unittest.TestCase):
+    @staticmethod
+    def make_proxy() -> KafkaProxy:
+        # avoid creating the synchronous producer
+        proxy = KafkaProxy.__new__(KafkaProxy)
+        proxy.kafka_topic = "topic"
+        proxy.logger = logging.getLogger(__name__)
+        proxy.producer = None
+        return proxy
+
+    def send(self, *, async_producer: mock.MagicMock, manager: mock.MagicMock):
+        globals_obj = mock.MagicMock()
+        globals_obj.is_kafka_producer_async.return_value = True
+        globals_obj.get_kafka_async_producer.return_value = async_producer
+        with mock.patch("fabric_cf.actor.core.container.globals.GlobalsSingleton.get", return_value=globals_obj), \
+                mock.patch.object(RPCManagerSingleton, "get", return_value=manager):
+            self.make_proxy().send_message(avro_message=DummyMessage(message_id="m1"))
+
+    def test_delivery_report_forwarded(self):
+        async_producer = mock.MagicMock()
+        async_producer.produce.return_value = True
+        manager = mock.MagicMock()
+        self.send(async_producer=async_producer, manager=manager)
+
+        manager.delivery_report.assert_not_called()
+        on_delivery = async_producer.produce.call_args.kwargs["on_delivery"]
+        with mock.patch.object(RPCManagerSingleton, "get", return_value=manager):
+            on_delivery("broker down")
+        manager.delivery_report.assert_called_once_with(message_id="m1", error="broker down")
+
+    def test_enqueue_failure(self):
+        async_producer = mock.MagicMock()
+        async_producer.produce.return_value = False
+        manager = mock.MagicMock()
+        self.send(async_producer=async_producer, manager=manager)
+
+        manager.delivery_report.assert_called_once_with(message_id="m1", error="Failed to queue message")
+
+
+if __name__ == '__main__':
+    unittest.main()
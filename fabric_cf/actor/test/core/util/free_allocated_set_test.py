@@ -25,6 +25,7 @@
 # Author: Komal Thareja (kthare10@renci.org)
 import unittest
 
+from fabric_cf.actor.core.common.exceptions import PolicyException
 from fabric_cf.actor.core.policy.free_allocated_set import FreeAllocatedSet
 
 
@@ -90,3 +91,20 @@ class FreeAllocatedSetTest(unittest.TestCase):
             self.assertTrue(free_set.free_set.__contains__(i))
             self.assertFalse(free_set.allocated.__contains__(i))
 
+
+    def test_range(self):
+        free_set = FreeAllocatedSet()
+        free_set.add_inventory_range(start=1, end=4094)
+        self.assertEqual(4094, free_set.get_free())
+
+        # lowest free tag first; configured tags are taken out of the free set
+        self.assertEqual(1, free_set.allocate())
+        self.assertEqual(100, free_set.allocate(tag=100, config_tag=True))
+        self.assertEqual(4092, free_set.get_free())
+        self.assertEqual(2, free_set.get_allocated())
+        self.assertRaises(PolicyException, free_set.allocate, tag=100, config_tag=True)
+        self.assertRaises(PolicyException, free_set.add_inventory_range, start=90, end=110)
+
+        free_set.free(item=100)
+        self.assertEqual(4093, free_set.get_free())
+        self.assertEqual([1], list(free_set.allocated))
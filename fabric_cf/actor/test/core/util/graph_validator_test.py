@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import os
+import unittest
+
+from fabric_cf.actor.core.common.exceptions import FrameworkException
+from fabric_cf.actor.core.util.graph_validator import GraphValidator
+
+GRAPH_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "..", "config", "neo4j")
+
+
+class GraphValidatorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(GRAPH_DIR, "site-am-2broker-ad-enumerated.graphml"), 'r') as f:
+            self.graph_str = f.read()
+
+    def test_rules_loaded_from_fim(self):
+        self.assertTrue(len(GraphValidator.load_rules()) > 0)
+        GraphValidator.validate_graphml(graph_str=self.graph_str)
+
+    def test_invalid(self):
+        with self.assertRaises(FrameworkException):
+            GraphValidator.validate_graphml(graph_str=self.graph_str.replace(">Server<", ">Floppy<"))
+        with self.assertRaises(FrameworkException):
+            GraphValidator.validate_graphml(graph_str="not graphml")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import random
+import unittest
+
+from fabric_cf.actor.core.util.interval_tree import IntervalTree
+
+
+class IntervalTreeTest(unittest.TestCase):
+    def test_search(self):
+        tree = IntervalTree(seed=1)
+        keys = {}
+        for i in range(6):
+            keys[i] = tree.insert(start=5 - i, end=10 - i, value=i)
+        self.assertEqual(6, len(tree))
+        self.assertEqual([5], tree.search(point=0))
+        self.assertEqual(list(range(6)), sorted(tree.search(point=5)))
+        self.assertEqual([0], tree.search(point=10))
+        self.assertEqual([], tree.search(point=11))
+        self.assertEqual([5, 4, 3, 2, 1, 0], tree.values())
+
+        self.assertTrue(tree.remove(key=keys[5]))
+        self.assertFalse(tree.remove(key=keys[5]))
+        self.assertEqual(5, len(tree))
+        self.assertEqual([], tree.search(point=0))
+
+        tree.clear()
+        self.assertEqual(0, len(tree))
+        self.assertEqual([], tree.search(point=5))
+
+    def test_random_against_reference(self):
+        rnd = random.Random(7)
+        tree = IntervalTree(seed=7)
+        intervals = {}
+        for i in range(2000):
+            if rnd.random() < 0.7 or len(intervals) == 0:
+                start = rnd.randint(0, 1000)
+                end = start + rnd.randint(0, 100)
+                key = tree.insert(start=start, end=end, value=i)
+                intervals[key] = (start, end, i)
+            else:
+                key = rnd.choice(list(intervals.keys()))
+                intervals.pop(key)
+                self.assertTrue(tree.remove(key=key))
+            start = rnd.randint(0, 1100)
+            end = start + rnd.randint(0, 20)
+            expected = sorted(v for s, e, v in intervals.values() if s <= end and e >= start)
+            self.assertEqual(expected, sorted(tree.overlap(start=start, end=end)))
+            self.assertEqual(len(intervals), len(tree))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from prometheus_client import REGISTRY
+
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.kernel.rpc_request_type import RPCRequestType
+from fabric_cf.actor.core.util.metrics import ActorMetrics
+
+
+@ActorMetrics.timed_methods
+class DummyDatabase:
+    def get_value(self, *, value: int) -> int:
+        return value
+
+    def stream_values(self, *, count: int):
+        for i in range(count):
+            yield i
+
+    @staticmethod
+    def get_static() -> int:
+        return 1
+
+
+class MetricsTest(unittest.TestCase):
+    def tearDown(self):
+        ActorMetrics.enabled = False
+
+    @staticmethod
+    def get_count(name: str, labels: dict) -> float:
+        value = REGISTRY.get_sample_value(name, labels)
+        return value if value is not None else 0
+
+    def test_configure(self):
+        ActorMetrics.configure(runtime_config={})
+        self.assertFalse(ActorMetrics.enabled)
+        self.assertIsNone(ActorMetrics.start())
+        ActorMetrics.configure(runtime_config={Constants.property_conf_prometheus_metrics: True})
+        self.assertTrue(ActorMetrics.enabled)
+        self.assertIsNotNone(ActorMetrics.start())
+        ActorMetrics.configure(runtime_config={Constants.property_conf_prometheus_metrics: "false"})
+        self.assertFalse(ActorMetrics.enabled)
+
+    def test_disabled(self):
+        labels = {'direction': ActorMetrics.OUTBOUND, 'type': RPCRequestType.Ticket.name}
+        before = self.get_count('actor_rpc_total', labels)
+        before_db = self.get_count('actor_db_seconds_count', {'method': 'get_value'})
+        ActorMetrics.count_rpc(direction=ActorMetrics.OUTBOUND, request_type=RPCRequestType.Ticket)
+        ActorMetrics.observe_rpc(direction=ActorMetrics.OUTBOUND, request_type=RPCRequestType.Ticket,
+                                 begin=ActorMetrics.start())
+        self.assertEqual(before, self.get_count('actor_rpc_total', labels))
+        self.assertEqual(1, DummyDatabase().get_value(value=1))
+        self.assertEqual(before_db, self.get_count('actor_db_seconds_count', {'method': 'get_value'}))
+
+    def test_enabled(self):
+        ActorMetrics.enabled = True
+        labels = {'direction': ActorMetrics.INBOUND, 'type': RPCRequestType.Redeem.name}
+        before = self.get_count('actor_rpc_total', labels)
+        before_seconds = self.get_count('actor_rpc_seconds_count', labels)
+        ActorMetrics.count_rpc(direction=ActorMetrics.INBOUND, request_type=RPCRequestType.Redeem)
+        ActorMetrics.observe_rpc(direction=ActorMetrics.INBOUND, request_type=RPCRequestType.Redeem,
+                                 begin=ActorMetrics.start())
+        self.assertEqual(before + 1, self.get_count('actor_rpc_total', labels))
+        self.assertEqual(before_seconds + 1, self.get_count('actor_rpc_seconds_count', labels))
+
+        ActorMetrics.observe_tick(actor="test-actor", begin=ActorMetrics.start())
+        self.assertEqual(1, self.get_count('actor_tick_seconds_count', {'actor': "test-actor"}))
+        ActorMetrics.set_event_queue_depth(actor="test-actor", depth=5)
+        self.assertEqual(5, self.get_count('actor_event_queue_depth', {'actor': "test-actor"}))
+
+    def test_timed_methods(self):
+        ActorMetrics.enabled = True
+        db = DummyDatabase()
+        before = self.get_count('actor_db_seconds_count', {'method': 'get_value'})
+        self.assertEqual(2, db.get_value(value=2))
+        self.assertEqual(before + 1, self.get_count('actor_db_seconds_count', {'method': 'get_value'}))
+        self.assertEqual([0, 1, 2], list(db.stream_values(count=3)))
+        self.assertEqual(1, DummyDatabase.get_static())
+        self.assertEqual(0, self.get_count('actor_db_seconds_count', {'method': 'stream_values'}))
+        self.assertEqual(0, self.get_count('actor_db_seconds_count', {'method': 'get_static'}))
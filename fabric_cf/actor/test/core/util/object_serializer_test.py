@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import pickle
+import unittest
+import zlib
+
+from fabric_cf.actor.core.common.exceptions import SerializerException
+from fabric_cf.actor.core.kernel.client_reservation_factory import ClientReservationFactory
+from fabric_cf.actor.core.kernel.resource_set import ResourceSet
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.object_serializer import ObjectSerializer, Compression
+from fabric_cf.actor.core.util.resource_type import ResourceType
+
+
+class ObjectSerializerTest(unittest.TestCase):
+    def make_reservation(self):
+        rset = ResourceSet(units=1, rtype=ResourceType(resource_type="VM"))
+        return ClientReservationFactory.create(rid=ID(), resources=rset)
+
+    def test_round_trip(self):
+        reservation = self.make_reservation()
+        for compression in [Compression.Nothing, Compression.Zlib]:
+            serializer = ObjectSerializer(compression=compression, compression_threshold=0)
+            data = serializer.serialize(obj=reservation)
+            self.assertTrue(data.startswith(ObjectSerializer.MAGIC))
+            self.assertEqual(compression, data[len(ObjectSerializer.MAGIC) + 1])
+            result = serializer.deserialize(data=data)
+            self.assertEqual(reservation.get_reservation_id(), result.get_reservation_id())
+
+    def test_compression_threshold(self):
+        serializer = ObjectSerializer(compression=Compression.Zlib, compression_threshold=1024 * 1024)
+        data = serializer.serialize(obj=self.make_reservation())
+        self.assertEqual(Compression.Nothing, data[len(ObjectSerializer.MAGIC) + 1])
+
+    def test_decode_all(self):
+        reservation = self.make_reservation()
+        serializer = ObjectSerializer(compression=Compression.Zlib, compression_threshold=0)
+        legacy = pickle.dumps(reservation)
+        decoded = ObjectSerializer.decode_all(data_list=[serializer.serialize(obj=reservation), legacy, None])
+        self.assertEqual(3, len(decoded))
+        self.assertEqual(legacy, decoded[1])
+        self.assertIsNone(decoded[2])
+        result = serializer.deserialize(data=decoded[0])
+        self.assertEqual(reservation.get_reservation_id(), result.get_reservation_id())
+
+    def test_legacy_pickle(self):
+        reservation = self.make_reservation()
+        result = ObjectSerializer().deserialize(data=pickle.dumps(reservation))
+        self.assertEqual(reservation.get_reservation_id(), result.get_reservation_id())
+
+    def test_unsupported_version(self):
+        data = ObjectSerializer.MAGIC + bytes([ObjectSerializer.VERSION + 1, Compression.Zlib]) + \
+               zlib.compress(pickle.dumps("x"))
+        with self.assertRaises(SerializerException):
+            ObjectSerializer().deserialize(data=data)
+
+    def test_compression_from_name(self):
+        self.assertEqual(Compression.Nothing, Compression.from_name(name=None))
+        self.assertEqual(Compression.Zlib, Compression.from_name(name="ZLIB"))
+        with self.assertRaises(SerializerException):
+            Compression.from_name(name="unknown")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import pickle
+import random
+import unittest
+
+from fabric_cf.actor.core.util.ipv4_set import IPv4Set
+from fabric_cf.actor.core.util.range_set import RangeSet
+
+
+class RangeSetTest(unittest.TestCase):
+    def test_ranges(self):
+        rs = RangeSet()
+        rs.add_range(start=10, end=20)
+        rs.add_range(start=30, end=40)
+        self.assertEqual(22, len(rs))
+        self.assertEqual([(10, 20), (30, 40)], rs.get_ranges())
+
+        # adjacent and overlapping ranges are merged
+        rs.add_range(start=21, end=29)
+        self.assertEqual([(10, 40)], rs.get_ranges())
+        self.assertEqual(31, len(rs))
+        rs.add_range(start=5, end=45)
+        self.assertEqual([(5, 45)], rs.get_ranges())
+        self.assertEqual(41, len(rs))
+
+        rs.remove(value=20)
+        self.assertEqual([(5, 19), (21, 45)], rs.get_ranges())
+        self.assertNotIn(20, rs)
+        self.assertIn(21, rs)
+        with self.assertRaises(KeyError):
+            rs.remove(value=20)
+
+        self.assertEqual(5, rs.pop())
+        self.assertEqual(6, rs.pop())
+        self.assertEqual(38, len(rs))
+        self.assertEqual("[7-19,21-45]", str(rs))
+
+        copy = pickle.loads(pickle.dumps(rs))
+        self.assertEqual(rs.get_ranges(), copy.get_ranges())
+        self.assertEqual(len(rs), len(copy))
+
+    def test_random(self):
+        rnd = random.Random(0)
+        rs = RangeSet()
+        expected = set()
+        for i in range(5000):
+            op = rnd.randint(0, 3)
+            if op == 0:
+                start = rnd.randint(0, 1000)
+                end = start + rnd.randint(0, 20)
+                rs.add_range(start=start, end=end)
+                expected.update(range(start, end + 1))
+            elif op == 1:
+                value = rnd.randint(0, 1020)
+                rs.add(value=value)
+                expected.add(value)
+            elif op == 2:
+                value = rnd.randint(0, 1020)
+                rs.discard(value=value)
+                expected.discard(value)
+            elif len(expected) > 0:
+                value = rs.pop()
+                self.assertEqual(min(expected), value)
+                expected.remove(value)
+            self.assertEqual(len(expected), len(rs))
+        self.assertEqual(sorted(expected), list(rs))
+        ranges = rs.get_ranges()
+        for (s1, e1), (s2, e2) in zip(ranges, ranges[1:]):
+            self.assertLess(e1 + 1, s2)
+
+    def test_ipv4_set(self):
+        ipset = IPv4Set(ip_list="10.0.0.1/16,192.168.1.10-20,172.16.0.1")
+        self.assertEqual(65534 + 11 + 1, ipset.get_free_count())
+        self.assertEqual("10.0.0.1", ipset.allocate())
+        self.assertEqual("10.0.0.2", ipset.allocate())
+        ipset.free(ip="10.0.0.1")
+        self.assertEqual("10.0.0.1", ipset.allocate())
+        ipset.reserve(ip="192.168.1.15")
+        self.assertTrue(ipset.is_allocated(ip=ipset.to_ip4(ip="192.168.1.15")))
+        self.assertFalse(ipset.is_free(ip=ipset.to_ip4(ip="192.168.1.15")))
+        self.assertEqual(65534 + 11 + 1 - 3, ipset.get_free_count())
@@ -23,12 +23,15 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
+import random
 import unittest
 
 from fabric_cf.actor.core.apis.i_reservation import IReservation
 from fabric_cf.actor.core.kernel.client_reservation_factory import ClientReservationFactory
+from fabric_cf.actor.core.kernel.resource_set import ResourceSet
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.actor.core.util.reservation_holdings import ReservationHoldings
+from fabric_cf.actor.core.util.resource_type import ResourceType
 
 
 class ReservationHoldingsTest(unittest.TestCase):
@@ -194,4 +197,62 @@ class ReservationHoldingsTest(unittest.TestCase):
         for i in range(len(points)):
             rset = holdings.get_reservations(time=points[i])
             self.assertIsNotNone(rset)
-            self.assertEqual(results[i], rset.size())
\ No newline at end of file
+            self.assertEqual(results[i], rset.size())
+
+    @staticmethod
+    def reference_query(*, intervals: dict, time: int = None, rtype: ResourceType = None) -> set:
+        result = set()
+        for rid, (reservation, start, end) in intervals.items():
+            if time is not None and not start <= time <= end:
+                continue
+            if rtype is not None and reservation.get_type() != rtype:
+                continue
+            result.add(rid)
+        return result
+
+    def test_random_against_reference(self):
+        rtypes = [ResourceType(resource_type=t) for t in ["VM", "Baremetal", "L2Bridge"]]
+        for seed in range(10):
+            rnd = random.Random(seed)
+            holdings = ReservationHoldings()
+            # Brute force model of the expected contents: rid -> (reservation, start, end)
+            intervals = {}
+            now = 0
+            for step in range(300):
+                op = rnd.random()
+                if op < 0.5 or len(intervals) == 0:
+                    rset = ResourceSet(units=1, rtype=rnd.choice(rtypes))
+                    res = ClientReservationFactory.create(rid=ID(), resources=rset)
+                    start = now + rnd.randint(0, 50)
+                    end = start + rnd.randint(0, 50)
+                    holdings.add_reservation(reservation=res, start=start, end=end)
+                    intervals[res.get_reservation_id()] = (res, start, end)
+                elif op < 0.65:
+                    # extend an existing reservation
+                    rid = rnd.choice(list(intervals.keys()))
+                    res, start, end = intervals[rid]
+                    new_end = end + rnd.randint(1, 20)
+                    holdings.add_reservation(reservation=res, start=end + 1, end=new_end)
+                    intervals[rid] = (res, start, new_end)
+                elif op < 0.8:
+                    rid = rnd.choice(list(intervals.keys()))
+                    holdings.remove_reservation(reservation=intervals.pop(rid)[0])
+                elif op < 0.85:
+                    now += rnd.randint(0, 10)
+                    holdings.tick(time=now)
+                    intervals = {k: v for k, v in intervals.items() if v[2] > now}
+                else:
+                    time = now + rnd.randint(0, 100)
+                    rtype = rnd.choice(rtypes + [None])
+                    expected = self.reference_query(intervals=intervals, time=time, rtype=rtype)
+                    rset = holdings.get_reservations(time=time, rtype=rtype)
+                    self.assertEqual(expected, set(r.get_reservation_id() for r in rset.values()))
+
+                self.assertEqual(len(intervals), holdings.size())
+                self.assertEqual(len(intervals), len(holdings.list))
+                self.assertEqual(len(intervals), sum(len(t) for t in holdings.trees.values()))
+
+            for rtype in rtypes:
+                expected = self.reference_query(intervals=intervals, rtype=rtype)
+                rset = holdings.get_reservations(rtype=rtype)
+                self.assertEqual(expected, set(r.get_reservation_id() for r in rset.values()))
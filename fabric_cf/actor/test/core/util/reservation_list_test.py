@@ -126,3 +126,34 @@ class ReservationListTest(unittest.TestCase):
                 r_list.remove_reservation(reservation=res)
                 exist = self.check_exists(holdings=r_list, reservation=res, cycle=i)
                 self.assertTrue(not exist)
+
+        self.assertEqual(0, r_list.size())
+        self.assertEqual(0, len(r_list.rset_wrapper_list))
+        self.assertEqual(0, len(r_list.cycle_to_rset))
+
+    def test_get_all_reservations(self):
+        r_list = ReservationList()
+        for i in range(10):
+            for j in range(10):
+                res = self.make_reservation(str((i * 10) + j))
+                # add cycles out of order
+                r_list.add_reservation(reservation=res, cycle=(i * 3) % 10)
+
+        self.assertFalse(r_list.has_reservations(cycle=-1))
+        for cycle in range(10):
+            rset = r_list.get_all_reservations(cycle=cycle)
+            self.assertEqual((cycle + 1) * 10, rset.size())
+            self.assertTrue(r_list.has_reservations(cycle=cycle))
+
+        # removing all reservations for a cycle removes its entry from the sorted list
+        for res in r_list.get_reservations(cycle=0).values():
+            r_list.remove_reservation(reservation=res)
+        self.assertEqual(9, len(r_list.rset_wrapper_list))
+        self.assertFalse(r_list.has_reservations(cycle=0))
+        self.assertEqual(10, r_list.get_all_reservations(cycle=1).size())
+
+        r_list.tick(cycle=4)
+        self.assertEqual(5, len(r_list.rset_wrapper_list))
+        self.assertEqual(50, r_list.size())
+        self.assertEqual(50, len(r_list.reservation_id_to_cycle))
+        self.assertEqual(0, r_list.get_all_reservations(cycle=4).size())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+
+from fabric_cf.actor.db.psql_database import PsqlDatabase
+
+
+class PsqlDatabaseTest(unittest.TestCase):
+    def make_database(self) -> PsqlDatabase:
+        db = PsqlDatabase(user="user", password="password", database="db", db_host="localhost",
+                          logger=logging.getLogger(__name__))
+        db.db_engine = create_engine("sqlite://")
+        db.create_db()
+        return db
+
+    def test_stream_reservations(self):
+        db = self.make_database()
+        db.add_actor(name="actor1", guid="guid1", act_type=1, properties=b'')
+        db.add_actor(name="actor2", guid="guid2", act_type=1, properties=b'')
+        act_id = db.get_actor(name="actor1")['act_id']
+        other_act_id = db.get_actor(name="actor2")['act_id']
+        db.add_slice(act_id=act_id, slc_guid="slice1", slc_name="slice1", slc_type=1, slc_resource_type="VM",
+                     properties=b'')
+        db.add_slice(act_id=act_id, slc_guid="slice2", slc_name="slice2", slc_type=2, slc_resource_type="VM",
+                     properties=b'')
+        db.add_slice(act_id=other_act_id, slc_guid="slice3", slc_name="slice3", slc_type=1,
+                     slc_resource_type="VM", properties=b'')
+        for i in range(10):
+            db.add_reservation(act_id=act_id, slc_guid="slice2" if i % 2 else "slice1", rsv_resid="r{}".format(i),
+                               rsv_category=1, rsv_state=i % 3, rsv_pending=0, rsv_joining=0, properties=b'data')
+        db.add_reservation(act_id=other_act_id, slc_guid="slice3", rsv_resid="other", rsv_category=1, rsv_state=0,
+                           rsv_pending=0, rsv_joining=0, properties=b'data')
+
+        result = list(db.stream_reservations(act_id=act_id, batch_size=3))
+        self.assertEqual(10, len(result))
+        slice_ids = [r['rsv_slc_id'] for r in result]
+        self.assertEqual(sorted(slice_ids), slice_ids)
+        self.assertEqual(b'data', result[0]['properties'])
+
+        result = list(db.stream_reservations(act_id=act_id, slc_types=[2], exclude_states=[1]))
+        self.assertEqual(["r3", "r5", "r9"], [r['rsv_resid'] for r in result])
+
+        stream = db.stream_reservations(act_id=act_id, batch_size=2)
+        self.assertIsNotNone(next(stream))
+        stream.close()
+
+    def populate(self, *, db: PsqlDatabase) -> int:
+        db.add_actor(name="actor1", guid="guid1", act_type=1, properties=b'')
+        act_id = db.get_actor(name="actor1")['act_id']
+        db.add_slice(act_id=act_id, slc_guid="slice1", slc_name="slice1", slc_type=1, slc_resource_type="VM",
+                     properties=b'')
+        slc_id = db.get_slice(act_id=act_id, slice_guid="slice1")['slc_id']
+        db.add_reservation(act_id=act_id, slc_guid="slice1", rsv_resid="r1", rsv_category=1, rsv_state=0,
+                           rsv_pending=0, rsv_joining=0, properties=b'old')
+        db.add_delegation(dlg_act_id=act_id, dlg_slc_id=slc_id, dlg_graph_id="d1", dlg_state=0, properties=b'old')
+        return act_id
+
+    @staticmethod
+    def updates() -> dict:
+        return {'slices': [{'slc_guid': "slice1", 'slc_name': "renamed", 'slc_type': 1, 'slc_resource_type': "VM",
+                            'properties': b'new'}],
+                'reservations': [{'rsv_resid': "r1", 'rsv_category': 1, 'rsv_state': 2, 'rsv_pending': 0,
+                                  'rsv_joining': 0, 'properties': b'new'}],
+                'delegations': [{'dlg_graph_id': "d1", 'dlg_state': 2, 'properties': b'new'}]}
+
+    def test_update_objects(self):
+        db = self.make_database()
+        act_id = self.populate(db=db)
+
+        db.update_objects(act_id=act_id, **self.updates())
+        self.assertEqual("renamed", db.get_slice(act_id=act_id, slice_guid="slice1")['slc_name'])
+        self.assertEqual(2, db.get_reservation(act_id=act_id, rsv_resid="r1")['rsv_state'])
+        self.assertEqual(2, db.get_delegation(dlg_act_id=act_id, dlg_graph_id="d1")['dlg_state'])
+
+    def test_update_objects_rollback(self):
+        db = self.make_database()
+        act_id = self.populate(db=db)
+
+        # a failure on the last table rolls back the slice and reservation updates as well
+        with mock.patch.object(PsqlDatabase, "bulk_update_delegations", side_effect=Exception("connection lost")):
+            with self.assertRaises(Exception):
+                db.update_objects(act_id=act_id, **self.updates())
+        self.assertEqual("slice1", db.get_slice(act_id=act_id, slice_guid="slice1")['slc_name'])
+        self.assertEqual(0, db.get_reservation(act_id=act_id, rsv_resid="r1")['rsv_state'])
+        self.assertEqual(0, db.get_delegation(dlg_act_id=act_id, dlg_graph_id="d1")['dlg_state'])
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import unittest
+
+from fabric_cf.actor.db.psql_engine_cache import PsqlEngineCache, InstrumentedQueuePool
+
+
+class PsqlEngineCacheTest(unittest.TestCase):
+    dsn = "sqlite://"
+
+    def tearDown(self) -> None:
+        PsqlEngineCache.dispose()
+
+    def test_engine_shared_by_dsn(self):
+        engine = PsqlEngineCache.get_engine(dsn=self.dsn, pool_config={'pool_size': 2, 'max_overflow': 1})
+        self.assertIsInstance(engine.pool, InstrumentedQueuePool)
+        self.assertEqual(2, engine.pool.size())
+        # Pool settings of later callers are ignored, the engine is shared
+        self.assertIs(engine, PsqlEngineCache.get_engine(dsn=self.dsn, pool_config={'pool_size': 7}))
+        self.assertIs(PsqlEngineCache.get_session_factory(engine=engine),
+                      PsqlEngineCache.get_session_factory(engine=engine))
+
+    def test_pool_metrics(self):
+        engine = PsqlEngineCache.get_engine(dsn=self.dsn, pool_config={'pool_size': 2})
+        with engine.connect() as conn:
+            conn.exec_driver_sql("select 1")
+            metrics = PsqlEngineCache.get_pool_metrics(engine=engine)
+            self.assertEqual(1, metrics['checked_out'])
+            self.assertEqual(1, metrics['wait_count'])
+        metrics = PsqlEngineCache.get_pool_metrics(engine=engine)
+        self.assertEqual(0, metrics['checked_out'])
+        self.assertEqual(1, metrics['checked_in'])
+        self.assertGreaterEqual(metrics['wait_time_max'], metrics['wait_time_avg'])
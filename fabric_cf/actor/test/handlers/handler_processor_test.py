@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import time
+import unittest
+
+from fabric_cf.actor.core.plugins.config.config import Config
+from fabric_cf.actor.core.plugins.config.configuration_mapping import ConfigurationMapping
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.resource_type import ResourceType
+from fabric_cf.actor.handlers.handler_base import HandlerBase
+from fabric_cf.actor.handlers.handler_processor import HandlerProcessor
+
+
+class DummyUnit:
+    def __init__(self, *, rtype: str = "vm"):
+        self.id = ID()
+        self.rtype = ResourceType(resource_type=rtype)
+
+    def get_id(self) -> ID:
+        return self.id
+
+    def get_sequence(self) -> int:
+        return 0
+
+    def get_resource_type(self) -> ResourceType:
+        return self.rtype
+
+
+class DummyHandler(HandlerBase):
+    delay = 0.05
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+    calls = []
+
+    def run(self, *, action: str, unit: DummyUnit, properties: dict) -> dict:
+        with DummyHandler.lock:
+            DummyHandler.running += 1
+            DummyHandler.max_running = max(DummyHandler.max_running, DummyHandler.running)
+            DummyHandler.calls.append((action, unit.get_id()))
+        try:
+            time.sleep(properties.get("delay", DummyHandler.delay))
+            if properties.get("fail", False):
+                raise Exception("failure")
+            return {"action": action}
+        finally:
+            with DummyHandler.lock:
+                DummyHandler.running -= 1
+
+    def create(self, *, unit: DummyUnit, properties: dict) -> dict:
+        return self.run(action=Config.target_create, unit=unit, properties=properties)
+
+    def delete(self, *, unit: DummyUnit, properties: dict) -> dict:
+        return self.run(action=Config.target_delete, unit=unit, properties=properties)
+
+    def modify(self, *, unit: DummyUnit, properties: dict) -> dict:
+        return self.run(action=Config.target_modify, unit=unit, properties=properties)
+
+
+class DummyPlugin:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.completions = []
+
+    def configuration_complete(self, *, token, properties: dict):
+        with self.condition:
+            self.completions.append((token, properties))
+            self.condition.notify_all()
+
+    def wait(self, *, count: int, timeout: float = 10):
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.completions) >= count, timeout=timeout)
+        return self.completions
+
+
+class HandlerProcessorTest(unittest.TestCase):
+    logger = logging.getLogger(__name__)
+
+    def setUp(self):
+        DummyHandler.running = 0
+        DummyHandler.max_running = 0
+        DummyHandler.calls = []
+
+    @staticmethod
+    def make_mapping(*, rtype: str = "vm", properties: dict = None) -> ConfigurationMapping:
+        mapping = ConfigurationMapping()
+        mapping.set_key(key=rtype)
+        mapping.set_module_name(module_name=__name__)
+        mapping.set_class_name(class_name=DummyHandler.__name__)
+        mapping.set_properties(properties=properties)
+        return mapping
+
+    def test_parallel(self):
+        plugin = DummyPlugin()
+        processor = HandlerProcessor(plugin=plugin, logger=self.logger, workers=20)
+        mapping = self.make_mapping()
+        units = [DummyUnit() for _ in range(100)]
+        begin = time.time()
+        for u in units:
+            processor.submit(target=Config.target_create, token=u, properties={}, mapping=mapping)
+        completions = plugin.wait(count=len(units))
+        elapsed = time.time() - begin
+        processor.shutdown()
+
+        self.assertEqual(len(units), len(completions))
+        self.assertLess(elapsed, len(units) * DummyHandler.delay / 2)
+        self.assertGreater(DummyHandler.max_running, 1)
+        for token, properties in completions:
+            self.assertEqual(Config.result_code_ok, Config.get_result_code(properties=properties))
+            self.assertEqual(Config.target_create, properties[Config.property_target_name])
+            self.assertEqual(token.get_sequence(), Config.get_action_sequence_number(properties=properties))
+            self.assertEqual(Config.target_create, properties["action"])
+
+    def test_type_concurrency(self):
+        plugin = DummyPlugin()
+        processor = HandlerProcessor(plugin=plugin, logger=self.logger, workers=20, concurrency=2)
+        mapping = self.make_mapping()
+        for _ in range(10):
+            processor.submit(target=Config.target_create, token=DummyUnit(), properties={}, mapping=mapping)
+        self.assertEqual(10, len(plugin.wait(count=10)))
+        processor.shutdown()
+        self.assertEqual(2, DummyHandler.max_running)
+
+        plugin = DummyPlugin()
+        processor = HandlerProcessor(plugin=plugin, logger=self.logger, workers=20, concurrency=2)
+        mapping = self.make_mapping(properties={HandlerProcessor.property_concurrency: 1})
+        DummyHandler.max_running = 0
+        for _ in range(5):
+            processor.submit(target=Config.target_create, token=DummyUnit(), properties={}, mapping=mapping)
+        self.assertEqual(5, len(plugin.wait(count=5)))
+        processor.shutdown()
+        self.assertEqual(1, DummyHandler.max_running)
+
+    def test_unit_order(self):
+        plugin = DummyPlugin()
+        processor = HandlerProcessor(plugin=plugin, logger=self.logger, workers=4)
+        mapping = self.make_mapping()
+        u = DummyUnit()
+        processor.submit(target=Config.target_create, token=u, properties={"delay": 0.1}, mapping=mapping)
+        processor.submit(target=Config.target_modify, token=u, properties={}, mapping=mapping)
+        processor.submit(target=Config.target_delete, token=u, properties={}, mapping=mapping)
+        completions = plugin.wait(count=3)
+        processor.shutdown()
+        self.assertEqual([Config.target_create, Config.target_modify, Config.target_delete],
+                         [properties[Config.property_target_name] for token, properties in completions])
+        self.assertEqual(1, DummyHandler.max_running)
+
+    def test_failure_and_timeout(self):
+        plugin = DummyPlugin()
+        processor = HandlerProcessor(plugin=plugin, logger=self.logger, workers=4, timeout=0.2)
+        mapping = self.make_mapping()
+        processor.submit(target=Config.target_create, token=DummyUnit(), properties={"fail": True}, mapping=mapping)
+        processor.submit(target=Config.target_create, token=DummyUnit(), properties={"delay": 1}, mapping=mapping)
+        completions = plugin.wait(count=2)
+        self.assertEqual(2, len(completions))
+        for token, properties in completions:
+            self.assertEqual(Config.result_code_exception, Config.get_result_code(properties=properties))
+            self.assertIsNotNone(Config.get_exception_message(properties=properties))
+        # the late result of the timed out action is discarded
+        time.sleep(1)
+        processor.shutdown()
+        self.assertEqual(2, len(plugin.completions))
+        metrics = processor.get_metrics()
+        self.assertEqual(1, metrics['timed_out'])
+        self.assertEqual(2, metrics['failed'])
+
+    def test_cancel(self):
+        plugin = DummyPlugin()
+        processor = HandlerProcessor(plugin=plugin, logger=self.logger, workers=1)
+        mapping = self.make_mapping()
+        first = DummyUnit()
+        second = DummyUnit()
+        processor.submit(target=Config.target_create, token=first, properties={"delay": 0.3}, mapping=mapping)
+        processor.submit(target=Config.target_create, token=second, properties={}, mapping=mapping)
+        self.assertEqual(1, processor.cancel(token=second))
+        completions = plugin.wait(count=2)
+        processor.shutdown()
+        self.assertEqual(2, len(completions))
+        token, properties = completions[0]
+        self.assertEqual(second, token)
+        self.assertEqual(Config.result_code_exception, Config.get_result_code(properties=properties))
+        self.assertEqual([(Config.target_create, first.get_id())], DummyHandler.calls)
+
+    def test_no_handler(self):
+        plugin = DummyPlugin()
+        processor = HandlerProcessor(plugin=plugin, logger=self.logger, workers=4)
+        mapping = self.make_mapping()
+        mapping.set_module_name(module_name="fabric_cf.actor.plugins.missing")
+        processor.submit(target=Config.target_delete, token=DummyUnit(), properties={}, mapping=mapping)
+        processor.submit(target=Config.target_modify, token=DummyUnit(), properties={})
+        completions = plugin.wait(count=2)
+        processor.shutdown()
+        for token, properties in completions:
+            self.assertEqual(Config.result_code_ok, Config.get_result_code(properties=properties))
+        self.assertEqual(0, len(DummyHandler.calls))
+
+    def test_inline(self):
+        plugin = DummyPlugin()
+        processor = HandlerProcessor(plugin=plugin, logger=self.logger, workers=0)
+        processor.submit(target=Config.target_create, token=DummyUnit(), properties={}, mapping=self.make_mapping())
+        self.assertEqual(1, len(plugin.completions))
+        self.assertEqual(1, len(DummyHandler.calls))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import time
+import unittest
+from unittest import mock
+
+from fabric_cf.actor.core.apis.i_actor import ActorType
+from fabric_cf.actor.security.pdp_auth import PdpAuth, PdpAuthException, ActionId, ResourceType, PdpDecisionCache
+
+
+class PdpAuthTest(unittest.TestCase):
+    token = {"email": "user@example.org",
+             "roles": ["CO:members:active", "CO:COU:project-leads:members:active"],
+             "project": "all"}
+
+    def setUp(self) -> None:
+        PdpAuth.decision_cache = PdpDecisionCache()
+
+    @staticmethod
+    def get_response(*, decision: str):
+        response = mock.MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"Response": [{"Decision": decision}]}
+        return response
+
+    def check_access(self, *, pdp: PdpAuth, resource_id: str = None, token: dict = None) -> bool:
+        return pdp.check_access(fabric_token=token if token is not None else self.token,
+                                actor_type=ActorType.Orchestrator, action_id=ActionId.query,
+                                resource_type=ResourceType.slice, resource_id=resource_id)
+
+    def test_decision_cache(self):
+        pdp = PdpAuth(config={'url': 'http://pdp', 'decision-cache-ttl': 60})
+        session = mock.MagicMock()
+        session.post.return_value = self.get_response(decision="Permit")
+        with mock.patch.object(PdpAuth, 'get_session', return_value=session):
+            self.assertTrue(self.check_access(pdp=pdp))
+            self.assertTrue(self.check_access(pdp=pdp))
+            self.assertEqual(1, session.post.call_count)
+
+            # different resource or subject is not served from the cache
+            self.assertTrue(self.check_access(pdp=pdp, resource_id="slice-1"))
+            other = dict(self.token)
+            other["email"] = "other@example.org"
+            self.assertTrue(self.check_access(pdp=pdp, token=other))
+            self.assertEqual(3, session.post.call_count)
+
+            session.post.return_value = self.get_response(decision="Deny")
+            with self.assertRaises(PdpAuthException):
+                self.check_access(pdp=pdp, resource_id="slice-2")
+            with self.assertRaises(PdpAuthException):
+                self.check_access(pdp=pdp, resource_id="slice-2")
+            self.assertEqual(4, session.post.call_count)
+
+        metrics = PdpAuth.get_metrics()
+        self.assertEqual(2, metrics["hits"])
+        self.assertEqual(4, metrics["misses"])
+
+    def test_cache_disabled(self):
+        pdp = PdpAuth(config={'url': 'http://pdp', 'decision-cache-ttl': 0})
+        session = mock.MagicMock()
+        session.post.return_value = self.get_response(decision="Permit")
+        with mock.patch.object(PdpAuth, 'get_session', return_value=session):
+            self.assertTrue(self.check_access(pdp=pdp))
+            self.assertTrue(self.check_access(pdp=pdp))
+        self.assertEqual(2, session.post.call_count)
+
+    def test_expiry_and_eviction(self):
+        cache = PdpDecisionCache(ttl=1, size=2)
+        cache.put(key=("a",), decision=True, response={})
+        cache.put(key=("b",), decision=True, response={})
+        self.assertIsNotNone(cache.get(key=("a",)))
+        cache.put(key=("c",), decision=True, response={})
+        self.assertIsNone(cache.get(key=("b",)))
+        self.assertIsNotNone(cache.get(key=("a",)))
+        with mock.patch.object(time, 'monotonic', return_value=time.monotonic() + 2):
+            self.assertIsNone(cache.get(key=("a",)))
+        self.assertEqual(1, cache.get_metrics()["size"])
@@ -23,8 +23,8 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-from fabric_cf.actor.core.apis.i_mgmt_controller import IMgmtController
 from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.status_checker import StatusChecker, Status
@@ -36,24 +36,27 @@ class ActiveStatusChecker(StatusChecker):
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
         self.logger = GlobalsSingleton.get().get_logger()
 
-    def check_(self, *, controller: IMgmtController, rid) -> Status:
+    def get_reservation_id(self, *, rid) -> ID:
+        if not isinstance(rid, ID):
+            return None
+        return rid
+
+    def check_(self, *, rid, status: ReservationStatusMng) -> Status:
         if not isinstance(rid, ID):
             return Status.NOTREADY
 
         try:
-            reservations = controller.get_reservations(rid=rid)
-            units = controller.get_reservation_units(rid=rid)
-
-            if reservations is None or len(reservations) == 0:
+            if status is None or status.get_state() == ReservationStates.Unknown.value:
                 raise OrchestratorException("Unable to obtain reservation information for {}".format(rid))
-            reservation = next(iter(reservations))
 
-            if reservation.get_state() == ReservationStates.Active:
+            if status.get_state() == ReservationStates.Active.value:
+                units = status.get_units()
                 if units is None or len(units) == 0:
                     return Status.NOTREADY
-            elif reservation.get_state() == ReservationStates.Closed:
                 return Status.OK
-            elif reservation.get_state() == ReservationStates.Failed:
+            elif status.get_state() == ReservationStates.Closed.value:
+                return Status.OK
+            elif status.get_state() == ReservationStates.Failed.value:
                 return Status.NOTOK
 
         except Exception as e:
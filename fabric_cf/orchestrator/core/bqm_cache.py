@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import threading
+import time
+from typing import Callable, Tuple
+
+from fabric_cf.actor.core.util.graph_validator import GraphValidator
+from fabric_cf.orchestrator.core.exceptions import OrchestratorException
+
+
+class BqmCache:
+    """
+    Caches the validated Broker Query Model (BQM) in the Orchestrator. A cached BQM is served until it is older
+    than the TTL or has been invalidated. Concurrent callers that find the cache stale share a single in-flight
+    fetch. A BQM is validated in memory against the FIM graph validation rules and only when its version changes.
+    When a refresh interval is configured, a request served from a cached BQM older than the interval also
+    refreshes it in the background using that request's fetch function, so the broker is only queried on behalf
+    of a caller with a current token.
+
+    A fetch function returns a tuple (version, bqm); version may be None if the broker does not report one and
+    bqm is None if the broker did not return a BQM.
+    """
+    DEFAULT_TTL = 60
+    DEFAULT_REFRESH_INTERVAL = 0
+
+    def __init__(self, *, logger, ttl: float = DEFAULT_TTL, refresh_interval: float = DEFAULT_REFRESH_INTERVAL):
+        self.logger = logger
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.lock = threading.Condition()
+        self.bqm = None
+        self.version = None
+        self.fetched_at = 0
+        self.in_flight = False
+        self.last_error = None
+        self.thread = None
+        self.metrics = {"hits": 0, "misses": 0, "coalesced": 0, "fetches": 0, "fetch_failures": 0,
+                        "validations": 0, "background_refreshes": 0}
+
+    def is_fresh(self) -> bool:
+        """
+        Check if the cached BQM can be served; caller must hold the lock
+        @return True if fresh
+        """
+        return self.bqm is not None and (time.monotonic() - self.fetched_at) < self.ttl
+
+    def is_refresh_due(self) -> bool:
+        """
+        Check if the cached BQM should be refreshed in the background; caller must hold the lock
+        @return True if a refresh is due
+        """
+        return self.refresh_interval > 0 and (time.monotonic() - self.fetched_at) >= self.refresh_interval
+
+    def get(self, *, fetch: Callable[[], Tuple[str, str]]) -> str:
+        """
+        Return the cached BQM or fetch a new one. If a fetch is already in flight, wait for its result.
+        @param fetch function returning (version, bqm)
+        @return BQM or None if the broker did not return one
+        @raises OrchestratorException if the BQM could not be fetched
+        """
+        with self.lock:
+            if self.is_fresh():
+                self.metrics["hits"] += 1
+                if not self.in_flight and self.is_refresh_due():
+                    self.in_flight = True
+                    self.refresh_in_background(fetch=fetch)
+                return self.bqm
+
+            if self.in_flight:
+                self.metrics["coalesced"] += 1
+                while self.in_flight:
+                    self.lock.wait()
+                if self.is_fresh():
+                    return self.bqm
+                if self.last_error is None:
+                    return None
+                raise OrchestratorException("Could not fetch broker query model: {}".format(self.last_error))
+
+            self.metrics["misses"] += 1
+            self.in_flight = True
+
+        return self.refresh(fetch=fetch)
+
+    def refresh(self, *, fetch: Callable[[], Tuple[str, str]]) -> str:
+        """
+        Fetch the BQM and update the cache; waiters blocked in get are woken up once done.
+        Caller must have marked the fetch as in flight.
+        @param fetch function returning (version, bqm)
+        @return BQM or None if the broker did not return one
+        @raises OrchestratorException if the BQM could not be fetched
+        """
+        with self.lock:
+            cached_version = self.version
+            cached_bqm = self.bqm
+        bqm = None
+        error = None
+        validated = False
+        try:
+            version, bqm = fetch()
+            if bqm is not None and (version is None or version != cached_version or bqm != cached_bqm):
+                self.validate(bqm=bqm)
+                validated = True
+        except Exception as e:
+            error = e
+            bqm = None
+            version = None
+        finally:
+            with self.lock:
+                self.in_flight = False
+                self.metrics["fetches"] += 1
+                if validated:
+                    self.metrics["validations"] += 1
+                if error is not None:
+                    self.metrics["fetch_failures"] += 1
+                self.last_error = error
+                if bqm is not None:
+                    self.bqm = bqm
+                    self.version = version
+                    self.fetched_at = time.monotonic()
+                self.lock.notify_all()
+
+        if error is not None:
+            if isinstance(error, OrchestratorException):
+                raise error
+            raise OrchestratorException("Could not fetch broker query model: {}".format(error))
+        return bqm
+
+    def refresh_in_background(self, *, fetch: Callable[[], Tuple[str, str]]):
+        """
+        Refresh the BQM on a separate thread; caller must hold the lock and have marked the fetch as in flight
+        @param fetch function returning (version, bqm)
+        """
+        self.metrics["background_refreshes"] += 1
+        self.thread = threading.Thread(target=self.run, kwargs={"fetch": fetch}, name="BqmCacheRefresh",
+                                       daemon=True)
+        self.thread.start()
+
+    def run(self, *, fetch: Callable[[], Tuple[str, str]]):
+        try:
+            self.refresh(fetch=fetch)
+        except Exception as e:
+            self.logger.debug("Background refresh of broker query model failed: {}".format(e))
+
+    def invalidate(self, *, version: str = None):
+        """
+        Invalidate the cached BQM, e.g. on a change notification from the broker
+        @param version new version reported by the broker; cache is kept if it already holds this version
+        """
+        with self.lock:
+            if version is not None and version == self.version:
+                return
+            self.fetched_at = 0
+
+    def get_version(self) -> str:
+        """
+        Return the version of the cached BQM
+        @return version
+        """
+        with self.lock:
+            return self.version
+
+    def get_metrics(self) -> dict:
+        """
+        Return cache hit/miss/fetch counters
+        @return dict of counters
+        """
+        with self.lock:
+            return dict(self.metrics)
+
+    def stop(self):
+        """
+        Wait for a background refresh in progress
+        """
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread is not None:
+            thread.join()
+
+    @staticmethod
+    def validate(*, bqm: str):
+        """
+        Validate a BQM in memory, applying the FIM graph validation rules
+        @param bqm BQM as GraphML
+        @raises OrchestratorException if the BQM is invalid
+        """
+        try:
+            GraphValidator.validate_graphml(graph_str=bqm)
+        except Exception as e:
+            raise OrchestratorException("Invalid broker query model: {}".format(e))
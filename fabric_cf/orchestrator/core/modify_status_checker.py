@@ -23,9 +23,10 @@
 #
 #
 # Author: Komal Thareja (kthare10@renci.org)
-from fabric_cf.actor.core.apis.i_mgmt_controller import IMgmtController
 from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
+from fabric_cf.actor.core.util.id import ID
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.reservation_id_with_modify_index import ReservationIDWithModifyIndex
 from fabric_cf.orchestrator.core.status_checker import StatusChecker, Status
@@ -37,39 +38,42 @@ class ModifyStatusChecker(StatusChecker):
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
         self.logger = GlobalsSingleton.get().get_logger()
 
-    def check_(self, *, controller: IMgmtController, rid) -> Status:
+    def get_reservation_id(self, *, rid) -> ID:
+        if not isinstance(rid, ReservationIDWithModifyIndex):
+            return None
+        return rid.get_reservation_id()
+
+    def check_(self, *, rid, status: ReservationStatusMng) -> Status:
         if not isinstance(rid, ReservationIDWithModifyIndex):
             return Status.NOTREADY
 
         try:
-            reservations = controller.get_reservations(rid=rid.get_reservation_id())
-            if reservations is None or len(reservations) == 0:
+            if status is None or status.get_state() == ReservationStates.Unknown.value:
                 raise OrchestratorException("Unable to obtain reservation information for {}".format(
                     rid.get_reservation_id()))
-            reservation = next(iter(reservations))
 
-            if reservation.get_state() != ReservationStates.Active or \
-                    reservation.get_pending_state() != ReservationPendingStates.None_:
+            if status.get_state() == ReservationStates.Failed.value or \
+                    status.get_state() == ReservationStates.Closed.value:
+                return Status.NOTOK
+
+            if status.get_state() != ReservationStates.Active.value or \
+                    status.get_pending_state() != ReservationPendingStates.None_.value:
                 self.logger.debug("Returning NOTREADY for reservation {} in state ({}, {})".format(
-                    rid, reservation.get_state(), reservation.get_pending_state()))
+                    rid, status.get_state(), status.get_pending_state()))
                 return Status.NOTREADY
 
-            if reservation.get_state() == ReservationStates.Failed or \
-                    reservation.get_pending_state() == ReservationStates.Closed:
-                return Status.NOTOK
-
-            units_list = controller.get_reservation_units(rid=rid.get_reservation_id())
+            units_list = status.get_units()
 
-            if len(units_list) == 0:
+            if units_list is None or len(units_list) == 0:
                 raise OrchestratorException("No units associated with reservation {}".format(rid.get_reservation_id()))
 
             unit = units_list.__iter__().__next__()
 
             properties = unit.get_properties()
-            code_property_name = Constants.unit_modify_prop_prefix + rid.get_modify_index() +\
+            code_property_name = Constants.unit_modify_prop_prefix + str(rid.get_modify_index()) +\
                                  Constants.unit_modify_prop_code_suffix
 
-            message_property_name = Constants.unit_modify_prop_prefix + rid.get_modify_index() +\
+            message_property_name = Constants.unit_modify_prop_prefix + str(rid.get_modify_index()) +\
                                     Constants.unit_modify_prop_message_suffix
             modify_failed = False
             modify_error_message = None
@@ -25,7 +25,6 @@
 # Author: Komal Thareja (kthare10@renci.org)
 import traceback
 
-from fabric_cf.actor.boot.inventory.neo4j_resource_pool_factory import Neo4jResourcePoolFactory
 from fabric_cf.actor.core.apis.i_actor import ActorType
 from fabric_cf.actor.core.apis.i_mgmt_controller import IMgmtController
 from fabric_cf.actor.core.common.constants import Constants
@@ -71,7 +70,13 @@ class OrchestratorHandler:
 
         return None
 
-    def discover_types(self, *, controller: IMgmtController, token: str) -> dict:
+    def fetch_bqm(self, *, controller: IMgmtController, token: str) -> tuple:
+        """
+        Query the broker for its resource pools
+        @param controller management controller
+        @param token id token
+        @return tuple (version, bqm)
+        """
         broker = self.get_broker(controller=controller)
         if broker is None:
             raise OrchestratorException("Unable to determine broker proxy for this controller. "
@@ -83,20 +88,19 @@ class OrchestratorHandler:
         if my_pools is None:
             raise OrchestratorException("Could not discover types: {}".format(controller.get_last_error()))
 
+        version = None
         response = None
         for p in my_pools:
-            try:
-                bqm = p.properties.get(Constants.broker_query_model, None)
-                if bqm is not None:
-                    graph = Neo4jResourcePoolFactory.get_graph_from_string(graph_str=bqm)
-                    graph.validate_graph()
-                    Neo4jResourcePoolFactory.delete_graph(graph_id=graph.get_graph_id())
-                    response = bqm
-            except Exception as e:
-                self.logger.error(traceback.format_exc())
-                self.logger.debug("Could not process discover types response {}".format(e))
+            bqm = p.properties.get(Constants.broker_query_model, None)
+            if bqm is not None:
+                version = p.properties.get(Constants.broker_query_model_version, None)
+                response = bqm
 
-        return response
+        return version, response
+
+    def discover_types(self, *, controller: IMgmtController, token: str) -> dict:
+        bqm_cache = self.controller_state.get_bqm_cache()
+        return bqm_cache.get(fetch=lambda: self.fetch_bqm(controller=controller, token=token))
 
     def list_resources(self, *, token: str):
         try:
@@ -30,10 +30,12 @@ from typing import List
 
 from fabric_mb.message_bus.messages.reservation_mng import ReservationMng
 
-from fabric_cf.actor.core.apis.i_mgmt_actor import IMgmtController
+from fabric_cf.actor.core.apis.i_mgmt_controller import IMgmtController
+from fabric_cf.actor.core.common.constants import Constants
 from fabric_cf.actor.core.manage.management_utils import ManagementUtils
 from fabric_cf.actor.core.time.term import Term
 from fabric_cf.actor.core.util.id import ID
+from fabric_cf.orchestrator.core.bqm_cache import BqmCache
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.orchestrator_slice import OrchestratorSlice
 from fabric_cf.orchestrator.core.reservation_status_update_thread import ReservationStatusUpdateThread
@@ -52,6 +54,7 @@ class OrchestratorState:
         self.broker = None
         self.logger = None
         self.controller = None
+        self.bqm_cache = None
 
     def set_broker(self, *, broker: str):
         self.broker = broker
@@ -76,7 +79,22 @@ class OrchestratorState:
             self.controller = ManagementUtils.get_local_actor()
         return self.controller
 
+    def get_bqm_cache(self) -> BqmCache:
+        with self.lock:
+            if self.bqm_cache is None:
+                from fabric_cf.actor.core.container.globals import GlobalsSingleton
+                runtime_config = GlobalsSingleton.get().get_config().get_runtime_config()
+                ttl = float(runtime_config.get(Constants.property_conf_controller_bqm_cache_ttl,
+                                               BqmCache.DEFAULT_TTL))
+                refresh_interval = float(runtime_config.get(Constants.property_conf_controller_bqm_refresh_interval,
+                                                            BqmCache.DEFAULT_REFRESH_INTERVAL))
+                self.bqm_cache = BqmCache(logger=self.get_logger(), ttl=ttl, refresh_interval=refresh_interval)
+            return self.bqm_cache
+
     def stop_threads(self):
+        if self.bqm_cache is not None:
+            self.bqm_cache.stop()
+
         if self.sdt is not None:
             self.sdt.stop()
 
@@ -24,9 +24,15 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 import threading
-from typing import List
+from typing import List, Dict
 
+from fabric_cf.actor.core.apis.i_event import IEvent
+from fabric_cf.actor.core.apis.i_event_handler import IEventHandler
 from fabric_cf.actor.core.apis.i_mgmt_controller import IMgmtController
+from fabric_cf.actor.core.kernel.reservation_state_transition_event import ReservationStateTransitionEvent
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
+from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
+from fabric_cf.actor.core.util.all_actor_events_filter import AllActorEventsFilter
 from fabric_cf.actor.core.util.id import ID
 from fabric_cf.orchestrator.core.active_status_checker import ActiveStatusChecker
 from fabric_cf.orchestrator.core.i_status_update_callback import IStatusUpdateCallback
@@ -35,7 +41,7 @@ from fabric_cf.orchestrator.core.status_checker import StatusChecker, Status
 from fabric_cf.orchestrator.core.watch_entry import WatchEntry, TriggeredWatchEntry
 
 
-class ReservationStatusUpdateThread:
+class ReservationStatusUpdateThread(IEventHandler):
     """
     This thread allows expressing interest in completion of certain reservations and can run callbacks on other specified
     reservations when the status changes accordingly
@@ -45,34 +51,159 @@ class ReservationStatusUpdateThread:
     Principle of operation: allows to watch the following state transitions and events: - to Active transitions on
     reservations - to Active transitions followed by OK unit status on modify
 
-    The periodic thread polls reservations of interest to determine whether the they have reached the required state,
-    upon which
+    The thread subscribes to the reservation state transition events of the local controller actor. A transition of a
+    watched reservation wakes the thread up, which then re-evaluates only the watch entries containing that reservation
+    and invokes the callbacks of the entries which have reached the required state. The status of all reservations of
+    interest is fetched with a single management call. A slow periodic sweep of all watch entries remains as a safety
+    net; if the subscription cannot be created, the thread falls back to polling every MODIFY_CHECK_PERIOD seconds.
     """
     MODIFY_CHECK_PERIOD = 5 # seconds
+    SWEEP_PERIOD = 60 # seconds
+    # The database may lag behind the in-memory state transition; re-check such reservations shortly
+    RETRY_PERIOD = 0.1 # seconds
+    MAX_RETRIES = 50
 
     def __init__(self):
         self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
         self.active_watch = []
         self.modify_watch = []
+        # Reference count of the watched reservation ids
+        self.watched = {}
+        # Watched reservation ids which transitioned since the last scan mapped to the state observed in the event
+        self.changed = {}
+        # Reservation ids whose fetched status did not yet reflect the observed transition
+        self.retries = {}
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
         self.logger = GlobalsSingleton.get().get_logger()
 
         self.thread = None
-        self.stopped_worker = threading.Event()
+        self.stopped = False
+        self.subscription_id = None
+        self.token = None
 
     def start(self):
-        self.thread = threading.Thread(target=self.periodic())
+        self.subscribe()
+        self.thread = threading.Thread(target=self.periodic)
         self.thread.setName('ReservationStatusUpdateThread')
         self.thread.setDaemon(True)
         self.thread.start()
 
     def stop(self):
-        self.stopped_worker.set()
-        self.thread.join()
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        self.unsubscribe()
+        if self.thread is not None:
+            self.thread.join()
+
+    def subscribe(self):
+        """
+        Subscribe to the events of the local controller actor
+        """
+        try:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            actor = GlobalsSingleton.get().get_container().get_actor()
+            self.token = actor.get_identity()
+            self.subscription_id = GlobalsSingleton.get().event_manager.create_subscription(
+                token=self.token, filters=[AllActorEventsFilter(actor_guid=actor.get_guid())], handler=self)
+        except Exception as e:
+            self.subscription_id = None
+            self.logger.error("Unable to subscribe to reservation events, falling back to polling e: {}".format(e))
+
+    def unsubscribe(self):
+        """
+        Delete the event subscription
+        """
+        if self.subscription_id is None:
+            return
+        try:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            GlobalsSingleton.get().event_manager.delete_subscription(sid=self.subscription_id, token=self.token)
+        except Exception as e:
+            self.logger.error("Unable to delete event subscription e: {}".format(e))
+        self.subscription_id = None
+
+    def handle(self, *, event: IEvent):
+        """
+        Invoked on the actor thread for every event of the controller; only records the transitions of watched
+        reservations and wakes up the thread
+        @param event event
+        """
+        if not isinstance(event, ReservationStateTransitionEvent):
+            return
+
+        rid = str(event.get_reservation_id())
+        with self.condition:
+            if rid in self.watched:
+                self.changed[rid] = event.get_state()
+                self.condition.notify_all()
 
     def periodic(self):
-        while not self.stopped_worker.wait(timeout=self.get_period()):
-            self.run()
+        while True:
+            with self.condition:
+                if self.stopped:
+                    return
+                if len(self.changed) == 0:
+                    timeout = self.get_period()
+                    if len(self.retries) > 0:
+                        timeout = self.RETRY_PERIOD
+                    self.condition.wait(timeout=timeout)
+                if self.stopped:
+                    return
+                changed = self.changed
+                self.changed = {}
+                # reservations awaiting a retry are re-checked along with the new transitions
+                for rid, (state, attempts) in self.retries.items():
+                    if rid not in changed:
+                        changed[rid] = state
+
+            if len(changed) == 0:
+                self.run()
+            else:
+                self.run(changed=changed)
+
+    def add_watch_entry(self, *, watch_list: List[WatchEntry], watch_entry: WatchEntry, status_checker: StatusChecker):
+        """
+        Add a watch entry to a watch list and wake up the thread to evaluate it right away, as the reservations may
+        already have reached the required state
+        @param watch_list watch list
+        @param watch_entry watch entry
+        @param status_checker status checker
+        """
+        with self.condition:
+            watch_list.append(watch_entry)
+            for rid in self.get_watched_ids(watch_entry=watch_entry, status_checker=status_checker):
+                self.watched[rid] = self.watched.get(rid, 0) + 1
+                if rid not in self.changed:
+                    self.changed[rid] = None
+            self.condition.notify_all()
+
+    def remove_watch_entry(self, *, watch_list: List[WatchEntry], watch_entry: WatchEntry,
+                           status_checker: StatusChecker):
+        """
+        Remove a watch entry from a watch list; caller must hold the lock
+        @param watch_list watch list
+        @param watch_entry watch entry
+        @param status_checker status checker
+        """
+        watch_list.remove(watch_entry)
+        for rid in self.get_watched_ids(watch_entry=watch_entry, status_checker=status_checker):
+            count = self.watched.get(rid, 0) - 1
+            if count <= 0:
+                self.watched.pop(rid, None)
+                self.retries.pop(rid, None)
+            else:
+                self.watched[rid] = count
+
+    @staticmethod
+    def get_watched_ids(*, watch_entry: WatchEntry, status_checker: StatusChecker) -> List[str]:
+        result = []
+        for rid in watch_entry.watch:
+            reservation_id = status_checker.get_reservation_id(rid=rid)
+            if reservation_id is not None:
+                result.append(str(reservation_id))
+        return result
 
     def add_active_status_watch(self, *, watch: List[ID], act: List[ID], callback: IStatusUpdateCallback):
         """
@@ -88,11 +219,9 @@ class ReservationStatusUpdateThread:
             self.logger.info("watch list is size 0 or callback is null, ignoring")
             return
 
-        try:
-            self.lock.acquire()
-            self.active_watch.append(WatchEntry(watch=watch, rids=act, callback=callback))
-        finally:
-            self.lock.release()
+        self.add_watch_entry(watch_list=self.active_watch, watch_entry=WatchEntry(watch=watch, rids=act,
+                                                                                 callback=callback),
+                             status_checker=ActiveStatusChecker())
 
     def add_modify_status_watch(self, *, watch, act, callback: IStatusUpdateCallback):
         """
@@ -108,21 +237,23 @@ class ReservationStatusUpdateThread:
             self.logger.info("watch list is size 0 or callback is null, ignoring")
             return
 
-        try:
-            self.lock.acquire()
-            self.modify_watch.append(WatchEntry(watch=watch, rids=act, callback=callback))
-        finally:
-            self.lock.release()
+        self.add_watch_entry(watch_list=self.modify_watch, watch_entry=WatchEntry(watch=watch, rids=act,
+                                                                                 callback=callback),
+                             status_checker=ModifyStatusChecker())
 
-    def check_watch_entry(self, *, controller: IMgmtController, watch_entry: WatchEntry,
-                          status_checker: StatusChecker) -> TriggeredWatchEntry:
+    def check_watch_entry(self, *, watch_entry: WatchEntry, status_checker: StatusChecker,
+                          statuses: Dict[str, ReservationStatusMng]) -> TriggeredWatchEntry:
 
         ok = []
         notok = []
 
         ready = True
         for rid in watch_entry.watch:
-            status = status_checker.check(controller=controller, rid=rid, ok=ok, not_ok=notok)
+            reservation_id = status_checker.get_reservation_id(rid=rid)
+            status = None
+            if reservation_id is not None:
+                status = statuses.get(str(reservation_id), None)
+            status = status_checker.check(rid=rid, status=status, ok=ok, not_ok=notok)
             if status == Status.NOTREADY:
                 ready = False
 
@@ -133,31 +264,79 @@ class ReservationStatusUpdateThread:
         return TriggeredWatchEntry(watch=watch_entry.watch, rids=watch_entry.act, callback=watch_entry.callback, ok=ok,
                                    no_ok=notok)
 
+    def get_statuses(self, *, controller: IMgmtController, watch_list: List[WatchEntry],
+                     status_checker: StatusChecker) -> Dict[str, ReservationStatusMng]:
+        """
+        Fetch the status of all reservations watched by the entries in one call
+        @param controller controller
+        @param watch_list watch entries
+        @param status_checker status checker
+        @return reservation status keyed by reservation id; None if the status could not be obtained
+        """
+        rids = {}
+        for watch_entry in watch_list:
+            for rid in watch_entry.watch:
+                reservation_id = status_checker.get_reservation_id(rid=rid)
+                if reservation_id is not None:
+                    rids[str(reservation_id)] = reservation_id
+
+        if len(rids) == 0:
+            return {}
+
+        result = controller.get_reservation_status(rids=list(rids.values()))
+        if result is None:
+            self.logger.error("Unable to obtain status for reservations {}: {}".format(
+                list(rids.keys()), controller.get_last_error()))
+            return None
+
+        return {status.get_reservation_id(): status for status in result}
+
     def process_callback(self, *, watch_entry: TriggeredWatchEntry):
         if len(watch_entry.not_ok) == 0:
             self.logger.debug("Invoking success callback for reservations: {}".format(watch_entry.watch))
-            watch_entry.callback.success(watch_entry.ok, watch_entry.act)
+            watch_entry.callback.success(ok=watch_entry.ok, act_on=watch_entry.act)
         else:
             self.logger.debug("Invoking failure callback for reservations: {}".format(watch_entry.watch))
-            watch_entry.callback.failure(watch_entry.not_ok, watch_entry.ok, watch_entry.act)
+            watch_entry.callback.failure(failed=watch_entry.not_ok, ok=watch_entry.ok, act_on=watch_entry.act)
 
     def process_watch_list(self, *, controller: IMgmtController, watch_list: List[WatchEntry], watch_type: str,
-                           status_checker: StatusChecker):
-        to_remove = []
+                           status_checker: StatusChecker, changed: dict = None):
         self.logger.debug("Scanning {} watch list".format(watch_type))
+        try:
+            self.lock.acquire()
+            entries = watch_list.copy()
+        finally:
+            self.lock.release()
+
+        # only the entries watching a reservation which transitioned need to be re-evaluated
+        if changed is not None:
+            entries = [we for we in entries if any(rid in changed for rid in self.get_watched_ids(
+                watch_entry=we, status_checker=status_checker))]
+
+        if len(entries) == 0:
+            return
+
+        # management calls are made outside the critical section so that watches can be added meanwhile
+        statuses = self.get_statuses(controller=controller, watch_list=entries, status_checker=status_checker)
+        if statuses is None:
+            return
+
+        if changed is not None:
+            self.check_stale(changed=changed, statuses=statuses)
+
+        to_remove = []
         to_process = []
+        for watch_entry in entries:
+            twe = self.check_watch_entry(watch_entry=watch_entry, status_checker=status_checker, statuses=statuses)
+            if twe is not None:
+                to_process.append(twe)
+                to_remove.append(watch_entry)
+
         try:
             self.lock.acquire()
-            for watch_entry in watch_list:
-                twe = self.check_watch_entry(controller=controller, watch_entry=watch_entry,
-                                             status_checker=status_checker)
-                if twe is not None:
-                    to_process.append(twe)
-                    to_remove.append(twe)
             self.logger.debug("Removing {} entries from watch {}".format(watch_type, len(to_remove)))
-
             for we in to_remove:
-                watch_list.remove(we)
+                self.remove_watch_entry(watch_list=watch_list, watch_entry=we, status_checker=status_checker)
         finally:
             self.lock.release()
 
@@ -169,9 +348,36 @@ class ReservationStatusUpdateThread:
                 self.logger.error("Triggered {} watch entry for reservations {} returned with callback exception e: {}".
                                   format(watch_type, we.watch, e))
 
-    def run(self):
-        # wake up periodically and check the status of reservations (state or unit modify properties)
-        # and call appropriate callbacks if necessary.
+    def check_stale(self, *, changed: dict, statuses: Dict[str, ReservationStatusMng]):
+        """
+        Transition events are dispatched before the reservation is persisted; schedule a retry for the reservations
+        whose fetched status does not yet reflect the state observed in the event
+        @param changed transitioned reservation ids mapped to the observed state
+        @param statuses fetched reservation status
+        """
+        with self.lock:
+            for rid, state in changed.items():
+                status = statuses.get(rid, None)
+                if state is None or status is None:
+                    continue
+                stale = status.get_state() != state.get_state().value or \
+                    status.get_pending_state() != state.get_pending().value or \
+                    (status.get_state() == ReservationStates.Active.value and
+                     (status.get_units() is None or len(status.get_units()) == 0))
+                if not stale or rid not in self.watched:
+                    self.retries.pop(rid, None)
+                    continue
+                attempts = self.retries.get(rid, (state, 0))[1] + 1
+                if attempts > self.MAX_RETRIES:
+                    self.logger.warning("Status of reservation {} does not reflect state {}, deferring to the "
+                                        "periodic sweep".format(rid, state))
+                    self.retries.pop(rid, None)
+                else:
+                    self.retries[rid] = (state, attempts)
+
+    def run(self, *, changed: dict = None):
+        # wake up on reservation state transitions (or periodically) and check the status of reservations
+        # (state or unit modify properties) and call appropriate callbacks if necessary.
         # scan both lists and check if any of the
         # reservation groups on them are ready for callbacks
         # remove those ready for callbacks off the lists and invoke callbacks
@@ -184,12 +390,16 @@ class ReservationStatusUpdateThread:
             from fabric_cf.orchestrator.core.orchestrator_state import OrchestratorStateSingleton
             controller = OrchestratorStateSingleton.get().get_management_actor()
             self.process_watch_list(controller=controller, watch_list=self.active_watch, watch_type="active",
-                                    status_checker=ActiveStatusChecker())
+                                    status_checker=ActiveStatusChecker(), changed=changed)
             self.process_watch_list(controller=controller, watch_list=self.modify_watch, watch_type="modify",
-                                    status_checker=ModifyStatusChecker())
+                                    status_checker=ModifyStatusChecker(), changed=changed)
         except Exception as e:
             self.logger.error("RuntimeException: {} continuing".format(e))
 
-    @staticmethod
-    def get_period() -> int:
-        return ReservationStatusUpdateThread.MODIFY_CHECK_PERIOD
+    def get_period(self) -> int:
+        """
+        Return the period of the sweep of all watch entries; polling period if events are not available
+        """
+        if self.subscription_id is None:
+            return ReservationStatusUpdateThread.MODIFY_CHECK_PERIOD
+        return ReservationStatusUpdateThread.SWEEP_PERIOD
@@ -24,21 +24,27 @@
 #
 # Author: Komal Thareja (kthare10@renci.org)
 import threading
-import time
 import traceback
 from datetime import datetime
 
+from fabric_cf.actor.core.apis.i_event import IEvent
+from fabric_cf.actor.core.apis.i_event_handler import IEventHandler
 from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.kernel.reservation_state_transition_event import ReservationStateTransitionEvent
 from fabric_cf.actor.core.kernel.reservation_states import ReservationStates
 from fabric_cf.actor.core.time.term import Term
+from fabric_cf.actor.core.util.all_actor_events_filter import AllActorEventsFilter
 from fabric_cf.orchestrator.core.exceptions import OrchestratorException
 from fabric_cf.orchestrator.core.orchestrator_slice import OrchestratorSlice
 
 
-class SliceDeferThread:
+class SliceDeferThread(IEventHandler):
     """
     This runs as a standalone thread started by OrchestratorState and deals with slices that have to wait for other
     slices to complete.
+
+    The thread is woken up when a slice is deferred and on state transitions of the reservations of the last slice
+    (reported by the local controller actor events); THREAD_SLEEP_TIME (ms) bounds the wait otherwise.
     """
     THREAD_SLEEP_TIME = 10000
     DEFAULT_MAX_CREATE_TIME = 600000
@@ -47,7 +53,12 @@ class SliceDeferThread:
     def __init__(self):
         self.deferred_slices = []
         self.queue_lock = threading.Lock()
-        self.avail = threading.Condition()
+        self.avail = threading.Condition(self.queue_lock)
+        self.changed = False
+        # states of the reservations of the last slice as observed in the state transition events
+        self.observed = {}
+        self.subscription_id = None
+        self.token = None
         from fabric_cf.actor.core.container.globals import GlobalsSingleton
         self.logger = GlobalsSingleton.get().get_logger()
         self.thread = None
@@ -79,6 +90,7 @@ class SliceDeferThread:
             self.queue_lock.acquire()
             if controller_slice is not None:
                 self.deferred_slices.append(controller_slice)
+                self.changed = True
                 self.avail.notify_all()
 
         finally:
@@ -88,7 +100,9 @@ class SliceDeferThread:
         ret_val = None
         try:
             self.queue_lock.acquire()
-            self.avail.wait(self.THREAD_SLEEP_TIME)
+            if not self.changed and not self.stopped:
+                self.avail.wait(self.THREAD_SLEEP_TIME / 1000)
+            self.changed = False
             if len(self.deferred_slices) > 0:
                 ret_val = self.deferred_slices[0]
         except Exception:
@@ -111,8 +125,23 @@ class SliceDeferThread:
 
         self.logger.info("Updating last slice with: {}/{}".format(controller_slice.get_slice_urn(),
                                                                   controller_slice.get_slice_id()))
-        self.last_slice = controller_slice
-        self.last_slice_time = datetime.utcnow()
+        with self.avail:
+            self.last_slice = controller_slice
+            self.last_slice_time = datetime.utcnow()
+            self.observed.clear()
+
+    def get_state(self, *, reservation) -> ReservationStates:
+        """
+        Return the state of a reservation; the state observed in the transition events is preferred as it may not
+        have been persisted yet
+        @param reservation reservation
+        @return reservation state
+        """
+        with self.avail:
+            state = self.observed.get(str(reservation.get_reservation_id()), None)
+        if state is None:
+            state = ReservationStates(reservation.get_state())
+        return state
 
     def process_slice(self, *, controller_slice: OrchestratorSlice):
         if controller_slice is None:
@@ -132,21 +161,66 @@ class SliceDeferThread:
             self.demand_slice(controller_slice=controller_slice)
 
     def start(self):
-        self.thread = threading.Thread(target=self.run())
+        self.subscribe()
+        self.thread = threading.Thread(target=self.run)
         self.thread.setDaemon(True)
         self.thread.setName('SliceDeferThread')
         self.thread.start()
 
     def stop(self):
-        self.stopped = True
+        with self.avail:
+            self.stopped = True
+            self.avail.notify_all()
+        self.unsubscribe()
         if self.thread is not None:
             self.thread.join()
 
+    def subscribe(self):
+        """
+        Subscribe to the events of the local controller actor
+        """
+        try:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            actor = GlobalsSingleton.get().get_container().get_actor()
+            self.token = actor.get_identity()
+            self.subscription_id = GlobalsSingleton.get().event_manager.create_subscription(
+                token=self.token, filters=[AllActorEventsFilter(actor_guid=actor.get_guid())], handler=self)
+        except Exception as e:
+            self.subscription_id = None
+            self.logger.error("Unable to subscribe to reservation events e: {}".format(e))
+
+    def unsubscribe(self):
+        """
+        Delete the event subscription
+        """
+        if self.subscription_id is None:
+            return
+        try:
+            from fabric_cf.actor.core.container.globals import GlobalsSingleton
+            GlobalsSingleton.get().event_manager.delete_subscription(sid=self.subscription_id, token=self.token)
+        except Exception as e:
+            self.logger.error("Unable to delete event subscription e: {}".format(e))
+        self.subscription_id = None
+
+    def handle(self, *, event: IEvent):
+        """
+        Wake up the thread when a reservation of the last slice transitions while slices are deferred
+        @param event event
+        """
+        if not isinstance(event, ReservationStateTransitionEvent):
+            return
+
+        with self.avail:
+            if len(self.deferred_slices) == 0 or self.last_slice is None:
+                return
+            if str(event.get_reservation().get_slice_id()) == str(self.last_slice.get_slice_id()):
+                self.observed[str(event.get_reservation_id())] = event.get_state().get_state()
+                self.changed = True
+                self.avail.notify_all()
+
     def run(self):
         while True:
             controller_slice = self.get_head()
-            #self.logger.debug("SliceDeferThread tick")
-            time.sleep(1)
 
             if self.stopped:
                 self.logger.debug("SliceDeferThread exiting")
@@ -160,7 +234,7 @@ class SliceDeferThread:
             try:
                 self.last_slice.lock()
                 if self.delay_not_done(controller_slice=self.last_slice):
-                    if Term.delta(self.last_slice, datetime.utcnow()) > self.max_create_wait_time:
+                    if Term.delta(self.last_slice_time, datetime.utcnow()) > self.max_create_wait_time:
                         self.logger.info("Maximum wait time exceeded for slice: {}/{}, proceeding anyway".format(
                             self.last_slice.get_slice_urn(), self.last_slice.get_slice_id()))
                     else:
@@ -263,10 +337,11 @@ class SliceDeferThread:
             for reservation in all_reservations:
                 rtype = reservation.get_resource_type()
                 for drt in self.delay_resource_types:
-                    if drt == rtype and reservation.get_state() != ReservationStates.Active and \
-                        reservation.get_state() != ReservationStates.Closed and \
-                        reservation.get_state() != ReservationStates.CloseWait and \
-                            reservation.get_state() != ReservationStates.Failed:
+                    state = self.get_state(reservation=reservation)
+                    if drt == rtype and state != ReservationStates.Active and \
+                        state != ReservationStates.Closed and \
+                        state != ReservationStates.CloseWait and \
+                            state != ReservationStates.Failed:
                         self.logger.info("Slice: {}/{} has domain {} with reservation: {} that is not yet done".
                                          format(controller_slice.get_slice_urn(), controller_slice.get_slice_id(),
                                                 drt, reservation.get_reservation_id()))
@@ -26,7 +26,7 @@
 from enum import Enum
 from typing import List
 
-from fabric_cf.actor.core.apis.i_mgmt_controller import IMgmtController
+from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
 from fabric_cf.actor.core.util.id import ID
 
 
@@ -37,14 +37,25 @@ class Status(Enum):
 
 
 class StatusChecker:
+    """
+    Evaluates the status of a watched reservation from its ReservationStatusMng, which the
+    ReservationStatusUpdateThread fetches for all watched reservations in one call
+    """
+    def get_reservation_id(self, *, rid) -> ID:
+        """
+        Return the reservation id to fetch the status for
+        @param rid watched reservation
+        @return reservation id or None if rid is not supported by this checker
+        """
+        raise NotImplementedError
 
-    def check(self, *, controller: IMgmtController, rid, ok: List[ID], not_ok: List[ID]) -> Status:
-        result = self.check_(controller=controller, rid=0)
+    def check(self, *, rid, status: ReservationStatusMng, ok: List[ID], not_ok: List[ID]) -> Status:
+        result = self.check_(rid=rid, status=status)
         if result == Status.OK:
             ok.append(rid)
         elif result == Status.NOTOK:
             not_ok.append(rid)
         return result
 
-    def check_(self, *, controller: IMgmtController, rid) -> Status:
+    def check_(self, *, rid, status: ReservationStatusMng) -> Status:
         raise NotImplementedError
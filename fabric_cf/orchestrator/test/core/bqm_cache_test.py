@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import time
+import unittest
+from unittest import mock
+
+from fabric_cf.orchestrator.core.bqm_cache import BqmCache
+
+
+class DummyFetch:
+    """
+    Fetch function returning a fixed (version, bqm); blocks until released when gated
+    """
+    def __init__(self, *, version: str = "v1", bqm: str = "bqm", gated: bool = False):
+        self.version = version
+        self.bqm = bqm
+        self.calls = 0
+        self.gate = threading.Event()
+        if not gated:
+            self.gate.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.gate.wait()
+        return self.version, self.bqm
+
+
+class BqmCacheTest(unittest.TestCase):
+    def setUp(self):
+        # skip the FIM validation of the dummy BQMs
+        patcher = mock.patch.object(BqmCache, "validate")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def make_cache(*, ttl: float = 60) -> BqmCache:
+        return BqmCache(logger=logging.getLogger(__name__), ttl=ttl)
+
+    def test_ttl_hit(self):
+        cache = self.make_cache()
+        fetch = DummyFetch()
+        self.assertEqual("bqm", cache.get(fetch=fetch))
+        self.assertEqual("bqm", cache.get(fetch=fetch))
+        self.assertEqual(1, fetch.calls)
+        metrics = cache.get_metrics()
+        self.assertEqual(1, metrics["hits"])
+        self.assertEqual(1, metrics["misses"])
+
+    def test_ttl_miss(self):
+        cache = self.make_cache(ttl=0.05)
+        fetch = DummyFetch()
+        cache.get(fetch=fetch)
+        time.sleep(0.1)
+        fetch.bqm = "bqm2"
+        self.assertEqual("bqm2", cache.get(fetch=fetch))
+        self.assertEqual(2, fetch.calls)
+        self.assertEqual(2, cache.get_metrics()["misses"])
+
+    def test_concurrent_get_single_fetch(self):
+        cache = self.make_cache()
+        fetch = DummyFetch(gated=True)
+        count = 8
+        results = []
+
+        def get():
+            results.append(cache.get(fetch=fetch))
+
+        threads = [threading.Thread(target=get) for i in range(count)]
+        for t in threads:
+            t.start()
+        # wait until all the other callers are blocked on the in-flight fetch
+        deadline = time.monotonic() + 5
+        while cache.get_metrics()["coalesced"] < count - 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        fetch.gate.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(1, fetch.calls)
+        self.assertEqual(["bqm"] * count, results)
+        self.assertEqual(count - 1, cache.get_metrics()["coalesced"])
+
+    def test_invalidate(self):
+        cache = self.make_cache()
+        fetch = DummyFetch()
+        cache.get(fetch=fetch)
+
+        # matching version keeps the cached BQM
+        cache.invalidate(version="v1")
+        cache.get(fetch=fetch)
+        self.assertEqual(1, fetch.calls)
+
+        cache.invalidate(version="v2")
+        fetch.version = "v2"
+        cache.get(fetch=fetch)
+        self.assertEqual(2, fetch.calls)
+        self.assertEqual("v2", cache.get_version())
+
+    def test_none_not_cached(self):
+        cache = self.make_cache()
+        fetch = DummyFetch(bqm=None)
+        self.assertIsNone(cache.get(fetch=fetch))
+        self.assertIsNone(cache.get(fetch=fetch))
+        self.assertEqual(2, fetch.calls)
+        self.assertIsNone(cache.get_version())
+
+
+if __name__ == '__main__':
+    unittest.main()
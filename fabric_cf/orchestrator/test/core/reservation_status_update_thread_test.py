@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import time
+import unittest
+from typing import List
+from unittest import mock
+
+from fabric_cf.actor.core.kernel.reservation_state_transition_event import ReservationStateTransitionEvent
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.reservation_state import ReservationState
+from fabric_cf.orchestrator.core.active_status_checker import ActiveStatusChecker
+from fabric_cf.orchestrator.core.i_status_update_callback import IStatusUpdateCallback
+from fabric_cf.orchestrator.core.reservation_status_update_thread import ReservationStatusUpdateThread
+from fabric_cf.orchestrator.core.watch_entry import WatchEntry
+from fabric_cf.orchestrator.test.core.status_checker_test import DummyUnit, make_status
+
+
+class DummyController:
+    """
+    Returns the configured status of the requested reservations
+    """
+    def __init__(self):
+        self.statuses = {}
+        self.requests = []
+
+    def get_reservation_status(self, *, rids: List[ID]):
+        self.requests.append([str(r) for r in rids])
+        return [self.statuses[str(r)] for r in rids if str(r) in self.statuses]
+
+    def get_last_error(self):
+        return None
+
+
+class LaggingController(DummyController):
+    """
+    Reports the configured status only from the given request on; the earlier requests see the initial status
+    """
+    def __init__(self, *, ready_at: int):
+        super().__init__()
+        self.ready_at = ready_at
+        self.ready = {}
+
+    def get_reservation_status(self, *, rids: List[ID]):
+        if len(self.requests) + 1 >= self.ready_at:
+            self.statuses.update(self.ready)
+        return super().get_reservation_status(rids=rids)
+
+
+class DummyCallback(IStatusUpdateCallback):
+    def __init__(self):
+        self.ok = None
+        self.failed = None
+        self.called = threading.Event()
+
+    def success(self, *, ok: List[ID], act_on: List[ID]):
+        self.ok = ok
+        self.called.set()
+
+    def failure(self, *, failed: List[ID], ok: List[ID], act_on: List[ID]):
+        self.failed = failed
+        self.ok = ok
+        self.called.set()
+
+
+class ReservationStatusUpdateThreadTest(unittest.TestCase):
+    logger = logging.getLogger("ReservationStatusUpdateThreadTest")
+
+    def make_thread(self) -> ReservationStatusUpdateThread:
+        # avoid loading the logger from the globals
+        result = ReservationStatusUpdateThread.__new__(ReservationStatusUpdateThread)
+        result.lock = threading.Lock()
+        result.condition = threading.Condition(result.lock)
+        result.active_watch = []
+        result.modify_watch = []
+        result.watched = {}
+        result.changed = {}
+        result.retries = {}
+        result.logger = self.logger
+        result.thread = None
+        result.stopped = False
+        result.subscription_id = None
+        result.token = None
+        return result
+
+    def make_checker(self) -> ActiveStatusChecker:
+        result = ActiveStatusChecker.__new__(ActiveStatusChecker)
+        result.logger = self.logger
+        return result
+
+    def test_process_watch_list(self):
+        thread = self.make_thread()
+        checker = self.make_checker()
+        controller = DummyController()
+        r1, r2 = ID(), ID()
+        callback = DummyCallback()
+        thread.add_watch_entry(watch_list=thread.active_watch,
+                               watch_entry=WatchEntry(watch=[r1, r2], rids=[], callback=callback),
+                               status_checker=checker)
+
+        controller.statuses[str(r1)] = make_status(rid=r1, state=ReservationStates.Active,
+                                                   units=[DummyUnit(properties={})])
+        controller.statuses[str(r2)] = make_status(rid=r2, state=ReservationStates.Ticketed)
+        thread.process_watch_list(controller=controller, watch_list=thread.active_watch, watch_type="active",
+                                  status_checker=checker)
+        # one call for all watched reservations; not all are ready yet
+        self.assertEqual([[str(r1), str(r2)]], controller.requests)
+        self.assertFalse(callback.called.is_set())
+        self.assertEqual(1, len(thread.active_watch))
+
+        controller.statuses[str(r2)] = make_status(rid=r2, state=ReservationStates.Failed)
+        thread.process_watch_list(controller=controller, watch_list=thread.active_watch, watch_type="active",
+                                  status_checker=checker)
+        self.assertTrue(callback.called.is_set())
+        self.assertEqual([r2], callback.failed)
+        self.assertEqual([r1], callback.ok)
+        self.assertEqual(0, len(thread.active_watch))
+        self.assertEqual({}, thread.watched)
+
+    @staticmethod
+    def make_event(*, rid: ID, state: ReservationStates) -> ReservationStateTransitionEvent:
+        reservation = mock.MagicMock()
+        reservation.get_reservation_id.return_value = rid
+        return ReservationStateTransitionEvent(reservation=reservation,
+                                               state=ReservationState(state=state,
+                                                                      pending=ReservationPendingStates.None_))
+
+    def start(self, *, thread: ReservationStatusUpdateThread, controller: DummyController):
+        globals_obj = mock.MagicMock()
+        globals_obj.get_logger.return_value = self.logger
+        orchestrator_state = mock.MagicMock()
+        orchestrator_state.get_management_actor.return_value = controller
+        for patcher in [mock.patch("fabric_cf.actor.core.container.globals.GlobalsSingleton.get",
+                                   return_value=globals_obj),
+                        mock.patch("fabric_cf.orchestrator.core.orchestrator_state.OrchestratorStateSingleton.get",
+                                   return_value=orchestrator_state)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # subscribed to the events, only the slow sweep would pick up the transitions otherwise
+        thread.subscription_id = "subscription"
+        thread.thread = threading.Thread(target=thread.periodic, daemon=True)
+        thread.thread.start()
+        self.addCleanup(thread.stop)
+
+    @staticmethod
+    def wait_for_requests(*, controller: DummyController, count: int):
+        deadline = time.monotonic() + 5
+        while len(controller.requests) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_event_wakes_thread(self):
+        thread = self.make_thread()
+        controller = DummyController()
+        r1 = ID()
+        controller.statuses[str(r1)] = make_status(rid=r1, state=ReservationStates.Ticketed)
+        self.start(thread=thread, controller=controller)
+
+        callback = DummyCallback()
+        thread.add_active_status_watch(watch=[r1], act=[], callback=callback)
+        # the new entry is evaluated right away
+        self.wait_for_requests(controller=controller, count=1)
+        self.assertEqual(1, len(controller.requests))
+        self.assertFalse(callback.called.is_set())
+
+        # transitions of reservations which are not watched are ignored
+        thread.handle(event=self.make_event(rid=ID(), state=ReservationStates.Active))
+        with thread.condition:
+            self.assertEqual({}, thread.changed)
+
+        controller.statuses[str(r1)] = make_status(rid=r1, state=ReservationStates.Active,
+                                                   units=[DummyUnit(properties={})])
+        thread.handle(event=self.make_event(rid=r1, state=ReservationStates.Active))
+        self.assertTrue(callback.called.wait(timeout=5))
+        self.assertEqual([r1], callback.ok)
+        self.assertEqual(0, len(thread.active_watch))
+
+    def test_retry_stale_status(self):
+        thread = self.make_thread()
+        # the status only reflects the transition from the third request
+        controller = LaggingController(ready_at=3)
+        r1 = ID()
+        controller.statuses[str(r1)] = make_status(rid=r1, state=ReservationStates.Ticketed)
+        controller.ready[str(r1)] = make_status(rid=r1, state=ReservationStates.Active,
+                                                units=[DummyUnit(properties={})])
+        self.start(thread=thread, controller=controller)
+
+        callback = DummyCallback()
+        thread.add_active_status_watch(watch=[r1], act=[], callback=callback)
+        self.wait_for_requests(controller=controller, count=1)
+        thread.handle(event=self.make_event(rid=r1, state=ReservationStates.Active))
+
+        # re-checked after RETRY_PERIOD instead of waiting for the sweep
+        self.assertTrue(callback.called.wait(timeout=5))
+        self.assertEqual(3, len(controller.requests))
+        with thread.condition:
+            self.assertEqual({}, thread.retries)
+
+    def test_check_stale(self):
+        thread = self.make_thread()
+        r1 = str(ID())
+        thread.watched[r1] = 1
+        state = ReservationState(state=ReservationStates.Active, pending=ReservationPendingStates.None_)
+        changed = {r1: state}
+
+        # Active without units is not yet up to date
+        statuses = {r1: make_status(rid=r1, state=ReservationStates.Active)}
+        for i in range(ReservationStatusUpdateThread.MAX_RETRIES):
+            thread.check_stale(changed=changed, statuses=statuses)
+        self.assertEqual((state, ReservationStatusUpdateThread.MAX_RETRIES), thread.retries[r1])
+
+        # gives up and defers to the sweep
+        thread.check_stale(changed=changed, statuses=statuses)
+        self.assertEqual({}, thread.retries)
+
+        statuses = {r1: make_status(rid=r1, state=ReservationStates.Ticketed)}
+        thread.check_stale(changed=changed, statuses=statuses)
+        self.assertEqual(1, thread.retries[r1][1])
+
+        statuses = {r1: make_status(rid=r1, state=ReservationStates.Active, units=[DummyUnit(properties={})])}
+        thread.check_stale(changed=changed, statuses=statuses)
+        self.assertEqual({}, thread.retries)
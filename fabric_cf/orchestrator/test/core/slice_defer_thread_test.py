@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import threading
+import unittest
+from unittest import mock
+
+from fabric_cf.actor.core.kernel.reservation_state_transition_event import ReservationStateTransitionEvent
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.actor.core.util.reservation_state import ReservationState
+from fabric_cf.orchestrator.core.slice_defer_thread import SliceDeferThread
+
+
+class SliceDeferThreadTest(unittest.TestCase):
+    logger = logging.getLogger("SliceDeferThreadTest")
+
+    def make_thread(self) -> SliceDeferThread:
+        # avoid loading the logger and configuration from the globals
+        result = SliceDeferThread.__new__(SliceDeferThread)
+        result.deferred_slices = []
+        result.queue_lock = threading.Lock()
+        result.avail = threading.Condition(result.queue_lock)
+        result.changed = False
+        result.observed = {}
+        result.subscription_id = None
+        result.token = None
+        result.logger = self.logger
+        result.thread = None
+        result.last_slice = None
+        result.last_slice_time = None
+        result.max_create_wait_time = SliceDeferThread.DEFAULT_MAX_CREATE_TIME
+        result.delay_resource_types = SliceDeferThread.DEFAULT_DELAY_RESOURCE_TYPES.split(" ")
+        result.stopped = False
+        return result
+
+    @staticmethod
+    def make_slice(*, slice_id: ID) -> mock.MagicMock:
+        result = mock.MagicMock()
+        result.get_slice_id.return_value = slice_id
+        return result
+
+    @staticmethod
+    def make_reservation(*, slice_id: ID, state: ReservationStates) -> mock.MagicMock:
+        result = mock.MagicMock()
+        result.get_reservation_id.return_value = ID()
+        result.get_slice_id.return_value = slice_id
+        result.get_state.return_value = state.value
+        return result
+
+    @staticmethod
+    def make_event(*, reservation: mock.MagicMock, state: ReservationStates) -> ReservationStateTransitionEvent:
+        return ReservationStateTransitionEvent(reservation=reservation,
+                                               state=ReservationState(state=state,
+                                                                      pending=ReservationPendingStates.None_))
+
+    def test_handle(self):
+        thread = self.make_thread()
+        last_id = ID()
+        reservation = self.make_reservation(slice_id=last_id, state=ReservationStates.Ticketed)
+        event = self.make_event(reservation=reservation, state=ReservationStates.Active)
+
+        # nothing is deferred
+        thread.handle(event=event)
+        self.assertFalse(thread.changed)
+
+        thread.update_last(controller_slice=self.make_slice(slice_id=last_id))
+        thread.deferred_slices.append(self.make_slice(slice_id=ID()))
+
+        # reservation of another slice
+        other = self.make_reservation(slice_id=ID(), state=ReservationStates.Ticketed)
+        thread.handle(event=self.make_event(reservation=other, state=ReservationStates.Active))
+        self.assertFalse(thread.changed)
+        self.assertEqual({}, thread.observed)
+
+        thread.handle(event=event)
+        self.assertTrue(thread.changed)
+        self.assertEqual({str(reservation.get_reservation_id()): ReservationStates.Active}, thread.observed)
+
+    def test_handle_wakes_thread(self):
+        thread = self.make_thread()
+        last_id = ID()
+        deferred = self.make_slice(slice_id=ID())
+        thread.update_last(controller_slice=self.make_slice(slice_id=last_id))
+        thread.deferred_slices.append(deferred)
+
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(thread.get_head()), daemon=True)
+        waiter.start()
+        reservation = self.make_reservation(slice_id=last_id, state=ReservationStates.Ticketed)
+        # the event may arrive before get_head waits; changed is set then and get_head does not wait
+        thread.handle(event=self.make_event(reservation=reservation, state=ReservationStates.Active))
+
+        # returns well before THREAD_SLEEP_TIME
+        waiter.join(timeout=5)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual([deferred], result)
+
+    def test_get_state(self):
+        thread = self.make_thread()
+        last_id = ID()
+        thread.update_last(controller_slice=self.make_slice(slice_id=last_id))
+        thread.deferred_slices.append(self.make_slice(slice_id=ID()))
+        reservation = self.make_reservation(slice_id=last_id, state=ReservationStates.Ticketed)
+
+        # persisted state until a transition is observed
+        self.assertEqual(ReservationStates.Ticketed, thread.get_state(reservation=reservation))
+        thread.handle(event=self.make_event(reservation=reservation, state=ReservationStates.Active))
+        self.assertEqual(ReservationStates.Active, thread.get_state(reservation=reservation))
+
+        # observed states are reset with the last slice
+        thread.update_last(controller_slice=self.make_slice(slice_id=ID()))
+        self.assertEqual(ReservationStates.Ticketed, thread.get_state(reservation=reservation))
+
+
+if __name__ == '__main__':
+    unittest.main()
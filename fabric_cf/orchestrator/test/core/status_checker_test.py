@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# MIT License
+#
+# Copyright (c) 2020 FABRIC Testbed
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+#
+# Author: Komal Thareja (kthare10@renci.org)
+import logging
+import unittest
+
+from fabric_cf.actor.core.common.constants import Constants
+from fabric_cf.actor.core.kernel.reservation_states import ReservationStates, ReservationPendingStates
+from fabric_cf.actor.core.manage.messages.reservation_status_mng import ReservationStatusMng
+from fabric_cf.actor.core.util.id import ID
+from fabric_cf.orchestrator.core.active_status_checker import ActiveStatusChecker
+from fabric_cf.orchestrator.core.modify_status_checker import ModifyStatusChecker
+from fabric_cf.orchestrator.core.reservation_id_with_modify_index import ReservationIDWithModifyIndex
+from fabric_cf.orchestrator.core.status_checker import Status
+
+
+class DummyUnit:
+    def __init__(self, *, properties: dict):
+        self.properties = properties
+
+    def get_properties(self) -> dict:
+        return self.properties
+
+
+def make_status(*, rid: ID, state: ReservationStates,
+                pending: ReservationPendingStates = ReservationPendingStates.None_,
+                units: list = None) -> ReservationStatusMng:
+    result = ReservationStatusMng()
+    result.set_reservation_id(value=str(rid))
+    result.set_state(value=state.value)
+    result.set_pending_state(value=pending.value)
+    result.set_units(value=units)
+    return result
+
+
+class StatusCheckerTest(unittest.TestCase):
+    logger = logging.getLogger("StatusCheckerTest")
+
+    def make_checker(self, checker_class):
+        # avoid loading the logger from the globals
+        result = checker_class.__new__(checker_class)
+        result.logger = self.logger
+        return result
+
+    def test_active(self):
+        checker = self.make_checker(ActiveStatusChecker)
+        rid = ID()
+        unit = DummyUnit(properties={})
+        self.assertEqual(rid, checker.get_reservation_id(rid=rid))
+        self.assertEqual(Status.NOTREADY, checker.check_(rid=str(rid), status=None))
+        self.assertEqual(Status.NOTREADY, checker.check_(rid=rid, status=None))
+        self.assertEqual(Status.NOTREADY,
+                         checker.check_(rid=rid, status=make_status(rid=rid, state=ReservationStates.Unknown)))
+        self.assertEqual(Status.NOTREADY,
+                         checker.check_(rid=rid, status=make_status(rid=rid, state=ReservationStates.Ticketed)))
+        # Active is only reported once the units are available
+        self.assertEqual(Status.NOTREADY,
+                         checker.check_(rid=rid, status=make_status(rid=rid, state=ReservationStates.Active)))
+        self.assertEqual(Status.OK, checker.check_(rid=rid, status=make_status(rid=rid, state=ReservationStates.Active,
+                                                                              units=[unit])))
+        self.assertEqual(Status.OK,
+                         checker.check_(rid=rid, status=make_status(rid=rid, state=ReservationStates.Closed)))
+        self.assertEqual(Status.NOTOK,
+                         checker.check_(rid=rid, status=make_status(rid=rid, state=ReservationStates.Failed)))
+
+        ok, not_ok = [], []
+        checker.check(rid=rid, status=make_status(rid=rid, state=ReservationStates.Failed), ok=ok, not_ok=not_ok)
+        self.assertEqual(([], [rid]), (ok, not_ok))
+
+    def test_modify(self):
+        checker = self.make_checker(ModifyStatusChecker)
+        rid = ReservationIDWithModifyIndex(rid=ID(), index=2)
+        code = Constants.unit_modify_prop_prefix + "2" + Constants.unit_modify_prop_code_suffix
+        message = Constants.unit_modify_prop_prefix + "2" + Constants.unit_modify_prop_message_suffix
+        self.assertEqual(rid.get_reservation_id(), checker.get_reservation_id(rid=rid))
+        self.assertIsNone(checker.get_reservation_id(rid=ID()))
+
+        def check(status: ReservationStatusMng) -> Status:
+            return checker.check_(rid=rid, status=status)
+
+        res_id = rid.get_reservation_id()
+        self.assertEqual(Status.NOTREADY, check(None))
+        self.assertEqual(Status.NOTOK, check(make_status(rid=res_id, state=ReservationStates.Failed)))
+        self.assertEqual(Status.NOTOK, check(make_status(rid=res_id, state=ReservationStates.Closed)))
+        self.assertEqual(Status.NOTREADY, check(make_status(rid=res_id, state=ReservationStates.Active,
+                                                            pending=ReservationPendingStates.Redeeming,
+                                                            units=[DummyUnit(properties={code: "0"})])))
+        # no modify status recorded for this index yet
+        self.assertEqual(Status.NOTREADY, check(make_status(rid=res_id, state=ReservationStates.Active,
+                                                            units=[DummyUnit(properties={})])))
+        self.assertEqual(Status.OK, check(make_status(rid=res_id, state=ReservationStates.Active,
+                                                      units=[DummyUnit(properties={code: "0"})])))
+        self.assertEqual(Status.NOTOK, check(make_status(rid=res_id, state=ReservationStates.Active,
+                                                         units=[DummyUnit(properties={code: "1",
+                                                                                      message: "failed"})])))